@@ -21,6 +21,7 @@ from delfin import coordination
 from delfin import db
 from delfin import exception
 from delfin.common import alert_util
+from delfin.common import constants
 from delfin.drivers import api as driver_manager
 from delfin.exporter import base_exporter
 from delfin.task_manager import rpcapi
@@ -60,6 +61,8 @@ class AlertProcessor(object):
 
         # Export to base exporter which handles dispatch for all exporters
         if alert_model:
+            db.alerts_upsert(ctxt, alert['storage_id'], [alert_model],
+                             origin=constants.AlertOrigin.TRAP)
             self.exporter_manager.dispatch(ctxt, alert_model)
 
     @coordination.synchronized('sync-trap-{storage_id}', blocking=False)
@@ -13,13 +13,17 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import collections
+
 import six
+from six.moves.urllib import parse
 
 from oslo_config import cfg
 from oslo_log import log
 from oslo_utils import strutils
 
 from delfin.common import constants
+from delfin.common import sqlalchemyutils
 from delfin import exception
 from delfin.i18n import _
 
@@ -111,6 +115,97 @@ def _get_marker_param(params):
     return params.pop('marker', None)
 
 
+def get_cursor_param(params):
+    """Extract the keyset cursor from request's dictionary (defaults to None).
+
+    'cursor' is a token of a 'next' or 'prev' link of a list, it replaces
+    'marker', 'offset' and the sort parameters.
+    """
+    cursor = params.pop('cursor', None)
+    if cursor is None:
+        return None
+    if 'marker' in params or 'offset' in params:
+        msg = _('cursor param cannot be used with marker or offset')
+        raise exception.InvalidInput(msg)
+    return sqlalchemyutils.Cursor.decode(cursor)
+
+
+def get_cursor_links(request, items, limit, sort_keys, sort_dirs,
+                     cursor=None):
+    """Return the 'next' and 'prev' links of a page of a list.
+
+    There is a 'next' link when the page is full, or read backwards, and a
+    'prev' link when the page is read from a cursor, unless it is the
+    first page.
+
+    :param request: `wsgi.Request` of the page
+    :param items: items of the page, in the order of the list
+    :param limit: maximum number of items of the page
+    :param sort_keys: sort keys of the list
+    :param sort_dirs: sort directions of the list
+    :param cursor: cursor the page is read from, if any
+    :returns: list of links, with 'rel' and 'href'
+    """
+    links = []
+    if not items:
+        return links
+    if cursor is not None:
+        sort_keys, sort_dirs = cursor.sort_keys, cursor.sort_dirs
+    reverse = cursor is not None and cursor.reverse
+    full = len(items) >= limit
+    if full or reverse:
+        links.append(_get_cursor_link(request, 'next',
+                                      sqlalchemyutils.Cursor.from_row(
+                                          items[-1], sort_keys, sort_dirs)))
+    if cursor is not None and (full or not reverse):
+        links.append(_get_cursor_link(request, 'prev',
+                                      sqlalchemyutils.Cursor.from_row(
+                                          items[0], sort_keys, sort_dirs,
+                                          reverse=True)))
+    return links
+
+
+def _get_cursor_link(request, rel, cursor):
+    params = [(key, value) for key, value in request.GET.items()
+              if key not in ('cursor', 'marker', 'offset', 'sort',
+                             'sort_key', 'sort_dir')]
+    params.append(('cursor', cursor.encode()))
+    return {'rel': rel,
+            'href': '%s?%s' % (request.path_url, parse.urlencode(params))}
+
+
+def get_fields_param(params, allowed_fields):
+    """Extract the fields to return from request's dictionary (defaults to
+    None, for all fields) or fail.
+
+    'fields' is a comma separated list of fields, among allowed_fields.
+    """
+    fields = params.pop('fields', None)
+    if fields is None:
+        return None
+    fields = [field.strip() for field in fields.split(',') if field.strip()]
+    invalid_fields = [field for field in fields
+                      if field not in allowed_fields]
+    if invalid_fields:
+        msg = _('Invalid fields: %s') % ', '.join(invalid_fields)
+        raise exception.InvalidInput(msg)
+    return list(collections.OrderedDict.fromkeys(fields)) or None
+
+
+def get_fields_to_load(fields, sort_keys, sort_dirs, cursor=None):
+    """Return the fields to load for a list, the fields to return and the
+    sort keys the cursors of its links are built from.
+    """
+    if not fields:
+        return None
+    if cursor is not None:
+        sort_keys = cursor.sort_keys
+    else:
+        sort_keys, _sort_dirs = sqlalchemyutils.get_keyset_sort_params(
+            sort_keys, sort_dirs)
+    return fields + [key for key in sort_keys if key not in fields]
+
+
 def _get_offset_param(params):
     """Extract offset id from request's dictionary (defaults to 0) or fail."""
     offset = params.pop('offset', 0)
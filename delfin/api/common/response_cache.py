@@ -0,0 +1,98 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import hashlib
+import threading
+
+from oslo_config import cfg
+
+from delfin import db
+
+response_cache_opts = [
+    cfg.IntOpt('api_response_cache_size',
+               default=256,
+               min=0,
+               help='Maximum number of list responses cached by the API, '
+                    'by the change versions of the resources listed, '
+                    '0 to disable'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(response_cache_opts)
+
+
+class ResponseCache(object):
+    """Least recently used list response bodies by ETag.
+
+    ETag of a list derives from the change versions of the resources
+    listed, a list changed gets a new ETag and the bodies of its previous
+    versions age out.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.bodies = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, etag):
+        with self.lock:
+            body = self.bodies.get(etag)
+            if body is not None:
+                self.bodies.move_to_end(etag)
+            return body
+
+    def put(self, etag, body):
+        if not self.size:
+            return
+        with self.lock:
+            self.bodies[etag] = body
+            self.bodies.move_to_end(etag)
+            while len(self.bodies) > self.size:
+                self.bodies.popitem(last=False)
+
+    def put_chunks(self, etag, chunks):
+        """Yield the chunks of a streamed body, the body is cached once
+        all of it is sent.
+        """
+        body = []
+        for data in chunks:
+            if self.size:
+                body.append(data)
+            yield data
+        self.put(etag, b''.join(body))
+
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(CONF.api_response_cache_size)
+    return _cache
+
+
+def get_etag(request, resource_type):
+    """Strong ETag of a list of resources of resource_type, from the query
+    of the request, the change versions of the storages listed and the
+    generation of resource_type.
+    """
+    ctxt = request.environ['delfin.context']
+    versions = db.resource_version_get_all(ctxt, resource_type,
+                                           request.GET.get('storage_id'))
+    digest = hashlib.blake2b(request.path_qs.encode(), digest_size=16)
+    for storage_id, version in sorted(versions.items()):
+        digest.update(('%s:%d;' % (storage_id, version)).encode())
+    return digest.hexdigest()
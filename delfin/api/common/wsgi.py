@@ -16,16 +16,37 @@
 
 import inspect
 
+from oslo_config import cfg
 from oslo_log import log
 from oslo_serialization import jsonutils
+from oslo_utils import importutils
 import six
 import webob
 import webob.exc
 
 from delfin import exception
+from delfin.api.common import response_cache
 from delfin.i18n import _
 from delfin.wsgi import common as wsgi
 
+orjson = importutils.try_import('orjson')
+
+wsgi_opts = [
+    cfg.IntOpt('api_stream_min_items',
+               default=1000,
+               min=0,
+               help='Minimum number of items of a list in a response for '
+                    'the response to be streamed in chunks, 0 to disable'),
+    cfg.IntOpt('api_stream_chunk_size',
+               default=200,
+               min=1,
+               help='Number of items of a list encoded per chunk of a '
+                    'streamed response'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(wsgi_opts)
+
 LOG = log.getLogger(__name__)
 
 SUPPORTED_CONTENT_TYPES = (
@@ -239,11 +260,61 @@ class DictSerializer(ActionDispatcher):
         return ""
 
 
+def json_dumps(data):
+    """Encode data to JSON bytes, with orjson when installed, else with
+    jsonutils. Values orjson does not encode natively, as datetimes, are
+    converted by jsonutils as well.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=jsonutils.to_primitive,
+                                option=orjson.OPT_PASSTHROUGH_DATETIME |
+                                orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Integers beyond 64 bits among others
+            pass
+    return six.b(jsonutils.dumps(data))
+
+
 class JSONDictSerializer(DictSerializer):
     """Default JSON request body serialization."""
 
     def default(self, data):
-        return six.b(jsonutils.dumps(data))
+        return json_dumps(data)
+
+    def is_streamed(self, data):
+        """Whether data holds a list long enough to be streamed."""
+        if not CONF.api_stream_min_items or not isinstance(data, dict):
+            return False
+        return any(isinstance(value, list) and
+                   len(value) >= CONF.api_stream_min_items
+                   for value in data.values())
+
+    def serialize_chunks(self, data):
+        """Yield the JSON of a dict in chunks, the lists in it encoded
+        api_stream_chunk_size items at a time.
+        """
+        size = CONF.api_stream_chunk_size
+        yield b'{'
+        for index, (key, value) in enumerate(data.items()):
+            prefix = (b',' if index else b'') + json_dumps(key) + b':'
+            if not isinstance(value, list):
+                yield prefix + json_dumps(value)
+                continue
+            yield prefix + b'['
+            for start in range(0, len(value), size):
+                # Items of the chunk without the brackets of the list
+                items = json_dumps(value[start:start + size])[1:-1]
+                yield (b',' if start else b'') + items
+            yield b']'
+        yield b'}'
+
+
+class SerializedBodySerializer(DictSerializer):
+    """Response body serialized already, as served from cache."""
+
+    def default(self, data):
+        return data
 
 
 def serializers(**serializers):
@@ -295,6 +366,22 @@ def response(code):
     return decorator
 
 
+def cache_response(resource_type):
+    """Attaches the type of the resources it lists to a method.
+
+    Responses of the method are tagged with an ETag derived from the
+    change versions of the resources. A request matching its ETag in
+    If-None-Match is answered with 304, and a list not changed since it
+    was last served is served from cache.
+    """
+
+    def decorator(func):
+        func.wsgi_cache = resource_type
+        return func
+
+    return decorator
+
+
 class ResponseObject(object):
     """Bundles a response object with appropriate serializers.
 
@@ -412,7 +499,12 @@ class ResponseObject(object):
             response.headers[hdr] = six.text_type(value)
         response.headers['Content-Type'] = six.text_type(content_type)
         if self.obj is not None:
-            response.body = serializer.serialize(self.obj)
+            if hasattr(serializer, 'is_streamed') and \
+                    serializer.is_streamed(self.obj):
+                # Sent with chunked transfer encoding as encoded
+                response.app_iter = serializer.serialize_chunks(self.obj)
+            else:
+                response.body = serializer.serialize(self.obj)
 
         return response
 
@@ -733,7 +825,19 @@ class Resource(wsgi.Application):
         response, post = self.pre_process_extensions(extensions,
                                                      request, action_args)
 
-        if not response:
+        etag = None
+        cached = None
+        if not response and hasattr(meth, 'wsgi_cache'):
+            try:
+                with ResourceExceptionHandler():
+                    etag, cached = self._get_cached_response(
+                        request, meth.wsgi_cache)
+            except Fault as ex:
+                response = ex
+
+        if not response and cached is not None:
+            action_result = cached
+        elif not response:
             try:
                 with ResourceExceptionHandler():
                     action_result = self.dispatch(meth, request, action_args)
@@ -768,6 +872,14 @@ class Resource(wsgi.Application):
             if resp_obj and not response:
                 response = resp_obj.serialize(request, accept,
                                               self.default_serializers)
+                if etag and cached is None and response.status_int == 200:
+                    response.headers['ETag'] = '"%s"' % etag
+                    cache = response_cache.get_cache()
+                    if isinstance(response.app_iter, list):
+                        cache.put(etag, response.body)
+                    else:
+                        response.app_iter = cache.put_chunks(
+                            etag, response.app_iter)
 
         try:
             msg_dict = dict(url=request.url, status=response.status_int)
@@ -779,6 +891,21 @@ class Resource(wsgi.Application):
         LOG.info(msg)
         return response
 
+    @staticmethod
+    def _get_cached_response(request, resource_type):
+        """Get the ETag of a list of resources, with the response to
+        serve from it, None if the list is to be built.
+        """
+        etag = response_cache.get_etag(request, resource_type)
+        headers = {'etag': '"%s"' % etag}
+        if etag in request.if_none_match:
+            return etag, ResponseObject(None, code=304, headers=headers)
+        body = response_cache.get_cache().get(etag)
+        if body is None:
+            return etag, None
+        return etag, ResponseObject(body, headers=headers,
+                                    json=SerializedBodySerializer)
+
     def get_method(self, request, action, content_type, body):
         """Look up the action-specific method and its extensions."""
 
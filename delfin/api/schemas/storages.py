@@ -94,3 +94,17 @@ create = {
     ],
     'additionalProperties': False
 }
+
+bulk_create = {
+    'type': 'object',
+    'properties': {
+        'storages': {
+            'type': 'array',
+            'items': create,
+            'minItems': 1,
+            'maxItems': 1000
+        }
+    },
+    'required': ['storages'],
+    'additionalProperties': False
+}
@@ -16,6 +16,8 @@ from oslo_log import log
 
 from delfin import db
 from delfin import exception
+from delfin import utils
+from delfin.api import api_utils
 from delfin.api import validation
 from delfin.api.common import wsgi
 from delfin.api.schemas import alerts as schema_alerts
@@ -35,6 +37,9 @@ class AlertController(wsgi.Controller):
 
     @wsgi.response(200)
     def show(self, req, id):
+        """List the alerts of a storage from the alerts stored, which are
+        listed from the storage again first with refresh=true.
+        """
         ctx = req.environ['delfin.context']
 
         query_para = {}
@@ -60,20 +65,40 @@ class AlertController(wsgi.Controller):
             msg = "end_time should be greater than begin_time."
             raise exception.InvalidInput(msg)
 
+        refresh = utils.get_bool_from_api_params('refresh', query_para)
         storage = db.storage_get(ctx, id)
-        alert_list = self.driver_manager.list_alerts(ctx, id, query_para)
-
-        # Update storage attributes in each alert model
-        for alert in alert_list:
-            alert_util.fill_storage_attributes(alert, storage)
-
-        return alerts_view.build_alerts(alert_list)
+        if refresh:
+            alert_list = self.driver_manager.list_alerts(
+                ctx, id, {key: query_para[key] for key
+                          in ('begin_time', 'end_time') if key in query_para})
+            for alert in alert_list:
+                alert_util.fill_storage_attributes(alert, storage)
+            db.alerts_upsert(ctx, id, alert_list)
+
+        sort_keys, sort_dirs = api_utils.get_sort_params(
+            query_para, default_key='occur_time')
+        cursor = api_utils.get_cursor_param(query_para)
+        marker, limit, offset = api_utils.get_pagination_params(query_para)
+        filters = {'storage_id': id}
+        for key, value in (('begin_time', begin_time),
+                           ('end_time', end_time),
+                           ('severity', query_para.get('severity')),
+                           ('category', query_para.get('category'))):
+            if value is not None:
+                filters[key] = value
+
+        alerts = db.alert_get_all(ctx, cursor or marker, limit, sort_keys,
+                                  sort_dirs, filters, offset)
+        links = api_utils.get_cursor_links(req, alerts, limit, sort_keys,
+                                           sort_dirs, cursor)
+        return alerts_view.build_alerts(alerts, links)
 
     @wsgi.response(200)
     def delete(self, req, id, sequence_number):
         ctx = req.environ['delfin.context']
         _ = db.storage_get(ctx, id)
         self.driver_manager.clear_alert(ctx, id, sequence_number)
+        db.alerts_delete(ctx, id, [sequence_number])
 
     @validation.schema(schema_alerts.post)
     @wsgi.response(200)
@@ -0,0 +1,81 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from oslo_log import log
+
+from delfin import db
+from delfin import exception
+from delfin import utils
+from delfin.api.common import wsgi
+from delfin.api.views import metrics as metrics_view
+from delfin.exporter.tsdb import store
+
+LOG = log.getLogger(__name__)
+
+# Time range queried when start is not given, in milliseconds
+DEFAULT_QUERY_RANGE = 3600 * 1000
+
+
+class MetricController(wsgi.Controller):
+    def __init__(self):
+        super().__init__()
+        self.store = store.TimeSeriesStore()
+
+    @wsgi.response(200)
+    def show(self, req, id):
+        """Query performance metrics of a storage kept by the TSDB
+        exporter.
+        """
+        ctx = req.environ['delfin.context']
+
+        query_para = {}
+        query_para.update(req.GET)
+
+        metric = query_para.get('metric')
+        if not metric:
+            raise exception.InvalidInput("metric is required.")
+
+        try:
+            end_time = int(query_para['end']) if query_para.get('end') \
+                else utils.utcnow_ms()
+            start_time = int(query_para['start']) \
+                if query_para.get('start') \
+                else end_time - DEFAULT_QUERY_RANGE
+            step = int(query_para['step']) * 1000 \
+                if query_para.get('step') else None
+        except ValueError:
+            msg = "start and end should be integer values in milliseconds, " \
+                  "step should be integer value in seconds."
+            raise exception.InvalidInput(msg)
+
+        if end_time <= start_time:
+            msg = "end should be greater than start."
+            raise exception.InvalidInput(msg)
+        if step is not None and step <= 0:
+            msg = "step should be greater than 0."
+            raise exception.InvalidInput(msg)
+
+        # Check for the storage existence
+        _ = db.storage_get(ctx, id)
+
+        series = self.store.query(id, metric, start_time, end_time,
+                                  resource_type=query_para.get(
+                                      'resource_type'),
+                                  resource_id=query_para.get('resource_id'),
+                                  step=step)
+        return metrics_view.build_metrics(metric, series)
+
+
+def create_resource():
+    return wsgi.Resource(MetricController())
@@ -16,6 +16,7 @@ from delfin import db
 from delfin.api import api_utils
 from delfin.api.common import wsgi
 from delfin.api.views import ports as port_view
+from delfin.common import constants
 
 
 class PortController(wsgi.Controller):
@@ -24,25 +25,37 @@ class PortController(wsgi.Controller):
         super(PortController, self).__init__()
         self.search_options = ['name', 'status', 'id', 'storage_id', 'wwn',
                                'native_controller_id', 'native_port_id']
+        self.fields = ['created_at', 'updated_at', 'id', 'native_port_id',
+                       'name', 'location', 'type', 'logical_type',
+                       'connection_status', 'health_status', 'storage_id',
+                       'native_parent_id', 'speed', 'max_speed', 'wwn',
+                       'mac_address', 'ipv4', 'ipv4_mask', 'ipv6', 'ipv6_mask']
 
     def _get_ports_search_options(self):
         """Return ports search options allowed ."""
         return self.search_options
 
+    @wsgi.cache_response(constants.ResourceType.PORT)
     def index(self, req):
         ctxt = req.environ['delfin.context']
         query_params = {}
         query_params.update(req.GET)
         # update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
+        cursor = api_utils.get_cursor_param(query_params)
         marker, limit, offset = api_utils.get_pagination_params(query_params)
+        fields = api_utils.get_fields_param(query_params, self.fields)
         # strip out options except supported search  options
         api_utils.remove_invalid_options(ctxt, query_params,
                                          self._get_ports_search_options())
 
-        ports = db.port_get_all(ctxt, marker, limit, sort_keys,
-                                sort_dirs, query_params, offset)
-        return port_view.build_ports(ports)
+        ports = db.port_get_all(ctxt, cursor or marker, limit, sort_keys,
+                                sort_dirs, query_params, offset,
+                                api_utils.get_fields_to_load(
+                                    fields, sort_keys, sort_dirs, cursor))
+        links = api_utils.get_cursor_links(req, ports, limit, sort_keys,
+                                           sort_dirs, cursor)
+        return port_view.build_ports(ports, links, fields)
 
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
@@ -20,12 +20,15 @@ from delfin.api.v1 import alerts
 from delfin.api.v1 import controllers
 from delfin.api.v1 import disks
 from delfin.api.v1 import filesystems
+from delfin.api.v1 import metrics
 from delfin.api.v1 import ports
 from delfin.api.v1 import qtrees
 from delfin.api.v1 import quotas
 from delfin.api.v1 import shares
 from delfin.api.v1 import storage_pools
+from delfin.api.v1 import storage_registrations
 from delfin.api.v1 import storages
+from delfin.api.v1 import summaries
 from delfin.api.v1 import volumes
 from delfin.api.v1 import storage_hosts
 from delfin.api.v1 import storage_host_initiators
@@ -57,6 +60,27 @@ class APIRouter(common.APIRouter):
                        action="get_capabilities",
                        conditions={"method": ["GET"]})
 
+        self.resources['storage-registrations'] = \
+            storage_registrations.create_resource()
+        mapper.resource("storage-registration", "storage-registrations",
+                        controller=self.resources['storage-registrations'])
+
+        self.resources['metrics'] = metrics.create_resource()
+        mapper.connect("storages", "/storages/{id}/metrics",
+                       controller=self.resources['metrics'],
+                       action="show",
+                       conditions={"method": ["GET"]})
+
+        self.resources['summaries'] = summaries.create_resource()
+        mapper.connect("storages", "/storages/{id}/summary",
+                       controller=self.resources['summaries'],
+                       action="show",
+                       conditions={"method": ["GET"]})
+        mapper.connect("summary", "/summary",
+                       controller=self.resources['summaries'],
+                       action="index",
+                       conditions={"method": ["GET"]})
+
         self.resources['access_info'] = access_info.create_resource()
         mapper.connect("storages", "/storages/{id}/access-info",
                        controller=self.resources['access_info'],
@@ -0,0 +1,160 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+import eventlet
+import six
+from oslo_config import cfg
+from oslo_log import log
+from oslo_utils import timeutils
+
+from delfin import context
+from delfin import db
+from delfin.api import validation
+from delfin.api.common import wsgi
+from delfin.api.schemas import storages as schema_storages
+from delfin.api.v1 import storages
+from delfin.api.views import storage_registrations as registration_view
+from delfin.common import constants
+
+LOG = log.getLogger(__name__)
+
+storage_registration_opts = [
+    cfg.IntOpt('storage_registration_workers',
+               default=16,
+               min=1,
+               help='Maximum number of storages of bulk registrations '
+                    'discovered concurrently by an API process'),
+    cfg.IntOpt('storage_registration_timeout',
+               default=300,
+               min=1,
+               help='Time (in sec) allowed for the discovery of a storage '
+                    'of a bulk registration'),
+    cfg.IntOpt('storage_registration_retention',
+               default=7 * 86400,
+               min=0,
+               help='Time (in sec) finished bulk registrations are kept, '
+                    '0 to keep them'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(storage_registration_opts)
+
+# Time (in sec) beyond storage_registration_timeout after which items not
+# finished are left by an API process stopped
+STALE_ITEM_MARGIN = 300
+
+
+class StorageRegistrationController(wsgi.Controller):
+    def __init__(self):
+        super().__init__()
+        self.storage_controller = storages.StorageController()
+        self.pool = eventlet.GreenPool(CONF.storage_registration_workers)
+        ctxt = context.get_admin_context()
+        self._expire_items(ctxt)
+        self._delete_finished(ctxt)
+
+    @staticmethod
+    def _expire_items(ctxt):
+        """Fail the items left pending or running by API processes
+        stopped, so that their registrations finish.
+        """
+        try:
+            count = db.storage_registration_items_expire(
+                ctxt, timeutils.utcnow() - datetime.timedelta(
+                    seconds=CONF.storage_registration_timeout +
+                    STALE_ITEM_MARGIN),
+                'Registration interrupted')
+            if count:
+                LOG.warning("Failed %d storages of bulk registrations "
+                            "interrupted.", count)
+        except Exception as e:
+            LOG.error("Failed to fail storages of bulk registrations "
+                      "interrupted, reason: %s", six.text_type(e))
+
+    @staticmethod
+    def _delete_finished(ctxt):
+        """Delete the finished registrations beyond retention."""
+        if not CONF.storage_registration_retention:
+            return
+        try:
+            db.storage_registration_delete_finished(
+                ctxt, timeutils.utcnow() - datetime.timedelta(
+                    seconds=CONF.storage_registration_retention))
+        except Exception as e:
+            LOG.error("Failed to delete finished bulk registrations, "
+                      "reason: %s", six.text_type(e))
+
+    @wsgi.response(202)
+    @validation.schema(schema_storages.bulk_create)
+    def create(self, req, body):
+        """Register storage devices in bulk, in the background."""
+        ctxt = req.environ['delfin.context']
+        self._delete_finished(ctxt)
+        access_infos = body['storages']
+        items = []
+        for access_info in access_infos:
+            access = next(access_info[access]
+                          for access in constants.ACCESS_TYPE
+                          if access_info.get(access))
+            items.append({'vendor': access_info['vendor'],
+                          'model': access_info['model'],
+                          'host': access['host'],
+                          'status': constants.RegistrationStatus.PENDING})
+        registration = db.storage_registration_create(
+            ctxt, {'total': len(items)}, items)
+        items = db.storage_registration_items_get(ctxt, registration['id'])
+
+        eventlet.spawn_n(self._register_all, ctxt,
+                         [item['id'] for item in items], access_infos)
+        return registration_view.build_storage_registration(registration,
+                                                            items)
+
+    def show(self, req, id):
+        ctxt = req.environ['delfin.context']
+        registration = db.storage_registration_get(ctxt, id)
+        items = db.storage_registration_items_get(ctxt, id)
+        return registration_view.build_storage_registration(registration,
+                                                            items)
+
+    def _register_all(self, ctxt, item_ids, access_infos):
+        # The pool is shared by the registrations of the process, for
+        # storage_registration_workers discoveries at most in all
+        for item_id, access_info in zip(item_ids, access_infos):
+            self.pool.spawn_n(self._register, ctxt, item_id, access_info)
+
+    def _register(self, ctxt, item_id, access_info):
+        db.storage_registration_item_update(
+            ctxt, item_id, {'status': constants.RegistrationStatus.RUNNING})
+        values = {'status': constants.RegistrationStatus.FAILED}
+        try:
+            storage = self.storage_controller.register(
+                ctxt, access_info,
+                timeout=CONF.storage_registration_timeout)
+            values = {'status': constants.RegistrationStatus.SUCCEEDED,
+                      'storage_id': storage['id']}
+        except eventlet.Timeout:
+            values['error'] = 'Discovery timed out after %d seconds' % \
+                CONF.storage_registration_timeout
+        except Exception as e:
+            values['error'] = six.text_type(e)[:255]
+        if values.get('error'):
+            LOG.error("Failed to register storage of item %s of bulk "
+                      "registration, reason: %s", item_id, values['error'])
+        db.storage_registration_item_update(ctxt, item_id, values)
+
+
+def create_resource():
+    return wsgi.Resource(StorageRegistrationController())
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
+import eventlet
 import six
 
 from oslo_config import cfg
@@ -22,6 +22,7 @@ from oslo_utils import timeutils
 from delfin import coordination
 from delfin import db
 from delfin import exception
+from delfin import utils
 from delfin.api import api_utils
 from delfin.api import validation
 from delfin.api.common import wsgi
@@ -50,6 +51,7 @@ class StorageController(wsgi.Controller):
         """Return storages search options allowed ."""
         return self.search_options
 
+    @wsgi.cache_response(constants.ResourceType.STORAGE)
     def index(self, req):
         ctxt = req.environ['delfin.context']
         query_params = {}
@@ -75,8 +77,16 @@ class StorageController(wsgi.Controller):
     def create(self, req, body):
         """Register a new storage device."""
         ctxt = req.environ['delfin.context']
-        access_info_dict = body
+        storage = self.register(ctxt, body)
+        return storage_view.build_storage(storage)
+
+    def register(self, ctxt, access_info_dict, timeout=None):
+        """Discover a storage device with access information, and start
+        its resource sync, alert sync and performance monitoring.
 
+        The discovery raises eventlet.Timeout after timeout seconds if
+        given.
+        """
         # Lock to avoid synchronous creating.
         for access in constants.ACCESS_TYPE:
             if access_info_dict.get(access) is not None:
@@ -88,12 +98,13 @@ class StorageController(wsgi.Controller):
         with lock:
             if self._storage_exist(ctxt, access_info_dict):
                 raise exception.StorageAlreadyExists()
-            storage = self.driver_api.discover_storage(ctxt,
-                                                       access_info_dict)
+            with eventlet.Timeout(timeout):
+                storage = self.driver_api.discover_storage(ctxt,
+                                                           access_info_dict)
 
         # Registration success, sync resource collection for this storage
         try:
-            self.sync(req, storage['id'])
+            self._sync(ctxt, storage['id'])
 
             # Post registration, trigger alert sync
             self.task_rpcapi.sync_storage_alerts(ctxt, storage['id'],
@@ -121,7 +132,7 @@ class StorageController(wsgi.Controller):
                     '%(storage)s. Error: %(err)s') % {'storage': storage['id'],
                                                       'err': six.text_type(e)}
             LOG.error(msg)
-        return storage_view.build_storage(storage)
+        return storage
 
     @wsgi.response(202)
     def delete(self, req, id):
@@ -175,6 +186,9 @@ class StorageController(wsgi.Controller):
         :return:
         """
         ctxt = req.environ['delfin.context']
+        self._sync(ctxt, id)
+
+    def _sync(self, ctxt, id):
         storage = db.storage_get(ctxt, id)
         resource_count = len(resources.StorageResourceTask.__subclasses__())
         _set_synced_if_ok(ctxt, storage['id'], resource_count)
@@ -184,33 +198,50 @@ class StorageController(wsgi.Controller):
                 storage['id'],
                 subclass.__module__ + '.' + subclass.__name__)
 
+    def _get_access_info_by_fingerprint(self, context, fingerprint):
+        try:
+            return db.access_info_get_by_fingerprint(context, fingerprint)
+        except exception.AccessInfoNotFound:
+            pass
+
+        # Access information saved before fingerprints were introduced has
+        # none, set their fingerprints and match them
+        matched = None
+        for _access_info in db.access_info_get_all(
+                context, filters={'fingerprint': None}):
+            _fingerprint = utils.access_info_fingerprint(_access_info)
+            if _fingerprint == fingerprint and not matched:
+                matched = _access_info
+            try:
+                db.access_info_update(context, _access_info['storage_id'],
+                                      {'fingerprint': _fingerprint})
+            except exception.StorageAlreadyExists:
+                LOG.warning("Access information of storage %s is the same "
+                            "as another storage's." %
+                            _access_info['storage_id'])
+        return matched
+
     def _storage_exist(self, context, access_info):
-        access_info_dict = copy.deepcopy(access_info)
+        # Check if storage is registered, by the fingerprint of its access
+        # information
+        _access_info = self._get_access_info_by_fingerprint(
+            context, utils.access_info_fingerprint(access_info))
+        if not _access_info:
+            return False
 
-        # Remove unrelated query fields
-        unrelated_fields = ['username', 'password']
-        for access in constants.ACCESS_TYPE:
-            if access_info_dict.get(access):
-                for key in unrelated_fields:
-                    access_info_dict[access].pop(key)
-
-        # Check if storage is registered
-        access_info_list = db.access_info_get_all(context,
-                                                  filters=access_info_dict)
-        for _access_info in access_info_list:
-            try:
-                storage = db.storage_get(context, _access_info['storage_id'])
-                if storage:
-                    LOG.error("Storage %s has same access "
-                              "information." % storage['id'])
-                    return True
-            except exception.StorageNotFound:
-                # Suppose storage was not saved successfully after access
-                # information was saved in database when registering storage.
-                # Therefore, removing access info if storage doesn't exist to
-                # ensure the database has no residual data.
-                LOG.debug("Remove residual access information.")
-                db.access_info_delete(context, _access_info['storage_id'])
+        try:
+            storage = db.storage_get(context, _access_info['storage_id'])
+            if storage:
+                LOG.error("Storage %s has same access "
+                          "information." % storage['id'])
+                return True
+        except exception.StorageNotFound:
+            # Suppose storage was not saved successfully after access
+            # information was saved in database when registering storage.
+            # Therefore, removing access info if storage doesn't exist to
+            # ensure the database has no residual data.
+            LOG.debug("Remove residual access information.")
+            db.access_info_delete(context, _access_info['storage_id'])
 
         return False
 
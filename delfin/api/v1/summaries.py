@@ -0,0 +1,67 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from delfin import db
+from delfin import exception
+from delfin.api import api_utils
+from delfin.api.common import wsgi
+from delfin.api.views import summaries as summary_view
+
+
+class SummaryController(wsgi.Controller):
+    def __init__(self):
+        super().__init__()
+        self.search_options = ['name', 'vendor', 'model', 'status',
+                               'serial_number']
+        self.group_by_options = ['vendor', 'model', 'status']
+
+    def _get_group_by_param(self, query_params):
+        group_by = []
+        for key in query_params.pop('group_by', '').split(','):
+            key = key.strip()
+            if not key or key in group_by:
+                continue
+            if key not in self.group_by_options:
+                msg = "Invalid group_by: %s, should be among: %s" % (
+                    key, ', '.join(self.group_by_options))
+                raise exception.InvalidInput(msg)
+            group_by.append(key)
+        return group_by
+
+    def index(self, req):
+        """Number and capacity sums of the storages, by the values of
+        the columns of group_by.
+        """
+        ctxt = req.environ['delfin.context']
+        query_params = {}
+        query_params.update(req.GET)
+        group_by = self._get_group_by_param(query_params)
+        # strip out options except supported search  options
+        api_utils.remove_invalid_options(ctxt, query_params,
+                                         self.search_options)
+
+        summaries = db.storage_summary_get_all(ctxt, group_by, query_params)
+        return summary_view.build_summaries(summaries)
+
+    def show(self, req, id):
+        """Number, number by status and capacity sums of the resources of
+        a storage.
+        """
+        ctxt = req.environ['delfin.context']
+        summary = db.storage_resource_summary_get(ctxt, id)
+        return summary_view.build_storage_summary(id, summary)
+
+
+def create_resource():
+    return wsgi.Resource(SummaryController())
@@ -16,6 +16,7 @@ from delfin import db
 from delfin.api import api_utils
 from delfin.api.common import wsgi
 from delfin.api.views import volumes as volume_view
+from delfin.common import constants
 
 
 class VolumeController(wsgi.Controller):
@@ -24,25 +25,37 @@ class VolumeController(wsgi.Controller):
         super(VolumeController, self).__init__()
         self.search_options = ['name', 'status', 'id', 'storage_id', 'wwn',
                                'native_volume_id', 'native_storage_pool_id']
+        self.fields = ['created_at', 'updated_at', 'id', 'native_volume_id',
+                       'name', 'description', 'type', 'status', 'storage_id',
+                       'native_storage_pool_id', 'wwn', 'total_capacity',
+                       'used_capacity', 'free_capacity', 'compressed',
+                       'deduplicated']
 
     def _get_volumes_search_options(self):
         """Return volumes search options allowed ."""
         return self.search_options
 
+    @wsgi.cache_response(constants.ResourceType.VOLUME)
     def index(self, req):
         ctxt = req.environ['delfin.context']
         query_params = {}
         query_params.update(req.GET)
         # update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
+        cursor = api_utils.get_cursor_param(query_params)
         marker, limit, offset = api_utils.get_pagination_params(query_params)
+        fields = api_utils.get_fields_param(query_params, self.fields)
         # strip out options except supported search  options
         api_utils.remove_invalid_options(ctxt, query_params,
                                          self._get_volumes_search_options())
 
-        volumes = db.volume_get_all(ctxt, marker, limit, sort_keys,
-                                    sort_dirs, query_params, offset)
-        return volume_view.build_volumes(volumes)
+        volumes = db.volume_get_all(ctxt, cursor or marker, limit, sort_keys,
+                                    sort_dirs, query_params, offset,
+                                    api_utils.get_fields_to_load(
+                                        fields, sort_keys, sort_dirs, cursor))
+        links = api_utils.get_cursor_links(req, volumes, limit, sort_keys,
+                                           sort_dirs, cursor)
+        return volume_view.build_volumes(volumes, links, fields)
 
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
@@ -19,6 +19,7 @@ class ViewBuilder(object):
 
     def show(self, access_info):
         access_info_dict = access_info.to_dict()
+        access_info_dict.pop('fingerprint', None)
         for access in constants.ACCESS_TYPE:
             if access_info.get(access):
                 access_info[access].pop('password', None)
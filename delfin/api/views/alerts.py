@@ -11,16 +11,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
-def build_alerts(alerts):
+def build_alerts(alerts, links=None):
     # Build list of alerts
     views = [build_alert(alert)
              for alert in alerts]
-    return dict(alerts=views)
+    result = dict(alerts=views)
+    if links:
+        result['alerts_links'] = links
+    return result
 
 
 def build_alert(alert):
-    view = copy.deepcopy(alert)
-    return dict(view)
+    # Alerts stored keep the alert model as filled from the storage
+    return dict(alert['alert'])
@@ -0,0 +1,25 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+def build_metrics(name, series):
+    # Build list of series of the metric
+    views = [build_metric(name, labels, points)
+             for labels, points in series]
+    return dict(metrics=views)
+
+
+def build_metric(name, labels, points):
+    return dict(name=name, labels=labels,
+                values=[[timestamp, value] for timestamp, value in points])
@@ -11,16 +11,19 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
-def build_ports(ports):
+def build_ports(ports, links=None, fields=None):
     # Build list of ports
-    views = [build_port(port)
+    views = [build_port(port, fields)
              for port in ports]
-    return dict(ports=views)
+    result = dict(ports=views)
+    if links:
+        result['ports_links'] = links
+    return result
 
 
-def build_port(port):
-    view = copy.deepcopy(port)
-    return dict(view)
+def build_port(port, fields=None):
+    if fields:
+        return {field: port[field] for field in fields}
+    return dict(port)
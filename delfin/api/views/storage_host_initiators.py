@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
 def build_storage_host_initiators(storage_host_initiators):
@@ -22,5 +21,4 @@ def build_storage_host_initiators(storage_host_initiators):
 
 
 def build_storage_host_initiator(storage_host_initiator):
-    view = copy.deepcopy(storage_host_initiator)
-    return dict(view)
+    return dict(storage_host_initiator)
@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
 def build_storage_hosts(storage_hosts):
@@ -22,5 +21,4 @@ def build_storage_hosts(storage_hosts):
 
 
 def build_storage_host(storage_host):
-    view = copy.deepcopy(storage_host)
-    return dict(view)
+    return dict(storage_host)
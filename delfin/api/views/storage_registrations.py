@@ -0,0 +1,38 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from delfin.common import constants
+
+
+def build_storage_registration(registration, items):
+    view = dict(id=registration['id'], total=registration['total'],
+                created_at=registration['created_at'])
+    for status in constants.RegistrationStatus.ITEM_STATUSES:
+        view[status] = 0
+    for item in items:
+        view[item['status']] += 1
+    if view[constants.RegistrationStatus.PENDING] or \
+            view[constants.RegistrationStatus.RUNNING]:
+        view['status'] = constants.RegistrationStatus.RUNNING
+    else:
+        view['status'] = constants.RegistrationStatus.FINISHED
+    view['storages'] = [build_storage_registration_item(item)
+                        for item in items]
+    return view
+
+
+def build_storage_registration_item(item):
+    return dict(vendor=item['vendor'], model=item['model'],
+                host=item['host'], status=item['status'],
+                storage_id=item['storage_id'], error=item['error'])
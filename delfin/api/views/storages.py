@@ -11,8 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
-
 from delfin.common import constants
 
 
@@ -24,12 +22,12 @@ def build_storages(storages):
 
 
 def build_storage(storage):
-    view = copy.deepcopy(storage)
+    view = dict(storage)
     if view['sync_status'] == constants.SyncStatus.SYNCED:
         view['sync_status'] = 'SYNCED'
     else:
         view['sync_status'] = 'SYNCING'
-    return dict(view)
+    return view
 
 
 def build_capabilities(storage_info, capabilities):
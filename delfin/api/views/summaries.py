@@ -0,0 +1,25 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+def build_summaries(summaries):
+    # Build list of summaries of storages
+    views = [dict(summary) for summary in summaries]
+    return dict(summaries=views)
+
+
+def build_storage_summary(storage_id, summary):
+    view = dict(storage_id=storage_id)
+    view.update(summary)
+    return view
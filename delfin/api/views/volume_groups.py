@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
 def build_volume_groups(volume_groups):
@@ -22,5 +21,4 @@ def build_volume_groups(volume_groups):
 
 
 def build_volume_group(volume_group):
-    view = copy.deepcopy(volume_group)
-    return dict(view)
+    return dict(volume_group)
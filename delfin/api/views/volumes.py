@@ -11,16 +11,19 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
-def build_volumes(volumes):
+def build_volumes(volumes, links=None, fields=None):
     # Build list of volumes
-    views = [build_volume(volume)
+    views = [build_volume(volume, fields)
              for volume in volumes]
-    return dict(volumes=views)
+    result = dict(volumes=views)
+    if links:
+        result['volumes_links'] = links
+    return result
 
 
-def build_volume(volume):
-    view = copy.deepcopy(volume)
-    return dict(view)
+def build_volume(volume, fields=None):
+    if fields:
+        return {field: volume[field] for field in fields}
+    return dict(volume)
@@ -104,7 +104,26 @@ storage_driver_opts = [
     cfg.StrOpt('ca_path',
                default='',
                help='"": Disable SSL certificate verification, '
-                    '/path/to/file: Use SSL certificate from file location')
+                    '/path/to/file: Use SSL certificate from file location'),
+    cfg.IntOpt('driver_idle_timeout',
+               default=0,
+               help='Seconds after which a driver not used is closed and '
+                    'removed from cache, 0 to keep idle drivers'),
+    cfg.IntOpt('max_cached_drivers',
+               default=0,
+               help='Maximum number of drivers cached, least recently used '
+                    'ones are evicted beyond it, 0 for no limit'),
+    cfg.IntOpt('session_refresh_interval',
+               default=0,
+               help='Seconds after which the session of a cached driver is '
+                    'renewed before it expires at backend, 0 to disable'),
+    cfg.BoolOpt('warm_up_drivers',
+                default=True,
+                help='Whether drivers of registered storages are created '
+                     'when task service starts'),
+    cfg.IntOpt('driver_warm_up_concurrency',
+               default=10,
+               help='Number of drivers created concurrently on warm up'),
 ]
 
 CONF.register_opts(storage_driver_opts, group='storage_driver')
@@ -150,6 +169,65 @@ telemetry_opts = [
     cfg.IntOpt('node_weight',
                default=100,
                help='Weight for the node in the Hash Ring'),
+    cfg.FloatOpt('max_collection_load_in_child',
+                 default=2.0,
+                 help='Max collection load of the storages handled by one '
+                      'local executor process, load of a storage is the '
+                      'time its collections take per second of interval'),
+    cfg.FloatOpt('placement_imbalance_threshold',
+                 default=0.25,
+                 min=0,
+                 help='Fraction by which the collection load of a node or '
+                      'local executor may exceed its share before tasks '
+                      'are placed on, or moved to, another one'),
+    cfg.IntOpt('task_state_flush_interval',
+               default=30,
+               help='Interval (in sec) at which last run time of collection '
+                    'tasks is written to DB'),
+    cfg.IntOpt('storage_label_cache_ttl',
+               default=600,
+               help='Time (in sec) storage labels added to performance '
+                    'metrics are cached'),
+    cfg.StrOpt('collection_scheduler',
+               default='heap',
+               choices=['heap', 'apscheduler'],
+               help='Scheduler of performance collection jobs, heap based '
+                    'collection scheduler or APScheduler background '
+                    'scheduler'),
+    cfg.IntOpt('collection_scheduler_workers',
+               default=100,
+               help='Maximum number of collection jobs run concurrently by '
+                    'heap based collection scheduler'),
+    cfg.FloatOpt('collection_deadline_ratio',
+                 default=0.8,
+                 min=0,
+                 help='Deadline of a performance collection as a fraction '
+                      'of the task interval, 0 to disable'),
+    cfg.BoolOpt('auto_adjust_interval',
+                default=False,
+                help='Whether the collection interval of a storage is '
+                     'raised when its collections keep exceeding deadline'),
+    cfg.IntOpt('min_backfill_interval',
+               default=60,
+               help='Minimum interval (in sec) between backfills of failed '
+                    'performance collections of a storage'),
+    cfg.BoolOpt('export_deduplication',
+                default=True,
+                help='Whether performance metric points already exported '
+                     'by overlapping collections are dropped'),
+    cfg.StrOpt('export_watermark_file',
+               default='',
+               help='File the last exported timestamp of performance '
+                    'metric series is saved to, so that deduplication '
+                    'survives restarts. Not saved if empty'),
+    cfg.IntOpt('export_watermark_save_interval',
+               default=60,
+               help='Minimum interval (in sec) between saves of export '
+                    'watermarks'),
+    cfg.IntOpt('export_watermark_ttl',
+               default=86400,
+               help='Time (in sec) after which the export watermark of a '
+                    'series not updated is dropped'),
 ]
 
 CONF.register_opts(telemetry_opts, "telemetry")
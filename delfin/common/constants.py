@@ -71,6 +71,32 @@ class SyncStatus(object):
     SYNCED = 0
 
 
+class SyncPriority(object):
+    # Syncs triggered by the user are admitted before the periodic ones
+    USER = 'user'
+    PERIODIC = 'periodic'
+
+    ALL = (USER, PERIODIC)
+
+
+class AlertOrigin(object):
+    # Stored alerts listed from the storage are removed once it does not
+    # list them anymore, the ones only received as traps when too old
+    LISTED = 'listed'
+    TRAP = 'trap'
+
+
+class RegistrationStatus(object):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    # All the storages of the registration succeeded or failed
+    FINISHED = 'finished'
+
+    ITEM_STATUSES = (PENDING, RUNNING, SUCCEEDED, FAILED)
+
+
 class VolumeType(object):
     THICK = 'thick'
     THIN = 'thin'
@@ -330,6 +356,9 @@ SNMP_QUERY_OID = '1.3.6.1.2.1.1.1.0'
 # Alert id for internal alerts
 SNMP_CONNECTION_FAILED_ALERT_ID = '19660818'
 
+# Maximum number of alerts cleared concurrently from one storage
+DEFAULT_CLEAR_ALERT_CONCURRENCY = 10
+
 # Maps to convert config values to pysnmp values
 AUTH_PROTOCOL_MAP = {"hmacsha": config.usmHMACSHAAuthProtocol,
                      "hmacmd5": config.usmHMACMD5AuthProtocol,
@@ -408,6 +437,12 @@ class TelemetryCollection(object):
     DEF_PERFORMANCE_TIMESTAMP_OVERLAP = 60
     """Maximum failed task retry window in seconds"""
     MAX_FAILED_TASK_RETRY_WINDOW = 7200
+    """Consecutive deadline overruns before raising collection interval"""
+    MAX_CONSECUTIVE_OVERRUNS = 3
+    """Maximum factor by which collection interval is raised"""
+    MAX_INTERVAL_FACTOR = 4
+    """Weight of the last collection in the smoothed collection cost"""
+    COLLECTION_COST_SMOOTHING = 0.3
 
 
 class TelemetryTaskStatus(object):
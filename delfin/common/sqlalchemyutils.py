@@ -18,7 +18,10 @@
 #    under the License.
 
 """Implementation of paginate query."""
+import base64
+import binascii
 import datetime
+import json
 
 from oslo_log import log as logging
 from six.moves import range
@@ -57,11 +60,156 @@ def _get_default_column_value(model, column_name):
     return _TYPE_SCHEMA[attr_type.__visit_name__]
 
 
+def get_keyset_sort_params(sort_keys, sort_dirs, default_dir='desc'):
+    """Return the sort keys and directions of a keyset paginated list.
+
+    created_at and id are added, if not sorted by already, with the
+    direction of the first key, so that the last key is unique.
+    """
+    sort_keys = list(sort_keys or [])
+    sort_dirs = list(sort_dirs or [])
+    default_dir = sort_dirs[0] if sort_dirs else default_dir
+    while len(sort_dirs) < len(sort_keys):
+        sort_dirs.append(default_dir)
+    for key in ('created_at', 'id'):
+        if key not in sort_keys:
+            sort_keys.append(key)
+            sort_dirs.append(default_dir)
+    return sort_keys, sort_dirs
+
+
+class Cursor(object):
+    """Position of a row in a sorted list, for keyset pagination.
+
+    A cursor holds the sort keys and directions of the list, with the
+    values of the sort keys at the row. The page following the row is
+    read, or the one preceding it if reverse. Clients get cursors encoded,
+    as opaque tokens.
+    """
+
+    def __init__(self, sort_keys, sort_dirs, values, reverse=False):
+        self.sort_keys = sort_keys
+        self.sort_dirs = sort_dirs
+        self.values = values
+        self.reverse = reverse
+
+    @classmethod
+    def from_row(cls, row, sort_keys, sort_dirs, reverse=False):
+        sort_keys, sort_dirs = get_keyset_sort_params(sort_keys, sort_dirs)
+        return cls(sort_keys, sort_dirs, [row[key] for key in sort_keys],
+                   reverse)
+
+    def encode(self):
+        values = [value.isoformat()
+                  if isinstance(value, datetime.datetime) else value
+                  for value in self.values]
+        data = json.dumps([self.sort_keys, self.sort_dirs, values,
+                           int(self.reverse)], separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, token):
+        try:
+            data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            sort_keys, sort_dirs, values, reverse = json.loads(
+                data.decode())
+        except (binascii.Error, TypeError, ValueError):
+            raise exception.InvalidInput(_('Invalid cursor'))
+        if not isinstance(sort_keys, list) or \
+                not all(isinstance(key, str) for key in sort_keys) or \
+                not isinstance(sort_dirs, list) or \
+                not all(sort_dir in ('asc', 'desc')
+                        for sort_dir in sort_dirs) or \
+                not isinstance(values, list) or \
+                not len(sort_keys) == len(sort_dirs) == len(values):
+            raise exception.InvalidInput(_('Invalid cursor'))
+        return cls(sort_keys, sort_dirs, values, bool(reverse))
+
+
+def _get_cursor_value(model, sort_key, value):
+    """Convert a value of a decoded cursor to the type of its column."""
+    attr = getattr(model, sort_key)
+    if isinstance(value, str) and \
+            isinstance(attr.type, sqlalchemy.DateTime):
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            raise exception.InvalidInput(_('Invalid cursor'))
+    return value
+
+
+def _is_always_set(model, sort_key):
+    """Whether a column has a value in every row, not null or set by
+    default on insert.
+    """
+    column = getattr(model, sort_key).property.columns[0]
+    return not column.nullable or column.default is not None
+
+
+def _marker_criteria(model, sort_keys, sort_dirs, marker_values):
+    """Criteria of the rows following the marker values in the order of
+    the sort keys, with nulls taken as the default of their column.
+    """
+    # Build up an array of sort criteria as in the docstring of
+    # paginate_query
+    criteria_list = []
+    for i in range(0, len(sort_keys)):
+        crit_attrs = []
+        for j in range(0, i):
+            model_attr = getattr(model, sort_keys[j])
+            default = _get_default_column_value(model, sort_keys[j])
+            attr = sa_sql.expression.case([(model_attr.isnot(None),
+                                            model_attr), ],
+                                          else_=default)
+            crit_attrs.append((attr == marker_values[j]))
+
+        model_attr = getattr(model, sort_keys[i])
+        default = _get_default_column_value(model, sort_keys[i])
+        attr = sa_sql.expression.case([(model_attr.isnot(None),
+                                        model_attr), ],
+                                      else_=default)
+        if sort_dirs[i] == 'desc':
+            crit_attrs.append((attr < marker_values[i]))
+        elif sort_dirs[i] == 'asc':
+            crit_attrs.append((attr > marker_values[i]))
+        else:
+            raise ValueError(_("Unknown sort direction, "
+                               "must be 'desc' or 'asc'"))
+
+        criteria = sqlalchemy.sql.and_(*crit_attrs)
+        criteria_list.append(criteria)
+
+    return sqlalchemy.sql.or_(*criteria_list)
+
+
+def _keyset_criteria(model, sort_keys, sort_dirs, values):
+    """Criteria of the rows following the values of a cursor.
+
+    The sort keys are compared as one tuple, a range on an index of the
+    sort keys, when they are sorted in the same direction and always set.
+    Otherwise, it falls back to the criteria of a marker.
+    """
+    if len(set(sort_dirs)) > 1 or None in values or \
+            not all(_is_always_set(model, key) for key in sort_keys):
+        return _marker_criteria(
+            model, sort_keys, sort_dirs,
+            [_get_default_column_value(model, key) if value is None
+             else value for key, value in zip(sort_keys, values)])
+
+    columns = sqlalchemy.tuple_(*[getattr(model, key) for key in sort_keys])
+    bounds = sqlalchemy.tuple_(*[
+        sqlalchemy.literal(value, type_=getattr(model, key).type)
+        for key, value in zip(sort_keys, values)])
+    if sort_dirs[0] == 'desc':
+        return columns < bounds
+    return columns > bounds
+
+
 # TODO(wangxiyuan): Use oslo_db.sqlalchemy.utils.paginate_query once it is
 # stable and afforded by the minimum version in requirement.txt.
 # copied from glance/db/sqlalchemy/api.py
 def paginate_query(query, model, limit, sort_keys, marker=None,
-                   sort_dir=None, sort_dirs=None, offset=None):
+                   sort_dir=None, sort_dirs=None, offset=None, cursor=None):
     """Returns a query with sorting / pagination criteria added.
 
     Pagination works by requiring a unique sort_key, specified by sort_keys.
@@ -89,6 +237,9 @@ def paginate_query(query, model, limit, sort_keys, marker=None,
     :param sort_dirs: per-column array of sort_dirs, corresponding to sort_keys
     :param offset: the number of items to skip from the marker or from the
                     first element.
+    :param cursor: a Cursor to read the page following, or preceding if
+                   reverse, instead of marker. The rows of a page read
+                   backwards are in reverse order.
 
     :rtype: sqlalchemy.orm.query.Query
     :return: The query with sorting/pagination added.
@@ -109,6 +260,10 @@ def paginate_query(query, model, limit, sort_keys, marker=None,
         raise AssertionError(
             'sort_dirs length is not equal to sort_keys length.')
 
+    if cursor is not None and cursor.reverse:
+        sort_dirs = ['asc' if sort_dir == 'desc' else 'desc'
+                     for sort_dir in sort_dirs]
+
     # Add sorting
     for current_sort_key, current_sort_dir in zip(sort_keys, sort_dirs):
         sort_dir_func = {
@@ -125,44 +280,20 @@ def paginate_query(query, model, limit, sort_keys, marker=None,
         query = query.order_by(sort_dir_func(sort_key_attr))
 
     # Add pagination
-    if marker is not None:
+    if cursor is not None:
+        values = [_get_cursor_value(model, key, value)
+                  for key, value in zip(sort_keys, cursor.values)]
+        query = query.filter(_keyset_criteria(model, sort_keys, sort_dirs,
+                                              values))
+    elif marker is not None:
         marker_values = []
         for sort_key in sort_keys:
             v = getattr(marker, sort_key)
             if v is None:
                 v = _get_default_column_value(model, sort_key)
             marker_values.append(v)
-
-        # Build up an array of sort criteria as in the docstring
-        criteria_list = []
-        for i in range(0, len(sort_keys)):
-            crit_attrs = []
-            for j in range(0, i):
-                model_attr = getattr(model, sort_keys[j])
-                default = _get_default_column_value(model, sort_keys[j])
-                attr = sa_sql.expression.case([(model_attr.isnot(None),
-                                                model_attr), ],
-                                              else_=default)
-                crit_attrs.append((attr == marker_values[j]))
-
-            model_attr = getattr(model, sort_keys[i])
-            default = _get_default_column_value(model, sort_keys[i])
-            attr = sa_sql.expression.case([(model_attr.isnot(None),
-                                            model_attr), ],
-                                          else_=default)
-            if sort_dirs[i] == 'desc':
-                crit_attrs.append((attr < marker_values[i]))
-            elif sort_dirs[i] == 'asc':
-                crit_attrs.append((attr > marker_values[i]))
-            else:
-                raise ValueError(_("Unknown sort direction, "
-                                   "must be 'desc' or 'asc'"))
-
-            criteria = sqlalchemy.sql.and_(*crit_attrs)
-            criteria_list.append(criteria)
-
-        f = sqlalchemy.sql.or_(*criteria_list)
-        query = query.filter(f)
+        query = query.filter(_marker_criteria(model, sort_keys, sort_dirs,
+                                              marker_values))
 
     if limit is not None:
         query = query.limit(limit)
@@ -341,12 +341,45 @@ class ConsistentHashing(Coordinator):
         except coordination.MemberAlreadyExist:
             LOG.info('Member %s already in partitioner_group' % CONF.host)
 
-    def get_task_executor(self, task_id):
+    def get_task_executor(self, task_id, load=None, executor_loads=None):
+        """Get the node of a task.
+
+        Given the collection load of the task and the loads of the nodes,
+        nodes the task would take beyond their share of the total load,
+        by weight, by more than placement_imbalance_threshold are passed
+        over for the next node on the ring.
+        """
         part = partitioner.Partitioner(self.coordinator, self.GROUP_NAME)
         members = part.members_for_object(task_id)
-        for member in members:
-            LOG.info('For task id %s, host should be %s' % (task_id, member))
-            return member.decode('utf-8')
+        if not load or executor_loads is None:
+            for member in members:
+                LOG.info('For task id %s, host should be %s'
+                         % (task_id, member))
+                return member.decode('utf-8')
+
+        weights = part.ring.nodes
+        total_load = load + sum(executor_loads.get(member.decode('utf-8'), 0)
+                                for member in weights)
+        share = (1 + CONF.telemetry.placement_imbalance_threshold) * \
+            total_load / sum(weights.values())
+        first = None
+        passed = set()
+        while members:
+            member = next(iter(members))
+            executor = member.decode('utf-8')
+            first = first or executor
+            if executor_loads.get(executor, 0) + load <= \
+                    share * weights[member]:
+                LOG.info('For task id %s, host should be %s'
+                         % (task_id, executor))
+                return executor
+            passed.add(member)
+            if len(passed) == len(weights):
+                break
+            members = part.members_for_object(task_id, ignore_members=passed)
+        LOG.info('For task id %s, all hosts are loaded, host should be %s'
+                 % (task_id, first))
+        return first
 
     def register_watcher_func(self, on_node_join, on_node_leave):
         self.coordinator.watch_join_group(self.GROUP_NAME, on_node_join)
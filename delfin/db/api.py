@@ -44,6 +44,8 @@ these objects be simple dictionaries.
 from oslo_config import cfg
 from oslo_db import api as db_api
 
+from delfin.common import constants
+
 db_opts = [
     cfg.StrOpt('db_backend',
                default='sqlalchemy',
@@ -108,6 +110,110 @@ def storage_delete(context, storage_id):
     return IMPL.storage_delete(context, storage_id)
 
 
+def resource_version_bump(context, storage_id, resource_type):
+    """Increase the change version of a resource type of a storage, so
+    that responses built from the previous version are not served again.
+    """
+    return IMPL.resource_version_bump(context, storage_id, resource_type)
+
+
+def resource_version_delete(context, storage_id, resource_type=None):
+    """Delete the change versions of a storage removed, of all its resource
+    types if resource_type is not given. The generations of the resource
+    types are bumped, so that responses listing the resources of the
+    storage are not served again.
+    """
+    return IMPL.resource_version_delete(context, storage_id, resource_type)
+
+
+def resource_version_get_all(context, resource_type, storage_id=None):
+    """Get the change versions of a resource type as a dictionary of
+    storage id to version, for one storage if storage_id is given. The
+    generation of the resource type is under the empty storage id.
+    """
+    return IMPL.resource_version_get_all(context, resource_type,
+                                         storage_id)
+
+
+def resource_digest_get(context, storage_id, resource_task):
+    """Get the digest of the resources of a storage written by the last
+    sync of resource_task, None if there is none.
+    """
+    return IMPL.resource_digest_get(context, storage_id, resource_task)
+
+
+def resource_digest_set(context, storage_id, resource_task, digest):
+    """Set the digest of the resources of a storage written by a sync of
+    resource_task.
+    """
+    return IMPL.resource_digest_set(context, storage_id, resource_task,
+                                    digest)
+
+
+def resource_digest_delete(context, storage_id, resource_task=None):
+    """Delete the digests of the resources of a storage, of all the
+    resource tasks if resource_task is not given.
+    """
+    return IMPL.resource_digest_delete(context, storage_id, resource_task)
+
+
+def storage_summary_get_all(context, group_by=None, filters=None):
+    """Get the number and the capacity sums of storages as a list of
+    dictionaries, one per combination of the values of the columns of
+    group_by.
+    """
+    return IMPL.storage_summary_get_all(context, group_by, filters)
+
+
+def storage_resource_summary_get(context, storage_id):
+    """Get the number, the number by status and the capacity sums of the
+    resources of a storage, as a dictionary by resource.
+    """
+    return IMPL.storage_resource_summary_get(context, storage_id)
+
+
+def storage_registration_create(context, values, items):
+    """Create a bulk registration of storages with the values dictionary,
+    and its items with the dictionaries of items.
+    """
+    return IMPL.storage_registration_create(context, values, items)
+
+
+def storage_registration_get(context, registration_id):
+    """Get a bulk registration of storages."""
+    return IMPL.storage_registration_get(context, registration_id)
+
+
+def storage_registration_items_get(context, registration_id):
+    """Get the items of a bulk registration of storages, in the order of
+    the storages registered.
+    """
+    return IMPL.storage_registration_items_get(context, registration_id)
+
+
+def storage_registration_item_update(context, item_id, values):
+    """Update an item of a bulk registration of storages with the values
+    dictionary.
+    """
+    return IMPL.storage_registration_item_update(context, item_id, values)
+
+
+def storage_registration_items_expire(context, updated_before, error):
+    """Fail the pending and running items of bulk registrations not updated
+    since updated_before, left by API processes stopped, with error.
+    """
+    return IMPL.storage_registration_items_expire(context, updated_before,
+                                                  error)
+
+
+def storage_registration_delete_finished(context, created_before):
+    """Delete the bulk registrations created before created_before of which
+    all the items are finished, and their items.
+    """
+    return IMPL.storage_registration_delete_finished(context,
+                                                     created_before)
+
+
 def volume_create(context, values):
     """Create a volume from the values dictionary."""
     return IMPL.volume_create(context, values)
@@ -139,7 +245,7 @@ def volume_get(context, volume_id):
 
 
 def volume_get_all(context, marker=None, limit=None, sort_keys=None,
-                   sort_dirs=None, filters=None, offset=None):
+                   sort_dirs=None, filters=None, offset=None, fields=None):
     """Retrieves all volumes.
 
     If no sort parameters are specified then the returned volumes are sorted
@@ -157,10 +263,12 @@ def volume_get_all(context, marker=None, limit=None, sort_keys=None,
                       'desc' for descending order
     :param filters: dictionary of filters
     :param offset: number of items to skip
+    :param fields: names of the columns to load, if not all of them, the
+                   items are then dicts of the columns
     :returns: list of volumes
     """
     return IMPL.volume_get_all(context, marker, limit, sort_keys,
-                               sort_dirs, filters, offset)
+                               sort_dirs, filters, offset, fields)
 
 
 def volume_delete_by_storage(context, storage_id):
@@ -322,7 +430,7 @@ def port_delete_by_storage(context, storage_id):
 
 
 def port_get_all(context, marker=None, limit=None, sort_keys=None,
-                 sort_dirs=None, filters=None, offset=None):
+                 sort_dirs=None, filters=None, offset=None, fields=None):
     """Retrieves all ports.
     If no sort parameters are specified then the returned volumes are sorted
     first by the 'created_at' key and then by the 'id' key in descending
@@ -338,10 +446,12 @@ def port_get_all(context, marker=None, limit=None, sort_keys=None,
                       'desc' for descending order
     :param filters: dictionary of filters
     :param offset: number of items to skip
+    :param fields: names of the columns to load, if not all of them, the
+                   items are then dicts of the columns
     :returns: list of controllers
     """
     return IMPL.port_get_all(context, marker, limit, sort_keys,
-                             sort_dirs, filters, offset)
+                             sort_dirs, filters, offset, fields)
 
 
 def disks_create(context, values):
@@ -648,6 +758,13 @@ def access_info_update(context, storage_id, values):
     return IMPL.access_info_update(context, storage_id, values)
 
 
+def access_info_get_by_fingerprint(context, fingerprint):
+    """Get the access information of a fingerprint, identifying the
+    storage the access information is of.
+    """
+    return IMPL.access_info_get_by_fingerprint(context, fingerprint)
+
+
 def access_info_get(context, storage_id):
     """Get a storage access information."""
     return IMPL.access_info_get(context, storage_id)
@@ -732,6 +849,64 @@ def alert_source_get_all(context, marker=None, limit=None, sort_keys=None,
                                      sort_dirs, filters, offset)
 
 
+def alerts_upsert(context, storage_id, alerts,
+                  origin=constants.AlertOrigin.LISTED):
+    """Store the alerts of a storage, replacing the ones stored with the
+    same sequence numbers. origin tells whether the alerts are listed from
+    the storage or received as traps.
+    """
+    return IMPL.alerts_upsert(context, storage_id, alerts, origin)
+
+
+def alerts_touch(context, storage_id, sequence_numbers):
+    """Mark the stored alerts of a storage as listed from the storage now
+    by their sequence numbers.
+    """
+    return IMPL.alerts_touch(context, storage_id, sequence_numbers)
+
+
+def alert_get_all(context, marker=None, limit=None, sort_keys=None,
+                  sort_dirs=None, filters=None, offset=None):
+    """Retrieves all the alerts stored.
+
+    If no sort parameters are specified then the returned alerts are sorted
+    first by the 'created_at' key and then by the 'id' key in descending
+    order. begin_time and end_time of filters select the alerts which occur
+    in the time range.
+
+    :param context: context of this request, it's helpful to trace the
+                    request
+    :param marker: the last item of the previous page, used to determine the
+                   next page of results to return
+    :param limit: maximum number of items to return
+    :param sort_keys: list of attributes by which results should be sorted,
+                      paired with corresponding item in sort_dirs
+    :param sort_dirs: list of directions in which results should be sorted,
+                      paired with corresponding item in sort_keys, for
+                      example 'desc' for descending order
+    :param filters: dictionary of filters
+    :param offset: number of items to skip
+    :returns: list of alerts
+    """
+    return IMPL.alert_get_all(context, marker, limit, sort_keys,
+                              sort_dirs, filters, offset)
+
+
+def alerts_delete(context, storage_id, sequence_numbers):
+    """Delete the alerts of a storage by their sequence numbers."""
+    return IMPL.alerts_delete(context, storage_id, sequence_numbers)
+
+
+def alert_delete_by_storage(context, storage_id, seen_before=None,
+                            origin=None):
+    """Delete the alerts of a storage, only the ones not listed from the
+    storage nor received since seen_before if it is given, and of origin
+    if it is given.
+    """
+    return IMPL.alert_delete_by_storage(context, storage_id, seen_before,
+                                        origin)
+
+
 def task_create(context, values):
     """Create a task entry from the values dictionary."""
     return IMPL.task_create(context, values)
@@ -742,6 +917,21 @@ def task_update(context, task_id, values):
     return IMPL.task_update(context, task_id, values)
 
 
+def task_update_last_run_time(context, last_run_times):
+    """Update last run time of tasks from a dictionary of task id to
+    last run time, tasks which do not exist are skipped.
+    """
+    return IMPL.task_update_last_run_time(context, last_run_times)
+
+
+def task_update_collection_cost(context, costs):
+    """Update collection cost and series count of tasks from a dictionary
+    of task id to (collection cost, series count), tasks which do not
+    exist are skipped.
+    """
+    return IMPL.task_update_collection_cost(context, costs)
+
+
 def task_get(context, task_id):
     """Get a task or raise an exception if it does not exist."""
     return IMPL.task_get(context, task_id)
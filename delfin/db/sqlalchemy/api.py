@@ -19,11 +19,13 @@
 
 """Implementation of SQLAlchemy backend."""
 
+import collections
 import sys
 
 import six
 import sqlalchemy
 from oslo_config import cfg
+from oslo_db import exception as db_exc
 from oslo_db import options as db_options
 from oslo_db.sqlalchemy import session
 from oslo_db.sqlalchemy import utils as db_utils
@@ -32,6 +34,7 @@ from oslo_utils import uuidutils, timeutils
 from sqlalchemy import create_engine
 
 from delfin import exception
+from delfin.common import constants
 from delfin.common import sqlalchemyutils
 from delfin.db.sqlalchemy import models
 from delfin.db.sqlalchemy.models import Storage, AccessInfo
@@ -88,6 +91,33 @@ def register_db():
     engine = create_engine(CONF.database.connection, echo=False)
     for model in models:
         model.metadata.create_all(engine)
+    _upgrade_tables(engine, Storage.metadata)
+
+
+def _upgrade_tables(engine, metadata):
+    """Add the columns and indexes of the models missing in the tables
+    created by previous versions, which create_all does not alter.
+    """
+    inspector = sqlalchemy.inspect(engine)
+    quote = engine.dialect.identifier_preparer.quote
+    for table in metadata.sorted_tables:
+        columns = set(column['name'] for column
+                      in inspector.get_columns(table.name))
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            LOG.info("Add column %s to table %s.", column.name, table.name)
+            engine.execute('ALTER TABLE %s ADD COLUMN %s %s' % (
+                quote(table.name), quote(column.name),
+                column.type.compile(dialect=engine.dialect)))
+
+        indexes = set(index['name'] for index
+                      in inspector.get_indexes(table.name))
+        for index in table.indexes:
+            if index.name not in indexes:
+                LOG.info("Add index %s to table %s.", index.name,
+                         table.name)
+                index.create(engine)
 
 
 def _process_model_like_filter(model, query, filters):
@@ -164,8 +194,12 @@ def access_info_create(context, values):
     access_info_ref.update(values)
 
     session = get_session()
-    with session.begin():
-        session.add(access_info_ref)
+    try:
+        with session.begin():
+            session.add(access_info_ref)
+    except db_exc.DBDuplicateEntry:
+        # Registered concurrently
+        raise exception.StorageAlreadyExists()
 
     return _access_info_get(context,
                             access_info_ref['storage_id'],
@@ -175,9 +209,12 @@ def access_info_create(context, values):
 def access_info_update(context, storage_id, values):
     """Update a storage access information with the values dictionary."""
     session = get_session()
-    with session.begin():
-        _access_info_get(context, storage_id, session).update(values)
-        return _access_info_get(context, storage_id, session)
+    try:
+        with session.begin():
+            _access_info_get(context, storage_id, session).update(values)
+    except db_exc.DBDuplicateEntry:
+        raise exception.StorageAlreadyExists()
+    return _access_info_get(context, storage_id, session)
 
 
 def access_info_delete(context, storage_id):
@@ -191,6 +228,18 @@ def access_info_get(context, storage_id):
     return _access_info_get(context, storage_id)
 
 
+def access_info_get_by_fingerprint(context, fingerprint):
+    """Get the access information of a fingerprint."""
+    result = (_access_info_get_query(context)
+              .filter_by(fingerprint=fingerprint)
+              .first())
+
+    if not result:
+        raise exception.AccessInfoNotFound(fingerprint)
+
+    return result
+
+
 def _access_info_get(context, storage_id, session=None):
     result = (_access_info_get_query(context, session=session)
               .filter_by(storage_id=storage_id)
@@ -242,6 +291,8 @@ def storage_create(context, values):
     session = get_session()
     with session.begin():
         session.add(storage_ref)
+        _resource_version_bump(context, session, storage_ref['id'],
+                               constants.ResourceType.STORAGE)
 
     return _storage_get(context,
                         storage_ref['id'],
@@ -254,6 +305,8 @@ def storage_update(context, storage_id, values):
     with session.begin():
         query = _storage_get_query(context, session)
         result = query.filter_by(id=storage_id).update(values)
+        _resource_version_bump(context, session, storage_id,
+                               constants.ResourceType.STORAGE)
     return result
 
 
@@ -313,7 +366,314 @@ def _process_storage_info_filters(query, filters):
 def storage_delete(context, storage_id):
     """Delete a storage device."""
     delete_info = {'deleted': True, 'deleted_at': timeutils.utcnow()}
-    _storage_get_query(context).filter_by(id=storage_id).update(delete_info)
+    session = get_session()
+    with session.begin():
+        _storage_get_query(context, session).filter_by(
+            id=storage_id).update(delete_info)
+        _resource_version_bump(context, session, storage_id,
+                               constants.ResourceType.STORAGE)
+
+
+# Storage id of the generation of a resource type, bumped when the versions
+# of a storage are deleted
+RESOURCE_GENERATION_STORAGE_ID = ''
+
+
+def resource_version_bump(context, storage_id, resource_type):
+    """Increase the change version of a resource type of a storage."""
+    try:
+        session = get_session()
+        with session.begin():
+            _resource_version_bump(context, session, storage_id,
+                                   resource_type)
+    except db_exc.DBDuplicateEntry:
+        # Version added in between by another writer
+        session = get_session()
+        with session.begin():
+            _resource_version_bump(context, session, storage_id,
+                                   resource_type)
+
+
+def _resource_version_bump(context, session, storage_id, resource_type):
+    query = model_query(context, models.ResourceVersion, session=session)
+    result = query.filter_by(storage_id=storage_id,
+                             resource_type=resource_type).update(
+        {'version': models.ResourceVersion.version + 1},
+        synchronize_session=False)
+    if not result:
+        version_ref = models.ResourceVersion()
+        version_ref.update({'storage_id': storage_id,
+                            'resource_type': resource_type,
+                            'version': 1})
+        session.add(version_ref)
+
+
+def resource_version_delete(context, storage_id, resource_type=None):
+    """Delete the change versions of a storage, of all resource types if
+    resource_type is not given, and bump the generations of the resource
+    types.
+    """
+    try:
+        session = get_session()
+        with session.begin():
+            _resource_version_delete(context, session, storage_id,
+                                     resource_type)
+    except db_exc.DBDuplicateEntry:
+        # Generation added in between by another removal
+        session = get_session()
+        with session.begin():
+            _resource_version_delete(context, session, storage_id,
+                                     resource_type)
+
+
+def _resource_version_delete(context, session, storage_id, resource_type):
+    query = model_query(context, models.ResourceVersion, session=session)
+    query = query.filter_by(storage_id=storage_id)
+    if resource_type:
+        query = query.filter_by(resource_type=resource_type)
+    resource_types = set(version_ref.resource_type
+                         for version_ref in query.all())
+    query.delete(synchronize_session=False)
+
+    # The resources of the storage may still be listed after its versions
+    # are deleted, the generation changes the ETags once they are removed
+    if resource_type:
+        resource_types.add(resource_type)
+    for _resource_type in resource_types:
+        _resource_version_bump(context, session,
+                               RESOURCE_GENERATION_STORAGE_ID, _resource_type)
+
+
+def resource_version_get_all(context, resource_type, storage_id=None):
+    """Get the change versions of a resource type by storage id, with the
+    generation of the resource type.
+    """
+    query = model_query(context, models.ResourceVersion, session=None)
+    query = query.filter_by(resource_type=resource_type)
+    if storage_id:
+        query = query.filter(models.ResourceVersion.storage_id.in_(
+            [storage_id, RESOURCE_GENERATION_STORAGE_ID]))
+    return {version_ref.storage_id: version_ref.version
+            for version_ref in query.all()}
+
+
+def resource_digest_get(context, storage_id, resource_task):
+    """Get the digest of the resources written by the last sync."""
+    digest_ref = model_query(context, models.ResourceDigest,
+                             session=None).filter_by(
+        storage_id=storage_id, resource_task=resource_task).first()
+    return digest_ref.digest if digest_ref else None
+
+
+def resource_digest_set(context, storage_id, resource_task, digest):
+    """Set the digest of the resources written by a sync."""
+    try:
+        session = get_session()
+        with session.begin():
+            result = model_query(context, models.ResourceDigest,
+                                 session=session).filter_by(
+                storage_id=storage_id, resource_task=resource_task).update(
+                {'digest': digest}, synchronize_session=False)
+            if not result:
+                digest_ref = models.ResourceDigest()
+                digest_ref.update({'storage_id': storage_id,
+                                   'resource_task': resource_task,
+                                   'digest': digest})
+                session.add(digest_ref)
+    except db_exc.DBDuplicateEntry:
+        # Digest added in between by another sync
+        resource_digest_set(context, storage_id, resource_task, digest)
+
+
+def resource_digest_delete(context, storage_id, resource_task=None):
+    """Delete the digests of a storage, of one resource task if given."""
+    query = model_query(context, models.ResourceDigest,
+                        session=None).filter_by(storage_id=storage_id)
+    if resource_task:
+        query = query.filter_by(resource_task=resource_task)
+    query.delete()
+
+
+def storage_registration_create(context, values, items):
+    """Create a bulk registration of storages with its items."""
+    if not values.get('id'):
+        values['id'] = uuidutils.generate_uuid()
+
+    registration_ref = models.StorageRegistration()
+    registration_ref.update(values)
+
+    session = get_session()
+    with session.begin():
+        session.add(registration_ref)
+        for item in items:
+            item_ref = models.StorageRegistrationItem()
+            item_ref.update(item)
+            item_ref.registration_id = registration_ref.id
+            session.add(item_ref)
+
+    return _storage_registration_get(context, registration_ref['id'],
+                                     session=session)
+
+
+def storage_registration_get(context, registration_id):
+    """Get a bulk registration of storages."""
+    return _storage_registration_get(context, registration_id)
+
+
+def _storage_registration_get(context, registration_id, session=None):
+    result = (model_query(context, models.StorageRegistration,
+                          session=session)
+              .filter_by(id=registration_id)
+              .first())
+
+    if not result:
+        raise exception.StorageRegistrationNotFound(registration_id)
+
+    return result
+
+
+def storage_registration_items_get(context, registration_id):
+    """Get the items of a bulk registration of storages, in order."""
+    return (model_query(context, models.StorageRegistrationItem,
+                        session=None)
+            .filter_by(registration_id=registration_id)
+            .order_by(models.StorageRegistrationItem.id)
+            .all())
+
+
+def storage_registration_item_update(context, item_id, values):
+    """Update an item of a bulk registration of storages."""
+    session = get_session()
+    with session.begin():
+        return (model_query(context, models.StorageRegistrationItem,
+                            session=session)
+                .filter_by(id=item_id)
+                .update(values))
+
+
+def storage_registration_items_expire(context, updated_before, error):
+    """Fail the pending and running items of bulk registrations not
+    updated since updated_before.
+    """
+    item = models.StorageRegistrationItem
+    session = get_session()
+    with session.begin():
+        return (model_query(context, item, session=session)
+                .filter(item.status.in_(
+                    [constants.RegistrationStatus.PENDING,
+                     constants.RegistrationStatus.RUNNING]))
+                .filter(sqlalchemy.func.coalesce(
+                    item.updated_at, item.created_at) < updated_before)
+                .update({'status': constants.RegistrationStatus.FAILED,
+                         'error': error}, synchronize_session=False))
+
+
+def storage_registration_delete_finished(context, created_before):
+    """Delete the bulk registrations created before created_before of
+    which all the items are finished, with their items.
+    """
+    item = models.StorageRegistrationItem
+    registration = models.StorageRegistration
+    session = get_session()
+    with session.begin():
+        unfinished = (model_query(context, item, item.registration_id,
+                                  session=session)
+                      .filter(item.status.in_(
+                          [constants.RegistrationStatus.PENDING,
+                           constants.RegistrationStatus.RUNNING])))
+        registration_ids = [
+            registration_ref.id for registration_ref in
+            model_query(context, registration, registration.id,
+                        session=session)
+            .filter(registration.created_at < created_before)
+            .filter(~registration.id.in_(unfinished.subquery()))]
+        if registration_ids:
+            (model_query(context, item, session=session)
+             .filter(item.registration_id.in_(registration_ids))
+             .delete(synchronize_session=False))
+            (model_query(context, registration, session=session)
+             .filter(registration.id.in_(registration_ids))
+             .delete(synchronize_session=False))
+        return len(registration_ids)
+
+
+# Capacities summed by storage summaries
+STORAGE_SUMMARY_CAPACITIES = ('total_capacity', 'used_capacity',
+                              'free_capacity', 'raw_capacity',
+                              'subscribed_capacity')
+# Resources of a storage summarized, with their status column and the
+# capacities summed
+RESOURCE_SUMMARY_COLUMNS = collections.OrderedDict([
+    ('storage_pools', (models.StoragePool, 'status',
+                       ('total_capacity', 'used_capacity', 'free_capacity',
+                        'subscribed_capacity'))),
+    ('volumes', (models.Volume, 'status',
+                 ('total_capacity', 'used_capacity', 'free_capacity'))),
+    ('disks', (models.Disk, 'status', ('capacity',))),
+    ('filesystems', (models.Filesystem, 'status',
+                     ('total_capacity', 'used_capacity', 'free_capacity'))),
+    ('controllers', (models.Controller, 'status', ())),
+    ('ports', (models.Port, 'health_status', ())),
+])
+
+
+def _sums(model, capacities):
+    return [sqlalchemy.func.coalesce(
+        sqlalchemy.func.sum(getattr(model, capacity)), 0)
+        for capacity in capacities]
+
+
+def storage_summary_get_all(context, group_by=None, filters=None):
+    """Get the number and the capacity sums of storages, by the values of
+    the columns of group_by.
+    """
+    group_by = group_by or []
+    session = get_session()
+    with session.begin():
+        query = _storage_get_query(context, session)
+        query = _process_storage_info_filters(query, filters or {})
+        if query is None:
+            return []
+        columns = [getattr(models.Storage, key) for key in group_by]
+        query = query.with_entities(
+            *(columns + [sqlalchemy.func.count()] +
+              _sums(models.Storage, STORAGE_SUMMARY_CAPACITIES)))
+        if columns:
+            query = query.group_by(*columns).order_by(*columns)
+        summaries = []
+        for row in query.all():
+            summary = dict(zip(group_by, row))
+            summary['count'] = row[len(group_by)]
+            summary.update(zip(STORAGE_SUMMARY_CAPACITIES,
+                               row[len(group_by) + 1:]))
+            summaries.append(summary)
+        return summaries
+
+
+def storage_resource_summary_get(context, storage_id):
+    """Get the number, the number by status and the capacity sums of the
+    resources of a storage, by resource.
+    """
+    session = get_session()
+    with session.begin():
+        _storage_get(context, storage_id, session)
+        result = collections.OrderedDict()
+        for resource, (model, status, capacities) in \
+                RESOURCE_SUMMARY_COLUMNS.items():
+            status = getattr(model, status)
+            query = model_query(context, model, session=session).filter_by(
+                storage_id=storage_id).with_entities(
+                status, sqlalchemy.func.count(),
+                *_sums(model, capacities)).group_by(status)
+            summary = dict(count=0, status=dict())
+            summary.update((capacity, 0) for capacity in capacities)
+            for row in query.all():
+                summary['count'] += row[1]
+                summary['status'][row[0]] = row[1]
+                for capacity, value in zip(capacities, row[2:]):
+                    summary[capacity] += value
+            result[resource] = summary
+        return result
 
 
 def _volume_get_query(context, session=None):
@@ -411,7 +771,7 @@ def volume_get(context, volume_id):
 
 
 def volume_get_all(context, marker=None, limit=None, sort_keys=None,
-                   sort_dirs=None, filters=None, offset=None):
+                   sort_dirs=None, filters=None, offset=None, fields=None):
     """Retrieves all storage volumes."""
     session = get_session()
     with session.begin():
@@ -422,7 +782,7 @@ def volume_get_all(context, marker=None, limit=None, sort_keys=None,
         # No volume would match, return empty list
         if query is None:
             return []
-        return query.all()
+        return _get_page(query, models.Volume, marker, fields)
 
 
 @apply_like_filters(model=models.Volume)
@@ -840,7 +1200,7 @@ def port_delete_by_storage(context, storage_id):
 
 
 def port_get_all(context, marker=None, limit=None, sort_keys=None,
-                 sort_dirs=None, filters=None, offset=None):
+                 sort_dirs=None, filters=None, offset=None, fields=None):
     """Retrieves all ports."""
 
     session = get_session()
@@ -853,7 +1213,7 @@ def port_get_all(context, marker=None, limit=None, sort_keys=None,
         # No Port would match, return empty list
         if query is None:
             return []
-        return query.all()
+        return _get_page(query, models.Port, marker, fields)
 
 
 @apply_like_filters(model=models.Port)
@@ -1675,6 +2035,141 @@ def alert_source_get_all(context, marker=None, limit=None, sort_keys=None,
         return query.all()
 
 
+def _alert_get_query(context, session=None):
+    return model_query(context, models.Alert, session=session)
+
+
+def _alert_get(context, alert_id, session=None):
+    result = (_alert_get_query(context, session=session)
+              .filter_by(id=alert_id)
+              .first())
+
+    if not result:
+        raise exception.AlertNotFound(alert_id)
+
+    return result
+
+
+def _process_alert_filters(query, filters):
+    """Common filter processing for alert queries, begin_time and end_time
+    filter the occur time of the alerts in the range.
+    """
+    filters = dict(filters)
+    begin_time = filters.pop('begin_time', None)
+    end_time = filters.pop('end_time', None)
+    if begin_time is not None:
+        query = query.filter(models.Alert.occur_time >= begin_time)
+    if end_time is not None:
+        query = query.filter(models.Alert.occur_time <= end_time)
+    if filters:
+        if not is_valid_model_filters(models.Alert, filters):
+            return
+        query = query.filter_by(**filters)
+
+    return query
+
+
+def alerts_upsert(context, storage_id, alerts,
+                  origin=constants.AlertOrigin.LISTED):
+    """Add the alerts of a storage, the alerts of which the sequence
+    numbers are stored already replace them.
+    """
+    try:
+        session = get_session()
+        with session.begin():
+            _alerts_upsert(context, session, storage_id, alerts, origin)
+    except db_exc.DBDuplicateEntry:
+        # Alert added in between by a trap or a sync
+        session = get_session()
+        with session.begin():
+            _alerts_upsert(context, session, storage_id, alerts, origin)
+
+
+def _alerts_upsert(context, session, storage_id, alerts, origin):
+    last_seen_at = timeutils.utcnow()
+    sequence_numbers = set(six.text_type(alert['sequence_number'])
+                           for alert in alerts
+                           if alert.get('sequence_number') is not None)
+    alert_refs = {}
+    if sequence_numbers:
+        query = _alert_get_query(context, session).filter_by(
+            storage_id=storage_id).filter(
+            models.Alert.sequence_number.in_(sequence_numbers))
+        alert_refs = {alert_ref.sequence_number: alert_ref
+                      for alert_ref in query}
+    for alert in alerts:
+        sequence_number = alert.get('sequence_number')
+        if sequence_number is not None:
+            sequence_number = six.text_type(sequence_number)
+        alert_ref = alert_refs.get(sequence_number)
+        if alert_ref is None:
+            alert_ref = models.Alert()
+            session.add(alert_ref)
+            if sequence_number is not None:
+                alert_refs[sequence_number] = alert_ref
+        alert_ref.update({'storage_id': storage_id,
+                          'sequence_number': sequence_number,
+                          'occur_time': alert.get('occur_time'),
+                          'severity': alert.get('severity'),
+                          'category': alert.get('category'),
+                          'last_seen_at': last_seen_at,
+                          'alert': alert})
+        # An alert listed from the storage stays listed when received as
+        # a trap again
+        if alert_ref.origin != constants.AlertOrigin.LISTED:
+            alert_ref.origin = origin
+
+
+def alerts_touch(context, storage_id, sequence_numbers):
+    """Mark the stored alerts of a storage as listed from the storage now
+    by their sequence numbers.
+    """
+    sequence_numbers = set(six.text_type(sequence_number)
+                           for sequence_number in sequence_numbers
+                           if sequence_number is not None)
+    if not sequence_numbers:
+        return
+    _alert_get_query(context).filter_by(storage_id=storage_id).filter(
+        models.Alert.sequence_number.in_(sequence_numbers)).update(
+        {'last_seen_at': timeutils.utcnow(),
+         'origin': constants.AlertOrigin.LISTED}, synchronize_session=False)
+
+
+def alert_get_all(context, marker=None, limit=None, sort_keys=None,
+                  sort_dirs=None, filters=None, offset=None):
+    """Retrieves all alerts."""
+    session = get_session()
+    with session.begin():
+        query = _generate_paginate_query(context, session, models.Alert,
+                                         marker, limit, sort_keys, sort_dirs,
+                                         filters, offset)
+        if query is None:
+            return []
+        return _get_page(query, models.Alert, marker)
+
+
+def alerts_delete(context, storage_id, sequence_numbers):
+    """Delete the alerts of a storage by their sequence numbers."""
+    _alert_get_query(context).filter_by(storage_id=storage_id).filter(
+        models.Alert.sequence_number.in_(
+            [six.text_type(sequence_number)
+             for sequence_number in sequence_numbers])).delete(
+        synchronize_session=False)
+
+
+def alert_delete_by_storage(context, storage_id, seen_before=None,
+                            origin=None):
+    """Delete the alerts of a storage, the ones not seen since seen_before
+    and of origin if given.
+    """
+    query = _alert_get_query(context).filter_by(storage_id=storage_id)
+    if seen_before:
+        query = query.filter(models.Alert.last_seen_at < seen_before)
+    if origin:
+        query = query.filter_by(origin=origin)
+    query.delete(synchronize_session=False)
+
+
 def task_create(context, values):
     """Add task configuration."""
     tasks_ref = models.Task()
@@ -1701,6 +2196,36 @@ def task_update(context, tasks_id, values):
     return result
 
 
+def task_update_last_run_time(context, last_run_times):
+    """Update last run time of tasks in one transaction."""
+    session = get_session()
+    result = 0
+    with session.begin():
+        for task_id, last_run_time in last_run_times.items():
+            query = _task_get_query(context, session)
+            result += query.filter_by(id=task_id).update(
+                {'last_run_time': last_run_time})
+
+    return result
+
+
+def task_update_collection_cost(context, costs):
+    """Update collection cost and series count of tasks in one
+    transaction.
+    """
+    session = get_session()
+    result = 0
+    with session.begin():
+        for task_id, (collection_cost, series_count) in costs.items():
+            values = {'collection_cost': collection_cost}
+            if series_count is not None:
+                values['series_count'] = series_count
+            query = _task_get_query(context, session)
+            result += query.filter_by(id=task_id).update(values)
+
+    return result
+
+
 def _task_get(context, task_id, session=None):
     result = (_task_get_query(context, session=session)
               .filter_by(id=task_id)
@@ -2860,6 +3385,7 @@ PAGINATION_HELPERS = {
     models.AlertSource: (_alert_source_get_query,
                          _process_alert_source_filters,
                          _alert_source_get),
+    models.Alert: (_alert_get_query, _process_alert_filters, _alert_get),
     models.Volume: (_volume_get_query, _process_volume_info_filters,
                     _volume_get),
     models.Controller: (_controller_get_query,
@@ -3000,7 +3526,9 @@ def _generate_paginate_query(context, session, paginate_type, marker,
     :param context: context to query under
     :param session: the session to use
     :param marker: the last item of the previous page; we returns the next
-                    results after this value.
+                    results after this value. It is either the id of the
+                    item or a sqlalchemyutils.Cursor, whose sort keys
+                    replace sort_keys and sort_dirs.
     :param limit: maximum number of items to return
     :param sort_keys: list of attributes by which results should be sorted,
                       paired with corresponding item in sort_dirs
@@ -3016,8 +3544,17 @@ def _generate_paginate_query(context, session, paginate_type, marker,
     """
     get_query, process_filters, get = PAGINATION_HELPERS[paginate_type]
 
+    cursor = None
+    if isinstance(marker, sqlalchemyutils.Cursor):
+        cursor, marker = marker, None
+        sort_keys, sort_dirs = cursor.sort_keys, cursor.sort_dirs
+    # Rows are in a stable order when ids break the ties of sort keys
+    default_keys = ['created_at']
+    if hasattr(paginate_type, 'id'):
+        default_keys.append('id')
     sort_keys, sort_dirs = process_sort_params(sort_keys,
                                                sort_dirs,
+                                               default_keys=default_keys,
                                                default_dir='desc')
     query = get_query(context, session=session)
 
@@ -3034,4 +3571,25 @@ def _generate_paginate_query(context, session, paginate_type, marker,
                                           sort_keys,
                                           marker=marker_object,
                                           sort_dirs=sort_dirs,
-                                          offset=offset)
+                                          offset=offset,
+                                          cursor=cursor)
+
+
+def _get_page(query, model, marker, fields=None):
+    """Get the rows of a paginated query in the order of the list.
+
+    With fields, only the columns of the fields are loaded, and rows are
+    dicts of them rather than models.
+    """
+    if fields:
+        try:
+            columns = [getattr(model, field) for field in fields]
+        except AttributeError:
+            raise exception.InvalidInput(_('Invalid fields'))
+        result = [dict(zip(fields, row))
+                  for row in query.with_entities(*columns)]
+    else:
+        result = query.all()
+    if isinstance(marker, sqlalchemyutils.Cursor) and marker.reverse:
+        result.reverse()
+    return result
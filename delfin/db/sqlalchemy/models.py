@@ -24,13 +24,16 @@ from oslo_config import cfg
 from oslo_db.sqlalchemy import models
 from oslo_db.sqlalchemy.types import JsonEncodedDict
 from sqlalchemy import Column, Integer, String, Boolean, BigInteger, \
-    DateTime, BIGINT
+    DateTime, BIGINT, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import class_mapper
 
 from delfin.common import constants
 
 CONF = cfg.CONF
 BASE = declarative_base()
+# Column keys by model class
+_column_keys = {}
 
 
 class DelfinBase(models.ModelBase,
@@ -46,10 +49,27 @@ class DelfinBase(models.ModelBase,
                 model_dict[k] = v
         return model_dict
 
+    def _as_dict(self):
+        """Columns and attributes from joins of the model, the columns
+        mapped once per model class rather than once per row.
+        """
+        keys = _column_keys.get(type(self))
+        if keys is None:
+            keys = list(class_mapper(type(self)).columns.keys())
+            _column_keys[type(self)] = keys
+        local = {key: getattr(self, key) for key in keys + self._extra_keys}
+        local.update((k, v) for k, v in self.__dict__.items()
+                     if not k[0] == '_')
+        return local
+
 
 class AccessInfo(BASE, DelfinBase):
     """Represent access info required for storage accessing."""
     __tablename__ = "access_info"
+    # Access information of a storage registered once
+    __table_args__ = (
+        Index('idx_access_info_fingerprint', 'fingerprint', unique=True),
+        DelfinBase.__table_args__)
     storage_id = Column(String(36), primary_key=True)
     vendor = Column(String(255))
     model = Column(String(255))
@@ -58,6 +78,7 @@ class AccessInfo(BASE, DelfinBase):
     cli = Column(JsonEncodedDict)
     smis = Column(JsonEncodedDict)
     extra_attributes = Column(JsonEncodedDict)
+    fingerprint = Column(String(64))
 
 
 class Storage(BASE, DelfinBase):
@@ -86,6 +107,15 @@ class Storage(BASE, DelfinBase):
 class Volume(BASE, DelfinBase):
     """Represents a volume object."""
     __tablename__ = 'volumes'
+    # Keyset pagination of the default list order, of all the volumes and
+    # of the ones of a storage, and summaries of the volumes of a storage
+    __table_args__ = (
+        Index('idx_volumes_created_at_id', 'created_at', 'id'),
+        Index('idx_volumes_storage_id_created_at_id', 'storage_id',
+              'created_at', 'id'),
+        Index('idx_volumes_summary', 'storage_id', 'status',
+              'total_capacity', 'used_capacity', 'free_capacity'),
+        DelfinBase.__table_args__)
     id = Column(String(36), primary_key=True)
     native_volume_id = Column(String(255))
     name = Column(String(255))
@@ -105,6 +135,12 @@ class Volume(BASE, DelfinBase):
 class StoragePool(BASE, DelfinBase):
     """Represents a storage_pool object."""
     __tablename__ = 'storage_pools'
+    # Summaries of the storage pools of a storage
+    __table_args__ = (
+        Index('idx_storage_pools_summary', 'storage_id', 'status',
+              'total_capacity', 'used_capacity', 'free_capacity',
+              'subscribed_capacity'),
+        DelfinBase.__table_args__)
     id = Column(String(36), primary_key=True)
     native_storage_pool_id = Column(String(255))
     name = Column(String(255))
@@ -121,6 +157,10 @@ class StoragePool(BASE, DelfinBase):
 class Disk(BASE, DelfinBase):
     """Represents a disk object."""
     __tablename__ = 'disks'
+    # Summaries of the disks of a storage
+    __table_args__ = (
+        Index('idx_disks_summary', 'storage_id', 'status', 'capacity'),
+        DelfinBase.__table_args__)
     id = Column(String(36), primary_key=True)
     native_disk_id = Column(String(255))
     name = Column(String(255))
@@ -157,6 +197,13 @@ class Controller(BASE, DelfinBase):
 class Port(BASE, DelfinBase):
     """Represents a port object."""
     __tablename__ = 'ports'
+    # Keyset pagination of the default list order, of all the ports and
+    # of the ones of a storage
+    __table_args__ = (
+        Index('idx_ports_created_at_id', 'created_at', 'id'),
+        Index('idx_ports_storage_id_created_at_id', 'storage_id',
+              'created_at', 'id'),
+        DelfinBase.__table_args__)
     id = Column(String(36), primary_key=True)
     native_port_id = Column(String(255))
     name = Column(String(255))
@@ -180,6 +227,11 @@ class Port(BASE, DelfinBase):
 class Filesystem(BASE, DelfinBase):
     """Represents a filesystem object."""
     __tablename__ = 'filesystems'
+    # Summaries of the filesystems of a storage
+    __table_args__ = (
+        Index('idx_filesystems_summary', 'storage_id', 'status',
+              'total_capacity', 'used_capacity', 'free_capacity'),
+        DelfinBase.__table_args__)
     id = Column(String(36), primary_key=True)
     native_filesystem_id = Column(String(255))
     name = Column(String(255))
@@ -259,6 +311,34 @@ class AlertSource(BASE, DelfinBase):
     expiration = Column(Integer)
 
 
+class Alert(BASE, DelfinBase):
+    """Represents an alert of a storage, listed from the storage or
+    received as a trap.
+    """
+    __tablename__ = 'alerts'
+    __table_args__ = (
+        Index('idx_alerts_storage_id_occur_time', 'storage_id',
+              'occur_time', 'created_at', 'id'),
+        Index('idx_alerts_storage_id_sequence_number', 'storage_id',
+              'sequence_number', unique=True),
+        Index('idx_alerts_storage_id_last_seen_at', 'storage_id',
+              'last_seen_at'),
+        DelfinBase.__table_args__)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    storage_id = Column(String(36))
+    sequence_number = Column(String(255))
+    occur_time = Column(BigInteger)
+    severity = Column(String(255))
+    category = Column(String(255))
+    # Last time the alert was listed from the storage or received
+    last_seen_at = Column(DateTime)
+    # Whether the alert was listed from the storage or only received as a
+    # trap, one of constants.AlertOrigin
+    origin = Column(String(255))
+    # Alert model as filled by the driver and the storage attributes
+    alert = Column(JsonEncodedDict)
+
+
 class Task(BASE, DelfinBase):
     """Represents a task attributes."""
     __tablename__ = 'tasks'
@@ -270,6 +350,8 @@ class Task(BASE, DelfinBase):
     last_run_time = Column(Integer)
     job_id = Column(String(36))
     executor = Column(String(255))
+    collection_cost = Column(Float)
+    series_count = Column(Integer)
     deleted_at = Column(DateTime)
     deleted = Column(Boolean, default=False)
 
@@ -398,3 +480,41 @@ class VolGrpVolRel(BASE, DelfinBase):
     description = Column(String(255))
     native_volume_group_id = Column(String(255))
     native_volume_id = Column(String(255))
+
+
+class ResourceVersion(BASE, DelfinBase):
+    """Represents the change version of a resource type of a storage."""
+    __tablename__ = 'resource_versions'
+    storage_id = Column(String(36), primary_key=True)
+    resource_type = Column(String(64), primary_key=True)
+    version = Column(Integer, default=0)
+
+
+class ResourceDigest(BASE, DelfinBase):
+    """Represents the digest of the resources of a storage written by the
+    last sync of a resource task.
+    """
+    __tablename__ = 'resource_digests'
+    storage_id = Column(String(36), primary_key=True)
+    resource_task = Column(String(64), primary_key=True)
+    digest = Column(String(64))
+
+
+class StorageRegistration(BASE, DelfinBase):
+    """Represents a registration of storages in bulk."""
+    __tablename__ = 'storage_registrations'
+    id = Column(String(36), primary_key=True)
+    total = Column(Integer)
+
+
+class StorageRegistrationItem(BASE, DelfinBase):
+    """Represents the registration of a storage of a bulk registration."""
+    __tablename__ = 'storage_registration_items'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    registration_id = Column(String(36), index=True)
+    vendor = Column(String(255))
+    model = Column(String(255))
+    host = Column(String(255))
+    status = Column(String(255))
+    storage_id = Column(String(36))
+    error = Column(String(255))
@@ -18,6 +18,7 @@ from oslo_log import log
 from oslo_utils import uuidutils
 
 from delfin import db
+from delfin import utils
 from delfin.drivers import helper
 from delfin.drivers import manager
 
@@ -42,6 +43,8 @@ class API(object):
 
         # Need to validate storage response from driver
         helper.check_storage_repetition(context, storage)
+        access_info['fingerprint'] = utils.access_info_fingerprint(
+            access_info)
         access_info = db.access_info_create(context, access_info)
         storage['id'] = access_info['storage_id']
         storage = db.storage_create(context, storage)
@@ -60,6 +63,8 @@ class API(object):
         # Need to validate storage response from driver
         storage_id = access_info['storage_id']
         helper.check_storage_consistency(context, storage_id, storage_new)
+        access_info['fingerprint'] = utils.access_info_fingerprint(
+            access_info)
         access_info = db.access_info_update(context, storage_id, access_info)
         db.storage_update(context, storage_id, storage_new)
 
@@ -72,55 +77,55 @@ class API(object):
 
     def get_storage(self, context, storage_id):
         """Get storage device information from storage system"""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.get_storage(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.get_storage(context)
 
     def list_storage_pools(self, context, storage_id):
         """List all storage pools from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_storage_pools(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_storage_pools(context)
 
     def list_volumes(self, context, storage_id):
         """List all storage volumes from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_volumes(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_volumes(context)
 
     def list_controllers(self, context, storage_id):
         """List all storage controllers from storage system."""
 
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_controllers(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_controllers(context)
 
     def list_ports(self, context, storage_id):
         """List all ports from storage system."""
 
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_ports(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_ports(context)
 
     def list_disks(self, context, storage_id):
         """List all disks from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_disks(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_disks(context)
 
     def list_quotas(self, context, storage_id):
         """List all quotas from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_quotas(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_quotas(context)
 
     def list_filesystems(self, context, storage_id):
         """List all filesystems from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_filesystems(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_filesystems(context)
 
     def list_qtrees(self, context, storage_id):
         """List all qtrees from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_qtrees(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_qtrees(context)
 
     def list_shares(self, context, storage_id):
         """List all shares from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_shares(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_shares(context)
 
     def add_trap_config(self, context, storage_id, trap_config):
         """Config the trap receiver in storage system."""
@@ -140,58 +145,62 @@ class API(object):
 
     def clear_alert(self, context, storage_id, sequence_number):
         """Clear alert from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        driver.clear_alert(context, sequence_number)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            driver.clear_alert(context, sequence_number)
+
+    def clear_alerts(self, context, storage_id, sequence_numbers):
+        """Clear a batch of alerts from storage system."""
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.clear_alerts(context, sequence_numbers)
 
     def list_alerts(self, context, storage_id, query_para=None):
         """List alert from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_alerts(context, query_para)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_alerts(context, query_para)
 
     def collect_perf_metrics(self, context, storage_id,
                              resource_metrics, start_time, end_time):
 
         """Collect performance metrics"""
-        driver = self.driver_manager.get_driver(context,
-                                                storage_id=storage_id)
-        return driver.collect_perf_metrics(context, storage_id,
-                                           resource_metrics, start_time,
-                                           end_time)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.collect_perf_metrics(context, storage_id,
+                                               resource_metrics, start_time,
+                                               end_time)
 
     def get_capabilities(self, context, storage_id, filters=None):
         """Get capabilities from supported driver"""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.get_capabilities(context, filters)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.get_capabilities(context, filters)
 
     def list_storage_host_initiators(self, context, storage_id):
         """List all storage initiators from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_storage_host_initiators(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_storage_host_initiators(context)
 
     def list_storage_hosts(self, context, storage_id):
         """List all storage hosts from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_storage_hosts(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_storage_hosts(context)
 
     def list_storage_host_groups(self, context, storage_id):
         """List all storage host groups from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_storage_host_groups(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_storage_host_groups(context)
 
     def list_port_groups(self, context, storage_id):
         """List all port groups from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_port_groups(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_port_groups(context)
 
     def list_volume_groups(self, context, storage_id):
         """List all volume groups from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_volume_groups(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_volume_groups(context)
 
     def list_masking_views(self, context, storage_id):
         """List all masking views from storage system."""
-        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
-        return driver.list_masking_views(context)
+        with self.driver_manager.use_driver(context, storage_id) as driver:
+            return driver.list_masking_views(context)
 
     def get_alert_sources(self, context, storage_id):
         access_info = db.access_info_get(context, storage_id)
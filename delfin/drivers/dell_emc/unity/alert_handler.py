@@ -21,6 +21,7 @@ from delfin import exception, utils
 from delfin.common import alert_util
 from delfin.common import constants
 from delfin.drivers.dell_emc.unity import consts
+from delfin.drivers.utils import trap_parser
 from delfin.i18n import _
 
 LOG = log.getLogger(__name__)
@@ -64,8 +65,14 @@ class AlertHandler(object):
     STATE_SOLVED = 2
     TIME_PATTERN = "%Y-%m-%dT%H:%M:%S.%fZ"
 
+    # Trap varbinds are kept under their oids
+    TRAP_SPEC = trap_parser.TrapSpec(
+        {oid: oid for oid in (OID_SEVERITY, OID_NODE, OID_COMPONENT,
+                              OID_SYMPTOMID, OID_SYMPTOMTEXT)})
+
     @staticmethod
     def parse_alert(context, alert):
+        alert = AlertHandler.TRAP_SPEC.map_oids(alert)
         try:
             alert_model = dict()
             alert_model['alert_id'] = alert.get(AlertHandler.OID_SYMPTOMID)
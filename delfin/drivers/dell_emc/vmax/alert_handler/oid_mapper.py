@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from delfin.drivers.utils import trap_parser
+
 
 class OidMapper(object):
     """Functions/attributes for oid to alert info mapper"""
@@ -29,18 +31,15 @@ class OidMapper(object):
                "1.3.6.1.4.1.1139.3.8888.3.0": "emcAsyncEventComponentType",
                "1.3.6.1.4.1.1139.3.8888.4.0": "emcAsyncEventComponentName"}
 
+    # Trap spec compiled once from the above map
+    TRAP_SPEC = trap_parser.TrapSpec(OID_MAP)
+
     def __init__(self):
         pass
 
     @staticmethod
     def map_oids(alert):
-        """Translate oids using static map."""
-        alert_model = dict()
-
-        for attr in alert:
-            # Remove the instance number at the end of oid before mapping
-            oid_str = attr.rsplit('.', 1)[0]
-            key = OidMapper.OID_MAP.get(oid_str, None)
-            alert_model[key] = alert[attr]
-
-        return alert_model
+        """Translate oids using static map, unknown oids are mapped to
+        None.
+        """
+        return OidMapper.TRAP_SPEC.map_oids(alert, keep_unknown=True)
@@ -16,10 +16,10 @@ from time import gmtime, strftime
 
 from oslo_log import log
 
-from delfin import exception
 from delfin.common import constants
 from delfin.drivers.dell_emc.vmax.alert_handler import alert_mapper
 from delfin.drivers.dell_emc.vmax.alert_handler import oid_mapper
+from delfin.drivers.utils import trap_parser
 
 LOG = log.getLogger(__name__)
 
@@ -50,17 +50,16 @@ class AlertHandler(object):
                                    'emcAsyncEventComponentName',
                                    'emcAsyncEventSource')
 
+    # Trap spec compiled once from the oid map and mandatory attributes
+    TRAP_SPEC = trap_parser.TrapSpec(oid_mapper.OidMapper.OID_MAP,
+                                     _mandatory_alert_attributes)
+
     @staticmethod
     def parse_alert(context, alert):
         """Parse alert data got from alert manager and fill the alert model."""
 
-        alert = oid_mapper.OidMapper.map_oids(alert)
-        # Check for mandatory alert attributes
-        for attr in AlertHandler._mandatory_alert_attributes:
-            if not alert.get(attr):
-                msg = "Mandatory information %s missing in alert message. " \
-                      % attr
-                raise exception.InvalidInput(msg)
+        # Map oids and check for mandatory alert attributes
+        alert = AlertHandler.TRAP_SPEC.parse(alert)
 
         alert_model = {}
 
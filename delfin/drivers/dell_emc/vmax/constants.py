@@ -17,6 +17,9 @@
 # minimum interval supported by VMAX
 VMAX_PERF_MIN_INTERVAL = 5
 
+# Number of concurrent requests used to get alert details
+ALERT_DETAIL_FETCH_WORKERS = 10
+
 BEDIRECTOR_METRICS = {
     'iops': 'IOs',
     'throughput': 'MBs',
@@ -17,6 +17,7 @@
 import json
 import sys
 
+import eventlet
 import requests
 import requests.auth
 import requests.exceptions as r_exc
@@ -1201,11 +1202,14 @@ class VMaxRest(object):
         # For each alert id, get details of alert
         # Above list is prefixed with 'alertId'
         alert_id_list = alert_id_list['alertId']
+        target_uris = ['/%s/system/symmetrix/%s/alert/%s'
+                       % (version, array, alert_id)
+                       for alert_id in alert_id_list]
+        # Details are fetched with one request per alert id, so issue
+        # them concurrently
+        pool = eventlet.GreenPool(constants.ALERT_DETAIL_FETCH_WORKERS)
         alert_list = []
-        for alert_id in alert_id_list:
-            target_uri = '/%s/system/symmetrix/%s/alert/%s' \
-                         % (version, array, alert_id)
-            alert = self.get_alert_request(target_uri)
+        for alert in pool.imap(self.get_alert_request, target_uris):
             if alert is not None and alert_util.is_alert_in_time_range(
                     query_para, alert['created_date_milliseconds']):
                 alert_list.append(alert)
@@ -15,6 +15,10 @@
 import six
 import abc
 
+import eventlet
+
+from delfin.common import constants
+
 
 @six.add_metaclass(abc.ABCMeta)
 class StorageDriver(object):
@@ -116,13 +120,39 @@ class StorageDriver(object):
         """Clear alert from storage system."""
         pass
 
+    def clear_alerts(self, context, sequence_numbers):
+        """Clear a batch of alerts from storage system."""
+        """
+        By default clear_alert() is called concurrently for each of the
+        sequence numbers. Drivers whose backend can clear several alerts
+        in one call should override it.
+
+        Response: Dictionary of sequence number to the result of clearing
+                  it, None on success or the exception raised on failure
+        Example:
+        {'79': None,
+         '80': InvalidResults('Unable to remove alert 80')}
+        """
+        def _clear(sequence_number):
+            try:
+                self.clear_alert(context, sequence_number)
+                return sequence_number, None
+            except Exception as e:
+                return sequence_number, e
+
+        pool = eventlet.GreenPool(constants.DEFAULT_CLEAR_ALERT_CONCURRENCY)
+        return dict(pool.imap(_clear, sequence_numbers))
+
     def collect_perf_metrics(self, context, storage_id,
                              resource_metrics, start_time, end_time):
         """Collect performance metrics from storage system."""
 
         """
         Input:
-        context: context information
+        context: context information, its optional collection_deadline
+                 attribute can be checked between backend calls by calling
+                 context.collection_deadline.check(), which raises
+                 CollectionDeadlineExceeded once the collection is cancelled
         storage_id: storage identifier
         resource_metrics: dictionary represents the collection configuration
         Example:
@@ -551,7 +551,10 @@ class FakeStorageDriver(driver.StorageDriver):
                              end_time):
         """Collects performance metric for the given interval"""
         merged_metrics = []
+        deadline = getattr(context, 'collection_deadline', None)
         for key in resource_metrics.keys():
+            if deadline:
+                deadline.check()
             m = self.get_resource_perf_metrics(storage_id,
                                                start_time,
                                                end_time, key,
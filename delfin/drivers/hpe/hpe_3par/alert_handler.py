@@ -11,14 +11,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import time
-
 import six
 from oslo_log import log as logging
 
 from delfin import exception
 from delfin.common import constants
 from delfin.drivers.hpe.hpe_3par import consts
+from delfin.drivers.utils import trap_parser
 from delfin.i18n import _
 
 LOG = logging.getLogger(__name__)
@@ -82,6 +81,11 @@ class AlertHandler(object):
         OID_COMPONENT
     )
 
+    # Trap varbinds are kept under their oids
+    TRAP_SPEC = trap_parser.TrapSpec(
+        {oid: oid for oid in _mandatory_alert_attributes},
+        _mandatory_alert_attributes)
+
     # Convert received time to epoch format
     TIME_PATTERN = '%Y-%m-%d %H:%M:%S'
 
@@ -93,11 +97,7 @@ class AlertHandler(object):
     def parse_alert(context, alert):
         """Parse alert data got from alert manager and fill the alert model."""
         # Check for mandatory alert attributes
-        for attr in AlertHandler._mandatory_alert_attributes:
-            if not alert.get(attr):
-                msg = "Mandatory information %s missing in alert message. " \
-                      % attr
-                raise exception.InvalidInput(msg)
+        alert = AlertHandler.TRAP_SPEC.parse(alert)
 
         try:
             alert_model = dict()
@@ -156,6 +156,30 @@ class AlertHandler(object):
             LOG.error(err_msg)
             raise exception.InvalidResults(err_msg)
 
+    def clear_alerts(self, context, alerts):
+        """Clear alerts from storage system in batches.
+           Alerts of a failed batch are removed one by one to get the
+           result of each of them.
+        """
+        results = {}
+        alerts = [alert for alert in alerts if alert]
+        for i in range(0, len(alerts), consts.REMOVE_ALERT_BATCH_SIZE):
+            batch = alerts[i:i + consts.REMOVE_ALERT_BATCH_SIZE]
+            try:
+                self.ssh_handler.remove_alerts_batch(batch)
+                LOG.info("Clear alerts %s successfully." % batch)
+                results.update(dict.fromkeys(batch))
+            except Exception as e:
+                LOG.warning("Remove alerts %s in batch failed: %s, remove "
+                            "them one by one" % (batch, six.text_type(e)))
+                for alert in batch:
+                    try:
+                        self.clear_alert(context, alert)
+                        results[alert] = None
+                    except Exception as e:
+                        results[alert] = e
+        return results
+
     @staticmethod
     def judge_alert_time(map, query_para):
         if len(map) <= 1:
@@ -241,10 +265,9 @@ class AlertHandler(object):
             if time_str:
                 if (len(time_str.split()) == 3):
                     time_str = time_str.rsplit(' ', 1)[0]
-                # Convert to time array first
-                time_array = time.strptime(time_str, AlertHandler.TIME_PATTERN)
                 # Convert to timestamps to milliseconds
-                time_stamp = int(time.mktime(time_array) * 1000)
+                time_stamp = trap_parser.parse_time(
+                    time_str, AlertHandler.TIME_PATTERN)
         except Exception as e:
             LOG.error(e)
 
@@ -32,6 +32,8 @@ THIN_LUNTYPE = 2  # TPVV 2	• TPVV,
 STATUS_COMPRESSION_YES = 1  # Compression is enabled on the volume
 # VOLUME's deduplication status
 STATUS_DEDUPLICATIONSTATE_YES = 1  # Enables deduplication on the volume
+# Maximum alert ids removed by one removealert command
+REMOVE_ALERT_BATCH_SIZE = 100
 # Page size per page at default paging
 QUERY_PAGE_SIZE = 150
 # Connection timeout
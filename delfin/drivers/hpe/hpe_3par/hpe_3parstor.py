@@ -96,6 +96,9 @@ class Hpe3parStorDriver(driver.StorageDriver):
     def clear_alert(self, context, alert):
         return self.alert_handler.clear_alert(context, alert)
 
+    def clear_alerts(self, context, sequence_numbers):
+        return self.alert_handler.clear_alerts(context, sequence_numbers)
+
     def list_filesystems(self, context):
         pass
 
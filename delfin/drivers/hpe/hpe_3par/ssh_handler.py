@@ -102,6 +102,21 @@ class SSHHandler(object):
                 raise exception.InvalidResults(six.text_type(res))
             LOG.warning("Alert %s doesn't exist.", alert_id)
 
+    def remove_alerts_batch(self, alert_ids):
+        """Clear several alerts from storage system with one removealert
+        command. Alerts which do not exist are treated as cleared.
+        """
+        alert_ids = [six.text_type(alert_id) for alert_id in alert_ids]
+        utils.check_ssh_injection(alert_ids)
+        command_str = SSHHandler.HPE3PAR_COMMAND_REMOVEALERT \
+            % ' '.join(alert_ids)
+        res = self.exec_command(command_str)
+        if res:
+            for line in res.splitlines():
+                if line.strip() and self.ALERT_NOT_EXIST_MSG not in line:
+                    raise exception.InvalidResults(six.text_type(res))
+            LOG.warning("Some of the alerts %s don't exist.", alert_ids)
+
     def get_controllers(self):
         para_map = {
             'command': 'parse_node_table'
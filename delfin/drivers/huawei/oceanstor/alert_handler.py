@@ -12,14 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from datetime import datetime
-
 from oslo_log import log
 
 from delfin import exception
 from delfin.common import alert_util
 from delfin.common import constants
 from delfin.drivers.huawei.oceanstor import oid_mapper
+from delfin.drivers.utils import trap_parser
 from delfin.i18n import _
 
 LOG = log.getLogger(__name__)
@@ -74,19 +73,17 @@ class AlertHandler(object):
                                    'hwIsmReportingAlarmFaultTime'
                                    )
 
+    # Trap spec compiled once from the oid map and mandatory attributes
+    TRAP_SPEC = trap_parser.TrapSpec(oid_mapper.OidMapper.OID_MAP,
+                                     _mandatory_alert_attributes)
+
     @staticmethod
     def parse_alert(context, alert):
         """Parse alert data and fill the alert model."""
-        # Check for mandatory alert attributes
-        alert = oid_mapper.OidMapper.map_oids(alert)
+        # Map oids and check for mandatory alert attributes
+        alert = AlertHandler.TRAP_SPEC.parse(alert)
         LOG.info("Get alert from storage: %s", alert)
 
-        for attr in AlertHandler._mandatory_alert_attributes:
-            if not alert.get(attr):
-                msg = "Mandatory information %s missing in alert message. " \
-                      % attr
-                raise exception.InvalidInput(msg)
-
         try:
             alert_model = dict()
             # These information are sourced from device registration info
@@ -103,22 +100,13 @@ class AlertHandler(object):
                 constants.EventType.NOT_SPECIFIED)
             alert_model['sequence_number'] \
                 = alert['hwIsmReportingAlarmSerialNo']
-            occur_time = datetime.strptime(
+            alert_model['occur_time'] = trap_parser.parse_time(
                 alert['hwIsmReportingAlarmFaultTime'],
                 AlertHandler.TIME_PATTERN)
-            alert_model['occur_time'] = int(occur_time.timestamp() * 1000)
-
-            description = alert['hwIsmReportingAlarmAdditionInfo']
-            if AlertHandler._is_hex(description):
-                description = bytes.fromhex(description[2:]).decode('ascii')
-            alert_model['description'] = description
-
-            recovery_advice = alert['hwIsmReportingAlarmRestoreAdvice']
-            if AlertHandler._is_hex(recovery_advice):
-                recovery_advice = bytes.fromhex(
-                    recovery_advice[2:]).decode('ascii')
-
-            alert_model['recovery_advice'] = recovery_advice
+            alert_model['description'] = trap_parser.decode_hex(
+                alert['hwIsmReportingAlarmAdditionInfo'])
+            alert_model['recovery_advice'] = trap_parser.decode_hex(
+                alert['hwIsmReportingAlarmRestoreAdvice'])
 
             alert_model['resource_type'] = constants.DEFAULT_RESOURCE_TYPE
             alert_model['location'] = 'Node code=' \
@@ -187,11 +175,3 @@ class AlertHandler(object):
         # Currently not implemented
         """Clear alert from storage system."""
         pass
-
-    @staticmethod
-    def _is_hex(value):
-        try:
-            int(value, 16)
-        except ValueError:
-            return False
-        return True
@@ -12,8 +12,6 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
-import time
-
 import paramiko
 import six
 from oslo_log import log as logging
@@ -21,6 +19,7 @@ from oslo_utils import units
 
 from delfin import exception, utils
 from delfin.common import constants, alert_util
+from delfin.drivers.utils import trap_parser
 from delfin.drivers.utils.ssh_client import SSHPool
 
 LOG = logging.getLogger(__name__)
@@ -50,6 +49,12 @@ class SSHHandler(object):
         'sas_direct': constants.DiskPhysicalType.SAS
     }
 
+    # Trap varbinds are kept under their oids
+    TRAP_SPEC = trap_parser.TrapSpec(
+        {oid: oid for oid in (OID_ERR_ID, OID_SEQ_NUMBER, OID_LAST_TIME,
+                              OID_OBJ_TYPE, OID_OBJ_NAME, OID_SEVERITY)})
+    TRAP_TIME_PATTERN = '%a %b %d %H:%M:%S %Y'
+
     SECONDS_TO_MS = 1000
     ALERT_NOT_FOUND_CODE = 'CMMVC8275E'
 
@@ -69,6 +74,7 @@ class SSHHandler(object):
 
     @staticmethod
     def parse_alert(alert):
+        alert = SSHHandler.TRAP_SPEC.map_oids(alert)
         try:
             alert_model = dict()
             alert_name = SSHHandler.handle_split(alert.get(
@@ -89,12 +95,8 @@ class SSHHandler(object):
                 handle_split(alert.get(SSHHandler.OID_SEQ_NUMBER), '=', 1)
             timestamp = SSHHandler. \
                 handle_split(alert.get(SSHHandler.OID_LAST_TIME), '=', 1)
-            time_type = '%a %b %d %H:%M:%S %Y'
-            occur_time = int(time.mktime(time.strptime(
-                timestamp,
-                time_type)))
-            alert_model['occur_time'] = int(occur_time * SSHHandler.
-                                            SECONDS_TO_MS)
+            alert_model['occur_time'] = trap_parser.parse_time(
+                timestamp, SSHHandler.TRAP_TIME_PATTERN)
             alert_model['description'] = alert_name
             alert_model['resource_type'] = SSHHandler.handle_split(
                 alert.get(SSHHandler.OID_OBJ_TYPE), '=', 1)
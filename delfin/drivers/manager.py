@@ -12,11 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import copy
 import six
 import stevedore
 import threading
+import time
 
+import eventlet
+from oslo_config import cfg
 from oslo_log import log
 
 from delfin import db
@@ -24,9 +28,33 @@ from delfin import exception
 from delfin import utils
 from delfin import ssl_utils
 
+CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
 
+class DriverSession(object):
+    """Usage and login counters of a cached driver instance."""
+
+    def __init__(self):
+        now = time.time()
+        self.logins = 1
+        self.last_login = now
+        self.last_used = now
+        # Number of calls running on the driver, it is not evicted
+        # while any of them is in progress
+        self.in_use = 0
+
+    def login(self):
+        self.logins += 1
+        self.last_login = time.time()
+
+    def to_dict(self):
+        return {'logins': self.logins,
+                'last_login': self.last_login,
+                'last_used': self.last_used,
+                'in_use': self.in_use}
+
+
 @six.add_metaclass(utils.Singleton)
 class DriverManager(stevedore.ExtensionManager):
     _instance_lock = threading.Lock()
@@ -38,6 +66,8 @@ class DriverManager(stevedore.ExtensionManager):
         # each of storage systems so that the session between driver
         # and storage system is effectively used.
         self.driver_factory = dict()
+        # Session counters of the drivers in driver_factory
+        self.driver_sessions = dict()
 
     def get_driver(self, context, invoke_on_load=True,
                    cache_on_load=True, **kwargs):
@@ -54,6 +84,17 @@ class DriverManager(stevedore.ExtensionManager):
         :type cache_on_load: bool
         :param kwargs: Parameters from access_info.
         """
+        if invoke_on_load and cache_on_load:
+            # Fast path for the calls on a registered storage, access info
+            # and CA path are only checked when the driver is created
+            storage_id = kwargs.get('storage_id')
+            driver = self.driver_factory.get(storage_id)
+            if driver is not None:
+                session = self.driver_sessions.get(storage_id)
+                if session:
+                    session.last_used = time.time()
+                return driver
+
         kwargs = copy.deepcopy(kwargs)
         kwargs['verify'] = False
         ca_path = ssl_utils.get_storage_ca_path()
@@ -66,17 +107,125 @@ class DriverManager(stevedore.ExtensionManager):
         else:
             return self._get_driver_obj(context, cache_on_load, **kwargs)
 
+    @contextlib.contextmanager
+    def use_driver(self, context, storage_id):
+        """Get the cached driver of a storage and mark its session in use
+        until the block exits, so that it is not evicted meanwhile.
+        """
+        driver = self.get_driver(context, storage_id=storage_id)
+        session = self.driver_sessions.get(storage_id)
+        if session:
+            session.in_use += 1
+        try:
+            yield driver
+        finally:
+            if session:
+                session.in_use -= 1
+                session.last_used = time.time()
+
     def update_driver(self, storage_id, driver):
         self.driver_factory[storage_id] = driver
+        self.driver_sessions[storage_id] = DriverSession()
 
     def remove_driver(self, storage_id):
         """Clear driver instance from driver factory."""
         self.driver_factory.pop(storage_id, None)
+        self.driver_sessions.pop(storage_id, None)
+
+    def evict_drivers(self):
+        """Close and remove the drivers idle for longer than
+        driver_idle_timeout, and the least recently used ones beyond
+        max_cached_drivers. Drivers in use are never evicted.
+        """
+        total = len(self.driver_sessions)
+        sessions = sorted([item for item in self.driver_sessions.items()
+                           if not item[1].in_use],
+                          key=lambda item: item[1].last_used)
+        evict_ids = []
+        idle_timeout = CONF.storage_driver.driver_idle_timeout
+        if idle_timeout > 0:
+            idle_before = time.time() - idle_timeout
+            evict_ids = [storage_id for storage_id, session in sessions
+                         if session.last_used < idle_before]
+        max_drivers = CONF.storage_driver.max_cached_drivers
+        if 0 < max_drivers < total - len(evict_ids):
+            evict_ids = [storage_id for storage_id, _ in
+                         sessions[:total - max_drivers]]
+
+        for storage_id in evict_ids:
+            driver = self.driver_factory.get(storage_id)
+            self.remove_driver(storage_id)
+            LOG.info("Evict driver of storage %s from cache.", storage_id)
+            self._close_driver(storage_id, driver)
+        return evict_ids
+
+    def refresh_sessions(self, context):
+        """Login again the drivers whose session is older than
+        session_refresh_interval, before it expires at backend.
+        """
+        interval = CONF.storage_driver.session_refresh_interval
+        if interval <= 0:
+            return []
+
+        login_before = time.time() - interval
+        refresh_ids = [storage_id for storage_id, session
+                       in list(self.driver_sessions.items())
+                       if session.last_login < login_before]
+        for storage_id in refresh_ids:
+            driver = self.driver_factory.get(storage_id)
+            session = self.driver_sessions.get(storage_id)
+            if not driver or not session:
+                continue
+            try:
+                access_info = db.access_info_get(
+                    context, storage_id).to_dict()
+                access_info['verify'] = \
+                    ssl_utils.get_storage_ca_path() or False
+                driver.reset_connection(context, **access_info)
+                session.login()
+            except Exception as e:
+                LOG.warning("Failed to refresh session of storage %s, "
+                            "reason is %s", storage_id, six.text_type(e))
+        return refresh_ids
+
+    def warm_up(self, context, storage_ids):
+        """Create drivers of the storages concurrently, so that the first
+        calls after service start do not login to each storage in series.
+        """
+        def _create(storage_id):
+            try:
+                self.get_driver(context, storage_id=storage_id)
+            except Exception as e:
+                LOG.warning("Failed to warm up driver of storage %s, "
+                            "reason is %s", storage_id, six.text_type(e))
+
+        pool = eventlet.GreenPool(
+            CONF.storage_driver.driver_warm_up_concurrency)
+        for _ in pool.imap(_create, storage_ids):
+            pass
+
+    def get_session_stats(self):
+        """Number of cached drivers and counters of each of them."""
+        sessions = dict(self.driver_sessions)
+        return {'open_sessions': len(sessions),
+                'sessions': {storage_id: session.to_dict()
+                             for storage_id, session in sessions.items()}}
+
+    @staticmethod
+    def _close_driver(storage_id, driver):
+        close_connection = getattr(driver, 'close_connection', None)
+        if not close_connection:
+            return
+        try:
+            close_connection()
+        except Exception as e:
+            LOG.warning("Failed to close connection of storage %s, "
+                        "reason is %s", storage_id, six.text_type(e))
 
     def _get_driver_obj(self, context, cache_on_load=True, **kwargs):
         if not cache_on_load or not kwargs.get('storage_id'):
             if kwargs['verify']:
-                ssl_utils.reload_certificate(kwargs['verify'])
+                ssl_utils.reload_certificate_if_changed(kwargs['verify'])
             cls = self._get_driver_cls(**kwargs)
             return cls(**kwargs)
 
@@ -88,7 +237,7 @@ class DriverManager(stevedore.ExtensionManager):
                 return self.driver_factory[kwargs['storage_id']]
 
             if kwargs['verify']:
-                ssl_utils.reload_certificate(kwargs['verify'])
+                ssl_utils.reload_certificate_if_changed(kwargs['verify'])
             access_info = copy.deepcopy(kwargs)
             storage_id = access_info.pop('storage_id')
             access_info.pop('verify')
@@ -102,7 +251,7 @@ class DriverManager(stevedore.ExtensionManager):
                 cls = self._get_driver_cls(**access_info)
                 driver = cls(**access_info)
 
-            self.driver_factory[storage_id] = driver
+            self.update_driver(storage_id, driver)
             return driver
 
     def _get_driver_cls(self, **kwargs):
@@ -0,0 +1,120 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import functools
+from datetime import datetime
+
+from oslo_log import log as logging
+
+from delfin import exception
+
+LOG = logging.getLogger(__name__)
+
+# Key of the attribute name stored in a trie node
+_NAME = None
+
+
+class TrapSpec(object):
+    """Declarative description of the varbinds a driver reads from a trap.
+
+    The OID to attribute name map is compiled once into a trie keyed by
+    OID components. A varbind OID resolves to the name of its longest
+    registered prefix, so OIDs may be registered with or without the
+    instance suffix. Resolved OIDs are memoized.
+    """
+
+    MAX_RESOLVED_OIDS = 4096
+
+    def __init__(self, oid_map, mandatory_attributes=()):
+        """
+        :param oid_map: Dictionary of trap OID to attribute name
+        :param mandatory_attributes: Attribute names which must be present
+            with non empty value in a trap
+        """
+        self.mandatory_attributes = tuple(mandatory_attributes)
+        self._trie = {}
+        for oid, name in oid_map.items():
+            node = self._trie
+            for part in oid.split('.'):
+                node = node.setdefault(part, {})
+            node[_NAME] = name
+        self._resolved = {}
+
+    def resolve(self, oid):
+        """Get the attribute name of a varbind OID, None if unknown."""
+        try:
+            return self._resolved[oid]
+        except KeyError:
+            pass
+
+        name = None
+        node = self._trie
+        for part in oid.split('.'):
+            node = node.get(part)
+            if node is None:
+                break
+            name = node.get(_NAME, name)
+
+        if len(self._resolved) >= self.MAX_RESOLVED_OIDS:
+            self._resolved.clear()
+        self._resolved[oid] = name
+        return name
+
+    def map_oids(self, alert, keep_unknown=False):
+        """Translate trap OIDs to attribute names, unknown OIDs are
+        dropped, or kept under the None key if keep_unknown.
+        """
+        alert_info = {}
+        for oid, value in alert.items():
+            name = self.resolve(oid)
+            if name is not None or keep_unknown:
+                alert_info[name] = value
+        return alert_info
+
+    def parse(self, alert):
+        """Translate trap OIDs and check the mandatory attributes."""
+        alert_info = self.map_oids(alert)
+        for attr in self.mandatory_attributes:
+            if not alert_info.get(attr):
+                msg = "Mandatory information %s missing in alert message. " \
+                      % attr
+                raise exception.InvalidInput(msg)
+        return alert_info
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_time(time_str, time_pattern):
+    """Convert a local time string to epoch time in milliseconds.
+
+    Results are cached as the traps of one burst mostly carry the same
+    time stamps.
+    """
+    occur_time = datetime.strptime(time_str, time_pattern)
+    return int(occur_time.timestamp() * 1000)
+
+
+def is_hex(value):
+    try:
+        int(value, 16)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def decode_hex(value):
+    """Decode '0x' prefixed hex string to ascii, other values are returned
+    as they are.
+    """
+    if is_hex(value):
+        return bytes.fromhex(value[2:]).decode('ascii')
+    return value
@@ -150,6 +150,10 @@ class AlertSourceNotFoundWithHost(NotFound):
     msg_fmt = _("Alert source could not be found with host {0}.")
 
 
+class AlertNotFound(NotFound):
+    msg_fmt = _("Alert {0} could not be found.")
+
+
 class SNMPConnectionFailed(BadRequest):
     msg_fmt = _("Connection to SNMP server failed: {0}")
 
@@ -158,6 +162,10 @@ class StorageNotFound(NotFound):
     msg_fmt = _("Storage {0} could not be found.")
 
 
+class StorageRegistrationNotFound(NotFound):
+    msg_fmt = _("Storage registration {0} could not be found.")
+
+
 class StorageBackendNotFound(NotFound):
     msg_fmt = _("Storage backend could not be found.")
 
@@ -378,6 +386,15 @@ class TelemetryTaskExecError(DelfinException):
     msg_fmt = _("Failure in telemetry task execution")
 
 
+class CollectionDeadlineExceeded(TelemetryTaskExecError):
+    msg_fmt = _("Performance collection of storage {0} exceeded deadline "
+                "of {1} seconds.")
+
+
+class ExportFailed(DelfinException):
+    msg_fmt = _("Failed to export data to {0}: {1}")
+
+
 class ComponentNotFound(NotFound):
     msg_fmt = _("Component {0} could not be found.")
 
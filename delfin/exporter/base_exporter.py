@@ -13,12 +13,18 @@
 # limitations under the License.
 
 
+import functools
+
+import eventlet
 from oslo_config import cfg
 from oslo_log import log
+from oslo_serialization import msgpackutils
 import six
 from stevedore import extension
 
 from delfin import exception
+from delfin.common import constants
+from delfin.exporter import spool
 from delfin.i18n import _
 
 LOG = log.getLogger(__name__)
@@ -30,6 +36,11 @@ exporter_opts = [
     cfg.ListOpt('performance_exporters',
                 default=['PerformanceExporterExample'],
                 help="Which exporters for performance push."),
+    cfg.DictOpt('performance_rollup_mode',
+                default={},
+                help="Performance metrics pushed to each exporter when "
+                     "rollup is enabled, as exporter:mode with mode raw, "
+                     "rollup or both. Raw if not set."),
 ]
 
 CONF = cfg.CONF
@@ -57,14 +68,53 @@ class BaseManager(BaseExporter):
         if not isinstance(data, (list, tuple)):
             data = [data]
         for exporter in self.exporters:
-            try:
-                exporter.dispatch(ctxt, data)
-            except exception.DelfinException as e:
-                err_msg = _("Failed to export data (%s).") % e.msg
-                LOG.exception(err_msg)
-            except Exception as e:
-                err_msg = six.text_type(e)
-                LOG.exception(err_msg)
+            self._dispatch(ctxt, exporter, data)
+
+    def _dispatch(self, ctxt, exporter, data):
+        try:
+            exporter.dispatch(ctxt, data)
+        except exception.DelfinException as e:
+            err_msg = _("Failed to export data (%s).") % e.msg
+            LOG.exception(err_msg)
+            self._spool(exporter, data)
+        except Exception as e:
+            err_msg = six.text_type(e)
+            LOG.exception(err_msg)
+            self._spool(exporter, data)
+        else:
+            self._replay(ctxt, exporter)
+
+    def _spool(self, exporter, data):
+        """Keep data failed to export in the spool of the exporter, it is
+        replayed once the exporter succeeds again.
+        """
+        exporter_spool = spool.get_spool(exporter.__class__.__name__)
+        if exporter_spool is None:
+            return
+        try:
+            exporter_spool.append(msgpackutils.dumps(self._encode(data)))
+        except Exception as e:
+            LOG.error("Failed to spool data of exporter %s, reason: %s",
+                      exporter.__class__.__name__, six.text_type(e))
+
+    def _replay(self, ctxt, exporter):
+        exporter_spool = spool.get_spool(exporter.__class__.__name__,
+                                         create=False)
+        if exporter_spool is None or not exporter_spool.pending:
+            return
+        eventlet.spawn_n(exporter_spool.replay,
+                         functools.partial(self._dispatch_record, ctxt,
+                                           exporter))
+
+    def _dispatch_record(self, ctxt, exporter, record):
+        exporter.dispatch(ctxt, self._decode(msgpackutils.loads(record)))
+
+    def _encode(self, data):
+        """Convert data to the types supported by spool records."""
+        return data
+
+    def _decode(self, data):
+        return data
 
     def _get_exporters(self):
         """Get exporters from configuration file which
@@ -102,3 +152,31 @@ class PerformanceExporterManager(BaseManager):
 
     def _get_configured_exporters(self):
         return CONF.performance_exporters
+
+    def dispatch(self, ctxt, data, rollups=None):
+        """Dispatch raw metrics, their rollups or both to each exporter
+        according to performance_rollup_mode.
+        """
+        if rollups is None:
+            return super(PerformanceExporterManager, self).dispatch(ctxt,
+                                                                    data)
+        modes = CONF.performance_rollup_mode
+        for exporter in self.exporters:
+            mode = modes.get(exporter.__class__.__name__, 'raw')
+            if mode == 'rollup':
+                exporter_data = rollups
+            elif mode == 'both':
+                exporter_data = list(data) + rollups
+            else:
+                exporter_data = data
+            self._dispatch(ctxt, exporter, exporter_data)
+
+    def _encode(self, data):
+        # Timestamp keys of metric values are not valid map keys of records
+        return [[metric.name, metric.labels, list(metric.values.items())]
+                for metric in data]
+
+    def _decode(self, data):
+        return [constants.metric_struct(name=name, labels=labels,
+                                        values=dict(values))
+                for name, labels, values in data]
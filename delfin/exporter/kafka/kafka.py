@@ -13,9 +13,14 @@
 # limitations under the License.
 
 import json
+
+import six
 from oslo_config import cfg
 from oslo_log import log
 from kafka import KafkaProducer
+from kafka.errors import KafkaError
+
+from delfin import exception
 
 """"
 The metrics received from driver is should be in this format
@@ -51,6 +56,9 @@ kafka_opts = [
                help='The kafka server IP'),
     cfg.StrOpt('kafka_port', default='9092',
                help='The kafka server port'),
+    cfg.IntOpt('kafka_send_timeout', default=30, min=1,
+               help='Time (in sec) to wait for the kafka server to '
+                    'acknowledge the data sent'),
 ]
 
 CONF.register_opts(kafka_opts, "KAFKA_EXPORTER")
@@ -64,8 +72,19 @@ class KafkaExporter(object):
         ip = kafka.kafka_ip
         port = kafka.kafka_port
         bootstrap_server = ip + ':' + port
-        producer = KafkaProducer(
-            bootstrap_servers=[bootstrap_server],
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'))
+        producer = None
+        try:
+            producer = KafkaProducer(
+                bootstrap_servers=[bootstrap_server],
+                value_serializer=lambda v: json.dumps(v).encode('utf-8'))
 
-        producer.send(topic, value=data)
+            # Sending is asynchronous, wait for the acknowledgement
+            producer.send(topic, value=data).get(
+                timeout=kafka.kafka_send_timeout)
+        except KafkaError as e:
+            LOG.error("Failed to send data to kafka server %s, reason: %s",
+                      bootstrap_server, six.text_type(e))
+            raise exception.ExportFailed(bootstrap_server, six.text_type(e))
+        finally:
+            if producer:
+                producer.close(timeout=kafka.kafka_send_timeout)
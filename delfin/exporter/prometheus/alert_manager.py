@@ -15,6 +15,8 @@ import requests
 from oslo_config import cfg
 from oslo_log import log
 
+from delfin import exception
+
 LOG = log.getLogger(__name__)
 CONF = cfg.CONF
 alert_mngr_opts = [
@@ -40,6 +42,7 @@ class PrometheusAlertExporter(object):
 
         host = alert_cfg.alert_manager_host
         port = alert_cfg.alert_manager_port
+        failed = False
         for alert in alerts:
             dict = {}
             dict["labels"] = {}
@@ -57,6 +60,11 @@ class PrometheusAlertExporter(object):
                 if response.status_code != 200:
                     LOG.error("POST request failed for alert %s ",
                               alert.get('alert_id'))
+                    failed = True
             except Exception:
                 LOG.error("Exporting alert to alert manager has been failed "
                           "for alert %s ", alert.get('alert_id'))
+                failed = True
+        if failed:
+            raise exception.ExportFailed(host + ':' + port,
+                                         'alert manager not available')
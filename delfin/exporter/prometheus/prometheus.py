@@ -19,6 +19,8 @@ import six
 from oslo_config import cfg
 from oslo_log import log
 
+from delfin import exception
+
 LOG = log.getLogger(__name__)
 
 grp = cfg.OptGroup('PROMETHEUS_EXPORTER')
@@ -101,7 +103,8 @@ class PrometheusExporter(object):
 
     def push_to_prometheus(self, storage_metrics):
         if not self.check_metrics_dir_exists(self.metrics_dir):
-            return
+            raise exception.ExportFailed(self.metrics_dir,
+                                         'metrics directory not available')
         try:
             self.clean_old_metric_files(self.metrics_dir)
         except Exception:
@@ -146,5 +149,7 @@ class PrometheusExporter(object):
             os.renames(temp_file_name, actual_file_name)
             LOG.info('A new metric file %s has been generated',
                      actual_file_name)
-        except Exception:
+        except Exception as e:
             LOG.error('Error while renaming the temporary metric file')
+            raise exception.ExportFailed(self.metrics_dir,
+                                         six.text_type(e))
@@ -0,0 +1,195 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import threading
+import time
+
+import six
+from oslo_config import cfg
+from oslo_log import log
+
+from delfin import utils
+from delfin.common import constants
+from delfin.exporter import watermark
+
+LOG = log.getLogger(__name__)
+
+FUNCTIONS = ('min', 'max', 'avg', 'last', 'sum')
+
+rollup_opts = [
+    cfg.ListOpt('performance_rollup_windows',
+                default=[],
+                help="Windows (in sec) performance metrics are rolled up "
+                     "over before export, no rollup if empty."),
+    cfg.ListOpt('performance_rollup_functions',
+                default=list(FUNCTIONS),
+                help="Rollup functions of performance metrics, among "
+                     "min, max, avg, last and sum."),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(rollup_opts)
+
+# Interval (in sec) at which windows of series no longer collected are
+# dropped
+PURGE_INTERVAL = 600
+
+
+def window_label(window):
+    """Suffix of the rollup metric names of a window in seconds."""
+    for unit, seconds in (('d', 86400), ('h', 3600), ('m', 60)):
+        if window % seconds == 0:
+            return '%d%s' % (window // seconds, unit)
+    return '%ds' % window
+
+
+class Window(object):
+    """Aggregates of the points of a series in a time window."""
+
+    __slots__ = ('bucket', 'count', 'min', 'max', 'sum', 'last',
+                 'last_time')
+
+    def __init__(self, bucket, times, values):
+        self.bucket = bucket
+        self.count = len(values)
+        self.min = min(values)
+        self.max = max(values)
+        self.sum = sum(values)
+        self.last = values[-1]
+        self.last_time = times[-1]
+
+    def merge(self, other):
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sum += other.sum
+        self.last = other.last
+        self.last_time = other.last_time
+
+    def get(self, function):
+        if function == 'avg':
+            return self.sum / self.count
+        return getattr(self, function)
+
+
+def _windows_of(points, window_ms):
+    """Group points sorted by time into the windows they fall in."""
+    for bucket, group in itertools.groupby(
+            points, key=lambda point: point[0] // window_ms):
+        times, values = zip(*group)
+        yield Window(bucket, times, values)
+
+
+@six.add_metaclass(utils.Singleton)
+class RollupEngine(object):
+    """Rollups of performance metrics over performance_rollup_windows.
+
+    Each function of performance_rollup_functions gives a metric named
+    <name>_<function>_<window>, with one point per window at its start
+    time. In streaming mode, the window still open at the end of the
+    collected points is kept and completed with the points of the next
+    collections, so a window is emitted once, after it is over.
+    """
+
+    def __init__(self):
+        # (series key, window) to the open window of the series
+        self.open_windows = dict()
+        self.lock = threading.Lock()
+        self.last_purge_time = time.time()
+
+    def process(self, metrics, end_time, streaming=True):
+        """Get the rollups of the metrics collected up to end_time, in
+        epoch milliseconds. Without streaming, rollups of all the windows
+        of the points, complete or not, are returned.
+        """
+        windows = sorted(set(int(window) for window in
+                             CONF.performance_rollup_windows))
+        functions = [function for function in
+                     CONF.performance_rollup_functions
+                     if function in FUNCTIONS]
+        rollups = []
+        with self.lock:
+            for metric in metrics:
+                if not metric.values:
+                    continue
+                points = sorted(metric.values.items())
+                key = watermark.series_key(metric) if streaming else None
+                for window in windows:
+                    closed = self._rollup(points, window, key, end_time)
+                    if closed:
+                        rollups.extend(self._metrics(metric, window,
+                                                     functions, closed))
+            if streaming:
+                self._purge(max(windows))
+        return rollups
+
+    def _rollup(self, points, window, key, end_time):
+        window_ms = window * 1000
+        if key is None:
+            return list(_windows_of(points, window_ms))
+
+        open_window = self.open_windows.get((key, window))
+        if open_window:
+            # Points already aggregated, by overlapping collections, or
+            # late for a window emitted already are skipped
+            points = [point for point in points
+                      if point[0] > open_window.last_time
+                      and point[0] // window_ms >= open_window.bucket]
+        closed = []
+        for current in _windows_of(points, window_ms):
+            if open_window and current.bucket == open_window.bucket:
+                open_window.merge(current)
+                continue
+            if open_window:
+                closed.append(open_window)
+            open_window = current
+        if open_window and (open_window.bucket + 1) * window_ms <= end_time:
+            closed.append(open_window)
+            open_window = None
+
+        if open_window:
+            self.open_windows[(key, window)] = open_window
+        else:
+            self.open_windows.pop((key, window), None)
+        return closed
+
+    @staticmethod
+    def _metrics(metric, window, functions, windows):
+        window_ms = window * 1000
+        label = window_label(window)
+        rollups = []
+        for function in functions:
+            values = {closed.bucket * window_ms: closed.get(function)
+                      for closed in windows}
+            rollups.append(constants.metric_struct(
+                name='%s_%s_%s' % (metric.name, function, label),
+                labels=metric.labels, values=values))
+        return rollups
+
+    def _purge(self, max_window):
+        """Drop the open windows of the series no longer collected."""
+        now = time.time()
+        if now - self.last_purge_time < PURGE_INTERVAL:
+            return
+        self.last_purge_time = now
+        oldest = (now - 2 * max_window -
+                  CONF.telemetry.performance_collection_interval) * 1000
+        stale = [key for key, open_window in self.open_windows.items()
+                 if open_window.last_time < oldest]
+        for key in stale:
+            del self.open_windows[key]
+        if stale:
+            LOG.debug("Dropped %d rollup windows of series no longer "
+                      "collected", len(stale))
@@ -0,0 +1,287 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import errno
+import mmap
+import os
+import struct
+import threading
+import time
+
+import six
+from oslo_config import cfg
+from oslo_log import log
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+spool_opts = [
+    cfg.StrOpt('spool_dir', default='/var/lib/delfin/spool',
+               help='The directory data failed to export is spooled to '
+                    'until the exporter recovers, spool is disabled if '
+                    'empty'),
+    cfg.IntOpt('segment_size', default=16,
+               help='Size (in MB) at which a spool segment is rotated'),
+    cfg.IntOpt('max_size', default=1024,
+               help='Maximum size (in MB) of the spool of an exporter, '
+                    'oldest segments are dropped beyond it'),
+    cfg.IntOpt('max_age', default=86400,
+               help='Time (in sec) after which spooled data is dropped'),
+    cfg.IntOpt('replay_rate', default=50,
+               help='Maximum number of spooled records exported per second '
+                    'on replay'),
+]
+
+CONF.register_opts(spool_opts, "EXPORTER_SPOOL")
+spool_cfg = CONF.EXPORTER_SPOOL
+
+# Length prefix of a record
+HEADER = struct.Struct('>I')
+
+OPEN_SUFFIX = '.open'
+SEGMENT_SUFFIX = '.seg'
+REPLAY_SUFFIX = '.replay-'
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
+
+
+def read_records(path, offset=0):
+    """Yield the records of a segment with the offset following them.
+
+    A record cut short by a crash while it was written ends the segment.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= offset:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            while offset + HEADER.size <= size:
+                length, = HEADER.unpack_from(m, offset)
+                end = offset + HEADER.size + length
+                if end > size:
+                    LOG.warning("Drop truncated record at %d of spool "
+                                "segment %s", offset, path)
+                    return
+                yield m[offset + HEADER.size:end], end
+                offset = end
+
+
+class Spool(object):
+    """Append-only local spool of the data an exporter failed to export.
+
+    Records are length prefixed and appended to a segment, which is
+    rotated at segment_size. Segments are named after their creation time
+    and the process writing them, and are claimed by renaming them before
+    replay, so that processes sharing the directory never write or replay
+    the same segment. Replay is at least once, a segment is removed only
+    after all its records are exported.
+    """
+
+    def __init__(self, path, segment_size=None, max_size=None,
+                 max_age=None):
+        self.path = path
+        self.segment_size = segment_size or \
+            spool_cfg.segment_size * 1024 * 1024
+        self.max_size = max_size or spool_cfg.max_size * 1024 * 1024
+        self.max_age = max_age or spool_cfg.max_age
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.replay_lock = threading.Lock()
+        self.active = None
+        self.active_path = None
+        self.active_size = 0
+        self.last_stamp = 0
+        # Offset of the next record of the segments being replayed
+        self.offsets = dict()
+        if not os.path.exists(path):
+            os.makedirs(path)
+        self._recover()
+        self.pending = bool(self._segments())
+
+    def append(self, record):
+        with self.lock:
+            if self.active is None or \
+                    self.active_size >= self.segment_size:
+                self._rotate()
+            self.active.write(HEADER.pack(len(record)) + record)
+            self.active.flush()
+            self.active_size += HEADER.size + len(record)
+            self.pending = True
+
+    def replay(self, dispatch, rate=None):
+        """Pass spooled records to dispatch oldest first, at most rate
+        records per second. Stop at the first record dispatch raises for,
+        which is replayed first next time.
+
+        Returns the number of records replayed.
+        """
+        if not self.replay_lock.acquire(False):
+            return 0
+        try:
+            rate = rate or spool_cfg.replay_rate
+            with self.lock:
+                self._seal()
+            self._enforce_limits()
+            start = time.time()
+            count = 0
+            while True:
+                segment = self._claim()
+                if segment is None:
+                    self.pending = False
+                    return count
+                for record, offset in read_records(
+                        segment, self.offsets.get(segment, 0)):
+                    delay = start + count / rate - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                    try:
+                        dispatch(record)
+                    except Exception as e:
+                        LOG.warning("Stop replay of spool %s, reason: %s",
+                                    self.path, six.text_type(e))
+                        return count
+                    self.offsets[segment] = offset
+                    count += 1
+                self.offsets.pop(segment, None)
+                os.remove(segment)
+        finally:
+            self.replay_lock.release()
+
+    def size(self):
+        return sum(size for _, size, _ in self._stat_segments())
+
+    def _segments(self, suffix=None):
+        names = sorted(os.listdir(self.path))
+        if suffix:
+            names = [name for name in names if name.endswith(suffix)]
+        return [os.path.join(self.path, name) for name in names]
+
+    def _stat_segments(self):
+        stats = []
+        for segment in self._segments():
+            try:
+                stat = os.stat(segment)
+            except OSError:
+                # Removed by another process
+                continue
+            stats.append((segment, stat.st_size, stat.st_mtime))
+        return stats
+
+    def _rotate(self):
+        self._seal()
+        # Segment names sort by creation time
+        self.last_stamp = max(int(time.time() * 1e9), self.last_stamp + 1)
+        name = '%020d-%d' % (self.last_stamp, self.pid)
+        self.active_path = os.path.join(self.path, name + OPEN_SUFFIX)
+        self.active = open(self.active_path, 'ab')
+        self.active_size = 0
+        self._enforce_limits()
+
+    def _seal(self):
+        if self.active is None:
+            return
+        self.active.close()
+        os.rename(self.active_path,
+                  self.active_path[:-len(OPEN_SUFFIX)] + SEGMENT_SUFFIX)
+        self.active = None
+        self.active_path = None
+
+    def _claim(self):
+        """Get the oldest segment to replay, segments already claimed by
+        this process come first.
+        """
+        claimed = self._segments(REPLAY_SUFFIX + str(self.pid))
+        if claimed:
+            return claimed[0]
+        for segment in self._segments(SEGMENT_SUFFIX):
+            replay_path = segment[:-len(SEGMENT_SUFFIX)] + \
+                REPLAY_SUFFIX + str(self.pid)
+            try:
+                os.rename(segment, replay_path)
+            except OSError:
+                # Claimed by another process
+                continue
+            return replay_path
+        return None
+
+    def _recover(self):
+        """Release segments left by the processes no longer running."""
+        for segment in self._segments():
+            base, name = os.path.split(segment)
+            if name.endswith(OPEN_SUFFIX):
+                pid = name[:-len(OPEN_SUFFIX)].rsplit('-', 1)[-1]
+                key = name[:-len(OPEN_SUFFIX)]
+            elif REPLAY_SUFFIX in name:
+                key, pid = name.split(REPLAY_SUFFIX)
+            else:
+                continue
+            if int(pid) == self.pid or not _is_alive(int(pid)):
+                try:
+                    os.rename(segment,
+                              os.path.join(base, key + SEGMENT_SUFFIX))
+                except OSError:
+                    continue
+
+    def _enforce_limits(self):
+        """Drop the sealed segments older than max_age, and the oldest
+        ones beyond max_size.
+        """
+        stats = self._stat_segments()
+        total_size = sum(size for _, size, _ in stats)
+        oldest = time.time() - self.max_age
+        for segment, size, mtime in stats:
+            if not segment.endswith(SEGMENT_SUFFIX):
+                continue
+            if mtime >= oldest and total_size <= self.max_size:
+                break
+            try:
+                os.remove(segment)
+            except OSError:
+                continue
+            total_size -= size
+            LOG.warning("Dropped spool segment %s of %d bytes, spool is "
+                        "beyond its size or age limit", segment, size)
+
+
+_spools = dict()
+_spools_lock = threading.Lock()
+
+
+def get_spool(name, create=True):
+    """Get the spool of an exporter, None if spool is disabled or not
+    available. With create False, it is None unless the spool is already
+    on disk.
+    """
+    spool = _spools.get(name)
+    if spool is not None or name in _spools or not spool_cfg.spool_dir:
+        return spool
+    path = os.path.join(spool_cfg.spool_dir, name)
+    if not create and not os.path.isdir(path):
+        return None
+    with _spools_lock:
+        if name not in _spools:
+            try:
+                _spools[name] = Spool(path)
+            except (IOError, OSError) as e:
+                # Not retried, data of the exporter is not spooled
+                LOG.error("Failed to open spool of exporter %s, reason: %s",
+                          name, six.text_type(e))
+                _spools[name] = None
+    return _spools[name]
@@ -0,0 +1,188 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compressed chunk of the points of a series.
+
+Timestamps are encoded as delta of delta and values as XOR with the
+previous value, as described in "Gorilla: A Fast, Scalable, In-Memory
+Time Series Database". Points collected at a regular interval take about
+2 bits for the timestamp and a few bits for a slowly changing value.
+"""
+
+import struct
+
+COUNT = struct.Struct('>H')
+FLOAT = struct.Struct('>d')
+UINT64 = struct.Struct('>Q')
+
+# Control bits and width of the delta of delta buckets
+DOD_BUCKETS = ((0b10, 2, 7), (0b110, 3, 12), (0b1110, 4, 20))
+MAX_POINTS = 0xffff
+
+
+class BitWriter(object):
+    """Writes bits into a bytearray, keeping the bits of the last byte
+    until it is complete.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.bits = 0
+        self.length = 0
+
+    def write(self, bits, width):
+        self.bits = (self.bits << width) | (bits & ((1 << width) - 1))
+        self.length += width
+        if self.length >= 8:
+            remaining = self.length % 8
+            self.data += (self.bits >> remaining).to_bytes(
+                self.length // 8, 'big')
+            self.bits &= (1 << remaining) - 1
+            self.length = remaining
+
+    def to_bytes(self):
+        if not self.length:
+            return bytes(self.data)
+        return bytes(self.data) + bytes(
+            (self.bits << (8 - self.length),))
+
+
+class BitReader(object):
+    """Reads bits from bytes, from the bytes holding them only."""
+
+    def __init__(self, data):
+        self.data = bytes(data)
+        self.length = len(self.data) * 8
+        self.position = 0
+
+    def read(self, width):
+        start = self.position
+        end = start + width
+        if end > self.length:
+            raise ValueError("Chunk is truncated")
+        self.position = end
+        last = (end + 7) // 8
+        value = int.from_bytes(self.data[start // 8:last], 'big')
+        return (value >> (last * 8 - end)) & ((1 << width) - 1)
+
+    def read_bit(self):
+        position = self.position
+        if position >= self.length:
+            raise ValueError("Chunk is truncated")
+        self.position = position + 1
+        return (self.data[position // 8] >> (7 - position % 8)) & 1
+
+
+def _float_bits(value):
+    return UINT64.unpack(FLOAT.pack(float(value)))[0]
+
+
+def _float_value(bits):
+    return FLOAT.unpack(UINT64.pack(bits))[0]
+
+
+def _write_dod(writer, dod):
+    if dod == 0:
+        writer.write(0, 1)
+        return
+    for control, control_width, width in DOD_BUCKETS:
+        if -(1 << (width - 1)) <= dod < (1 << (width - 1)):
+            writer.write(control, control_width)
+            writer.write(dod, width)
+            return
+    writer.write(0b1111, 4)
+    writer.write(dod, 64)
+
+
+def _read_dod(reader):
+    if not reader.read_bit():
+        return 0
+    for _, _, width in DOD_BUCKETS:
+        if not reader.read_bit():
+            return _signed(reader.read(width), width)
+    return _signed(reader.read(64), 64)
+
+
+def _signed(value, width):
+    if value >= 1 << (width - 1):
+        value -= 1 << width
+    return value
+
+
+def encode(points):
+    """Encode points, a list of (timestamp, value) sorted by timestamp,
+    timestamps being epoch time in milliseconds.
+    """
+    if len(points) > MAX_POINTS:
+        raise ValueError("Too many points in a chunk")
+    writer = BitWriter()
+    previous_time = previous_delta = 0
+    previous_bits = 0
+    leading = trailing = None
+    for index, (timestamp, value) in enumerate(points):
+        bits = _float_bits(value)
+        if index == 0:
+            writer.write(timestamp, 64)
+            writer.write(bits, 64)
+        else:
+            delta = timestamp - previous_time
+            _write_dod(writer, delta - previous_delta)
+            previous_delta = delta
+
+            xor = bits ^ previous_bits
+            if xor == 0:
+                writer.write(0, 1)
+            else:
+                writer.write(1, 1)
+                current_leading = min(64 - xor.bit_length(), 31)
+                current_trailing = (xor & -xor).bit_length() - 1
+                if leading is not None and current_leading >= leading \
+                        and current_trailing >= trailing:
+                    # Meaningful bits fit in the previous window
+                    writer.write(0, 1)
+                    writer.write(xor >> trailing, 64 - leading - trailing)
+                else:
+                    leading, trailing = current_leading, current_trailing
+                    significant = 64 - leading - trailing
+                    writer.write(1, 1)
+                    writer.write(leading, 5)
+                    writer.write(significant - 1, 6)
+                    writer.write(xor >> trailing, significant)
+        previous_time = timestamp
+        previous_bits = bits
+    return COUNT.pack(len(points)) + writer.to_bytes()
+
+
+def decode(data):
+    """Decode a chunk into a list of (timestamp, value)."""
+    count, = COUNT.unpack_from(data)
+    reader = BitReader(data[COUNT.size:])
+    points = []
+    timestamp = delta = 0
+    bits = 0
+    leading = trailing = 0
+    for index in range(count):
+        if index == 0:
+            timestamp = reader.read(64)
+            bits = reader.read(64)
+        else:
+            delta += _read_dod(reader)
+            timestamp += delta
+            if reader.read_bit():
+                if reader.read_bit():
+                    leading = reader.read(5)
+                    significant = reader.read(6) + 1
+                    trailing = 64 - leading - significant
+                bits ^= reader.read(64 - leading - trailing) << trailing
+        points.append((timestamp, _float_value(bits)))
+    return points
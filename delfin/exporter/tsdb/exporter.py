@@ -0,0 +1,28 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from delfin.exporter import base_exporter
+from delfin.exporter.tsdb import store
+
+_store = store.TimeSeriesStore()
+
+
+def remove_storage(storage_id):
+    """Remove the performance metrics stored of a storage removed."""
+    _store.remove_storage(storage_id)
+
+
+class PerformanceExporterTSDB(base_exporter.BaseExporter):
+    def dispatch(self, ctxt, data):
+        _store.append(data)
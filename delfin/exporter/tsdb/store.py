@@ -0,0 +1,282 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import json
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+
+import six
+from oslo_config import cfg
+from oslo_log import log
+
+from delfin.exporter.tsdb import chunk
+from delfin.exporter import watermark
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+tsdb_opts = [
+    cfg.StrOpt('data_dir', default='/var/lib/delfin/tsdb',
+               help='The directory performance metrics are stored in'),
+    cfg.IntOpt('block_duration', default=7200,
+               help='Time range (in sec) of the metrics of a storage '
+                    'stored in one block file'),
+    cfg.IntOpt('retention', default=7 * 86400,
+               help='Time (in sec) performance metrics are kept'),
+]
+
+CONF.register_opts(tsdb_opts, "TSDB_EXPORTER")
+tsdb_cfg = CONF.TSDB_EXPORTER
+
+# Record length, min and max timestamp of the chunk, and series key
+RECORD = struct.Struct('>IqqQ')
+# Record length and series key of the name and labels of a series
+INDEX_RECORD = struct.Struct('>IQ')
+BLOCK_SUFFIX = '.blk'
+INDEX_SUFFIX = '.idx'
+# Interval (in sec) at which blocks beyond retention are removed
+RETENTION_CHECK_INTERVAL = 3600
+
+
+def downsample(points, step):
+    """Average points, sorted by timestamp, over windows of step
+    milliseconds, a window is at its start time.
+    """
+    result = []
+    bucket = total = count = None
+    for timestamp, value in points:
+        current = timestamp - timestamp % step
+        if current != bucket:
+            if count:
+                result.append((bucket, total / count))
+            bucket, total, count = current, 0.0, 0
+        total += value
+        count += 1
+    if count:
+        result.append((bucket, total / count))
+    return result
+
+
+def _read_records(path, record):
+    """Yield the fields following the length of the records of a file,
+    with the data of the record.
+    """
+    try:
+        f = open(path, 'rb')
+    except (IOError, OSError):
+        return
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            offset = 0
+            while offset + record.size <= size:
+                fields = record.unpack_from(m, offset)
+                end = offset + 4 + fields[0]
+                if end > size:
+                    # Record being written
+                    return
+                data = m[offset + record.size:end]
+                yield fields[1:] if len(fields) > 2 else fields[1], data
+                offset = end
+
+
+class TimeSeriesStore(object):
+    """Local store of the performance metrics of storages.
+
+    Metrics of a storage are kept in one block file per block_duration.
+    Each record of a block is a compressed chunk of the points of a
+    series, appended as metrics are exported, and prefixed with its time
+    range and series key. Name and labels of the series are written once
+    per block, to the index file of the block. Queries look up the series
+    in the index, read the blocks of the time range through mmap, and
+    decode only the chunks of the series and time range asked for. Blocks
+    older than retention are removed.
+
+    A storage is expected to be collected by one process at a time, which
+    is the only one appending to its blocks.
+    """
+
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or tsdb_cfg.data_dir
+        self.lock = threading.Lock()
+        self.last_retention_check = 0
+        # Keys of the series in the index of a block, by storage and block
+        self.indexed = dict()
+
+    def append(self, metrics):
+        """Add performance metrics, grouped by storage and block."""
+        block_ms = tsdb_cfg.block_duration * 1000
+        records = collections.defaultdict(list)
+        series = dict()
+        for metric in metrics:
+            storage_id = metric.labels.get('storage_id')
+            if not storage_id or not metric.values:
+                continue
+            key = watermark.series_key(metric)
+            series[key] = metric
+            points = sorted(metric.values.items())
+            start = 0
+            while start < len(points):
+                block = points[start][0] - points[start][0] % block_ms
+                end = start
+                while end < len(points) and \
+                        points[end][0] < block + block_ms and \
+                        end - start < chunk.MAX_POINTS:
+                    end += 1
+                data = chunk.encode(points[start:end])
+                records[(storage_id, block)].append(
+                    (key, RECORD.pack(RECORD.size - 4 + len(data),
+                                      points[start][0], points[end - 1][0],
+                                      key) + data))
+                start = end
+
+        with self.lock:
+            for (storage_id, block), block_records in records.items():
+                path = self._block_path(storage_id, block)
+                if not os.path.exists(os.path.dirname(path)):
+                    os.makedirs(os.path.dirname(path))
+                indexed = self._get_indexed(storage_id, block)
+                index_records = []
+                for key, _ in block_records:
+                    if key not in indexed:
+                        indexed.add(key)
+                        header = json.dumps(
+                            {'name': series[key].name,
+                             'labels': series[key].labels}).encode()
+                        index_records.append(INDEX_RECORD.pack(
+                            INDEX_RECORD.size - 4 + len(header), key) +
+                            header)
+                # Series are indexed before their chunks are written, and
+                # each file is written once, so readers see whole records
+                if index_records:
+                    with open(path[:-len(BLOCK_SUFFIX)] + INDEX_SUFFIX,
+                              'ab') as f:
+                        f.write(b''.join(index_records))
+                with open(path, 'ab') as f:
+                    f.write(b''.join(record for _, record in block_records))
+        self._apply_retention()
+
+    def query(self, storage_id, name, start_time, end_time,
+              resource_type=None, resource_id=None, step=None):
+        """Get the points of the series of a metric of a storage within
+        start_time and end_time, in epoch milliseconds, averaged over step
+        milliseconds if given.
+
+        Returns a list of (labels, [(timestamp, value), ...]).
+        """
+        series = collections.OrderedDict()
+        for path in self._block_paths(storage_id, start_time, end_time):
+            keys = dict()
+            for key, header in _read_records(
+                    path[:-len(BLOCK_SUFFIX)] + INDEX_SUFFIX, INDEX_RECORD):
+                header = json.loads(header.decode())
+                labels = header['labels']
+                if header['name'] != name or \
+                        (resource_type and
+                         labels.get('resource_type') != resource_type) or \
+                        (resource_id and
+                         labels.get('resource_id') != resource_id):
+                    continue
+                keys[key] = labels
+            if not keys:
+                continue
+
+            for (min_time, max_time, key), data in \
+                    _read_records(path, RECORD):
+                if key not in keys or min_time > end_time or \
+                        max_time < start_time:
+                    continue
+                if key not in series:
+                    series[key] = (keys[key], dict())
+                # Points collected again by overlapping collections are
+                # stored more than once
+                series[key][1].update(
+                    point for point in chunk.decode(data)
+                    if start_time <= point[0] <= end_time)
+
+        result = []
+        for labels, values in series.values():
+            points = sorted(values.items())
+            if step:
+                points = downsample(points, step)
+            result.append((labels, points))
+        return result
+
+    def remove_storage(self, storage_id):
+        with self.lock:
+            for key in [key for key in self.indexed
+                        if key[0] == storage_id]:
+                del self.indexed[key]
+        shutil.rmtree(os.path.join(self.data_dir, storage_id),
+                      ignore_errors=True)
+
+    def _block_path(self, storage_id, block):
+        return os.path.join(self.data_dir, storage_id,
+                            '%d%s' % (block, BLOCK_SUFFIX))
+
+    def _blocks(self, storage_id):
+        try:
+            names = os.listdir(os.path.join(self.data_dir, storage_id))
+        except OSError:
+            return []
+        return sorted(int(name[:-len(BLOCK_SUFFIX)]) for name in names
+                      if name.endswith(BLOCK_SUFFIX))
+
+    def _block_paths(self, storage_id, start_time, end_time):
+        block_ms = tsdb_cfg.block_duration * 1000
+        return [self._block_path(storage_id, block)
+                for block in self._blocks(storage_id)
+                if block + block_ms > start_time and block <= end_time]
+
+    def _get_indexed(self, storage_id, block):
+        indexed = self.indexed.get((storage_id, block))
+        if indexed is None:
+            # Index written before restart
+            path = self._block_path(storage_id, block)
+            indexed = set(key for key, _ in _read_records(
+                path[:-len(BLOCK_SUFFIX)] + INDEX_SUFFIX, INDEX_RECORD))
+            self.indexed[(storage_id, block)] = indexed
+        return indexed
+
+    def _apply_retention(self):
+        now = time.time()
+        if now - self.last_retention_check < RETENTION_CHECK_INTERVAL:
+            return
+        self.last_retention_check = now
+        oldest = (now - tsdb_cfg.retention -
+                  tsdb_cfg.block_duration) * 1000
+        try:
+            storage_ids = os.listdir(self.data_dir)
+        except OSError:
+            return
+        for storage_id in storage_ids:
+            for block in self._blocks(storage_id):
+                if block >= oldest:
+                    break
+                self.indexed.pop((storage_id, block), None)
+                path = self._block_path(storage_id, block)
+                try:
+                    os.remove(path[:-len(BLOCK_SUFFIX)] + INDEX_SUFFIX)
+                    os.remove(path)
+                except OSError as e:
+                    LOG.warning("Failed to remove metrics block %d of "
+                                "storage %s, reason: %s", block,
+                                storage_id, six.text_type(e))
@@ -0,0 +1,143 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import six
+from oslo_concurrency import lockutils
+from oslo_config import cfg
+from oslo_log import log
+
+from delfin import utils
+from delfin.common import constants
+
+CONF = cfg.CONF
+LOG = log.getLogger(__name__)
+
+
+def series_key(metric):
+    """64 bit hash of the metric name and labels identifying a series."""
+    series = repr((metric.name, sorted(metric.labels.items())))
+    return int.from_bytes(
+        hashlib.blake2b(series.encode(), digest_size=8).digest(), 'big')
+
+
+@six.add_metaclass(utils.Singleton)
+class WatermarkStore(object):
+    """Last exported timestamp of each performance metric series.
+
+    Collection windows overlap by performance_timestamp_overlap, and
+    history collection on reschedule fetches again up to
+    performance_history_on_reschedule, points up to the watermark of their
+    series are dropped before export. Watermarks are saved to
+    export_watermark_file, when set, so that they survive restarts. The
+    file is shared by the metrics processes of the host, each merges its
+    watermarks with the ones saved by the others.
+    """
+
+    def __init__(self):
+        self.watermarks = dict()
+        self.lock = threading.Lock()
+        self.path = CONF.telemetry.export_watermark_file
+        self.last_save_time = time.time()
+        self.changed = False
+        if self.path:
+            self._load()
+
+    def filter(self, metrics):
+        """Drop the points exported before.
+
+        Returns the metrics having new points, and the watermarks to be
+        committed once they are exported.
+        """
+        new_metrics = []
+        watermarks = dict()
+        for metric in metrics:
+            key = series_key(metric)
+            watermark = self.watermarks.get(key)
+            values = metric.values
+            if watermark is not None:
+                values = {timestamp: value
+                          for timestamp, value in values.items()
+                          if timestamp > watermark}
+            if not values:
+                continue
+            new_metrics.append(constants.metric_struct(
+                name=metric.name, labels=metric.labels, values=values))
+            watermarks[key] = max(max(values), watermarks.get(key, 0))
+        return new_metrics, watermarks
+
+    def commit(self, watermarks):
+        with self.lock:
+            for key, timestamp in watermarks.items():
+                if timestamp > self.watermarks.get(key, 0):
+                    self.watermarks[key] = timestamp
+                    self.changed = True
+        if self.path and self.changed and time.time() - \
+                self.last_save_time >= \
+                CONF.telemetry.export_watermark_save_interval:
+            self.save()
+
+    def save(self):
+        """Write watermarks to file, merged with the ones saved by other
+        processes, watermarks older than export_watermark_ttl are dropped.
+        """
+        now = time.time()
+        oldest = (now - CONF.telemetry.export_watermark_ttl) * 1000
+        with self.lock:
+            self.watermarks = {key: timestamp for key, timestamp
+                               in self.watermarks.items()
+                               if timestamp >= oldest}
+            watermarks = dict(self.watermarks)
+            self.changed = False
+            self.last_save_time = now
+
+        # Processes sharing the file save one at a time, each through its
+        # own temporary file
+        tmp_path = '%s.%d.tmp' % (self.path, os.getpid())
+        try:
+            with lockutils.lock('export-watermarks', 'delfin-',
+                                external=True, lock_path=os.path.dirname(
+                                    os.path.abspath(self.path))):
+                for key, timestamp in self._read().items():
+                    if timestamp >= oldest and \
+                            timestamp > watermarks.get(key, 0):
+                        watermarks[key] = timestamp
+                with open(tmp_path, 'w') as f:
+                    json.dump({'%x' % key: timestamp for key, timestamp
+                               in watermarks.items()}, f)
+                os.replace(tmp_path, self.path)
+        except (IOError, OSError) as e:
+            LOG.error("Failed to save export watermarks to %s, reason: %s",
+                      self.path, six.text_type(e))
+
+    def _load(self):
+        self.watermarks = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                watermarks = json.load(f)
+            return {int(key, 16): timestamp
+                    for key, timestamp in watermarks.items()}
+        except (IOError, OSError):
+            LOG.info("No export watermarks loaded from %s", self.path)
+        except ValueError as e:
+            LOG.warning("Ignore export watermarks in %s, reason: %s",
+                        self.path, six.text_type(e))
+        return {}
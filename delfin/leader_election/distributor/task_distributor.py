@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 
 import six
 from oslo_config import cfg
@@ -25,15 +26,62 @@ CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
 
+def get_task_load(task):
+    """Collection load of a task, the time its collections take per second
+    of interval, None if it is not measured yet.
+    """
+    if not task.get('collection_cost') or not task.get('interval'):
+        return None
+    return task['collection_cost'] / task['interval']
+
+
 class TaskDistributor(object):
-    def __init__(self, ctx):
+    def __init__(self, ctx, tasks=None):
+        """Tasks not deleted, if already fetched, give the loads of the
+        nodes, otherwise they are read from DB when a job is distributed.
+        """
         self.ctx = ctx
         self.task_rpcapi = task_rpcapi.TaskAPI()
+        self.tasks = tasks
+        # Task id to load and node of the tasks, and load of the nodes
+        self.task_loads = None
+        self.executor_loads = None
+        self.partitioner = None
+
+    def get_task_executor(self, task_id):
+        """Get the node of a task, by its load and the loads of the nodes
+        once its collection cost is measured.
+        """
+        if self.task_loads is None:
+            self._load_tasks()
+        load, origin = self.task_loads.get(task_id, (None, None))
+        if load and origin:
+            self.executor_loads[origin] -= load
+        if self.partitioner is None:
+            self.partitioner = ConsistentHashing()
+            self.partitioner.start()
+        executor = self.partitioner.get_task_executor(task_id, load,
+                                                      self.executor_loads)
+        if load:
+            self.executor_loads[executor] += load
+            self.task_loads[task_id] = (load, executor)
+        return executor
+
+    def _load_tasks(self):
+        tasks = self.tasks
+        if tasks is None:
+            tasks = db.task_get_all(self.ctx, filters={'deleted': False})
+        self.task_loads = dict()
+        self.executor_loads = collections.defaultdict(float)
+        for task in tasks:
+            load = get_task_load(task)
+            if load and task['executor']:
+                self.task_loads[task['id']] = (load, task['executor'])
+                self.executor_loads[task['executor']] += load
 
-    def distribute_new_job(self, task_id):
-        partitioner = ConsistentHashing()
-        partitioner.start()
-        executor = partitioner.get_task_executor(task_id)
+    def distribute_new_job(self, task_id, executor=None):
+        if not executor:
+            executor = self.get_task_executor(task_id)
         try:
             db.task_update(self.ctx, task_id, {'executor': executor})
             LOG.info('Distribute a new job, id: %s' % task_id)
@@ -25,6 +25,10 @@ LOG = log.getLogger(__name__)
 CONF = cfg.CONF
 FILE = 'configs.json'
 
+# Modification time of each CA directory when its certificates were last
+# loaded
+_ca_path_mtimes = dict()
+
 
 def get_storage_ca_path():
     return CONF.storage_driver.ca_path
@@ -76,6 +80,26 @@ def reload_certificate(ca_path):
                 _load_cert(fpath, file, ca_path)
 
 
+def reload_certificate_if_changed(ca_path):
+    """
+    Reload the certificates of ca_path only when the directory changed
+    since they were last loaded. Adding, removing or renaming a file
+    updates the modification time of the directory, so a stat of it is
+    enough to detect new certificates.
+    """
+    try:
+        mtime = os.stat(ca_path).st_mtime_ns
+    except OSError:
+        LOG.error("Directory {0} could not be found.".format(ca_path))
+        raise exception.InvalidCAPath(ca_path)
+    if _ca_path_mtimes.get(ca_path) == mtime:
+        return
+
+    reload_certificate(ca_path)
+    # Links created by the reload change the directory as well
+    _ca_path_mtimes[ca_path] = os.stat(ca_path).st_mtime_ns
+
+
 def get_host_name_ignore_adapter():
     return HostNameIgnoreAdapter()
 
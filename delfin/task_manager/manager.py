@@ -16,31 +16,95 @@
 **periodical task manager**
 
 """
+import eventlet
+from oslo_config import cfg
 from oslo_log import log
+from oslo_service import periodic_task
 from oslo_utils import importutils
 
+from delfin.common import constants
+from delfin import context
+from delfin import db
 from delfin import manager
 from delfin.drivers import manager as driver_manager
-from delfin.task_manager.tasks import alerts, telemetry
+from delfin.exporter.tsdb import exporter as tsdb_exporter
+from delfin.task_manager import sync_admission
+from delfin.task_manager.tasks import alerts, resources, telemetry
 
+CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
 
 class TaskManager(manager.Manager):
     """manage periodical tasks"""
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.1'
 
     def __init__(self, service_name=None, *args, **kwargs):
         self.alert_task = alerts.AlertSyncTask()
         self.telemetry_task = telemetry.TelemetryTask()
+        self.sync_admission = sync_admission.SyncAdmissionController(
+            self._sync_storage_resource)
         super(TaskManager, self).__init__(*args, **kwargs)
 
-    def sync_storage_resource(self, context, storage_id, resource_task):
+    def init_host(self):
+        if CONF.storage_driver.warm_up_drivers:
+            eventlet.spawn_n(self._warm_up_drivers)
+
+    def _warm_up_drivers(self):
+        ctxt = context.get_admin_context()
+        try:
+            storage_ids = [storage['id'] for storage in
+                           db.storage_get_all(ctxt)]
+        except Exception as e:
+            LOG.warning('Failed to get storages for driver warm up, '
+                        'reason is %s', e)
+            return
+        LOG.info('Warm up drivers of %d storages', len(storage_ids))
+        driver_manager.DriverManager().warm_up(ctxt, storage_ids)
+
+    @periodic_task.periodic_task(spacing=300)
+    def driver_session_maintenance(self, ctxt):
+        """Periodical task to evict idle drivers and renew sessions."""
+        drivers = driver_manager.DriverManager()
+        drivers.evict_drivers()
+        drivers.refresh_sessions(ctxt)
+        stats = drivers.get_session_stats()
+        LOG.debug('Driver sessions open: %d, logins: %s',
+                  stats['open_sessions'],
+                  {storage_id: session['logins'] for storage_id, session
+                   in stats['sessions'].items()})
+
+    @periodic_task.periodic_task(spacing=60)
+    def resource_sync_stats(self, ctxt):
+        """Periodical task to report the queue and results of resource
+        syncs.
+        """
+        stats = self.sync_admission.get_stats()
+        LOG.info('Resource syncs queued: %s, running: %d, admitted: %d, '
+                 'collapsed: %d, wait time avg: %.1fs, max: %.1fs, '
+                 'oldest queued: %.1fs', stats['queued'], stats['running'],
+                 stats['admitted'], stats['collapsed'],
+                 stats['wait_time_avg'], stats['wait_time_max'],
+                 stats['oldest_wait_time'])
+        stats = resources.get_sync_stats()
+        LOG.info('Resource syncs run: %d, unchanged: %d, resource writes '
+                 'avoided: %d', stats.get('syncs', 0),
+                 stats.get('unchanged_syncs', 0),
+                 stats.get('writes_avoided', 0))
+
+    def sync_storage_resource(self, context, storage_id, resource_task,
+                              priority=constants.SyncPriority.USER):
         LOG.debug("Received the sync_storage task: {0} request for storage"
                   " id:{1}".format(resource_task, storage_id))
+        self.sync_admission.submit(context, storage_id, resource_task,
+                                   priority)
+
+    def _sync_storage_resource(self, context, storage_id, resource_task,
+                               priority):
         cls = importutils.import_class(resource_task)
         device_obj = cls(context, storage_id)
+        device_obj.periodic = priority == constants.SyncPriority.PERIODIC
         device_obj.sync()
 
     def remove_storage_resource(self, context, storage_id, resource_task):
@@ -53,6 +117,9 @@ class TaskManager(manager.Manager):
                  .format(storage_id))
         drivers = driver_manager.DriverManager()
         drivers.remove_driver(storage_id)
+        self.sync_admission.remove_storage(storage_id)
+        self.alert_task.remove_watermark(storage_id)
+        tsdb_exporter.remove_storage(storage_id)
 
     def sync_storage_alerts(self, context, storage_id, query_para):
         LOG.info('Alert sync called for storage id:{0}'
@@ -15,6 +15,7 @@
 periodical task manager for metric collection tasks**
 """
 from apscheduler.schedulers.background import BackgroundScheduler
+import collections
 import datetime
 import six
 
@@ -29,6 +30,8 @@ from delfin import db
 from delfin import exception
 from delfin import manager
 from delfin import service
+from delfin.leader_election.distributor.task_distributor import \
+    get_task_load
 from delfin.task_manager.scheduler import schedule_manager
 from delfin.task_manager import subprocess_rpcapi as rpcapi
 from delfin.task_manager.scheduler.schedulers.telemetry.job_handler \
@@ -59,6 +62,9 @@ class MetricsTaskManager(manager.Manager):
         self.scheduler = None
         self.rpcapi = rpcapi.SubprocessAPI()
         self.executor_map = {}
+        # Local executor of a storage, and collection load of a storage
+        self.storage_executors = {}
+        self.storage_loads = {}
         self.enable_sub_process = CONF.telemetry.enable_dynamic_subprocess
         if self.enable_sub_process:
             self.scheduler = BackgroundScheduler()
@@ -83,14 +89,14 @@ class MetricsTaskManager(manager.Manager):
         else:
             job = db.task_get(context, task_id)
             storage_id = job['storage_id']
-            for name in self.executor_map.keys():
-                if storage_id in self.executor_map[name]["storages"]:
-                    local_executor = "{0}:{1}".format(executor, name)
-                    self.rpcapi.remove_job_local(
-                        context, task_id, local_executor)
-                    tasks, failed_tasks = self.get_all_tasks(storage_id)
-                    if len(failed_tasks) == 0 and len(tasks) == 0:
-                        self.stop_executor(name, local_executor, storage_id)
+            name = self.storage_executors.get(storage_id)
+            if name:
+                local_executor = "{0}:{1}".format(executor, name)
+                self.rpcapi.remove_job_local(
+                    context, task_id, local_executor)
+                tasks, failed_tasks = self.get_all_tasks(storage_id)
+                if len(failed_tasks) == 0 and len(tasks) == 0:
+                    self.stop_executor(name, local_executor, storage_id)
 
     def assign_failed_job(self, context, failed_task_id, executor):
         if not self.enable_sub_process:
@@ -112,14 +118,14 @@ class MetricsTaskManager(manager.Manager):
         else:
             job = db.failed_task_get(context, failed_task_id)
             storage_id = job['storage_id']
-            for name in self.executor_map.keys():
-                if storage_id in self.executor_map[name]["storages"]:
-                    local_executor = "{0}:{1}".format(executor, name)
-                    self.rpcapi.remove_failed_job_local(
-                        context, failed_task_id, local_executor)
-                    tasks, failed_tasks = self.get_all_tasks(storage_id)
-                    if len(failed_tasks) == 0 and len(tasks) == 0:
-                        self.stop_executor(name, local_executor, storage_id)
+            name = self.storage_executors.get(storage_id)
+            if name:
+                local_executor = "{0}:{1}".format(executor, name)
+                self.rpcapi.remove_failed_job_local(
+                    context, failed_task_id, local_executor)
+                tasks, failed_tasks = self.get_all_tasks(storage_id)
+                if len(failed_tasks) == 0 and len(tasks) == 0:
+                    self.stop_executor(name, local_executor, storage_id)
 
     def schedule_boot_jobs(self, executor):
         """Schedule periodic collection if any task is currently assigned to
@@ -235,6 +241,129 @@ class MetricsTaskManager(manager.Manager):
             self.executor_map[name]["launcher"].stop()
             self.executor_map.pop(name)
 
+        self.rebalance_executors()
+
+    def rebalance_executors(self):
+        """Move a storage off each local executor whose collection load
+        exceeds max_collection_load_in_child by more than
+        placement_imbalance_threshold. Loads are refreshed from the
+        collection cost measured by the local executors.
+        """
+        if not self.group:
+            return
+        filters = {'executor': self.group,
+                   'deleted': False}
+        context = ctxt.get_admin_context()
+        loads = collections.defaultdict(float)
+        for task in db.task_get_all(context, filters=filters):
+            load = get_task_load(task)
+            if load:
+                loads[task['storage_id']] += load
+        self.storage_loads.update(loads)
+
+        capacity = CONF.telemetry.max_collection_load_in_child
+        limit = capacity * (1 + CONF.telemetry.placement_imbalance_threshold)
+        for name in list(self.executor_map.keys()):
+            storages = self.executor_map[name]["storages"]
+            load = self.get_executor_load(name)
+            if load <= limit or len(storages) < 2:
+                continue
+            # Lightest storage bringing the executor back to capacity, or
+            # the heaviest one, others are moved in next rounds if needed
+            candidates = sorted(storages, key=self.get_storage_load)
+            storage_id = candidates[-1]
+            for candidate in candidates:
+                if load - self.get_storage_load(candidate) <= capacity:
+                    storage_id = candidate
+                    break
+            self.move_storage(context, storage_id, name)
+
+    def move_storage(self, context, storage_id, name):
+        """Move the jobs of a storage from a local executor to another."""
+        target = self.select_local_executor(storage_id, exclude=name)
+        if not target:
+            target = self.create_local_executor(self.group)
+            if not target:
+                return
+        source_topic = "{0}:{1}".format(self.group, name)
+        target_topic = "{0}:{1}".format(self.group, target)
+        LOG.info("Move storage {0} with collection load {1:.3f} from local "
+                 "executor {2} to {3}"
+                 .format(storage_id, self.get_storage_load(storage_id),
+                         source_topic, target_topic))
+        tasks, failed_tasks = self.get_all_tasks(storage_id)
+        for task in tasks:
+            self.rpcapi.remove_job_local(context, task['id'], source_topic)
+        for f_task in failed_tasks:
+            self.rpcapi.remove_failed_job_local(context, f_task['id'],
+                                                source_topic)
+        self.executor_map[name]["storages"].discard(storage_id)
+        self.executor_map[target]["storages"].add(storage_id)
+        self.storage_executors[storage_id] = target
+        for task in tasks:
+            self.rpcapi.assign_job_local(context, task['id'], target_topic)
+        for f_task in failed_tasks:
+            self.rpcapi.assign_failed_job_local(context, f_task['id'],
+                                                target_topic)
+
+    def get_storage_load(self, storage_id):
+        """Measured collection load of a storage, a storage not measured
+        yet counts as max_storages_in_child of them fill a local executor.
+        """
+        load = self.storage_loads.get(storage_id)
+        if load is None:
+            load = CONF.telemetry.max_collection_load_in_child / \
+                CONF.telemetry.max_storages_in_child
+        return load
+
+    def get_executor_load(self, name):
+        return sum(self.get_storage_load(storage_id)
+                   for storage_id in self.executor_map[name]["storages"])
+
+    def select_local_executor(self, storage_id, exclude=None):
+        """Get the local executor the storage fits best, the one with
+        least collection load left once the storage is added, None if it
+        fits in none.
+        """
+        capacity = CONF.telemetry.max_collection_load_in_child
+        load = self.get_storage_load(storage_id)
+        selected = None
+        selected_room = None
+        for name, local_executor in self.executor_map.items():
+            no_of_storages = len(local_executor["storages"])
+            # Executors left with no storage are being cleaned up
+            if name == exclude or not no_of_storages or \
+                    no_of_storages >= CONF.telemetry.max_storages_in_child:
+                continue
+            room = capacity - self.get_executor_load(name) - load
+            # Loads adding up to capacity fit despite rounding
+            if room < -1e-9:
+                continue
+            if selected is None or room < selected_room:
+                selected = name
+                selected_room = room
+        return selected
+
+    def create_local_executor(self, executor):
+        """Launch a local executor, None if max_childs_in_node are
+        running.
+        """
+        for index in range(CONF.telemetry.max_childs_in_node):
+            name = "executor_{0}".format(index + 1)
+            if name not in self.executor_map:
+                executor_topic = "{0}:{1}".format(executor, name)
+                LOG.info("Create a new local executor {0}"
+                         .format(executor_topic))
+                launcher = self.create_process(
+                    topic=executor_topic, host=executor)
+                self.executor_map[name] = {
+                    "storages": set(),
+                    "launcher": launcher,
+                    "cleanup_delay": 0
+                }
+                return name
+        return None
+
     def create_process(self, topic=None, host=None):
         metrics_task_server = service. \
             MetricsService.create(binary='delfin-task',
@@ -250,11 +379,13 @@ class MetricsTaskManager(manager.Manager):
         return launcher
 
     def get_local_executor(self, context, task_id, failed_task_id, executor):
-        executor_names = self.executor_map.keys()
         storage_id = None
         if task_id:
             job = db.task_get(context, task_id)
             storage_id = job['storage_id']
+            load = get_task_load(job)
+            if load:
+                self.storage_loads[storage_id] = load
         elif failed_task_id:
             job = db.failed_task_get(context, failed_task_id)
             storage_id = job['storage_id']
@@ -262,37 +393,22 @@ class MetricsTaskManager(manager.Manager):
             raise exception.InvalidInput("Missing task id")
 
         # Storage already exists
-        for name in executor_names:
-            executor_topic = "{0}:{1}".format(executor, name)
-            if storage_id in self.executor_map[name]["storages"]:
-                return executor_topic
+        name = self.storage_executors.get(storage_id)
+        if name:
+            return "{0}:{1}".format(executor, name)
 
         # Return existing executor_topic
-        for name in executor_names:
-            no_of_storages = len(self.executor_map[name]["storages"])
-            if no_of_storages and (no_of_storages <
-                                   CONF.telemetry.max_storages_in_child):
-                executor_topic = "{0}:{1}".format(executor, name)
-                LOG.info("Selecting existing local executor {0} for {1}"
-                         .format(executor_topic, storage_id))
-                self.executor_map[name]["storages"].append(storage_id)
-                return executor_topic
-
-        # Return executor_topic after creating one
-        for index in range(CONF.telemetry.max_childs_in_node):
-            name = "executor_{0}".format(index + 1)
-            if name not in executor_names:
-                executor_topic = "{0}:{1}".format(executor, name)
-                LOG.info("Create a new local executor {0} for {1}"
-                         .format(executor_topic, storage_id))
-                launcher = self.create_process(
-                    topic=executor_topic, host=executor)
-                self.executor_map[name] = {
-                    "storages": [storage_id],
-                    "launcher": launcher,
-                    "cleanup_delay": 0
-                }
-                return executor_topic
+        name = self.select_local_executor(storage_id)
+        if name:
+            LOG.info("Selecting existing local executor {0}:{1} for {2}"
+                     .format(executor, name, storage_id))
+        else:
+            # Return executor_topic after creating one
+            name = self.create_local_executor(executor)
+        if name:
+            self.executor_map[name]["storages"].add(storage_id)
+            self.storage_executors[storage_id] = name
+            return "{0}:{1}".format(executor, name)
 
         msg = "Reached maximum number of ({0}) local executors". \
             format(CONF.telemetry.max_childs_in_node)
@@ -310,8 +426,9 @@ class MetricsTaskManager(manager.Manager):
     def stop_executor(self, name, local_executor, storage_id):
         LOG.info("Stop and remove local executor {0}"
                  .format(local_executor))
-        if storage_id in self.executor_map[name]["storages"]:
-            self.executor_map[name]["storages"].remove(storage_id)
+        self.executor_map[name]["storages"].discard(storage_id)
+        self.storage_executors.pop(storage_id, None)
+        self.storage_loads.pop(storage_id, None)
         self.executor_map[name]["cleanup_delay"] = \
             CONF.telemetry.task_cleanup_delay
 
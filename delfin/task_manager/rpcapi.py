@@ -19,9 +19,18 @@ Client side of the task manager RPC API.
 import oslo_messaging as messaging
 from oslo_config import cfg
 
+from delfin.common import constants
 from delfin import rpc
 
+task_rpcapi_opts = [
+    cfg.StrOpt('task_rpc_version_cap',
+               help='Maximum version of the messages sent to the task '
+                    'services, the version of the oldest task service '
+                    'while they are upgraded'),
+]
+
 CONF = cfg.CONF
+CONF.register_opts(task_rpcapi_opts)
 
 
 class TaskAPI(object):
@@ -30,22 +39,30 @@ class TaskAPI(object):
     API version history:
 
         1.0 - Initial version.
+        1.1 - Add priority to sync_storage_resource.
     """
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.1'
 
     def __init__(self):
         super(TaskAPI, self).__init__()
         target = messaging.Target(topic=CONF.delfin_task_topic,
                                   version=self.RPC_API_VERSION)
-        self.client = rpc.get_client(target, version_cap=self.RPC_API_VERSION)
-
-    def sync_storage_resource(self, context, storage_id, resource_task):
-        call_context = self.client.prepare(version='1.0')
-        return call_context.cast(context,
-                                 'sync_storage_resource',
-                                 storage_id=storage_id,
-                                 resource_task=resource_task)
+        self.client = rpc.get_client(
+            target,
+            version_cap=CONF.task_rpc_version_cap or self.RPC_API_VERSION)
+
+    def sync_storage_resource(self, context, storage_id, resource_task,
+                              priority=constants.SyncPriority.USER):
+        kwargs = {'storage_id': storage_id,
+                  'resource_task': resource_task}
+        version = '1.0'
+        # Task services older than 1.1 sync at user priority
+        if self.client.can_send_version('1.1'):
+            version = '1.1'
+            kwargs['priority'] = priority
+        call_context = self.client.prepare(version=version)
+        return call_context.cast(context, 'sync_storage_resource', **kwargs)
 
     def collect_telemetry(self, context, storage_id, telemetry_task, args,
                           start_time, end_time):
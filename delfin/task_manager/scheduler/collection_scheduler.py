@@ -0,0 +1,216 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent import futures
+from datetime import datetime
+
+import six
+from apscheduler.jobstores.base import JobLookupError
+from oslo_config import cfg
+from oslo_log import log
+from oslo_utils import uuidutils
+
+CONF = cfg.CONF
+LOG = log.getLogger(__name__)
+
+TIME_PATTERN = '%Y-%m-%d %H:%M:%S'
+
+
+class CollectionJob(object):
+    """A periodic job of CollectionScheduler."""
+
+    def __init__(self, job_id, func, interval, next_run_time,
+                 misfire_grace_time=None):
+        self.id = job_id
+        self.func = func
+        self.interval = interval
+        self.next_run_time = next_run_time
+        self.misfire_grace_time = misfire_grace_time
+        self.running = False
+        self.removed = False
+
+
+class CollectionScheduler(object):
+    """Scheduler for the periodic collection jobs of an executor.
+
+    Jobs are kept in a heap ordered by next run time, removed jobs are
+    only marked and dropped when they reach the top of the heap, so that
+    add is O(log n) and get and remove are O(1). A single timer thread
+    pops the due jobs and hands them to a worker pool, which starts
+    threads on demand up to collection_scheduler_workers.
+
+    A run is skipped when the previous run of the job is still going on,
+    or when it is later than misfire_grace_time of the job. It supports
+    the subset of APScheduler interface used by the job handlers.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or \
+            CONF.telemetry.collection_scheduler_workers
+        self.jobs = dict()
+        self.heap = []
+        # Tie breaker of the jobs having the same run time
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.executor = None
+        self.timer = None
+        self.running = False
+        self.stats = {'runs': 0, 'skipped': 0, 'misfired': 0,
+                      'total_jitter': 0.0, 'max_jitter': 0.0}
+        self.stats_lock = threading.Lock()
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=self.max_workers)
+        self.timer = threading.Thread(target=self._run,
+                                      name='collection-scheduler')
+        self.timer.daemon = True
+        self.timer.start()
+
+    def shutdown(self, wait=True):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.timer:
+            self.timer.join()
+        if self.executor:
+            self.executor.shutdown(wait=wait)
+
+    def add_job(self, func, trigger='interval', seconds=None,
+                next_run_time=None, id=None, misfire_grace_time=None,
+                **kwargs):
+        if trigger != 'interval' or not seconds:
+            raise ValueError("Only interval jobs are supported")
+
+        job_id = id or uuidutils.generate_uuid()
+        if next_run_time is None:
+            next_run_time = time.time() + seconds
+        else:
+            next_run_time = self._to_timestamp(next_run_time)
+        job = CollectionJob(job_id, func, seconds, next_run_time,
+                            misfire_grace_time)
+        with self.condition:
+            existing = self.jobs.get(job_id)
+            if existing:
+                existing.removed = True
+            self.jobs[job_id] = job
+            self._push(job)
+            if self.heap[0][2] is job:
+                # Wake up the timer as job is due before others
+                self.condition.notify()
+        return job
+
+    def get_job(self, job_id):
+        return self.jobs.get(job_id)
+
+    def get_jobs(self):
+        return list(self.jobs.values())
+
+    def remove_job(self, job_id):
+        with self.condition:
+            job = self.jobs.pop(job_id, None)
+        if not job:
+            raise JobLookupError(job_id)
+        job.removed = True
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['jobs'] = len(self.jobs)
+        stats['average_jitter'] = \
+            stats['total_jitter'] / stats['runs'] if stats['runs'] else 0
+        return stats
+
+    def _push(self, job):
+        heapq.heappush(self.heap,
+                       (job.next_run_time, next(self.sequence), job))
+
+    def _pop_due_jobs(self, now):
+        due_jobs = []
+        while self.heap and self.heap[0][0] <= now:
+            run_time, _, job = heapq.heappop(self.heap)
+            if job.removed:
+                continue
+            due_jobs.append((job, run_time))
+            # Next run is based on planned time so that it does not drift,
+            # runs missed are not caught up
+            missed = int((now - run_time) // job.interval)
+            job.next_run_time = run_time + (missed + 1) * job.interval
+            self._push(job)
+        return due_jobs
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if not self.running:
+                    return
+                now = time.time()
+                due_jobs = self._pop_due_jobs(now)
+                if not due_jobs:
+                    timeout = self.heap[0][0] - now if self.heap else None
+                    self.condition.wait(timeout)
+                    continue
+
+            for job, run_time in due_jobs:
+                self._submit(job, run_time, now)
+
+    def _submit(self, job, run_time, now):
+        if job.misfire_grace_time is not None and \
+                now - run_time > job.misfire_grace_time:
+            self.stats['misfired'] += 1
+            LOG.warning("Run of job %s at %s missed by %.1f seconds",
+                        job.id, datetime.fromtimestamp(run_time),
+                        now - run_time)
+            return
+        if job.running:
+            self.stats['skipped'] += 1
+            LOG.warning("Skip run of job %s as previous run is still "
+                        "going on", job.id)
+            return
+
+        job.running = True
+        try:
+            self.executor.submit(self._run_job, job, run_time)
+        except Exception:
+            job.running = False
+            raise
+
+    def _run_job(self, job, run_time):
+        jitter = max(time.time() - run_time, 0)
+        with self.stats_lock:
+            self.stats['runs'] += 1
+            self.stats['total_jitter'] += jitter
+            if jitter > self.stats['max_jitter']:
+                self.stats['max_jitter'] = jitter
+        try:
+            job.func()
+        except Exception as e:
+            LOG.error("Failed to run job %s, reason: %s", job.id,
+                      six.text_type(e))
+        finally:
+            job.running = False
+
+    @staticmethod
+    def _to_timestamp(run_time):
+        if isinstance(run_time, six.string_types):
+            run_time = datetime.strptime(run_time, TIME_PATTERN)
+        if isinstance(run_time, datetime):
+            return run_time.timestamp()
+        return float(run_time)
@@ -0,0 +1,105 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import time
+
+from oslo_config import cfg
+from oslo_config import types
+from oslo_log import log
+
+from delfin.common import constants
+from delfin import context
+from delfin import db
+from delfin.task_manager import rpcapi as task_rpcapi
+from delfin.task_manager.tasks import resources
+
+LOG = log.getLogger(__name__)
+
+resource_sync_opts = [
+    cfg.IntOpt('resource_sync_interval',
+               default=3600,
+               min=0,
+               help='Interval in seconds of the periodic sync of the '
+                    'resources of every storage, 0 to disable'),
+    cfg.Opt('resource_sync_intervals',
+            type=types.Dict(value_type=types.Integer(min=0)),
+            default={},
+            help='Interval in seconds of the periodic sync of a resource, '
+                 'by the name of its resource task, in place of '
+                 'resource_sync_interval, for example '
+                 'StorageVolumeTask:600,StorageDiskTask:86400, 0 to '
+                 'disable'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(resource_sync_opts)
+
+
+class ResourceSyncScheduler(object):
+    """Request the periodic syncs of resources that are due, run by the
+    leader so that each sync is requested once.
+    """
+
+    def __init__(self):
+        self.ctx = context.get_admin_context()
+        self.task_rpcapi = task_rpcapi.TaskAPI()
+        # (storage id, resource task) -> time the next sync is due
+        self.next_sync_times = {}
+        # Intervals are validated by their option type when read
+        names = set(subclass.__name__ for subclass
+                    in resources.StorageResourceTask.__subclasses__())
+        for name in CONF.resource_sync_intervals:
+            if name not in names:
+                LOG.warning('Ignore resource_sync_intervals of %s, which is '
+                            'not a resource task', name)
+
+    @staticmethod
+    def get_interval(resource_task):
+        name = resource_task.rsplit('.', 1)[-1]
+        return CONF.resource_sync_intervals.get(
+            name, CONF.resource_sync_interval)
+
+    def schedule(self):
+        try:
+            storages = db.storage_get_all(self.ctx)
+        except Exception as e:
+            LOG.warning('Failed to get storages for periodic resource sync, '
+                        'reason is %s', e)
+            return
+
+        now = time.time()
+        next_sync_times = {}
+        for storage in storages:
+            for subclass in resources.StorageResourceTask.__subclasses__():
+                resource_task = subclass.__module__ + '.' + subclass.__name__
+                interval = self.get_interval(resource_task)
+                if not interval:
+                    continue
+                key = (storage['id'], resource_task)
+                next_sync_time = self.next_sync_times.get(key)
+                if next_sync_time is None:
+                    # Spread the first syncs over the interval
+                    next_sync_time = now + random.uniform(0, interval)
+                elif next_sync_time <= now:
+                    next_sync_time = now + interval
+                    if (storage['sync_status']
+                            == constants.SyncStatus.SYNCED):
+                        # Not while a sync requested by the user runs
+                        self.task_rpcapi.sync_storage_resource(
+                            self.ctx, storage['id'], resource_task,
+                            constants.SyncPriority.PERIODIC)
+                next_sync_times[key] = next_sync_time
+        # Storages removed are dropped
+        self.next_sync_times = next_sync_times
@@ -16,6 +16,7 @@ from datetime import datetime
 
 import six
 from apscheduler.schedulers.background import BackgroundScheduler
+from oslo_config import cfg
 from oslo_log import log
 from oslo_utils import uuidutils
 
@@ -27,7 +28,10 @@ from delfin.coordination import ConsistentHashing
 from delfin.leader_election.distributor.task_distributor \
     import TaskDistributor
 from delfin.task_manager import metrics_rpcapi as task_rpcapi
+from delfin.task_manager.scheduler import collection_scheduler
+from delfin.task_manager.scheduler import resource_sync_scheduler
 
+CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
 
@@ -35,21 +39,30 @@ LOG = log.getLogger(__name__)
 class SchedulerManager(object):
 
     GROUP_CHANGE_DETECT_INTERVAL_SEC = 30
+    RESOURCE_SYNC_CHECK_INTERVAL_SEC = 60
 
     def __init__(self, scheduler=None):
         if not scheduler:
             scheduler = BackgroundScheduler()
         self.scheduler = scheduler
+        if CONF.telemetry.collection_scheduler == 'apscheduler':
+            self.collection_scheduler = scheduler
+        else:
+            self.collection_scheduler = \
+                collection_scheduler.CollectionScheduler()
         self.scheduler_started = False
         self.ctx = context.get_admin_context()
         self.task_rpcapi = task_rpcapi.TaskAPI()
         self.watch_job_id = None
+        self.resource_sync_job_id = None
 
     def start(self):
         """ Initialise the schedulers for periodic job creation
         """
         if not self.scheduler_started:
             self.scheduler.start()
+            if self.collection_scheduler is not self.scheduler:
+                self.collection_scheduler.start()
             self.scheduler_started = True
 
     def on_node_join(self, event):
@@ -61,21 +74,19 @@ class SchedulerManager(object):
         # Get all the jobs
         filters = {'deleted': False}
         tasks = db.task_get_all(self.ctx, filters=filters)
-        distributor = TaskDistributor(self.ctx)
-        partitioner = ConsistentHashing()
-        partitioner.start()
+        distributor = TaskDistributor(self.ctx, tasks)
         for task in tasks:
             # Get the specific executor
             origin_executor = task['executor']
             # If the target executor is different from current executor,
             # remove the job from old executor and add it to new executor
-            new_executor = partitioner.get_task_executor(task['id'])
+            new_executor = distributor.get_task_executor(task['id'])
             if new_executor != origin_executor:
                 LOG.info('Re-distribute job %s from %s to %s' %
                          (task['id'], origin_executor, new_executor))
                 self.task_rpcapi.remove_job(self.ctx, task['id'],
                                             task['executor'])
-            distributor.distribute_new_job(task['id'])
+            distributor.distribute_new_job(task['id'], new_executor)
         failed_tasks = db.failed_task_get_all(self.ctx, filters=filters)
         for failed_task in failed_tasks:
             # Get the parent task executor
@@ -91,7 +102,6 @@ class SchedulerManager(object):
                     self.ctx, failed_task['id'], failed_task['executor'])
             distributor.distribute_failed_job(failed_task['id'],
                                               task['executor'])
-        partitioner.stop()
 
     def on_node_leave(self, event):
         LOG.info('Member %s left the group %s' % (event.member_id,
@@ -134,15 +144,27 @@ class SchedulerManager(object):
                                seconds=self.GROUP_CHANGE_DETECT_INTERVAL_SEC,
                                next_run_time=datetime.now(),
                                id=self.watch_job_id)
+        resource_sync = resource_sync_scheduler.ResourceSyncScheduler()
+        self.resource_sync_job_id = uuidutils.generate_uuid()
+        self.scheduler.add_job(resource_sync.schedule, 'interval',
+                               seconds=self.RESOURCE_SYNC_CHECK_INTERVAL_SEC,
+                               next_run_time=datetime.now(),
+                               id=self.resource_sync_job_id)
 
     def stop(self):
         """Cleanup periodic jobs"""
         if self.watch_job_id:
             self.scheduler.remove_job(self.watch_job_id)
+        if self.resource_sync_job_id:
+            self.scheduler.remove_job(self.resource_sync_job_id)
 
     def get_scheduler(self):
         return self.scheduler
 
+    def get_collection_scheduler(self):
+        """Get the scheduler of performance collection jobs."""
+        return self.collection_scheduler
+
     def recover_job(self):
         filters = {'deleted': False}
         all_tasks = db.task_get_all(self.ctx, filters=filters)
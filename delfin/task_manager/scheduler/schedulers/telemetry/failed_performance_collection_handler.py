@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+import time
+
 import six
 from oslo_config import cfg
 from oslo_log import log
@@ -21,14 +24,46 @@ from delfin import exception
 from delfin.common.constants import TelemetryJobStatus, TelemetryCollection
 from delfin.db.sqlalchemy.models import FailedTask
 from delfin.db.sqlalchemy.models import Task
+from delfin.drivers import api as driverapi
 from delfin.i18n import _
 from delfin.task_manager.scheduler import schedule_manager
+from delfin.task_manager.scheduler.schedulers.telemetry import task_cache
 from delfin.task_manager.tasks.telemetry import PerformanceCollectionTask
 from delfin.task_manager import metrics_rpcapi as metrics_task_rpcapi
 
 LOG = log.getLogger(__name__)
 CONF = cfg.CONF
 
+_backfill_lock = threading.Lock()
+# Last backfill time of the storages handled by this executor
+_last_backfill_times = dict()
+_running_backfills = set()
+
+
+def is_backfill_running(failed_task_id):
+    return failed_task_id in _running_backfills
+
+
+def _start_backfill(storage_id, failed_task_id):
+    """Start backfill of a failed task unless another backfill of the
+    storage is started within min_backfill_interval.
+    """
+    now = time.time()
+    with _backfill_lock:
+        last_backfill_time = _last_backfill_times.get(storage_id)
+        if last_backfill_time is not None and \
+                now - last_backfill_time < \
+                CONF.telemetry.min_backfill_interval:
+            return False
+        _last_backfill_times[storage_id] = now
+        _running_backfills.add(failed_task_id)
+    return True
+
+
+def _end_backfill(failed_task_id):
+    with _backfill_lock:
+        _running_backfills.discard(failed_task_id)
+
 
 class FailedPerformanceCollectionHandler(object):
     def __init__(self, ctx, failed_task_id, storage_id, args, job_id,
@@ -43,7 +78,7 @@ class FailedPerformanceCollectionHandler(object):
         self.end_time = end_time
         self.metrics_task_rpcapi = metrics_task_rpcapi.TaskAPI()
         self.scheduler_instance = \
-            schedule_manager.SchedulerManager().get_scheduler()
+            schedule_manager.SchedulerManager().get_collection_scheduler()
         self.result = TelemetryJobStatus.FAILED_JOB_STATUS_INIT
         self.executor = executor
 
@@ -79,11 +114,49 @@ class FailedPerformanceCollectionHandler(object):
                       % (self.storage_id, self.failed_task_id))
             return
 
+        # Window and retries are reset when failed windows are merged
+        self.start_time = failed_task[FailedTask.start_time.name]
+        self.end_time = failed_task[FailedTask.end_time.name]
+        self.retry_count = failed_task[FailedTask.retry_count.name]
+
+        # Retries are not consumed while the storage is still unreachable,
+        # or while another window of it is backfilled
+        if task_cache.is_collection_failing(self.storage_id):
+            if self._is_expired():
+                LOG.warning("Performance metrics of failed task id %s are "
+                            "no longer collectable while collection of "
+                            "storage %s is failing, giving up on retry"
+                            % (self.failed_task_id, self.storage_id))
+                self._stop_task()
+                return
+            LOG.debug('Collection of storage %s is failing, postponing '
+                      'failed task id %s.'
+                      % (self.storage_id, self.failed_task_id))
+            return
+        if not _start_backfill(self.storage_id, self.failed_task_id):
+            LOG.debug('Backfill of storage %s is rate limited, postponing '
+                      'failed task id %s.'
+                      % (self.storage_id, self.failed_task_id))
+            return
+        try:
+            self._backfill()
+        finally:
+            _end_backfill(self.failed_task_id)
+
+    def _backfill(self):
+        if not self._clip_to_retention_window():
+            LOG.warning("Performance metrics of failed task id %s are no "
+                        "longer retained by storage %s, giving up on retry"
+                        % (self.failed_task_id, self.storage_id))
+            self._stop_task()
+            return
+
         self.retry_count = self.retry_count + 1
         try:
             telemetry = PerformanceCollectionTask()
             status = telemetry.collect(self.ctx, self.storage_id, self.args,
-                                       self.start_time, self.end_time)
+                                       self.start_time, self.end_time,
+                                       deduplicate=False)
 
             if not status:
                 raise exception.TelemetryTaskExecError()
@@ -116,6 +189,49 @@ class FailedPerformanceCollectionHandler(object):
                               {FailedTask.retry_count.name: self.retry_count,
                                FailedTask.result.name: self.result})
 
+    def _get_retention_window(self):
+        """Performance metric retention window of the driver in seconds,
+        None if unknown.
+        """
+        try:
+            capabilities = driverapi.API().get_capabilities(self.ctx,
+                                                            self.storage_id)
+        except Exception as e:
+            LOG.warning("Failed to get driver capabilities of storage "
+                        "id :{0}, reason:{1}".format(self.storage_id,
+                                                     six.text_type(e)))
+            return None
+        return capabilities.get('performance_metric_retention_window')
+
+    def _is_expired(self):
+        """Whether the window ends before max_failed_task_retry_window or
+        the retention window of the driver, so it is never collected even
+        if the storage recovers.
+        """
+        expiry_window = CONF.telemetry.max_failed_task_retry_window
+        retention_window = self._get_retention_window()
+        if retention_window:
+            expiry_window = min(expiry_window, retention_window)
+        # Times are epoch time in milliseconds
+        return self.end_time <= int(time.time() - expiry_window) * 1000
+
+    def _clip_to_retention_window(self):
+        """Drop the part of the window older than the performance metric
+        retention window of the driver, so that the window is collected in
+        one driver call.
+
+        Returns False if no part of the window is retained.
+        """
+        retention_window = self._get_retention_window()
+        if not retention_window:
+            return True
+        # Times are epoch time in milliseconds
+        oldest_time = int(time.time() - retention_window) * 1000
+        if self.end_time <= oldest_time:
+            return False
+        self.start_time = max(self.start_time, oldest_time)
+        return True
+
     def _stop_task(self):
         db.failed_task_update(self.ctx, self.failed_task_id,
                               {FailedTask.retry_count.name: self.retry_count,
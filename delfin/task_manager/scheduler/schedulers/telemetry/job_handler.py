@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import zlib
 from datetime import datetime
 
 import six
@@ -25,12 +26,27 @@ from delfin.exception import TaskNotFound
 from delfin.i18n import _
 from delfin.task_manager import rpcapi as task_rpcapi
 from delfin.task_manager.scheduler import schedule_manager
+from delfin.task_manager.scheduler.schedulers.telemetry import task_cache
 from delfin.task_manager.tasks.telemetry import PerformanceCollectionTask
+from delfin.task_manager.tasks.telemetry import remove_storage_labels
 
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
 
+def get_next_collection_time(task_id, interval, current_time):
+    """Get the first collection time of a task after current_time.
+
+    Collection times of a task are spread over the interval by a phase
+    derived from the hash of its id, so that tasks scheduled at the same
+    time do not collect at the same instant. The phase is relative to
+    epoch, it does not change across restarts or executors.
+    """
+    phase = zlib.crc32(six.text_type(task_id).encode('utf-8')) % interval
+    delay = (phase - current_time) % interval
+    return current_time + (delay or interval)
+
+
 class JobHandler(object):
     def __init__(self, ctx, task_id, storage_id, args, interval):
         # create an object of periodic task scheduler
@@ -40,7 +56,8 @@ class JobHandler(object):
         self.args = args
         self.interval = interval
         self.task_rpcapi = task_rpcapi.TaskAPI()
-        self.scheduler = schedule_manager.SchedulerManager().get_scheduler()
+        self.scheduler = schedule_manager.SchedulerManager() \
+            .get_collection_scheduler()
         self.stopped = False
         self.job_ids = set()
 
@@ -86,7 +103,8 @@ class JobHandler(object):
         instance = collection_class.get_instance(self.ctx, self.task_id)
         current_time = int(datetime.now().timestamp())
         last_run_time = current_time
-        next_collection_time = last_run_time + job['interval']
+        next_collection_time = get_next_collection_time(
+            task_id, job['interval'], current_time)
         job_id = uuidutils.generate_uuid()
         next_collection_time = datetime \
             .fromtimestamp(next_collection_time) \
@@ -154,7 +172,9 @@ class JobHandler(object):
     def remove_job(self, task_id):
         try:
             LOG.info("Received job %s to remove", task_id)
+            task_cache.TaskStateCache().remove(task_id)
             job = db.task_get(self.ctx, task_id)
+            remove_storage_labels(job['storage_id'])
             job_id = job['job_id']
             self.remove_scheduled_job(job_id)
         except Exception as e:
@@ -165,7 +185,8 @@ class JobHandler(object):
 class FailedJobHandler(object):
     def __init__(self, ctx):
         # create an object of periodic failed task scheduler
-        self.scheduler = schedule_manager.SchedulerManager().get_scheduler()
+        self.scheduler = schedule_manager.SchedulerManager() \
+            .get_collection_scheduler()
         self.ctx = ctx
         self.stopped = False
         self.job_ids = set()
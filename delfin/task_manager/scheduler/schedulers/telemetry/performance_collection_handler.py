@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 from datetime import datetime
 
 import six
@@ -23,13 +24,16 @@ from oslo_log import log
 from delfin import db
 from delfin import exception
 from delfin.common.constants import TelemetryCollection
+from delfin.common.constants import TelemetryJobStatus
 from delfin.db.sqlalchemy.models import FailedTask
 from delfin.drivers import api as driverapi
 from delfin.task_manager import metrics_rpcapi as metrics_task_rpcapi
+from delfin.task_manager.scheduler import collection_scheduler
 from delfin.task_manager.scheduler import schedule_manager
 from delfin.task_manager.scheduler.schedulers.telemetry. \
     failed_performance_collection_handler import \
-    FailedPerformanceCollectionHandler
+    FailedPerformanceCollectionHandler, is_backfill_running
+from delfin.task_manager.scheduler.schedulers.telemetry import task_cache
 from delfin.task_manager.tasks.telemetry import PerformanceCollectionTask
 
 CONF = cfg.CONF
@@ -47,7 +51,8 @@ class PerformanceCollectionHandler(object):
         self.metric_task_rpcapi = metrics_task_rpcapi.TaskAPI()
         self.driver_api = driverapi.API()
         self.executor = executor
-        self.scheduler = schedule_manager.SchedulerManager().get_scheduler()
+        self.scheduler = schedule_manager.SchedulerManager() \
+            .get_collection_scheduler()
 
     @staticmethod
     def get_instance(ctx, task_id):
@@ -60,8 +65,8 @@ class PerformanceCollectionHandler(object):
         # Upon periodic job callback, if storage is already deleted or soft
         # deleted,do not proceed with performance collection flow
         try:
-            task = db.task_get(self.ctx, self.task_id)
-            if task["deleted"]:
+            if task_cache.TaskStateCache().is_deleted(self.ctx,
+                                                      self.task_id):
                 LOG.debug('Storage %s getting deleted, ignoring performance '
                           'collection cycle for task id %s.'
                           % (self.storage_id, self.task_id))
@@ -86,11 +91,20 @@ class PerformanceCollectionHandler(object):
             end_time = current_time * 1000
             start_time = end_time - (self.interval * 1000) - (overlap * 1000)
             telemetry = PerformanceCollectionTask()
+            timeout = self.interval * \
+                CONF.telemetry.collection_deadline_ratio or None
+            collect_start = time.time()
             status = telemetry.collect(self.ctx, self.storage_id, self.args,
-                                       start_time, end_time)
+                                       start_time, end_time, timeout=timeout)
+            duration = time.time() - collect_start
+            self._record_collection(duration, timeout, bool(status))
+            if status:
+                # Cost of the storage on its executor, for placement
+                task_cache.TaskStateCache().set_collection_cost(
+                    self.task_id, duration, telemetry.series_count)
 
-            db.task_update(self.ctx, self.task_id,
-                           {'last_run_time': current_time})
+            task_cache.TaskStateCache().set_last_run_time(self.task_id,
+                                                          current_time)
 
             if not status:
                 raise exception.TelemetryTaskExecError()
@@ -104,7 +118,99 @@ class PerformanceCollectionHandler(object):
                       ",task id :{1} and interval(in sec):{2}"
                       .format(self.storage_id, self.task_id, self.interval))
 
+    def _record_collection(self, duration, timeout, success=True):
+        overrun = bool(timeout) and duration >= timeout
+        stats = task_cache.record_collection(self.storage_id, duration,
+                                             overrun, success)
+        if overrun:
+            LOG.warning('Performance collection of storage %s took %.1f '
+                        'seconds, %d of %d collections exceeded deadline'
+                        % (self.storage_id, duration, stats.overruns,
+                           stats.runs))
+        if CONF.telemetry.auto_adjust_interval and \
+                stats.consecutive_overruns >= \
+                TelemetryCollection.MAX_CONSECUTIVE_OVERRUNS:
+            stats.consecutive_overruns = 0
+            self._raise_interval()
+
+    def _raise_interval(self):
+        """Double the collection interval of a storage whose collections
+        keep exceeding deadline, so that it does not hold workers most of
+        the time.
+        """
+        max_interval = CONF.telemetry.performance_collection_interval * \
+            TelemetryCollection.MAX_INTERVAL_FACTOR
+        interval = min(self.interval * 2, max_interval)
+        if interval <= self.interval:
+            return
+        try:
+            task = db.task_get(self.ctx, self.task_id)
+            db.task_update(self.ctx, self.task_id, {'interval': interval})
+            job = self.scheduler.get_job(task['job_id'])
+            if isinstance(job, collection_scheduler.CollectionJob):
+                job.interval = interval
+            elif job:
+                self.scheduler.reschedule_job(task['job_id'],
+                                              trigger='interval',
+                                              seconds=interval)
+        except Exception as e:
+            LOG.error("Failed to raise collection interval of storage %s, "
+                      "reason: %s", self.storage_id, six.text_type(e))
+            return
+        LOG.warning('Raise collection interval of storage %s from %d to %d '
+                    'seconds', self.storage_id, self.interval, interval)
+        self.interval = interval
+
+    def _merge_failed_task(self, start_time, end_time):
+        """Extend a pending failed task of this task with the failed window
+        when they overlap, so that an outage of the storage is backfilled
+        as one range instead of one failed task per missed collection.
+
+        Returns True if the window is merged.
+        """
+        if start_time is None or end_time is None:
+            return False
+        max_window = CONF.telemetry.max_failed_task_retry_window * 1000
+        filters = {FailedTask.task_id.name: self.task_id,
+                   FailedTask.deleted.name: False}
+        for failed_task in db.failed_task_get_all(self.ctx, filters=filters):
+            failed_start = failed_task[FailedTask.start_time.name]
+            failed_end = failed_task[FailedTask.end_time.name]
+            if failed_start is None or failed_end is None \
+                    or failed_task[FailedTask.result.name] == \
+                    TelemetryJobStatus.FAILED_JOB_STATUS_SUCCESS \
+                    or failed_task[FailedTask.retry_count.name] >= \
+                    TelemetryCollection.MAX_FAILED_JOB_RETRY_COUNT \
+                    or is_backfill_running(failed_task[FailedTask.id.name]):
+                continue
+            if start_time > failed_end or end_time < failed_start:
+                continue
+            merged_start = min(start_time, failed_start)
+            merged_end = max(end_time, failed_end)
+            if merged_end - merged_start > max_window:
+                continue
+
+            # Merged window gets a full set of retries
+            db.failed_task_update(
+                self.ctx, failed_task[FailedTask.id.name],
+                {FailedTask.start_time.name: merged_start,
+                 FailedTask.end_time.name: merged_end,
+                 FailedTask.retry_count.name: 0,
+                 FailedTask.result.name:
+                     TelemetryJobStatus.FAILED_JOB_STATUS_INIT})
+            LOG.info("Merged failed window of task id %s into failed task "
+                     "id %s", self.task_id, failed_task[FailedTask.id.name])
+            return True
+        return False
+
     def _handle_task_failure(self, start_time, end_time):
+        try:
+            if self._merge_failed_task(start_time, end_time):
+                return
+        except Exception as e:
+            LOG.error("Failed to merge failed window of task id :{0}, "
+                      "reason:{1}".format(self.task_id, six.text_type(e)))
+
         failed_task_interval = TelemetryCollection.FAILED_JOB_SCHEDULE_INTERVAL
 
         try:
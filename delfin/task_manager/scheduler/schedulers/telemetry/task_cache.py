@@ -0,0 +1,200 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import six
+from oslo_config import cfg
+from oslo_log import log
+from oslo_utils import uuidutils
+
+from delfin import context
+from delfin import db
+from delfin import utils
+from delfin.common.constants import TelemetryCollection
+from delfin.task_manager.scheduler import schedule_manager
+
+CONF = cfg.CONF
+LOG = log.getLogger(__name__)
+
+
+@six.add_metaclass(utils.Singleton)
+class TaskStateCache(object):
+    """State of the collection tasks handled by this executor.
+
+    Deleted flag of a task is read from DB once and kept until its job is
+    removed from the executor. Last run time and collection cost of tasks
+    are buffered and written to DB every task_state_flush_interval.
+    """
+
+    def __init__(self):
+        self.ctx = context.get_admin_context()
+        self.deleted = dict()
+        self.last_run_times = dict()
+        # Task id to smoothed collection duration and series count
+        self.collection_costs = dict()
+        self.changed_costs = set()
+        self.lock = threading.Lock()
+        self.flush_job_id = None
+
+    def is_deleted(self, ctx, task_id):
+        """Get deleted flag of the task, raise TaskNotFound if the task
+        does not exist.
+        """
+        deleted = self.deleted.get(task_id)
+        if deleted is None:
+            task = db.task_get(ctx, task_id)
+            deleted = bool(task['deleted'])
+            self.deleted[task_id] = deleted
+        return deleted
+
+    def set_last_run_time(self, task_id, last_run_time):
+        with self.lock:
+            self.last_run_times[task_id] = last_run_time
+            if not self.flush_job_id:
+                self._schedule_flush()
+
+    def set_collection_cost(self, task_id, duration, series_count=None):
+        """Smooth the duration of a collection of the task into its
+        collection cost.
+        """
+        with self.lock:
+            cost, count = self.collection_costs.get(task_id, (None, None))
+            if cost is None:
+                cost = duration
+            else:
+                cost += TelemetryCollection.COLLECTION_COST_SMOOTHING * \
+                    (duration - cost)
+            if series_count is not None:
+                count = series_count
+            self.collection_costs[task_id] = (cost, count)
+            self.changed_costs.add(task_id)
+            if not self.flush_job_id:
+                self._schedule_flush()
+
+    def remove(self, task_id):
+        """Invalidate the task when its job is removed from executor."""
+        self.deleted.pop(task_id, None)
+        with self.lock:
+            last_run_time = self.last_run_times.pop(task_id, None)
+            cost = self.collection_costs.pop(task_id, None)
+            if task_id not in self.changed_costs:
+                cost = None
+            self.changed_costs.discard(task_id)
+        if last_run_time is not None:
+            self._write({task_id: last_run_time})
+        if cost is not None:
+            self._write_costs({task_id: cost})
+
+    def flush(self):
+        with self.lock:
+            last_run_times = self.last_run_times
+            self.last_run_times = dict()
+            costs = {task_id: self.collection_costs[task_id]
+                     for task_id in self.changed_costs}
+            self.changed_costs = set()
+        if last_run_times:
+            self._write(last_run_times)
+        if costs:
+            self._write_costs(costs)
+
+    def _write(self, last_run_times):
+        try:
+            db.task_update_last_run_time(self.ctx, last_run_times)
+        except Exception as e:
+            LOG.error("Failed to update last run time of %d tasks, "
+                      "reason: %s", len(last_run_times), six.text_type(e))
+            # Keep them for next flush unless updated in between
+            with self.lock:
+                for task_id, last_run_time in last_run_times.items():
+                    self.last_run_times.setdefault(task_id, last_run_time)
+
+    def _write_costs(self, costs):
+        try:
+            db.task_update_collection_cost(self.ctx, costs)
+        except Exception as e:
+            LOG.error("Failed to update collection cost of %d tasks, "
+                      "reason: %s", len(costs), six.text_type(e))
+            with self.lock:
+                self.changed_costs.update(
+                    task_id for task_id in costs
+                    if task_id in self.collection_costs)
+
+    def _schedule_flush(self):
+        scheduler = schedule_manager.SchedulerManager().get_scheduler()
+        self.flush_job_id = uuidutils.generate_uuid()
+        scheduler.add_job(self.flush, 'interval',
+                          seconds=CONF.telemetry.task_state_flush_interval,
+                          id=self.flush_job_id)
+
+
+class CollectionStats(object):
+    """Duration, deadline overrun and failure counters of the collections
+    of a storage.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.overruns = 0
+        self.consecutive_overruns = 0
+        self.last_duration = 0
+        self.max_duration = 0
+        self.consecutive_failures = 0
+
+    def record(self, duration, overrun, success=True):
+        self.runs += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        if overrun:
+            self.overruns += 1
+            self.consecutive_overruns += 1
+        else:
+            self.consecutive_overruns = 0
+        if success:
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+
+    def to_dict(self):
+        return {'runs': self.runs,
+                'overruns': self.overruns,
+                'consecutive_overruns': self.consecutive_overruns,
+                'last_duration': self.last_duration,
+                'max_duration': self.max_duration,
+                'consecutive_failures': self.consecutive_failures}
+
+
+# Collection stats of the storages handled by this executor
+_collection_stats = dict()
+
+
+def record_collection(storage_id, duration, overrun, success=True):
+    """Record a collection of the storage and return its stats."""
+    stats = _collection_stats.get(storage_id)
+    if stats is None:
+        stats = _collection_stats.setdefault(storage_id, CollectionStats())
+    stats.record(duration, overrun, success)
+    return stats
+
+
+def is_collection_failing(storage_id):
+    """Whether the last collection of the storage on this executor failed.
+    """
+    stats = _collection_stats.get(storage_id)
+    return bool(stats and stats.consecutive_failures)
+
+
+def get_collection_stats():
+    return {storage_id: stats.to_dict()
+            for storage_id, stats in list(_collection_stats.items())}
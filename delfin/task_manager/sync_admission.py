@@ -0,0 +1,244 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Admission control of the resource syncs run by a task manager node.
+
+Syncs requested are queued and admitted within the limits of concurrent
+syncs of the node, of a vendor and of a storage backend, user triggered
+syncs before the periodic ones, and duplicate requests of a sync queued
+or running already are collapsed.
+"""
+import collections
+import threading
+import time
+
+import eventlet
+from oslo_config import cfg
+from oslo_log import log
+
+from delfin.common import constants
+from delfin import db
+from delfin import exception
+
+LOG = log.getLogger(__name__)
+
+sync_admission_opts = [
+    cfg.IntOpt('sync_max_concurrent_tasks',
+               default=32,
+               min=1,
+               help='Maximum number of resource sync tasks run concurrently '
+                    'by a task manager node'),
+    cfg.IntOpt('sync_max_concurrent_tasks_per_vendor',
+               default=16,
+               min=1,
+               help='Maximum number of resource sync tasks of the storages '
+                    'of a vendor run concurrently by a task manager node'),
+    cfg.IntOpt('sync_max_concurrent_tasks_per_storage',
+               default=4,
+               min=1,
+               help='Maximum number of resource sync tasks of a storage run '
+                    'concurrently, which bounds the sessions a sync opens '
+                    'to the storage backend'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(sync_admission_opts)
+
+# Lower rank is admitted first
+PRIORITY_RANKS = {constants.SyncPriority.USER: 0,
+                  constants.SyncPriority.PERIODIC: 1}
+
+
+class SyncRequest(object):
+
+    def __init__(self, context, storage_id, resource_task, priority,
+                 vendor):
+        self.context = context
+        self.storage_id = storage_id
+        self.resource_task = resource_task
+        self.priority = priority
+        self.vendor = vendor
+        self.queued_at = time.time()
+
+    @property
+    def key(self):
+        return self.storage_id, self.resource_task
+
+
+class SyncAdmissionController(object):
+    """Queue of the resource syncs requested to a task manager node.
+
+    Requests wait per priority and per storage, storages are served round
+    robin so that one storage with many requests does not hold back the
+    others. A request is admitted once the node, its vendor and its
+    storage are all below their limits of concurrent syncs.
+    """
+
+    def __init__(self, run_sync):
+        self.run_sync = run_sync
+        self.lock = threading.Lock()
+        # Priority -> storage id -> requests in order
+        self.waiting = {priority: collections.OrderedDict()
+                        for priority in PRIORITY_RANKS}
+        self.queued = {}
+        self.running = set()
+        self.running_by_vendor = collections.Counter()
+        self.running_by_storage = collections.Counter()
+        self.vendors = {}
+        self.admitted = 0
+        self.collapsed = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _get_vendor(self, context, storage_id):
+        if storage_id not in self.vendors:
+            try:
+                storage = db.storage_get(context, storage_id)
+            except exception.StorageNotFound:
+                # The sync of a storage removed fails fast, no need to
+                # count it to any vendor
+                return None
+            self.vendors[storage_id] = storage['vendor']
+        return self.vendors[storage_id]
+
+    def submit(self, context, storage_id, resource_task,
+               priority=constants.SyncPriority.USER):
+        """Queue a sync of resource_task for storage_id, collapsed into the
+        same sync when it is queued already, or when it is running and the
+        request is periodic.
+        """
+        vendor = self._get_vendor(context, storage_id)
+        key = (storage_id, resource_task)
+        with self.lock:
+            queued = self.queued.get(key)
+            if queued:
+                self.collapsed += 1
+                if PRIORITY_RANKS[priority] < PRIORITY_RANKS[queued.priority]:
+                    self._remove_waiting(queued)
+                    queued.priority = priority
+                    self._add_waiting(queued)
+            elif (key in self.running
+                  and priority == constants.SyncPriority.PERIODIC):
+                self.collapsed += 1
+            else:
+                request = SyncRequest(context, storage_id, resource_task,
+                                      priority, vendor)
+                self.queued[key] = request
+                self._add_waiting(request)
+            admitted = self._admit()
+        self._start(admitted)
+
+    def _add_waiting(self, request):
+        storages = self.waiting[request.priority]
+        storages.setdefault(request.storage_id,
+                            collections.deque()).append(request)
+
+    def _remove_waiting(self, request):
+        storages = self.waiting[request.priority]
+        requests = storages[request.storage_id]
+        requests.remove(request)
+        if not requests:
+            del storages[request.storage_id]
+
+    def _is_full(self, vendor=None, storage_id=None):
+        if len(self.running) >= CONF.sync_max_concurrent_tasks:
+            return True
+        if vendor and (self.running_by_vendor[vendor]
+                       >= CONF.sync_max_concurrent_tasks_per_vendor):
+            return True
+        return storage_id and (self.running_by_storage[storage_id]
+                               >= CONF.sync_max_concurrent_tasks_per_storage)
+
+    def _admit(self):
+        """Take the requests that fit in the limits, caller holds the
+        lock.
+        """
+        admitted = []
+        now = time.time()
+        for priority in sorted(PRIORITY_RANKS, key=PRIORITY_RANKS.get):
+            storages = self.waiting[priority]
+            for storage_id in list(storages):
+                if self._is_full():
+                    return admitted
+                requests = storages[storage_id]
+                skipped = collections.deque()
+                while requests and not self._is_full(requests[0].vendor,
+                                                     storage_id):
+                    request = requests.popleft()
+                    if request.key in self.running:
+                        # Runs once the same sync running finishes
+                        skipped.append(request)
+                        continue
+                    del self.queued[request.key]
+                    self.running.add(request.key)
+                    self.running_by_vendor[request.vendor] += 1
+                    self.running_by_storage[storage_id] += 1
+                    wait_time = now - request.queued_at
+                    self.admitted += 1
+                    self.wait_time_total += wait_time
+                    self.wait_time_max = max(self.wait_time_max, wait_time)
+                    admitted.append(request)
+                requests.extendleft(reversed(skipped))
+                if requests:
+                    # Serve the other storages before this one again
+                    storages.move_to_end(storage_id)
+                else:
+                    del storages[storage_id]
+        return admitted
+
+    def _start(self, requests):
+        for request in requests:
+            eventlet.spawn_n(self._run, request)
+
+    def _run(self, request):
+        try:
+            self.run_sync(request.context, request.storage_id,
+                          request.resource_task, request.priority)
+        except Exception as e:
+            LOG.error('Failed to sync %s of storage %s, reason is %s',
+                      request.resource_task, request.storage_id, e)
+        finally:
+            with self.lock:
+                self.running.discard(request.key)
+                self.running_by_vendor[request.vendor] -= 1
+                self.running_by_storage[request.storage_id] -= 1
+                admitted = self._admit()
+            self._start(admitted)
+
+    def remove_storage(self, storage_id):
+        self.vendors.pop(storage_id, None)
+
+    def get_stats(self):
+        """Queue depth per priority, syncs running and wait times of the
+        syncs admitted, in seconds.
+        """
+        with self.lock:
+            now = time.time()
+            oldest = min((request.queued_at for request
+                          in self.queued.values()), default=now)
+            return {
+                'queued': {priority: sum(len(requests) for requests
+                                         in storages.values())
+                           for priority, storages in self.waiting.items()},
+                'running': len(self.running),
+                'running_by_vendor': {vendor: count for vendor, count
+                                      in self.running_by_vendor.items()
+                                      if count},
+                'admitted': self.admitted,
+                'collapsed': self.collapsed,
+                'wait_time_avg': (self.wait_time_total / self.admitted
+                                  if self.admitted else 0.0),
+                'wait_time_max': self.wait_time_max,
+                'oldest_wait_time': now - oldest,
+            }
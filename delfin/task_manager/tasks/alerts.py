@@ -12,44 +12,157 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import threading
+
 import six
+from oslo_config import cfg
 from oslo_log import log
+from oslo_utils import timeutils
 
 from delfin import db
 from delfin import exception
 from delfin.common import alert_util
+from delfin.common import constants
 from delfin.drivers import api as driver_manager
 from delfin.exporter import base_exporter
 from delfin.i18n import _
 
 LOG = log.getLogger(__name__)
 
+alert_store_opts = [
+    cfg.IntOpt('alert_store_max_age',
+               default=30 * 24 * 3600,
+               min=0,
+               help='Seconds the alerts of a storage are kept in the alert '
+                    'store after they were last synced or received, 0 to '
+                    'keep them until the storage is removed'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(alert_store_opts)
+
+# Alert attributes which identify a change of an already exported alert
+ALERT_CHANGE_KEYS = ('alert_id', 'severity', 'category', 'type',
+                     'occur_time', 'description', 'location')
+
+
+class AlertWatermark(object):
+    """High-water mark of the alerts already exported for a storage."""
+
+    def __init__(self):
+        self.last_occur_time = None
+        # sequence_number -> (occur_time, fingerprint)
+        self.seen = {}
+
+    @staticmethod
+    def fingerprint(alert):
+        return tuple(alert.get(key) for key in ALERT_CHANGE_KEYS)
+
+    def get_query_para(self):
+        if self.last_occur_time is None:
+            return None
+        return {'begin_time': self.last_occur_time}
+
+    def filter_alerts(self, alert_list):
+        """Returns the alerts which are new or changed since last export."""
+        new_alerts = []
+        for alert in alert_list:
+            seen = self.seen.get(alert.get('sequence_number'))
+            if seen and seen[1] == self.fingerprint(alert):
+                continue
+            new_alerts.append(alert)
+        return new_alerts
+
+    def update(self, alert_list):
+        for alert in alert_list:
+            occur_time = alert.get('occur_time')
+            self.seen[alert.get('sequence_number')] = \
+                (occur_time, self.fingerprint(alert))
+            if occur_time is not None and (
+                    self.last_occur_time is None
+                    or occur_time > self.last_occur_time):
+                self.last_occur_time = occur_time
+
+        # Alerts older than the watermark are not returned by the driver
+        # anymore, so there is no need to remember them
+        self.seen = {seq: value for seq, value in self.seen.items()
+                     if value[0] is None
+                     or value[0] >= self.last_occur_time}
+
 
 class AlertSyncTask(object):
 
     def __init__(self):
         self.driver_manager = driver_manager.API()
         self.alert_export_manager = base_exporter.AlertExporterManager()
+        self.watermarks = {}
+        self.watermark_lock = threading.Lock()
+
+    def _get_watermark(self, storage_id):
+        with self.watermark_lock:
+            if storage_id not in self.watermarks:
+                self.watermarks[storage_id] = AlertWatermark()
+            return self.watermarks[storage_id]
+
+    def remove_watermark(self, storage_id):
+        """Forget the alert sync progress of a storage."""
+        with self.watermark_lock:
+            self.watermarks.pop(storage_id, None)
 
     def sync_alerts(self, ctx, storage_id, query_para):
-        """ Syncs all alerts from storage side to exporter """
+        """ Syncs all alerts from storage side to exporter
+
+        When query_para is not given, only the alerts which are new or
+        changed since the last sync of the storage are exported. When no
+        time range is queried, the stored alerts listed from the storage
+        which it does not list anymore, cleared on the storage, are removed
+        from the alert store. The ones only received as traps are kept until
+        alert_store_max_age.
+        """
 
         LOG.info('Syncing alerts for storage id:{0}'.format(storage_id))
         try:
             storage = db.storage_get(ctx, storage_id)
+            sync_time = timeutils.utcnow()
+            if CONF.alert_store_max_age:
+                db.alert_delete_by_storage(
+                    ctx, storage_id, sync_time - datetime.timedelta(
+                        seconds=CONF.alert_store_max_age))
+
+            watermark = self._get_watermark(storage_id)
+            incremental = not query_para
+            if incremental:
+                query_para = watermark.get_query_para()
 
             current_alert_list = self.driver_manager.list_alerts(ctx,
                                                                  storage_id,
                                                                  query_para)
-            if not len(current_alert_list):
+            if incremental:
+                alert_list = watermark.filter_alerts(current_alert_list)
+            else:
+                alert_list = current_alert_list
+
+            for alert in alert_list:
+                alert_util.fill_storage_attributes(alert, storage)
+            db.alerts_upsert(ctx, storage_id, alert_list)
+            db.alerts_touch(ctx, storage_id,
+                            [alert.get('sequence_number')
+                             for alert in current_alert_list])
+            if not query_para or not (query_para.get('begin_time')
+                                      or query_para.get('end_time')):
+                db.alert_delete_by_storage(
+                    ctx, storage_id, sync_time,
+                    origin=constants.AlertOrigin.LISTED)
+
+            if not len(alert_list):
                 # No alerts to sync
                 LOG.info('No alerts to sync from storage device for '
                          'storage id:{0}'.format(storage_id))
                 return
 
-            for alert in current_alert_list:
-                alert_util.fill_storage_attributes(alert, storage)
-            self.alert_export_manager.dispatch(ctx, current_alert_list)
+            self.alert_export_manager.dispatch(ctx, alert_list)
+            watermark.update(alert_list)
             LOG.info('Syncing storage alerts successful for storage id:{0}'
                      .format(storage_id))
         except Exception as e:
@@ -62,17 +175,35 @@ class AlertSyncTask(object):
 
         LOG.info('Clear alert for storage id:{0}'.format(storage_id))
         sequence_number_list = sequence_number_list or []
+        if not sequence_number_list:
+            return []
+        try:
+            results = self.driver_manager.clear_alerts(ctx, storage_id,
+                                                       sequence_number_list)
+        except (exception.AccessInfoNotFound,
+                exception.StorageNotFound) as e:
+            LOG.warning("Ignore the situation: %s", e.msg)
+            return []
+        except Exception as e:
+            LOG.error("Failed to clear alerts for storage: %s, reason: %s.",
+                      storage_id, six.text_type(e))
+            return list(sequence_number_list)
+
         failure_list = []
         for sequence_number in sequence_number_list:
-            try:
-                self.driver_manager.clear_alert(ctx, storage_id,
-                                                sequence_number)
-            except (exception.AccessInfoNotFound,
-                    exception.StorageNotFound) as e:
-                LOG.warning("Ignore the situation: %s", e.msg)
-            except Exception as e:
-                LOG.error("Failed to clear alert with sequence number: %s "
-                          "for storage: %s, reason: %s.",
-                          sequence_number, storage_id, six.text_type(e))
-                failure_list.append(sequence_number)
+            error = results.get(sequence_number)
+            if not error:
+                continue
+            if isinstance(error, (exception.AccessInfoNotFound,
+                                  exception.StorageNotFound)):
+                LOG.warning("Ignore the situation: %s", error.msg)
+                continue
+            LOG.error("Failed to clear alert with sequence number: %s "
+                      "for storage: %s, reason: %s.",
+                      sequence_number, storage_id, six.text_type(error))
+            failure_list.append(sequence_number)
+        db.alerts_delete(ctx, storage_id,
+                         [sequence_number for sequence_number
+                          in sequence_number_list
+                          if sequence_number not in failure_list])
         return failure_list
@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import hashlib
 import inspect
 
 import decorator
 from oslo_log import log
+from oslo_serialization import jsonutils
 
 from delfin import coordination
 from delfin import db
@@ -29,6 +32,26 @@ from delfin.i18n import _
 
 LOG = log.getLogger(__name__)
 
+# Syncs run and syncs skipped as the resources listed did not change since
+# the previous sync, with the resource rows those did not write
+_sync_stats = collections.Counter()
+
+
+def get_sync_stats():
+    return dict(_sync_stats)
+
+
+def resources_digest(resources):
+    """Digest of a list of resources listed by a driver, regardless of
+    their order.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    for resource in sorted(jsonutils.dumps(resource, sort_keys=True)
+                           for resource in resources):
+        digest.update(resource.encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
 
 def set_synced_after():
     @decorator.decorator
@@ -41,6 +64,10 @@ def set_synced_after():
             ret = func(*args, **kwargs)
         except Exception:
             sync_result = constants.ResourceSync.FAILED
+        if self.periodic:
+            # Periodic syncs are not counted in the sync status, which
+            # tracks the syncs requested by the user
+            return ret
         lock = coordination.Lock(self.storage_id)
         with lock:
             try:
@@ -77,6 +104,8 @@ def check_deleted():
                       % self.storage_id)
         else:
             self.remove()
+            db.resource_digest_delete(self.context, self.storage_id,
+                                      type(self).__name__)
         self.context.read_deleted = 'no'
         return ret
 
@@ -156,11 +185,43 @@ def _build_port_group_relations(ctx, storage_id, port_groups):
 
 class StorageResourceTask(object):
     NATIVE_RESOURCE_ID = None
+    # Type of the resources in constants.ResourceType, of which the change
+    # version is bumped when the resources of a storage change
+    RESOURCE_TYPE = None
 
     def __init__(self, context, storage_id):
         self.storage_id = storage_id
         self.context = context
         self.driver_api = driverapi.API()
+        self.periodic = False
+        self.digest = None
+
+    def _is_unchanged(self, storage_resources):
+        """Whether the resources listed are the ones written by the
+        previous sync, by their digest, which is saved by _save_digest once
+        the resources are written.
+        """
+        resource_task = type(self).__name__
+        self.digest = resources_digest(storage_resources)
+        previous_digest = db.resource_digest_get(
+            self.context, self.storage_id, resource_task)
+        _sync_stats['syncs'] += 1
+        if previous_digest == self.digest:
+            _sync_stats['unchanged_syncs'] += 1
+            _sync_stats['writes_avoided'] += len(storage_resources)
+            LOG.info('{} sync for storage(id={}) skipped, resources not '
+                     'changed'.format(resource_task, self.storage_id))
+            return True
+        if previous_digest:
+            # Resources written partly are not taken as unchanged
+            db.resource_digest_delete(self.context, self.storage_id,
+                                      resource_task)
+        return False
+
+    def _save_digest(self):
+        if self.digest:
+            db.resource_digest_set(self.context, self.storage_id,
+                                   type(self).__name__, self.digest)
 
     def _classify_resources(self, storage_resources, db_resources, key):
         """
@@ -188,6 +249,23 @@ class StorageResourceTask(object):
 
         return add_list, update_list, delete_id_list
 
+    @staticmethod
+    def _is_changed(update_list, db_resources):
+        """Whether any resource of update_list differs from the database."""
+        db_resources = {resource['id']: resource
+                        for resource in db_resources}
+        for resource in update_list:
+            db_resource = db_resources[resource['id']]
+            for key, value in resource.items():
+                if db_resource.get(key) != value:
+                    return True
+        return False
+
+    def _bump_version(self):
+        if self.RESOURCE_TYPE:
+            db.resource_version_bump(self.context, self.storage_id,
+                                     self.RESOURCE_TYPE)
+
     @check_deleted()
     @set_synced_after()
     def sync(self):
@@ -199,20 +277,33 @@ class StorageResourceTask(object):
         try:
             # list the storage resources from driver and database
             storage_resources = self.driver_list_resources()
+            if self._is_unchanged(storage_resources):
+                return
             db_resources = self.db_resource_get_all(
                 {'storage_id': self.storage_id})
 
             add_list, update_list, delete_id_list = self._classify_resources(
                 storage_resources, db_resources, self.NATIVE_RESOURCE_ID)
 
-            if delete_id_list:
-                self.db_resources_delete(delete_id_list)
-
-            if update_list:
-                self.db_resources_update(update_list)
-
-            if add_list:
-                self.db_resources_create(add_list)
+            # Version is bumped once any change is written, even if a
+            # later write fails
+            wrote = False
+            try:
+                if delete_id_list:
+                    self.db_resources_delete(delete_id_list)
+                    wrote = True
+
+                if update_list:
+                    changed = self._is_changed(update_list, db_resources)
+                    self.db_resources_update(update_list)
+                    wrote = wrote or changed
+
+                if add_list:
+                    self.db_resources_create(add_list)
+                    wrote = True
+            finally:
+                if wrote:
+                    self._bump_version()
         except NotImplementedError:
             # Ignore this exception because driver may not support it.
             pass
@@ -222,6 +313,7 @@ class StorageResourceTask(object):
             LOG.error(msg)
             raise
         else:
+            self._save_digest()
             LOG.info('{} sync for storage(id={}) successful'.format(
                 self.__class__.__name__, self.storage_id))
 
@@ -229,6 +321,13 @@ class StorageResourceTask(object):
         LOG.info('{} remove for storage(id={})'.format(
             self.__class__.__name__, self.storage_id))
         self.db_resource_delete_by_storage()
+        if self.RESOURCE_TYPE:
+            # Drop the version rather than bump it, the versions of the
+            # storage may be deleted already and a bump would restart from
+            # a version served for the resources listed before. The
+            # generation bumped instead changes the ETags.
+            db.resource_version_delete(self.context, self.storage_id,
+                                       self.RESOURCE_TYPE)
 
     def driver_list_resources(self):
         raise NotImplementedError(
@@ -271,6 +370,8 @@ class StorageDeviceTask(StorageResourceTask):
         try:
             storage = self.driver_api.get_storage(self.context,
                                                   self.storage_id)
+            if self._is_unchanged([storage]):
+                return
 
             db.storage_update(self.context, self.storage_id, storage)
         except Exception as e:
@@ -279,6 +380,7 @@ class StorageDeviceTask(StorageResourceTask):
             LOG.error(msg)
             raise
         else:
+            self._save_digest()
             LOG.info("Syncing storage successful!!!")
 
     def remove(self):
@@ -287,6 +389,9 @@ class StorageDeviceTask(StorageResourceTask):
         try:
             db.storage_delete(self.context, self.storage_id)
             db.access_info_delete(self.context, self.storage_id)
+            db.alert_delete_by_storage(self.context, self.storage_id)
+            db.resource_digest_delete(self.context, self.storage_id)
+            db.resource_version_delete(self.context, self.storage_id)
             db.alert_source_delete(self.context, self.storage_id)
         except Exception as e:
             LOG.error('Failed to update storage entry in DB: {0}'.format(e))
@@ -317,6 +422,7 @@ class StoragePoolTask(StorageResourceTask):
 
 class StorageVolumeTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_volume_id'
+    RESOURCE_TYPE = constants.ResourceType.VOLUME
 
     def driver_list_resources(self):
         return self.driver_api.list_volumes(self.context, self.storage_id)
@@ -361,6 +467,7 @@ class StorageControllerTask(StorageResourceTask):
 
 class StoragePortTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_port_id'
+    RESOURCE_TYPE = constants.ResourceType.PORT
 
     def driver_list_resources(self):
         return self.driver_api.list_ports(self.context, self.storage_id)
@@ -507,6 +614,8 @@ class StorageHostInitiatorTask(StorageResourceTask):
             # Collect the storage host initiator list from driver and database
             storage_host_initiators = self.driver_api \
                 .list_storage_host_initiators(self.context, self.storage_id)
+            if self._is_unchanged(storage_host_initiators):
+                return
             db_storage_host_initiators = db.storage_host_initiators_get_all(
                 self.context, filters={"storage_id": self.storage_id})
 
@@ -538,6 +647,7 @@ class StorageHostInitiatorTask(StorageResourceTask):
                     .format(e))
             LOG.error(msg)
         else:
+            self._save_digest()
             LOG.info("Syncing storage host initiators successful!!!")
 
     def remove(self):
@@ -563,6 +673,8 @@ class StorageHostTask(StorageResourceTask):
             # Collect the storage hosts list from driver and database
             storage_hosts = self.driver_api.list_storage_hosts(
                 self.context, self.storage_id)
+            if self._is_unchanged(storage_hosts):
+                return
             db_storage_hosts = db.storage_hosts_get_all(
                 self.context, filters={"storage_id": self.storage_id})
 
@@ -594,6 +706,7 @@ class StorageHostTask(StorageResourceTask):
                     .format(e))
             LOG.error(msg)
         else:
+            self._save_digest()
             LOG.info("Syncing storage hosts successful!!!")
 
     def remove(self):
@@ -619,6 +732,8 @@ class StorageHostGroupTask(StorageResourceTask):
             # Build relation between host grp and host to be handled here.
             storage_host_groups = self.driver_api \
                 .list_storage_host_groups(self.context, self.storage_id)
+            if self._is_unchanged(storage_host_groups):
+                return
             if storage_host_groups:
                 _build_storage_host_group_relations(
                     self.context, self.storage_id, storage_host_groups)
@@ -656,6 +771,7 @@ class StorageHostGroupTask(StorageResourceTask):
                     .format(e))
             LOG.error(msg)
         else:
+            self._save_digest()
             LOG.info("Syncing storage host groups successful!!!")
 
     def remove(self):
@@ -683,6 +799,8 @@ class PortGroupTask(StorageResourceTask):
             # Build relation between port grp and port to be handled here.
             port_groups = self.driver_api \
                 .list_port_groups(self.context, self.storage_id)
+            if self._is_unchanged(port_groups):
+                return
             if port_groups:
                 _build_port_group_relations(
                     self.context, self.storage_id, port_groups)
@@ -718,6 +836,7 @@ class PortGroupTask(StorageResourceTask):
             msg = _('Failed to sync port groups entry in DB: {0}'.format(e))
             LOG.error(msg)
         else:
+            self._save_digest()
             LOG.info("Syncing port groups successful!!!")
 
     def remove(self):
@@ -745,6 +864,8 @@ class VolumeGroupTask(StorageResourceTask):
             # Build relation between volume grp and volume to be handled here.
             volume_groups = self.driver_api \
                 .list_volume_groups(self.context, self.storage_id)
+            if self._is_unchanged(volume_groups):
+                return
             if volume_groups:
                 _build_volume_group_relations(
                     self.context, self.storage_id, volume_groups)
@@ -780,6 +901,7 @@ class VolumeGroupTask(StorageResourceTask):
             msg = _('Failed to sync volume groups entry in DB: {0}'.format(e))
             LOG.error(msg)
         else:
+            self._save_digest()
             LOG.info("Syncing volume groups successful!!!")
 
     def remove(self):
@@ -805,6 +927,8 @@ class MaskingViewTask(StorageResourceTask):
             # Collect the masking views from driver and database
             masking_views = self.driver_api \
                 .list_masking_views(self.context, self.storage_id)
+            if self._is_unchanged(masking_views):
+                return
             db_masking_views = db.masking_views_get_all(
                 self.context, filters={"storage_id": self.storage_id})
 
@@ -834,6 +958,7 @@ class MaskingViewTask(StorageResourceTask):
             msg = _('Failed to sync masking views entry in DB: {0}'.format(e))
             LOG.error(msg)
         else:
+            self._save_digest()
             LOG.info("Syncing masking views successful!!!")
 
     def remove(self):
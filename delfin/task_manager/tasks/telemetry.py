@@ -13,8 +13,12 @@
 # limitations under the License.
 
 import abc
+import copy
+import time
 
+import eventlet
 import six
+from oslo_config import cfg
 from oslo_log import log
 
 from delfin import context, db
@@ -22,10 +26,63 @@ from delfin import exception
 from delfin.common.constants import TelemetryTaskStatus
 from delfin.drivers import api as driver_api
 from delfin.exporter import base_exporter
+from delfin.exporter import rollup
+from delfin.exporter import watermark
 from delfin.i18n import _
 
+CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
+# Cache of storage id to (expire time, labels added to its metrics)
+_storage_labels = dict()
+
+
+def get_storage_labels(ctx, storage_id):
+    """Get the storage labels added to performance metrics, which are read
+    from DB at most once every storage_label_cache_ttl.
+    """
+    now = time.time()
+    cached = _storage_labels.get(storage_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    storage = db.storage_get(ctx, storage_id)
+    labels = {'name': storage['name'],
+              'serial_number': storage['serial_number']}
+    _storage_labels[storage_id] = \
+        (now + CONF.telemetry.storage_label_cache_ttl, labels)
+    return labels
+
+
+def remove_storage_labels(storage_id):
+    _storage_labels.pop(storage_id, None)
+
+
+class CollectionDeadline(object):
+    """Deadline of a performance collection.
+
+    It is passed to drivers as collection_deadline attribute of the context,
+    drivers doing long or concurrent work can call check() between backend
+    calls to stop early once the collection is cancelled or timed out.
+    """
+
+    def __init__(self, storage_id, timeout):
+        self.storage_id = storage_id
+        self.timeout = timeout
+        self.expire_time = time.time() + timeout
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def expired(self):
+        return self.cancelled or time.time() >= self.expire_time
+
+    def check(self):
+        if self.expired():
+            raise exception.CollectionDeadlineExceeded(self.storage_id,
+                                                       self.timeout)
+
 
 class TelemetryTask(object):
     @abc.abstractmethod
@@ -41,23 +98,42 @@ class PerformanceCollectionTask(TelemetryTask):
     def __init__(self):
         self.driver_api = driver_api.API()
         self.perf_exporter = base_exporter.PerformanceExporterManager()
+        # Number of series collected by the last collection
+        self.series_count = None
 
-    def collect(self, ctx, storage_id, args, start_time, end_time):
+    def collect(self, ctx, storage_id, args, start_time, end_time,
+                timeout=None, deduplicate=True):
+        """Collect performance metrics of the window and export them.
+
+        Points exported before are dropped unless deduplicate is False, as
+        for the backfill of windows missed, which are older than the
+        points exported since.
+        """
+        deadline = None
+        if timeout:
+            # Driver calls are interrupted when deadline is reached, and
+            # the work they spawned can check the deadline to stop
+            deadline = CollectionDeadline(storage_id, timeout)
+            ctx = copy.copy(ctx)
+            ctx.collection_deadline = deadline
         try:
             LOG.debug("Performance collection for storage [%s] with start time"
                       " [%s] and end time [%s]"
                       % (storage_id, start_time, end_time))
-            perf_metrics = self.driver_api \
-                .collect_perf_metrics(ctx, storage_id,
-                                      args,
-                                      start_time, end_time)
+            deadline_exceeded = exception.CollectionDeadlineExceeded(
+                storage_id, timeout)
+            with eventlet.Timeout(timeout, deadline_exceeded):
+                perf_metrics = self.driver_api \
+                    .collect_perf_metrics(ctx, storage_id,
+                                          args,
+                                          start_time, end_time)
+            self.series_count = len(perf_metrics)
 
             # Fill extra labels to metric by fetching metadata from resource DB
             try:
-                storage_details = db.storage_get(ctx, storage_id)
+                labels = get_storage_labels(ctx, storage_id)
                 for m in perf_metrics:
-                    m.labels["name"] = storage_details.name
-                    m.labels["serial_number"] = storage_details.serial_number
+                    m.labels.update(labels)
             except exception.StorageNotFound:
                 LOG.warning(f'Storage(id={storage_id}) has been removed.')
                 return TelemetryTaskStatus.TASK_EXEC_STATUS_SUCCESS
@@ -67,8 +143,25 @@ class PerformanceCollectionTask(TelemetryTask):
                 LOG.error(msg)
                 return TelemetryTaskStatus.TASK_EXEC_STATUS_FAILURE
 
-            self.perf_exporter.dispatch(context, perf_metrics)
+            watermarks = None
+            if deduplicate and CONF.telemetry.export_deduplication:
+                store = watermark.WatermarkStore()
+                perf_metrics, watermarks = store.filter(perf_metrics)
+            rollups = None
+            if CONF.performance_rollup_windows:
+                # Windows missed are rolled up on their own on backfill
+                rollups = rollup.RollupEngine().process(
+                    perf_metrics, end_time, streaming=deduplicate)
+            self.perf_exporter.dispatch(context, perf_metrics,
+                                        rollups=rollups)
+            if watermarks:
+                store.commit(watermarks)
             return TelemetryTaskStatus.TASK_EXEC_STATUS_SUCCESS
+        except exception.CollectionDeadlineExceeded as e:
+            if deadline:
+                deadline.cancel()
+            LOG.warning(six.text_type(e))
+            return TelemetryTaskStatus.TASK_EXEC_STATUS_FAILURE
         except Exception as e:
             LOG.error("Failed to collect performance metrics for "
                       "storage id :{0}, reason:{1}".format(storage_id,
@@ -0,0 +1,97 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the latency of a page of the alerts of a storage in a time
+range, filtered in memory from the whole alert log as listed live, and
+read from the alert store, on a sqlite database.
+
+Usage: python -m delfin.tests.benchmark.alert_list_benchmark
+           [alerts] [page size] [repeats]
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+from oslo_config import cfg
+
+from delfin.common import alert_util
+from delfin.common import config  # noqa
+from delfin import context
+from delfin import db
+from delfin.tests.benchmark import pagination_benchmark
+
+CONF = cfg.CONF
+STORAGE = {'id': 'storage-1', 'name': 'storage1', 'vendor': 'vendor',
+           'model': 'model', 'serial_number': 'serial'}
+
+
+def _alerts(count):
+    return [{'alert_id': str(i), 'sequence_number': i,
+             'alert_name': 'alert%d' % i, 'severity': 'Major',
+             'category': 'Fault', 'type': 'EquipmentAlarm',
+             'location': 'location%d' % i, 'description': 'description',
+             'occur_time': 1000000 + i * 1000}
+            for i in range(count)]
+
+
+def _live_page(alerts, query_para, limit):
+    # The whole log is parsed again, filtered and enriched per alert
+    page = []
+    for alert in alerts:
+        alert = dict(alert)
+        if alert_util.is_alert_in_time_range(query_para,
+                                             alert['occur_time']):
+            alert_util.fill_storage_attributes(alert, STORAGE)
+            page.append(alert)
+    page.sort(key=lambda alert: alert['occur_time'], reverse=True)
+    return page[:limit]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        CONF.set_override('connection', 'sqlite:///' +
+                          os.path.join(data_dir, 'delfin.sqlite'),
+                          'database')
+        db.register_db()
+        ctxt = context.get_admin_context()
+        alerts = _alerts(count)
+        for alert in alerts:
+            alert_util.fill_storage_attributes(alert, STORAGE)
+        db.alerts_upsert(ctxt, STORAGE['id'], alerts)
+
+        print("alerts: %d, page size: %d" % (count, limit))
+        print("%-30s %12s %12s" % ('time range', 'live (ms)', 'store (ms)'))
+        for name, begin in (('last hour', count * 1000 - 3600 * 1000),
+                            ('last day', count * 1000 - 86400 * 1000),
+                            ('all', 0)):
+            query_para = {'begin_time': 1000000 + max(begin, 0)}
+            live_ms = pagination_benchmark._measure(
+                lambda: _live_page(alerts, query_para, limit), repeats)
+            store_ms = pagination_benchmark._measure(
+                lambda: db.alert_get_all(
+                    ctxt, limit=limit, sort_keys=['occur_time'],
+                    filters=dict(query_para, storage_id=STORAGE['id'])),
+                repeats)
+            print("%-30s %12.1f %12.1f" % (name, live_ms, store_ms))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
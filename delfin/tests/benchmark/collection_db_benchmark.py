@@ -0,0 +1,111 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Count the DB calls of performance collection cycles with fake driver.
+
+Usage: python -m delfin.tests.benchmark.collection_db_benchmark
+           [storages] [cycles] [interval]
+"""
+import collections
+import sys
+from unittest import mock
+
+from delfin.common import config  # noqa
+from delfin import context
+from delfin import db
+from delfin.drivers import fake_storage
+from delfin.drivers import manager
+from delfin.task_manager.scheduler.schedulers.telemetry import task_cache
+from delfin.task_manager.scheduler.schedulers.telemetry. \
+    performance_collection_handler import PerformanceCollectionHandler
+
+RESOURCE_METRICS = {
+    'storage': {'throughput': {'unit': 'MB/s'},
+                'responseTime': {'unit': 'ms'}},
+}
+
+DB_CALLS = ('task_get', 'storage_get', 'task_update',
+            'task_update_last_run_time')
+
+
+def _fake_db(calls):
+    def _counted(name, result):
+        def _call(ctx, key, *args, **kwargs):
+            calls[name] += 1
+            return result(key)
+        return _call
+
+    return {
+        'task_get': _counted('task_get', lambda task_id: {
+            'id': task_id, 'deleted': False}),
+        'storage_get': _counted('storage_get', lambda storage_id: {
+            'id': storage_id, 'name': 'fake_storage',
+            'serial_number': 'SN_' + storage_id}),
+        'task_update': _counted('task_update', lambda task_id: 1),
+        'task_update_last_run_time': _counted(
+            'task_update_last_run_time', len),
+    }
+
+
+def main():
+    storages = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    interval = int(sys.argv[3]) if len(sys.argv) > 3 else 60
+
+    ctx = context.get_admin_context()
+    drivers = manager.DriverManager()
+    calls = collections.Counter()
+    patches = [mock.patch.object(db, name, func)
+               for name, func in _fake_db(calls).items()]
+    # Fake driver sleeps to simulate backend latency, not relevant here
+    patches.append(mock.patch.object(fake_storage.greenthread, 'sleep'))
+    patches.append(mock.patch('delfin.exporter.base_exporter.'
+                              'PerformanceExporterManager.dispatch'))
+    for patch in patches:
+        patch.start()
+
+    try:
+        handlers = []
+        for i in range(storages):
+            storage_id = 'storage_%d' % i
+            drivers.update_driver(storage_id, fake_storage.FakeStorageDriver(
+                storage_id=storage_id))
+            handlers.append(PerformanceCollectionHandler(
+                ctx, i, storage_id, RESOURCE_METRICS, interval, 'node'))
+
+        for _ in range(cycles):
+            for handler in handlers:
+                handler()
+            # One flush every cycle at most, as flush interval is usually
+            # shorter than collection interval
+            task_cache.TaskStateCache().flush()
+    finally:
+        for patch in patches:
+            patch.stop()
+        for i in range(storages):
+            drivers.remove_driver('storage_%d' % i)
+
+    total = sum(calls[name] for name in DB_CALLS)
+    per_cycle = total / cycles
+    print("storages: %d, cycles: %d, interval: %ds"
+          % (storages, cycles, interval))
+    for name in DB_CALLS:
+        print("  %-26s %8d" % (name, calls[name]))
+    print("DB calls per cycle: %.1f (%.2f per storage)"
+          % (per_cycle, per_cycle / storages))
+    print("DB QPS: %.2f, without caches: %.2f"
+          % (per_cycle / interval, 3.0 * storages / interval))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure scheduling jitter and throughput of the collection scheduler.
+
+Usage: python -m delfin.tests.benchmark.collection_scheduler_benchmark
+           [jobs] [interval] [duration] [workers]
+"""
+import sys
+import time
+
+from delfin.common import config  # noqa
+from delfin.task_manager.scheduler.collection_scheduler import \
+    CollectionScheduler
+from delfin.task_manager.scheduler.schedulers.telemetry.job_handler import \
+    get_next_collection_time
+
+
+def _collect():
+    pass
+
+
+def main():
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    interval = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    duration = int(sys.argv[3]) if len(sys.argv) > 3 else 120
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else 100
+
+    scheduler = CollectionScheduler(max_workers=workers)
+    scheduler.start()
+    current_time = int(time.time())
+    start = time.perf_counter()
+    for task_id in range(jobs):
+        scheduler.add_job(_collect, 'interval', seconds=interval,
+                          next_run_time=get_next_collection_time(
+                              task_id, interval, current_time),
+                          id=str(task_id),
+                          misfire_grace_time=interval / 2)
+    add_time = time.perf_counter() - start
+
+    time.sleep(duration)
+    start = time.perf_counter()
+    for task_id in range(jobs):
+        scheduler.remove_job(str(task_id))
+    remove_time = time.perf_counter() - start
+    scheduler.shutdown()
+
+    stats = scheduler.get_stats()
+    print("jobs: %d, interval: %ds, duration: %ds, workers: %d"
+          % (jobs, interval, duration, workers))
+    print("add: %.1f us/job, remove: %.1f us/job"
+          % (add_time * 1e6 / jobs, remove_time * 1e6 / jobs))
+    print("runs: %d (%.0f runs/s), expected %d"
+          % (stats['runs'], stats['runs'] / duration,
+             jobs * duration / interval))
+    print("skipped: %d, misfired: %d" % (stats['skipped'],
+                                         stats['misfired']))
+    print("jitter average: %.1f ms, max: %.1f ms"
+          % (stats['average_jitter'] * 1000, stats['max_jitter'] * 1000))
+
+
+if __name__ == '__main__':
+    main()
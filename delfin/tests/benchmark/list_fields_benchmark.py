@@ -0,0 +1,78 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure time, peak memory and response size of volume list pages, of
+all fields and of a few fields, on a sqlite database.
+
+Usage: python -m delfin.tests.benchmark.list_fields_benchmark
+           [volumes] [page size] [fields]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from oslo_config import cfg
+from oslo_serialization import jsonutils
+
+from delfin.api.v1 import volumes
+from delfin import db
+from delfin.tests.benchmark import pagination_benchmark
+from delfin.tests.unit.api import fakes
+
+CONF = cfg.CONF
+
+
+def _measure(controller, url):
+    req = fakes.HTTPRequest.blank(url)
+    tracemalloc.start()
+    start = time.time()
+    body = jsonutils.dumps(controller.index(req))
+    duration = time.time() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration * 1000, peak / 1024, len(body) / 1024
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    fields = sys.argv[3] if len(sys.argv) > 3 else 'id,name,total_capacity'
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        CONF.set_override('connection', 'sqlite:///' +
+                          os.path.join(data_dir, 'delfin.sqlite'),
+                          'database')
+        db.register_db()
+        pagination_benchmark._load(count)
+        controller = volumes.VolumeController()
+
+        print("volumes: %d, page size: %d" % (count, limit))
+        print("%-30s %10s %12s %10s" % ('fields', 'time (ms)', 'peak (KiB)',
+                                        'body (KiB)'))
+        for name, url in (('all', '/volumes?limit=%d' % limit),
+                          (fields, '/volumes?limit=%d&fields=%s'
+                           % (limit, fields))):
+            # First run warms up the caches of the query
+            _measure(controller, url)
+            print("%-30s %10.1f %12.1f %10.1f"
+                  % ((name,) + _measure(controller, url)))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure volume list page latency at depth, with offset, marker and
+keyset cursor pagination, on a sqlite database.
+
+Usage: python -m delfin.tests.benchmark.pagination_benchmark
+           [volumes] [page size] [repeats]
+"""
+import datetime
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from oslo_config import cfg
+
+from delfin.common import config  # noqa
+from delfin.common import sqlalchemyutils
+from delfin import context
+from delfin import db
+from delfin.db.sqlalchemy import api as db_api
+from delfin.db.sqlalchemy import models
+
+CONF = cfg.CONF
+STORAGES = 10
+BATCH = 10000
+
+
+def _load(count):
+    created_at = datetime.datetime(2021, 1, 1)
+    engine = db_api.get_engine()
+    for start in range(0, count, BATCH):
+        engine.execute(models.Volume.__table__.insert(), [
+            {'id': 'volume-%08d' % i,
+             'storage_id': 'storage-%d' % (i % STORAGES),
+             'name': 'volume%d' % i,
+             'native_volume_id': str(i),
+             'status': 'available',
+             # Several volumes per second, as synced in batches
+             'created_at': created_at + datetime.timedelta(seconds=i // 4)}
+            for i in range(start, min(start + BATCH, count))])
+
+
+def _measure(list_page, repeats):
+    durations = []
+    for _ in range(repeats):
+        start = time.time()
+        list_page()
+        durations.append(time.time() - start)
+    return statistics.median(durations) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        CONF.set_override('connection', 'sqlite:///' +
+                          os.path.join(data_dir, 'delfin.sqlite'),
+                          'database')
+        db.register_db()
+        _load(count)
+        ctxt = context.get_admin_context()
+        sort_keys, sort_dirs = ['created_at'], ['desc']
+        rows = db.volume_get_all(ctxt, sort_keys=sort_keys,
+                                 sort_dirs=sort_dirs)
+
+        print("volumes: %d, page size: %d" % (count, limit))
+        print("%10s %12s %12s %12s" % ('depth', 'offset (ms)', 'marker (ms)',
+                                       'cursor (ms)'))
+        for depth in (0, count // 10, count // 2, count - limit - 1):
+            row = rows[depth]
+            cursor = sqlalchemyutils.Cursor.from_row(row, sort_keys,
+                                                     sort_dirs)
+            offset_ms = _measure(lambda: db.volume_get_all(
+                ctxt, None, limit, sort_keys, sort_dirs,
+                offset=depth + 1), repeats)
+            marker_ms = _measure(lambda: db.volume_get_all(
+                ctxt, row['id'], limit, sort_keys, sort_dirs), repeats)
+            cursor_ms = _measure(lambda: db.volume_get_all(
+                ctxt, cursor, limit), repeats)
+            print("%10d %12.1f %12.1f %12.1f" % (depth, offset_ms, marker_ms,
+                                                 cursor_ms))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Simulate the peak of concurrent collections when all the tasks are
+scheduled at the same time, as on boot or rebalance.
+
+Usage: python -m delfin.tests.benchmark.phase_spread_benchmark
+           [tasks] [interval] [max collection duration]
+"""
+import random
+import sys
+
+from delfin.task_manager.scheduler.schedulers.telemetry.job_handler import \
+    get_next_collection_time
+
+
+def peak_concurrency(start_times, durations):
+    events = []
+    for start_time, duration in zip(start_times, durations):
+        events.append((start_time, 1))
+        events.append((start_time + duration, -1))
+    # Collections ending at a time are counted before the ones starting
+    events.sort(key=lambda event: (event[0], event[1]))
+    peak = running = 0
+    for _, change in events:
+        running += change
+        peak = max(peak, running)
+    return peak
+
+
+def main():
+    tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    interval = int(sys.argv[2]) if len(sys.argv) > 2 else 900
+    max_duration = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+
+    random.seed(0)
+    current_time = 1616560337
+    durations = [random.uniform(1, max_duration) for _ in range(tasks)]
+    task_ids = range(tasks)
+
+    same_time = [current_time + interval for _ in task_ids]
+    spread = [get_next_collection_time(task_id, interval, current_time)
+              for task_id in task_ids]
+
+    print("tasks: %d, interval: %ds, collection duration: 1-%.0fs"
+          % (tasks, interval, max_duration))
+    print("peak concurrent collections, now + interval: %d"
+          % peak_concurrency(same_time, durations))
+    print("peak concurrent collections, phase spread:   %d"
+          % peak_concurrency(spread, durations))
+    print("ideal: %.1f" % (sum(durations) / interval))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the time and the database writes of periodic volume syncs of a
+fleet whose volumes do not change, on a sqlite database.
+
+Usage: python -m delfin.tests.benchmark.resource_sync_benchmark
+           [storages] [volumes per storage]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from oslo_config import cfg
+from sqlalchemy import event
+
+from delfin.common import config  # noqa
+from delfin import context
+from delfin import db
+from delfin.db.sqlalchemy import api as db_api
+from delfin.task_manager.tasks import resources
+
+CONF = cfg.CONF
+
+
+def _list_volumes(ctxt, storage_id, count):
+    return [{'storage_id': storage_id,
+             'name': 'volume%d' % i,
+             'native_volume_id': str(i),
+             'status': 'available',
+             'type': 'thin',
+             'total_capacity': 1 << 30,
+             'used_capacity': 1 << 29,
+             'free_capacity': 1 << 29}
+            for i in range(count)]
+
+
+def _sync_all(ctxt, storage_ids):
+    for storage_id in storage_ids:
+        task = resources.StorageVolumeTask(ctxt, storage_id)
+        task.periodic = True
+        task.sync()
+
+
+def main():
+    storages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    volumes = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        CONF.set_override('connection', 'sqlite:///' +
+                          os.path.join(data_dir, 'delfin.sqlite'),
+                          'database')
+        db.register_db()
+        ctxt = context.get_admin_context()
+        storage_ids = ['storage-%d' % i for i in range(storages)]
+        for storage_id in storage_ids:
+            db.storage_create(ctxt, {'id': storage_id, 'sync_status': 0})
+
+        writes = []
+
+        @event.listens_for(db_api.get_engine(), 'after_cursor_execute')
+        def count_writes(conn, cursor, statement, *args):
+            if statement.split(None, 1)[0] in ('INSERT', 'UPDATE',
+                                               'DELETE'):
+                writes.append(max(cursor.rowcount, 1))
+
+        print("storages: %d, volumes per storage: %d" % (storages, volumes))
+        print("%-30s %10s %14s" % ('sync', 'time (ms)', 'rows written'))
+        with mock.patch('delfin.drivers.api.API.list_volumes',
+                        lambda self, ctxt, storage_id: _list_volumes(
+                            ctxt, storage_id, volumes)):
+            for name in ('first', 'unchanged'):
+                del writes[:]
+                start = time.time()
+                _sync_all(ctxt, storage_ids)
+                print("%-30s %10.1f %14d" % (name,
+                                             (time.time() - start) * 1000,
+                                             sum(writes)))
+            # Without the digests, as before
+            db_api.get_engine().execute('DELETE FROM resource_digests')
+            with mock.patch.object(resources.StorageVolumeTask,
+                                   '_is_unchanged', return_value=False):
+                del writes[:]
+                start = time.time()
+                _sync_all(ctxt, storage_ids)
+                print("%-30s %10.1f %14d" % ('unchanged, no digest',
+                                             (time.time() - start) * 1000,
+                                             sum(writes)))
+        print("resource writes avoided: %d"
+              % resources.get_sync_stats()['writes_avoided'])
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
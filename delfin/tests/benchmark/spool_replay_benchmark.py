@@ -0,0 +1,75 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure spool and replay throughput of the exporter spool, with
+batches of performance metrics as collected from a storage.
+
+Usage: python -m delfin.tests.benchmark.spool_replay_benchmark
+           [records] [metrics per record] [points per metric]
+"""
+import json
+import shutil
+import sys
+import tempfile
+import time
+
+from oslo_serialization import msgpackutils
+
+from delfin.exporter import spool
+
+
+def _record(metrics, points):
+    return [['throughput',
+             {'storage_id': '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6',
+              'resource_type': 'volume', 'resource_id': 'volume%d' % i,
+              'type': 'RAW', 'unit': 'IOPS'},
+             [[1622808000000 + j * 60000, 61.9388895680357]
+              for j in range(points)]]
+            for i in range(metrics)]
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    metrics = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    points = int(sys.argv[3]) if len(sys.argv) > 3 else 15
+
+    data = _record(metrics, points)
+    path = tempfile.mkdtemp()
+    try:
+        exporter_spool = spool.Spool(path, segment_size=16 * 1024 * 1024,
+                                     max_size=1024 ** 4)
+        start = time.perf_counter()
+        for _ in range(records):
+            exporter_spool.append(msgpackutils.dumps(data))
+        append_time = time.perf_counter() - start
+        size = exporter_spool.size()
+
+        start = time.perf_counter()
+        replayed = exporter_spool.replay(msgpackutils.loads,
+                                         rate=float('inf'))
+        replay_time = time.perf_counter() - start
+    finally:
+        shutil.rmtree(path)
+
+    print("records: %d, metrics per record: %d, points per metric: %d"
+          % (records, metrics, points))
+    print("record size: %d bytes, json: %d bytes"
+          % (size / records, len(json.dumps(data))))
+    print("spool: %.0f records/s, %.1f MB/s"
+          % (records / append_time, size / append_time / 1e6))
+    print("replay: %d records, %.0f records/s, %.1f MB/s"
+          % (replayed, replayed / replay_time, size / replay_time / 1e6))
+
+
+if __name__ == '__main__':
+    main()
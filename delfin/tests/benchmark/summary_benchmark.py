@@ -0,0 +1,80 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the capacity summary of the volumes of a storage, summed by
+the database and summed over the volume rows listed, on a sqlite
+database.
+
+Usage: python -m delfin.tests.benchmark.summary_benchmark
+           [volumes] [repeats]
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+from oslo_config import cfg
+
+from delfin import context
+from delfin import db
+from delfin.db.sqlalchemy import api as db_api
+from delfin.tests.benchmark import pagination_benchmark
+
+CONF = cfg.CONF
+
+
+def _sum_rows(ctxt, storage_id):
+    summary = dict(count=0, total_capacity=0, used_capacity=0)
+    for volume in db.volume_get_all(ctxt, filters={'storage_id': storage_id}):
+        summary['count'] += 1
+        summary['total_capacity'] += volume['total_capacity'] or 0
+        summary['used_capacity'] += volume['used_capacity'] or 0
+    return summary
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    data_dir = tempfile.mkdtemp()
+    try:
+        CONF.set_override('connection', 'sqlite:///' +
+                          os.path.join(data_dir, 'delfin.sqlite'),
+                          'database')
+        db.register_db()
+        pagination_benchmark._load(count)
+        ctxt = context.get_admin_context()
+        storage_id = 'storage-0'
+        db.storage_create(ctxt, {'id': storage_id})
+
+        plan = db_api.get_engine().execute(
+            'EXPLAIN QUERY PLAN SELECT status, count(*), '
+            'sum(total_capacity), sum(used_capacity), sum(free_capacity) '
+            'FROM volumes WHERE storage_id = ? GROUP BY status',
+            storage_id).fetchall()
+        print("volumes: %d, of the storage: %d" % (
+            count, len(range(0, count, pagination_benchmark.STORAGES))))
+        print("query plan: %s" % '; '.join(row[-1] for row in plan))
+        print("%-20s %12s" % ('summary', 'time (ms)'))
+        for name, func in (
+                ('database', lambda: db.storage_resource_summary_get(
+                    ctxt, storage_id)),
+                ('rows', lambda: _sum_rows(ctxt, storage_id))):
+            print("%-20s %12.1f" % (name, pagination_benchmark._measure(
+                func, repeats)))
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
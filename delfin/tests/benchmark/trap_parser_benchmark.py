@@ -0,0 +1,114 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the trap parsing throughput of the drivers.
+
+Usage: python -m delfin.tests.benchmark.trap_parser_benchmark [count]
+"""
+import sys
+import time
+
+from delfin.common import config  # noqa
+from delfin.drivers.dell_emc.unity import alert_handler as unity_alert
+from delfin.drivers.dell_emc.vmax.alert_handler import snmp_alerts
+from delfin.drivers.hpe.hpe_3par import alert_handler as hpe_3par_alert
+from delfin.drivers.huawei.oceanstor import alert_handler as oceanstor_alert
+from delfin.drivers.ibm.storwize_svc import ssh_handler as storwize_ssh
+
+OCEANSTOR_TRAP = {
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.1.0': 'Array',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.2.0': 'location=location1',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.3.0': 'Recovery advice',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.4.0': 'Trap Test Alarm',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.5.0': '2',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.6.0': '1',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.7.0': '4294967294',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.8.0': '2020-6-25,1:42:26.0',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.9.0': '4294967295',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.10.0': 'Trap Test Alarm',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.11.0': '1',
+    '1.3.6.1.6.3.1.1.4.1.0': '1.3.6.1.4.1.2011.2.91.10.2.1.0.1',
+}
+
+VMAX_TRAP = {
+    '1.3.6.1.3.94.1.11.1.3.0': 79,
+    '1.3.6.1.3.94.1.6.1.20.0': '000192601409',
+    '1.3.6.1.3.94.1.11.1.7.0': 'topology',
+    '1.3.6.1.3.94.1.11.1.9.0': 'Symmetrix 000192601409 FastSRP '
+                               'SRP_1 : Remote (SRDF) diagnostic '
+                               'event trace triggered.',
+    '1.3.6.1.3.94.1.11.1.6.0': '6',
+    '1.3.6.1.3.94.1.6.1.3.0': 'storage-subsystem',
+    '1.3.6.1.4.1.1139.3.8888.1.0.0': 'symmetrix',
+    '1.3.6.1.4.1.1139.3.8888.2.0.0': '1050',
+    '1.3.6.1.4.1.1139.3.8888.3.0.0': '1051',
+    '1.3.6.1.4.1.1139.3.8888.4.0.0': 'SRP_1',
+}
+
+HPE_3PAR_TRAP = {
+    '1.3.6.1.4.1.12925.1.7.1.8.1': '3407085587',
+    '1.3.6.1.4.1.12925.1.7.1.2.1': '6',
+    '1.3.6.1.4.1.12925.1.7.1.9.1': '1',
+    '1.3.6.1.4.1.12925.1.7.1.7.1': '49',
+    '1.3.6.1.4.1.12925.1.7.1.3.1': '2021-01-20 09:53:26 CST',
+    '1.3.6.1.4.1.12925.1.7.1.6.1': 'test alert',
+    '1.3.6.1.4.1.12925.1.7.1.5.1': 'test component',
+}
+
+UNITY_TRAP = {
+    '1.3.6.1.2.1.1.3.0': '0',
+    '1.3.6.1.6.3.1.1.4.1.0': '1.3.6.1.4.1.1139.103.1.18.2.0',
+    '1.3.6.1.4.1.1139.103.1.18.1.1': 'spa',
+    '1.3.6.1.4.1.1139.103.1.18.1.3': '14:60bba',
+    '1.3.6.1.4.1.1139.103.1.18.1.4': 'test alert',
+    '1.3.6.1.4.1.1139.103.1.18.1.5': '2020/11/20 14:10:10',
+    '1.3.6.1.4.1.1139.103.1.18.1.2': 'test component',
+}
+
+STORWIZE_TRAP = {
+    '1.3.6.1.2.1.1.3.0': '0',
+    '1.3.6.1.6.3.1.1.4.1.0': '1.3.6.1.4.1.2.6.190.3',
+    '1.3.6.1.4.1.2.6.190.4.3': '# Error ID = 981004 : FC discovery '
+                               'occurred',
+    '1.3.6.1.4.1.2.6.190.4.9': '# Error Sequence Number = 165',
+    '1.3.6.1.4.1.2.6.190.4.10': '# Timestamp = Tue Nov 10 09:08:27 2020',
+    '1.3.6.1.4.1.2.6.190.4.11': '# Object Type = cluster',
+    '1.3.6.1.4.1.2.6.190.4.17': '# Object Name = Cluster_1',
+}
+
+PARSERS = (
+    ('oceanstor', oceanstor_alert.AlertHandler().parse_alert,
+     OCEANSTOR_TRAP),
+    ('vmax', snmp_alerts.AlertHandler().parse_alert, VMAX_TRAP),
+    ('hpe_3par', hpe_3par_alert.AlertHandler().parse_alert, HPE_3PAR_TRAP),
+    ('unity', unity_alert.AlertHandler().parse_alert, UNITY_TRAP),
+    ('storwize', lambda context, alert:
+     storwize_ssh.SSHHandler.parse_alert(alert), STORWIZE_TRAP),
+)
+
+
+def run(parse, trap, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        parse(None, dict(trap))
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for name, parse, trap in PARSERS:
+        print("%-10s %12.0f traps/s" % (name, run(parse, trap, count)))
+
+
+if __name__ == '__main__':
+    main()
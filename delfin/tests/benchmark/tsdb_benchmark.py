@@ -0,0 +1,99 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure ingest rate and range query latency of the local time series
+store, with collections of minute level points of a storage.
+
+Usage: python -m delfin.tests.benchmark.tsdb_benchmark
+           [resources] [collections] [points per collection]
+"""
+import pathlib
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from delfin.common.constants import metric_struct
+from delfin.exporter.tsdb import store
+
+STORAGE_ID = '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6'
+METRICS = ('iops', 'throughput', 'response_time')
+
+
+def _collection(resources, start_time, points):
+    return [metric_struct(name=name,
+                          labels={'storage_id': STORAGE_ID,
+                                  'resource_type': 'volume',
+                                  'resource_id': 'volume%d' % i,
+                                  'type': 'RAW', 'unit': 'IOPS'},
+                          values={start_time + j * 60000:
+                                  round(random.uniform(0, 100), 1)
+                                  for j in range(points)})
+            for name in METRICS for i in range(resources)]
+
+
+def main():
+    resources = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    collections = int(sys.argv[2]) if len(sys.argv) > 2 else 96
+    points = int(sys.argv[3]) if len(sys.argv) > 3 else 15
+
+    random.seed(0)
+    data_dir = tempfile.mkdtemp()
+    try:
+        tsdb = store.TimeSeriesStore(data_dir)
+        tsdb.last_retention_check = time.time()
+        start_time = int(time.time() / 86400) * 86400000
+        ingest_time = 0
+        for n in range(collections):
+            metrics = _collection(resources, start_time + n * points * 60000,
+                                  points)
+            start = time.perf_counter()
+            tsdb.append(metrics)
+            ingest_time += time.perf_counter() - start
+        total_points = len(METRICS) * resources * collections * points
+        size = sum(path.stat().st_size
+                   for path in pathlib.Path(data_dir).rglob('*.blk'))
+
+        end_time = start_time + collections * points * 60000
+        results = []
+        for hours, step in ((1, None), (24, 300000), (24, 3600000)):
+            query_start = max(end_time - hours * 3600000, start_time)
+            start = time.perf_counter()
+            series = tsdb.query(STORAGE_ID, 'response_time', query_start,
+                                end_time, resource_type='volume',
+                                resource_id='volume0', step=step)
+            one_time = time.perf_counter() - start
+            start = time.perf_counter()
+            all_series = tsdb.query(STORAGE_ID, 'response_time',
+                                    query_start, end_time,
+                                    resource_type='volume', step=step)
+            all_time = time.perf_counter() - start
+            results.append((hours, step, len(series[0][1]), one_time,
+                            len(all_series), all_time))
+    finally:
+        shutil.rmtree(data_dir)
+
+    print("series: %d, collections: %d, points per collection: %d"
+          % (len(METRICS) * resources, collections, points))
+    print("ingest: %.0f points/s, %.2f bytes/point"
+          % (total_points / ingest_time, size / total_points))
+    for hours, step, count, one_time, series_count, all_time in results:
+        print("query %dh step %s: one series %d points %.1f ms, "
+              "%d series %.1f ms"
+              % (hours, step and '%ds' % (step // 1000) or 'raw', count,
+                 one_time * 1000, series_count, all_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the per row cost of building the view of volume rows, with a
+deepcopy of the rows and with a projection, and of encoding the list
+response, with jsonutils and with orjson when installed.
+
+Usage: python -m delfin.tests.benchmark.view_serialization_benchmark
+           [rows] [repeats]
+"""
+import copy
+import datetime
+import statistics
+import sys
+import time
+
+from oslo_serialization import jsonutils
+import six
+
+from delfin.api.common import wsgi
+from delfin.api.views import volumes as volume_view
+from delfin.db.sqlalchemy import models
+
+
+def _rows(count):
+    created_at = datetime.datetime(2021, 1, 1)
+    return [models.Volume(id='volume-%08d' % i, storage_id='storage-1',
+                          name='volume%d' % i, native_volume_id=str(i),
+                          status='available', type='thin',
+                          total_capacity=1 << 30, used_capacity=1 << 29,
+                          free_capacity=1 << 29, compressed=False,
+                          deduplicated=False, created_at=created_at)
+            for i in range(count)]
+
+
+def _deepcopy_view(rows):
+    return dict(volumes=[dict(copy.deepcopy(row)) for row in rows])
+
+
+def _measure(func, repeats, count):
+    durations = []
+    for _ in range(repeats):
+        start = time.time()
+        func()
+        durations.append(time.time() - start)
+    return statistics.median(durations) * 1e6 / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rows = _rows(count)
+    body = volume_view.build_volumes(rows)
+    serializer = wsgi.JSONDictSerializer()
+
+    print("rows: %d, orjson installed: %s" % (count, wsgi.orjson is not None))
+    print("%-30s %12s" % ('step', 'per row (us)'))
+    for name, func in (
+            ('view, deepcopy', lambda: _deepcopy_view(rows)),
+            ('view, projection', lambda: volume_view.build_volumes(rows)),
+            ('encode, jsonutils',
+             lambda: six.b(jsonutils.dumps(body))),
+            ('encode, default', lambda: serializer.serialize(body)),
+            ('encode, chunks',
+             lambda: b''.join(serializer.serialize_chunks(body)))):
+        print("%-30s %12.1f" % (name, _measure(func, repeats, count)))
+
+
+if __name__ == '__main__':
+    main()
@@ -34,13 +34,15 @@ class AlertProcessorTestCase(unittest.TestCase):
         alert_processor = alert_processor_class()
         return alert_processor
 
+    @mock.patch('delfin.db.alerts_upsert')
     @mock.patch('delfin.db.storage_get')
     @mock.patch('delfin.drivers.api.API.parse_alert')
     @mock.patch('delfin.exporter.base_exporter'
                 '.AlertExporterManager.dispatch')
     @mock.patch('delfin.context.get_admin_context')
     def test_process_alert_info_success(self, mock_ctxt, mock_export_model,
-                                        mock_parse_alert, mock_storage):
+                                        mock_parse_alert, mock_storage,
+                                        mock_alerts_upsert):
         fake_storage_info = fakes.fake_storage_info()
         input_alert = {'storage_id': 'abcd-1234-56789',
                        'connUnitEventId': 79,
@@ -86,7 +88,10 @@ class AlertProcessorTestCase(unittest.TestCase):
         alert_processor_inst = self._get_alert_processor()
         alert_processor_inst.process_alert_info(input_alert)
 
-        # Verify that model returned by driver is exported
+        # Verify that model returned by driver is stored and exported
+        mock_alerts_upsert.assert_called_once_with(
+            expected_ctxt, input_alert['storage_id'], [expected_alert_model],
+            origin=constants.AlertOrigin.TRAP)
         mock_export_model.assert_called_once_with(expected_ctxt,
                                                   expected_alert_model)
 
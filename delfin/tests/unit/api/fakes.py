@@ -165,6 +165,10 @@ def fake_access_info_get_all(context, marker=None, limit=None, sort_keys=None,
     ]
 
 
+def fake_access_info_get_by_fingerprint(context, fingerprint):
+    return fake_access_info_get_all(context)[0]
+
+
 def fake_sync(self, req, id):
     pass
 
@@ -350,7 +354,8 @@ def fake_update_access_info(self, context, access_info):
 
 def fake_volume_get_all(context, marker=None,
                         limit=None, sort_keys=None,
-                        sort_dirs=None, filters=None, offset=None):
+                        sort_dirs=None, filters=None, offset=None,
+                        fields=None):
     return [
         {
             "created_at": "2020-06-10T07:17:31.157079",
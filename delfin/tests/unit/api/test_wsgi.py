@@ -11,11 +11,15 @@
 #    under the License.
 
 import ddt
+from oslo_serialization import jsonutils
 import six
 import webob
 
+import datetime
 import inspect
+from unittest import mock
 
+from delfin.api.common import response_cache
 from delfin.api.common import wsgi
 from delfin import exception
 from delfin import test
@@ -175,6 +179,18 @@ class JSONDictSerializerTest(test.TestCase):
                                 six.b('')).replace(six.b(' '), six.b(''))
         self.assertEqual(expected_json, result)
 
+    def test_json_datetime(self):
+        input_dict = {'created_at': datetime.datetime(2021, 1, 1)}
+        serializer = wsgi.JSONDictSerializer()
+        self.assertEqual(jsonutils.loads(jsonutils.dumps(input_dict)),
+                         jsonutils.loads(serializer.serialize(input_dict)))
+
+    @mock.patch.object(wsgi, 'orjson', None)
+    def test_json_without_orjson(self):
+        serializer = wsgi.JSONDictSerializer()
+        self.assertEqual(six.b('{"servers": {"a": [2, 3]}}'),
+                         serializer.serialize(dict(servers=dict(a=(2, 3)))))
+
 
 class TextDeserializerTest(test.TestCase):
     def test_dispatch_default(self):
@@ -227,6 +243,89 @@ class ResourceTest(test.TestCase):
         response = req.get_response(app)
         self.assertEqual(403, response.status_int)
 
+    @mock.patch('delfin.api.common.response_cache.get_etag')
+    @mock.patch('delfin.api.common.response_cache.get_cache')
+    def test_resource_cache_response(self, mock_get_cache, mock_get_etag):
+        called = []
+
+        class Controller(object):
+            @wsgi.cache_response('volume')
+            def index(self, req):
+                called.append(1)
+                return {'volumes': []}
+
+        mock_get_cache.return_value = response_cache.ResponseCache(2)
+        mock_get_etag.return_value = 'v1'
+        app = fakes.TestRouter(Controller())
+
+        response = webob.Request.blank('/tests').get_response(app)
+        self.assertEqual(200, response.status_int)
+        self.assertEqual('"v1"', response.headers['ETag'])
+        body = response.body
+        self.assertEqual({'volumes': []}, jsonutils.loads(body))
+
+        # Same list is served from cache
+        response = webob.Request.blank('/tests').get_response(app)
+        self.assertEqual(body, response.body)
+        self.assertEqual('"v1"', response.headers['ETag'])
+        self.assertEqual([1], called)
+
+        req = webob.Request.blank('/tests')
+        req.headers['If-None-Match'] = '"v1"'
+        response = req.get_response(app)
+        self.assertEqual(304, response.status_int)
+        self.assertEqual(six.b(''), response.body)
+
+        # List changed
+        mock_get_etag.return_value = 'v2'
+        response = req.get_response(app)
+        self.assertEqual(200, response.status_int)
+        self.assertEqual('"v2"', response.headers['ETag'])
+        self.assertEqual([1, 1], called)
+
+    @mock.patch('delfin.api.common.response_cache.get_etag')
+    @mock.patch('delfin.api.common.response_cache.get_cache')
+    def test_resource_stream_response(self, mock_get_cache, mock_get_etag):
+        self.override_config('api_stream_min_items', 3)
+        self.override_config('api_stream_chunk_size', 2)
+        volumes = [{'id': str(index)} for index in range(5)]
+
+        class Controller(object):
+            @wsgi.cache_response('volume')
+            def index(self, req):
+                return {'volumes': volumes[:int(req.GET['count'])],
+                        'volumes_links': []}
+
+        mock_get_cache.return_value = response_cache.ResponseCache(2)
+        mock_get_etag.side_effect = lambda req, resource_type: req.path_qs
+        app = fakes.TestRouter(Controller())
+
+        response = webob.Request.blank('/tests?count=2').get_response(app)
+        self.assertIsNotNone(response.content_length)
+        self.assertEqual({'volumes': volumes[:2], 'volumes_links': []},
+                         jsonutils.loads(response.body))
+
+        response = webob.Request.blank('/tests?count=5').get_response(app)
+        self.assertIsNone(response.content_length)
+        chunks = list(response.app_iter)
+        # Braces, brackets of both lists and 3 chunks of volumes
+        self.assertEqual(9, len(chunks))
+        self.assertEqual({'volumes': volumes, 'volumes_links': []},
+                         jsonutils.loads(b''.join(chunks)))
+        # Body is cached once streamed
+        self.assertEqual(b''.join(chunks),
+                         mock_get_cache.return_value.get('/tests?count=5'))
+
+    def test_response_cache_lru(self):
+        cache = response_cache.ResponseCache(2)
+        cache.put('v1', 'body1')
+        cache.put('v2', 'body2')
+        self.assertEqual('body1', cache.get('v1'))
+        cache.put('v3', 'body3')
+        self.assertIsNone(cache.get('v2'))
+        self.assertEqual('body1', cache.get('v1'))
+        self.assertEqual('body3', cache.get('v3'))
+
     def test_dispatch(self):
         class Controller(object):
             def index(self, req, pants=None):
@@ -19,6 +19,7 @@ from oslo_utils import importutils
 
 from delfin import context
 from delfin import exception
+from delfin.db.sqlalchemy import models
 from delfin.tests.unit.api import fakes
 
 
@@ -60,6 +61,7 @@ class AlertControllerTestCase(unittest.TestCase):
         alert_controller = alert_controller_class()
         return alert_controller
 
+    @mock.patch('delfin.db.alerts_delete', mock.Mock())
     @mock.patch('delfin.db.storage_get', fakes.fake_storages_get_all)
     @mock.patch('delfin.drivers.api.API.clear_alert')
     @mock.patch('delfin.task_manager.rpcapi.TaskAPI', mock.Mock())
@@ -92,15 +94,18 @@ class AlertControllerTestCase(unittest.TestCase):
                                alert_controller_inst.delete, req,
                                fake_storage_id, fake_sequence_number)
 
+    @mock.patch('delfin.db.alert_get_all', mock.Mock(return_value=[]))
+    @mock.patch('delfin.db.alerts_upsert')
     @mock.patch('delfin.db.storage_get')
     @mock.patch('delfin.drivers.api.API.list_alerts')
     @mock.patch('delfin.task_manager.rpcapi.TaskAPI', mock.Mock())
     @mock.patch('delfin.api.views.alerts.build_alerts')
     def test_list_alert_success(self, mock_build_alerts, mock_fake_alerts,
-                                mock_fake_storage):
+                                mock_fake_storage, mock_alerts_upsert):
         req = fakes.HTTPRequest.blank('/storages/fake_id/alerts')
         req.GET['begin_time'] = '123400000'
         req.GET['end_time'] = '123500000'
+        req.GET['refresh'] = 'true'
         fake_storage_id = 'abcd-1234-5678'
 
         expected_alert_output = {
@@ -117,7 +122,7 @@ class AlertControllerTestCase(unittest.TestCase):
                                "2. SNMP authentication parameters "
                                "are invalid.",
             'occur_time': 13445566900,
-            'storage_id': fake_storage_id,
+            'storage_id': fake_storage_info()['id'],
             'storage_name': 'storage1',
             'vendor': 'fake vendor',
             'model': 'fake model',
@@ -128,8 +133,41 @@ class AlertControllerTestCase(unittest.TestCase):
 
         alert_controller_inst = self._get_alert_controller()
         alert_controller_inst.show(req, fake_storage_id)
+        mock_fake_alerts.assert_called_once_with(
+            mock.ANY, fake_storage_id, {'begin_time': '123400000',
+                                        'end_time': '123500000'})
+        mock_alerts_upsert.assert_called_once_with(
+            mock.ANY, fake_storage_id, [expected_alert_output])
         self.assertTrue(mock_build_alerts.called_with(expected_alert_output))
 
+    @mock.patch('delfin.db.alert_get_all')
+    @mock.patch('delfin.db.storage_get', mock.Mock())
+    @mock.patch('delfin.drivers.api.API.list_alerts')
+    @mock.patch('delfin.task_manager.rpcapi.TaskAPI', mock.Mock())
+    def test_list_alert_from_store(self, mock_list_alerts,
+                                   mock_alert_get_all):
+        req = fakes.HTTPRequest.blank('/storages/fake_id/alerts')
+        req.GET['begin_time'] = '123400000'
+        req.GET['severity'] = 'Major'
+        req.GET['limit'] = '1'
+        fake_storage_id = 'abcd-1234-5678'
+        alert = dict(fake_alert_list()[0], storage_id=fake_storage_id)
+        mock_alert_get_all.return_value = [models.Alert(
+            id=1, storage_id=fake_storage_id, sequence_number='10',
+            occur_time=alert['occur_time'], alert=alert)]
+
+        alert_controller_inst = self._get_alert_controller()
+        result = alert_controller_inst.show(req, fake_storage_id)
+
+        mock_list_alerts.assert_not_called()
+        mock_alert_get_all.assert_called_once_with(
+            mock.ANY, None, 1, ['occur_time'], ['desc'],
+            {'storage_id': fake_storage_id, 'begin_time': 123400000,
+             'severity': 'Major'}, 0)
+        self.assertEqual([alert], result['alerts'])
+        self.assertEqual(['next'], [link['rel'] for link
+                                    in result['alerts_links']])
+
     @mock.patch('delfin.task_manager.rpcapi.TaskAPI', mock.Mock())
     def test_list_alert_invalid_querypara(self):
         req = fakes.HTTPRequest.blank('/storages/fake_id/alerts')
@@ -0,0 +1,64 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from delfin import exception
+from delfin import test
+from delfin.api.v1.metrics import MetricController
+from delfin.tests.unit.api import fakes
+
+fake_labels = {'storage_id': 'abcd-1234-56789', 'resource_type': 'pool',
+               'resource_id': 'pool0'}
+
+
+class TestMetricController(test.TestCase):
+
+    def setUp(self):
+        super(TestMetricController, self).setUp()
+        self.controller = MetricController()
+        self.controller.store = mock.Mock()
+
+    @mock.patch('delfin.db.storage_get', mock.Mock())
+    def test_show(self):
+        self.controller.store.query.return_value = [
+            (fake_labels, [(1000, 1.0), (61000, 2.0)])]
+        req = fakes.HTTPRequest.blank(
+            '/storages/abcd-1234-56789/metrics?metric=response_time&'
+            'resource_type=pool&start=1000&end=120000&step=60')
+
+        res = self.controller.show(req, 'abcd-1234-56789')
+        self.controller.store.query.assert_called_once_with(
+            'abcd-1234-56789', 'response_time', 1000, 120000,
+            resource_type='pool', resource_id=None, step=60000)
+        self.assertEqual({'metrics': [
+            {'name': 'response_time', 'labels': fake_labels,
+             'values': [[1000, 1.0], [61000, 2.0]]}]}, res)
+
+    @mock.patch('delfin.db.storage_get', mock.Mock())
+    def test_show_invalid_input(self):
+        for query in ('', 'metric=iops&start=abc',
+                      'metric=iops&start=2000&end=1000',
+                      'metric=iops&step=0'):
+            req = fakes.HTTPRequest.blank(
+                '/storages/abcd-1234-56789/metrics?' + query)
+            self.assertRaises(exception.InvalidInput, self.controller.show,
+                              req, 'abcd-1234-56789')
+
+    @mock.patch('delfin.db.storage_get', fakes.fake_storage_get_exception)
+    def test_show_storage_not_found(self):
+        req = fakes.HTTPRequest.blank(
+            '/storages/abcd-1234-56789/metrics?metric=iops')
+        self.assertRaises(exception.StorageNotFound, self.controller.show,
+                          req, 'abcd-1234-56789')
@@ -0,0 +1,154 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+from unittest import mock
+
+import eventlet
+from oslo_utils import timeutils
+
+from delfin import context
+from delfin import db
+from delfin import exception
+from delfin import test
+from delfin.api.v1 import storage_registrations
+from delfin.tests.unit.api import fakes
+
+
+def fake_access_info(index):
+    return {'vendor': 'fake_storage', 'model': 'fake_driver',
+            'rest': {'host': '10.0.%d.%d' % (index // 250, index % 250 + 1),
+                     'port': 8443, 'username': 'user',
+                     'password': 'pass'}}
+
+
+class TestStorageRegistrationController(test.TestCase):
+
+    def _create(self, controller, count):
+        req = fakes.HTTPRequest.blank('/storage-registrations')
+        body = {'storages': [fake_access_info(index)
+                             for index in range(count)]}
+        res = controller.create(req, body=body)
+        self.assertEqual((count, 'running'), (res['pending'], res['status']))
+        # Poll until all the storages are registered
+        while res['status'] == 'running':
+            eventlet.sleep(0.01)
+            res = controller.show(req, res['id'])
+        return res
+
+    @mock.patch('delfin.task_manager.perf_job_controller.create_perf_job')
+    def test_create_with_fake_driver(self, mock_create_perf_job):
+        count = 200
+        # Calls to the fake driver take 0.1 to 0.5 seconds
+        self.override_config('storage_registration_workers', 100)
+        controller = storage_registrations.StorageRegistrationController()
+        controller.storage_controller.task_rpcapi = mock.Mock()
+
+        res = self._create(controller, count)
+        self.assertEqual('finished', res['status'])
+        self.assertEqual((count, count, 0),
+                         (res['total'], res['succeeded'], res['failed']))
+        storage_ids = [item['storage_id'] for item in res['storages']]
+        driver_manager = controller.storage_controller.driver_api.\
+            driver_manager
+        for storage_id in storage_ids:
+            self.addCleanup(driver_manager.remove_driver, storage_id)
+        self.assertEqual(count, len(set(storage_ids)))
+        self.assertEqual(count, len(db.storage_get_all(
+            fakes.HTTPRequest.blank('/').environ['delfin.context'])))
+        self.assertEqual(['10.0.0.1', '10.0.0.200'],
+                         [res['storages'][0]['host'],
+                          res['storages'][-1]['host']])
+
+        # Registered already
+        res = self._create(controller, 2)
+        self.assertEqual((0, 2), (res['succeeded'], res['failed']))
+        self.assertEqual('Storage already exists.',
+                         res['storages'][0]['error'])
+
+    @mock.patch('delfin.task_manager.perf_job_controller.create_perf_job',
+                mock.Mock())
+    def test_create_concurrency_and_timeout(self):
+        self.override_config('storage_registration_workers', 4)
+        self.override_config('storage_registration_timeout', 1)
+        controller = storage_registrations.StorageRegistrationController()
+        storage_controller = controller.storage_controller
+        running = []
+        max_running = []
+
+        def discover_storage(ctxt, access_info):
+            running.append(1)
+            max_running.append(len(running))
+            # First storage does not respond
+            eventlet.sleep(2 if access_info['rest']['host'] == '10.0.0.1'
+                           else 0.01)
+            running.pop()
+            return {'id': access_info['rest']['host']}
+
+        def sync(ctxt, storage_id):
+            # Only the discovery is timed
+            eventlet.sleep(1.5 if storage_id == '10.0.0.2' else 0)
+
+        storage_controller.driver_api = mock.Mock()
+        storage_controller.driver_api.discover_storage.side_effect = \
+            discover_storage
+        storage_controller.task_rpcapi = mock.Mock()
+        storage_controller._storage_exist = mock.Mock(return_value=False)
+        storage_controller._sync = sync
+        res = self._create(controller, 20)
+        self.assertEqual(4, max(max_running))
+        self.assertEqual((19, 1), (res['succeeded'], res['failed']))
+        self.assertEqual('failed', res['storages'][0]['status'])
+        self.assertIn('timed out', res['storages'][0]['error'])
+        self.assertEqual('10.0.0.2', res['storages'][1]['storage_id'])
+
+    def test_show_not_found(self):
+        controller = storage_registrations.StorageRegistrationController()
+        req = fakes.HTTPRequest.blank('/storage-registrations/fake_id')
+        self.assertRaises(exception.StorageRegistrationNotFound,
+                          controller.show, req, 'fake_id')
+
+    def test_cleanup(self):
+        ctxt = context.get_admin_context()
+        now = datetime.datetime(2021, 1, 1)
+        timeutils.set_time_override(now)
+        self.addCleanup(timeutils.clear_time_override)
+        registration = db.storage_registration_create(
+            ctxt, {'total': 3}, [{'host': host, 'status': status}
+                                 for host, status in
+                                 (('10.0.0.1', 'succeeded'),
+                                  ('10.0.0.2', 'running'),
+                                  ('10.0.0.3', 'pending'))])
+        req = fakes.HTTPRequest.blank('/storage-registrations')
+
+        # Items of an API process stopped are failed on start
+        timeutils.set_time_override(now + datetime.timedelta(seconds=60))
+        controller = storage_registrations.StorageRegistrationController()
+        res = controller.show(req, registration['id'])
+        self.assertEqual('running', res['status'])
+        timeutils.set_time_override(now + datetime.timedelta(hours=1))
+        controller = storage_registrations.StorageRegistrationController()
+        res = controller.show(req, registration['id'])
+        self.assertEqual(('finished', 1, 2),
+                         (res['status'], res['succeeded'], res['failed']))
+        self.assertEqual('Registration interrupted',
+                         res['storages'][2]['error'])
+
+        # Finished registrations are deleted beyond retention
+        timeutils.set_time_override(now + datetime.timedelta(days=8))
+        storage_registrations.StorageRegistrationController()
+        self.assertRaises(exception.StorageRegistrationNotFound,
+                          controller.show, req, registration['id'])
+        self.assertEqual([], db.storage_registration_items_get(
+            ctxt, registration['id']))
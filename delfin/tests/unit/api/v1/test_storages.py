@@ -17,6 +17,7 @@ from unittest import mock
 from delfin import db
 from delfin import exception
 from delfin import test
+from delfin import utils
 from delfin.api.v1.storages import StorageController
 from delfin.common import constants
 from delfin.tests.unit.api import fakes
@@ -200,13 +201,13 @@ class TestStorageController(test.TestCase):
                 'subscribed_capacity': 219902325555200
             }))
         self.mock_object(
-            db, 'access_info_get_all',
-            fakes.fake_access_info_get_all)
+            db, 'access_info_get_by_fingerprint',
+            fakes.fake_access_info_get_by_fingerprint)
         self.mock_object(
             db, 'storage_get',
             mock.Mock(side_effect=exception.StorageNotFound('fake_id')))
         self.mock_object(
-            self.controller, 'sync',
+            self.controller, '_sync',
             fakes.fake_sync)
         body = {
             'model': 'fake_driver',
@@ -263,13 +264,13 @@ class TestStorageController(test.TestCase):
                 'subscribed_capacity': 219902325555200
             }))
         self.mock_object(
-            db, 'access_info_get_all',
-            fakes.fake_access_info_get_all)
+            db, 'access_info_get_by_fingerprint',
+            fakes.fake_access_info_get_by_fingerprint)
         self.mock_object(
             db, 'storage_get',
             fakes.fake_storages_show)
         self.mock_object(
-            self.controller, 'sync',
+            self.controller, '_sync',
             fakes.fake_sync)
         body = {
             'model': 'fake_driver',
@@ -288,6 +289,75 @@ class TestStorageController(test.TestCase):
                           self.controller.create,
                           req, body=body)
 
+    def test_create_when_storage_exists_without_fingerprint(self):
+        self.mock_object(
+            db, 'access_info_get_by_fingerprint',
+            mock.Mock(side_effect=exception.AccessInfoNotFound('fake_id')))
+        self.mock_object(
+            db, 'access_info_get_all', fakes.fake_access_info_get_all)
+        mock_access_info_update = self.mock_object(
+            db, 'access_info_update', mock.Mock())
+        self.mock_object(
+            db, 'storage_get',
+            fakes.fake_storages_show)
+        body = {
+            'model': 'fake_driver',
+            'vendor': 'fake_storage',
+            'rest': {
+                'username': 'admin',
+                'password': 'abcd',
+                'host': '10.0.0.76',
+                'port': 1234
+            },
+            'extra_attributes': {'array_id': '0001234567891'}
+        }
+        req = fakes.HTTPRequest.blank(
+            '/storages')
+        self.assertRaises(exception.StorageAlreadyExists,
+                          self.controller.create,
+                          req, body=body)
+        # Fingerprint of the access information saved before is set
+        mock_access_info_update.assert_called_once_with(
+            mock.ANY, '5f5c806d-2e65-473c-b612-345ef43f0642',
+            {'fingerprint': utils.access_info_fingerprint(body)})
+
+    def test_create_arrays_behind_same_endpoint(self):
+        registered = {
+            'model': 'vmax',
+            'vendor': 'dellemc',
+            'rest': {
+                'username': 'admin',
+                'password': 'abcd',
+                'host': '10.0.0.76',
+                'port': 8443
+            },
+            'extra_attributes': {'array_id': '000123456789'}
+        }
+        fingerprint = utils.access_info_fingerprint(registered)
+
+        def fake_get_by_fingerprint(context, _fingerprint):
+            if _fingerprint == fingerprint:
+                return dict(registered, storage_id='fake_id')
+            raise exception.AccessInfoNotFound(_fingerprint)
+
+        self.mock_object(
+            db, 'access_info_get_by_fingerprint', fake_get_by_fingerprint)
+        self.mock_object(db, 'access_info_get_all', mock.Mock(return_value=[]))
+        self.mock_object(db, 'storage_get', fakes.fake_storages_show)
+        mock_discover = self.mock_object(
+            self.controller.driver_api, 'discover_storage',
+            mock.Mock(return_value=fakes.fake_storages_show(
+                None, '5f5c806d-2e65-473c-b612-345ef43f0642')))
+        self.mock_object(self.controller, '_sync', fakes.fake_sync)
+
+        req = fakes.HTTPRequest.blank('/storages')
+        self.assertRaises(exception.StorageAlreadyExists,
+                          self.controller.create, req, body=registered)
+        body = dict(registered,
+                    extra_attributes={'array_id': '000987654321'})
+        self.controller.create(req, body=body)
+        mock_discover.assert_called_once_with(mock.ANY, body)
+
     def test_get_capabilities(self):
         self.mock_object(
             db, 'storage_get',
@@ -377,13 +447,13 @@ class TestStorageController(test.TestCase):
                 'subscribed_capacity': 219902325555200
             }))
         self.mock_object(
-            db, 'access_info_get_all',
-            fakes.fake_access_info_get_all)
+            db, 'access_info_get_by_fingerprint',
+            fakes.fake_access_info_get_by_fingerprint)
         self.mock_object(
             db, 'storage_get',
             mock.Mock(side_effect=exception.StorageNotFound('fake_id')))
         self.mock_object(
-            self.controller, 'sync',
+            self.controller, '_sync',
             fakes.fake_sync)
         body = {
             'model': 'fake_driver',
@@ -470,13 +540,13 @@ class TestStorageController(test.TestCase):
                 'subscribed_capacity': 219902325555200
             }))
         self.mock_object(
-            db, 'access_info_get_all',
-            fakes.fake_access_info_get_all)
+            db, 'access_info_get_by_fingerprint',
+            fakes.fake_access_info_get_by_fingerprint)
         self.mock_object(
             db, 'storage_get',
             mock.Mock(side_effect=exception.StorageNotFound('fake_id')))
 
-        self.mock_object(self.controller, 'sync', fakes.fake_sync)
+        self.mock_object(self.controller, '_sync', fakes.fake_sync)
         body = {
             'model': 'fake_driver',
             'vendor': 'fake_storage',
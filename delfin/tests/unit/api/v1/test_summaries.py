@@ -0,0 +1,58 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from delfin import exception
+from delfin import test
+from delfin.api.v1.summaries import SummaryController
+from delfin.tests.unit.api import fakes
+
+
+class TestSummaryController(test.TestCase):
+
+    def setUp(self):
+        super(TestSummaryController, self).setUp()
+        self.controller = SummaryController()
+
+    @mock.patch('delfin.db.storage_summary_get_all')
+    def test_index(self, mock_summary_get_all):
+        summaries = [{'vendor': 'vendor1', 'count': 2,
+                      'total_capacity': 200, 'used_capacity': 20,
+                      'free_capacity': 180, 'raw_capacity': 0,
+                      'subscribed_capacity': 0}]
+        mock_summary_get_all.return_value = summaries
+        req = fakes.HTTPRequest.blank(
+            '/summary?group_by=vendor,status,vendor&model=model1&id=x')
+
+        res = self.controller.index(req)
+        mock_summary_get_all.assert_called_once_with(
+            mock.ANY, ['vendor', 'status'], {'model': 'model1'})
+        self.assertEqual({'summaries': summaries}, res)
+
+    def test_index_invalid_group_by(self):
+        req = fakes.HTTPRequest.blank('/summary?group_by=vendor,name')
+        self.assertRaises(exception.InvalidInput, self.controller.index,
+                          req)
+
+    @mock.patch('delfin.db.storage_resource_summary_get')
+    def test_show(self, mock_summary_get):
+        summary = {'volumes': {'count': 1, 'status': {'normal': 1},
+                               'total_capacity': 10, 'used_capacity': 4,
+                               'free_capacity': 6}}
+        mock_summary_get.return_value = summary
+        req = fakes.HTTPRequest.blank('/storages/abcd-1234-56789/summary')
+
+        res = self.controller.show(req, 'abcd-1234-56789')
+        self.assertEqual(dict(storage_id='abcd-1234-56789', **summary), res)
@@ -14,10 +14,13 @@
 
 from unittest import mock
 
+from six.moves.urllib import parse
+
 from delfin import db
 from delfin import exception
 from delfin import test
 from delfin.api.v1.volumes import VolumeController
+from delfin.common import sqlalchemyutils
 from delfin.tests.unit.api import fakes
 
 
@@ -129,6 +132,64 @@ class TestVolumeController(test.TestCase):
 
         self.assertDictEqual(expctd_dict, res_dict)
 
+    def test_list_cursor_links(self):
+        mock_get_all = self.mock_object(
+            db, 'volume_get_all',
+            mock.Mock(side_effect=fakes.fake_volume_get_all))
+        req = fakes.HTTPRequest.blank('/volumes?status=available&limit=2')
+
+        links = self.controller.index(req)['volumes_links']
+        self.assertEqual(['next'], [link['rel'] for link in links])
+        path, query = links[0]['href'].split('?')
+        self.assertEqual('http://localhost/v1/volumes', path)
+        params = dict(parse.parse_qsl(query))
+        self.assertEqual({'status': 'available', 'limit': '2'},
+                         {key: value for key, value in params.items()
+                          if key != 'cursor'})
+        cursor = sqlalchemyutils.Cursor.decode(params['cursor'])
+        self.assertEqual(['created_at', 'id'], cursor.sort_keys)
+        self.assertEqual(['2020-06-10T07:17:31.157079',
+                          'dad84a1f-db8d-49ab-af40-048fc3544c12'],
+                         cursor.values)
+        self.assertFalse(cursor.reverse)
+
+        # Page read from the cursor links back to the previous page
+        req = fakes.HTTPRequest.blank(links[0]['href'])
+        links = self.controller.index(req)['volumes_links']
+        self.assertIsInstance(mock_get_all.call_args[0][1],
+                              sqlalchemyutils.Cursor)
+        self.assertEqual(['next', 'prev'], [link['rel'] for link in links])
+        cursor = sqlalchemyutils.Cursor.decode(
+            dict(parse.parse_qsl(links[1]['href'].split('?')[1]))['cursor'])
+        self.assertEqual('d7fe425b-fddc-4ba4-accb-4343c142dc47',
+                         cursor.values[-1])
+        self.assertTrue(cursor.reverse)
+
+        req = fakes.HTTPRequest.blank(links[0]['href'] + '&offset=2')
+        self.assertRaises(exception.InvalidInput, self.controller.index, req)
+        req = fakes.HTTPRequest.blank('/volumes?cursor=invalid')
+        self.assertRaises(exception.InvalidInput, self.controller.index, req)
+
+    def test_list_with_fields(self):
+        mock_get_all = self.mock_object(
+            db, 'volume_get_all',
+            mock.Mock(side_effect=fakes.fake_volume_get_all))
+        req = fakes.HTTPRequest.blank(
+            '/volumes?fields=name,total_capacity,name&limit=2')
+
+        res_dict = self.controller.index(req)
+        # Sort keys are loaded for the cursor of the next page
+        self.assertEqual(['name', 'total_capacity', 'created_at', 'id'],
+                         mock_get_all.call_args[0][7])
+        self.assertEqual([{'name': '004DF', 'total_capacity': 1075838976},
+                          {'name': '004E0', 'total_capacity': 1075838976}],
+                         res_dict['volumes'])
+        self.assertEqual(['next'], [link['rel'] for link in
+                                    res_dict['volumes_links']])
+
+        req = fakes.HTTPRequest.blank('/volumes?fields=name,native_wwn')
+        self.assertRaises(exception.InvalidInput, self.controller.index, req)
+
     def test_show(self):
         self.mock_object(
             db, 'volume_get',
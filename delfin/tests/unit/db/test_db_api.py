@@ -12,10 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import tempfile
 from unittest import mock
 
+import sqlalchemy
+from oslo_db import exception as db_exc
+from oslo_utils import timeutils
+
 from delfin import context, exception
 from delfin import test
+from delfin import utils as delfin_utils
+from delfin.common import constants
+from delfin.common import sqlalchemyutils
 from delfin.db import api as db_api
 from delfin.db.sqlalchemy import api, models
 from delfin.tests.unit import fake_data, utils
@@ -63,6 +72,33 @@ class TestSIMDBAPI(test.TestCase):
     def test_register_db(self):
         db_api.register_db()
 
+    def test_register_db_upgrade(self):
+        db_file = tempfile.NamedTemporaryFile(suffix='.sqlite')
+        self.addCleanup(db_file.close)
+        connection = 'sqlite:///' + db_file.name
+        engine = sqlalchemy.create_engine(connection)
+        # Tables created by a previous version
+        engine.execute('CREATE TABLE tasks (id INTEGER PRIMARY KEY, '
+                       'storage_id VARCHAR(36))')
+        engine.execute('CREATE TABLE access_info (storage_id VARCHAR(36) '
+                       'PRIMARY KEY, vendor VARCHAR(255))')
+        engine.execute("INSERT INTO tasks (id, storage_id) "
+                       "VALUES (1, 'storage1')")
+
+        self.override_config('connection', connection, group='database')
+        db_api.register_db()
+        inspector = sqlalchemy.inspect(engine)
+        self.assertEqual(
+            set(models.Task.__table__.columns.keys()),
+            set(column['name'] for column in inspector.get_columns('tasks')))
+        self.assertIn('idx_access_info_fingerprint',
+                      [index['name'] for index
+                       in inspector.get_indexes('access_info')])
+        self.assertEqual([(1, 'storage1', None)], engine.execute(
+            'SELECT id, storage_id, collection_cost FROM tasks').fetchall())
+        # Upgraded already
+        db_api.register_db()
+
     def test_get_session(self):
         api.get_session()
 
@@ -1166,3 +1202,285 @@ class TestSIMDBAPI(test.TestCase):
         result = db_api.masking_views_delete_by_storage(
             ctxt, masking_view_lst[0]['storage_id'])
         assert result is None
+
+    def test_resource_version_bump(self):
+        db_api.resource_version_bump(ctxt, 'storage1', 'volume')
+        db_api.resource_version_bump(ctxt, 'storage1', 'volume')
+        db_api.resource_version_bump(ctxt, 'storage2', 'volume')
+        db_api.resource_version_bump(ctxt, 'storage1', 'port')
+
+        self.assertEqual({'storage1': 2, 'storage2': 1},
+                         db_api.resource_version_get_all(ctxt, 'volume'))
+        self.assertEqual({'storage2': 1},
+                         db_api.resource_version_get_all(ctxt, 'volume',
+                                                         'storage2'))
+
+        # Deleted versions bump the generations of their resource types
+        db_api.resource_version_delete(ctxt, 'storage1', 'volume')
+        self.assertEqual({'storage1': 1},
+                         db_api.resource_version_get_all(ctxt, 'port'))
+        self.assertEqual({'': 1, 'storage2': 1},
+                         db_api.resource_version_get_all(ctxt, 'volume',
+                                                         'storage2'))
+        db_api.resource_version_delete(ctxt, 'storage1')
+        self.assertEqual({'': 1},
+                         db_api.resource_version_get_all(ctxt, 'port'))
+        self.assertEqual({'': 1, 'storage2': 1},
+                         db_api.resource_version_get_all(ctxt, 'volume'))
+
+        # Resources removed after the versions of their storage
+        db_api.resource_version_delete(ctxt, 'storage1', 'volume')
+        self.assertEqual({'': 2, 'storage2': 1},
+                         db_api.resource_version_get_all(ctxt, 'volume'))
+
+    def test_resource_digest(self):
+        db_api.resource_digest_set(ctxt, 'storage1', 'volume', 'digest1')
+        db_api.resource_digest_set(ctxt, 'storage1', 'port', 'digest2')
+        db_api.resource_digest_set(ctxt, 'storage1', 'volume', 'digest3')
+        self.assertEqual('digest3',
+                         db_api.resource_digest_get(ctxt, 'storage1',
+                                                    'volume'))
+        self.assertIsNone(db_api.resource_digest_get(ctxt, 'storage2',
+                                                     'volume'))
+
+        db_api.resource_digest_delete(ctxt, 'storage1', 'volume')
+        self.assertIsNone(db_api.resource_digest_get(ctxt, 'storage1',
+                                                     'volume'))
+        db_api.resource_digest_delete(ctxt, 'storage1')
+        self.assertIsNone(db_api.resource_digest_get(ctxt, 'storage1',
+                                                     'port'))
+
+    def test_alert_store(self):
+        alerts = [{'sequence_number': i, 'alert_id': str(i),
+                   'severity': 'Major' if i % 2 else 'Minor',
+                   'occur_time': 1000 + i} for i in range(10)]
+        db_api.alerts_upsert(ctxt, 'storage1', alerts)
+        db_api.alerts_upsert(ctxt, 'storage2', alerts[:1])
+        # Alert changed replaces the one of its sequence number
+        db_api.alerts_upsert(ctxt, 'storage1',
+                             [dict(alerts[9], severity='Critical')])
+
+        stored = db_api.alert_get_all(
+            ctxt, limit=3, sort_keys=['occur_time'],
+            filters={'storage_id': 'storage1', 'begin_time': 1002,
+                     'end_time': 1009})
+        self.assertEqual([dict(alerts[9], severity='Critical'), alerts[8],
+                          alerts[7]], [alert.alert for alert in stored])
+        stored = db_api.alert_get_all(
+            ctxt, stored[-1]['id'], sort_keys=['occur_time'],
+            filters={'storage_id': 'storage1', 'begin_time': 1002,
+                     'severity': 'Major'})
+        self.assertEqual([alerts[5], alerts[3]],
+                         [alert.alert for alert in stored])
+
+        db_api.alerts_delete(ctxt, 'storage1', ['9', 8])
+        self.assertEqual(8, len(db_api.alert_get_all(
+            ctxt, filters={'storage_id': 'storage1'})))
+        db_api.alert_delete_by_storage(ctxt, 'storage1',
+                                       datetime.datetime(2000, 1, 1))
+        self.assertEqual(8, len(db_api.alert_get_all(
+            ctxt, filters={'storage_id': 'storage1'})))
+        # Alerts seen again are kept
+        seen_at = datetime.datetime(2100, 1, 1)
+        timeutils.set_time_override(seen_at)
+        self.addCleanup(timeutils.clear_time_override)
+        db_api.alerts_touch(ctxt, 'storage1', [0, '1', None])
+        db_api.alert_delete_by_storage(ctxt, 'storage1', seen_at)
+        self.assertEqual(['1', '0'], [
+            alert.sequence_number for alert in db_api.alert_get_all(
+                ctxt, sort_keys=['occur_time'],
+                filters={'storage_id': 'storage1'})])
+        db_api.alert_delete_by_storage(ctxt, 'storage1')
+        self.assertEqual([], db_api.alert_get_all(
+            ctxt, filters={'storage_id': 'storage1'}))
+        self.assertEqual(1, len(db_api.alert_get_all(ctxt)))
+
+    def test_alert_store_origin(self):
+        trap_alerts = [{'sequence_number': i} for i in range(3)]
+        db_api.alerts_upsert(ctxt, 'storage1', trap_alerts[:2])
+        db_api.alerts_upsert(ctxt, 'storage1', trap_alerts,
+                             origin=constants.AlertOrigin.TRAP)
+        # Alerts listed from the storage stay listed when trapped again
+        db_api.alert_delete_by_storage(ctxt, 'storage1',
+                                       origin=constants.AlertOrigin.LISTED)
+        self.assertEqual(['2'], [alert.sequence_number for alert in
+                                 db_api.alert_get_all(ctxt)])
+
+        # Trap alert listed afterwards becomes a listed one
+        db_api.alerts_touch(ctxt, 'storage1', [2])
+        db_api.alert_delete_by_storage(ctxt, 'storage1',
+                                       origin=constants.AlertOrigin.LISTED)
+        self.assertEqual([], db_api.alert_get_all(ctxt))
+
+    def test_alerts_upsert_concurrently(self):
+        alert = {'sequence_number': 1, 'severity': 'Major'}
+        _alerts_upsert = api._alerts_upsert
+
+        def upsert_after_other(context, session, *args):
+            # A trap stores the same alert in between
+            if not upsert.call_count > 1:
+                _alerts_upsert(context, api.get_session(), *args)
+                raise db_exc.DBDuplicateEntry()
+            _alerts_upsert(context, session, *args)
+
+        with mock.patch.object(api, '_alerts_upsert',
+                               side_effect=upsert_after_other) as upsert:
+            db_api.alerts_upsert(ctxt, 'storage1',
+                                 [dict(alert, severity='Critical')])
+        self.assertEqual(2, upsert.call_count)
+        stored = db_api.alert_get_all(ctxt)
+        self.assertEqual(['Critical'], [alert.severity for alert in stored])
+
+    def test_volume_get_all_by_cursor(self):
+        created_at = datetime.datetime(2021, 1, 1)
+        volumes = [{'id': 'volume%d' % i, 'storage_id': 'storage1',
+                    'name': 'volume%d' % (i % 3),
+                    'created_at': created_at + datetime.timedelta(
+                        seconds=i // 2)}
+                   for i in range(7)]
+        db_api.volumes_create(ctxt, volumes)
+        expected = [volume['id'] for volume in sorted(
+            volumes, key=lambda v: (v['created_at'], v['id']),
+            reverse=True)]
+
+        for sort_keys, sort_dirs in ((None, None),
+                                     (['name'], ['asc']),
+                                     (['name', 'id'], ['asc', 'desc'])):
+            pages = []
+            cursor = None
+            while True:
+                page = db_api.volume_get_all(ctxt, cursor, 3, sort_keys,
+                                             sort_dirs)
+                if not page:
+                    break
+                pages.append([volume['id'] for volume in page])
+                cursor = sqlalchemyutils.Cursor.from_row(
+                    page[-1], sort_keys or ['created_at'],
+                    sort_dirs or ['desc'])
+            all_ids = [volume['id'] for volume in db_api.volume_get_all(
+                ctxt, sort_keys=sort_keys, sort_dirs=sort_dirs)]
+            self.assertEqual(all_ids, sum(pages, []))
+            if sort_keys is None:
+                self.assertEqual(expected, all_ids)
+
+            # Previous page of the last one
+            last = db_api.volume_get_all(ctxt, cursor, 3)
+            cursor = sqlalchemyutils.Cursor.from_row(
+                db_api.volume_get(ctxt, pages[-1][0]),
+                sort_keys or ['created_at'], sort_dirs or ['desc'],
+                reverse=True)
+            self.assertEqual([], last)
+            self.assertEqual(pages[-2], [
+                volume['id']
+                for volume in db_api.volume_get_all(ctxt, cursor, 3)])
+
+        cursor = sqlalchemyutils.Cursor.decode(cursor.encode())
+        self.assertEqual(pages[-2], [
+            volume['id'] for volume in db_api.volume_get_all(ctxt, cursor,
+                                                             3)])
+
+        # Only the columns of the fields are loaded
+        page = db_api.volume_get_all(ctxt, cursor, 3,
+                                     fields=['id', 'name'])
+        self.assertEqual([{'id': volume_id, 'name': 'volume%d' % (
+            int(volume_id[-1]) % 3)} for volume_id in pages[-2]], page)
+
+    def test_storage_summary_get_all(self):
+        for index, (vendor, status) in enumerate((
+                ('vendor1', 'normal'), ('vendor1', 'normal'),
+                ('vendor1', 'abnormal'), ('vendor2', 'normal'))):
+            db_api.storage_create(ctxt, {'id': 'storage%d' % index,
+                                         'vendor': vendor, 'status': status,
+                                         'total_capacity': 100,
+                                         'used_capacity': 10 * index})
+        db_api.storage_delete(ctxt, 'storage3')
+
+        summaries = db_api.storage_summary_get_all(ctxt)
+        self.assertEqual(1, len(summaries))
+        self.assertEqual(3, summaries[0]['count'])
+        self.assertEqual(300, summaries[0]['total_capacity'])
+        self.assertEqual(30, summaries[0]['used_capacity'])
+        self.assertEqual(0, summaries[0]['free_capacity'])
+
+        summaries = db_api.storage_summary_get_all(
+            ctxt, ['vendor', 'status'], {'vendor': 'vendor1'})
+        self.assertEqual([('vendor1', 'abnormal', 1, 20),
+                          ('vendor1', 'normal', 2, 10)],
+                         [(s['vendor'], s['status'], s['count'],
+                           s['used_capacity']) for s in summaries])
+
+    def test_storage_resource_summary_get(self):
+        db_api.storage_create(ctxt, {'id': 'storage1'})
+        db_api.volumes_create(ctxt, [
+            {'id': 'volume%d' % index, 'storage_id': storage_id,
+             'status': status, 'total_capacity': 10, 'used_capacity': 4,
+             'free_capacity': 6}
+            for index, (storage_id, status) in enumerate((
+                ('storage1', 'normal'), ('storage1', 'normal'),
+                ('storage1', 'offline'), ('storage2', 'normal')))])
+
+        summary = db_api.storage_resource_summary_get(ctxt, 'storage1')
+        self.assertEqual({'count': 3,
+                          'status': {'normal': 2, 'offline': 1},
+                          'total_capacity': 30, 'used_capacity': 12,
+                          'free_capacity': 18}, summary['volumes'])
+        self.assertEqual({'count': 0, 'status': {}, 'capacity': 0},
+                         summary['disks'])
+        self.assertRaises(exception.StorageNotFound,
+                          db_api.storage_resource_summary_get, ctxt,
+                          'storage2')
+
+    def test_access_info_get_by_fingerprint(self):
+        access_info = {'vendor': 'fake_storage', 'model': 'fake_driver',
+                       'rest': {'host': '10.0.0.76', 'port': 1234,
+                                'username': 'admin', 'password': 'abcd'}}
+        db_api.access_info_create(ctxt, dict(
+            access_info, storage_id='storage1',
+            fingerprint=delfin_utils.access_info_fingerprint(access_info)))
+
+        # Same storage with other credentials
+        duplicate = {'vendor': 'Fake_Storage', 'model': 'fake_driver',
+                     'rest': {'host': '10.0.0.76 ', 'port': '1234',
+                              'username': 'user', 'password': 'efgh'}}
+        fingerprint = delfin_utils.access_info_fingerprint(duplicate)
+        self.assertEqual('storage1', db_api.access_info_get_by_fingerprint(
+            ctxt, fingerprint)['storage_id'])
+        self.assertRaises(exception.StorageAlreadyExists,
+                          db_api.access_info_create, ctxt,
+                          dict(duplicate, storage_id='storage2',
+                               fingerprint=fingerprint))
+
+        other = dict(access_info, rest=dict(access_info['rest'], port=443))
+        self.assertRaises(exception.AccessInfoNotFound,
+                          db_api.access_info_get_by_fingerprint, ctxt,
+                          delfin_utils.access_info_fingerprint(other))
+
+    def test_access_info_fingerprint_extra_attributes(self):
+        # Two VMAX arrays behind the same Unisphere
+        access_info = {'vendor': 'dellemc', 'model': 'vmax',
+                       'rest': {'host': '10.0.0.76', 'port': 8443,
+                                'username': 'admin', 'password': 'abcd'},
+                       'extra_attributes': {'array_id': '000123456789'}}
+        other = dict(access_info,
+                     extra_attributes={'array_id': '000987654321'})
+        for storage_id, info in (('storage1', access_info),
+                                 ('storage2', other)):
+            db_api.access_info_create(ctxt, dict(
+                info, storage_id=storage_id,
+                fingerprint=delfin_utils.access_info_fingerprint(info)))
+        self.assertEqual('storage2', db_api.access_info_get_by_fingerprint(
+            ctxt, delfin_utils.access_info_fingerprint(other))['storage_id'])
+
+        # Credentials in extra attributes are not part of the fingerprint
+        self.assertEqual(
+            delfin_utils.access_info_fingerprint(access_info),
+            delfin_utils.access_info_fingerprint(dict(
+                access_info, extra_attributes={'array_id': '000123456789',
+                                               'api_token': 'abcd'})))
+        # Nor are missing extra attributes different from empty ones
+        no_extra = dict(access_info)
+        no_extra.pop('extra_attributes')
+        self.assertEqual(
+            delfin_utils.access_info_fingerprint(no_extra),
+            delfin_utils.access_info_fingerprint(dict(
+                no_extra, extra_attributes={})))
@@ -583,6 +583,24 @@ class TestHpe3parStorageDriver(TestCase):
         driver.clear_alert(context, alert_id)
         self.assertEqual(mock_clear_alert.call_count, 1)
 
+    @mock.patch.object(SSHHandler, 'exec_command')
+    def test_clear_alerts(self, mock_exec_command):
+        driver = create_driver()
+        alert_ids = ['230584300921369', '230584300921370']
+        mock_exec_command.return_value = ''
+        results = driver.clear_alerts(context, alert_ids)
+        self.assertEqual(results, dict.fromkeys(alert_ids))
+        mock_exec_command.assert_called_once_with(
+            'removealert -f 230584300921369 230584300921370')
+
+        # A failed batch falls back to removing alerts one by one
+        mock_exec_command.side_effect = ['Error: remove failed', '',
+                                         'Error: remove failed']
+        results = driver.clear_alerts(context, alert_ids)
+        self.assertIsNone(results[alert_ids[0]])
+        self.assertIsInstance(results[alert_ids[1]],
+                              exception.InvalidResults)
+
     def test_get_controllers(self):
         driver = create_driver()
         SSHPool.get = mock.Mock(return_value={paramiko.SSHClient()})
@@ -12,17 +12,106 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import shutil
 import sys
+import tempfile
 
 from unittest import TestCase, mock
+from oslo_config import cfg
+
+from delfin import context
+from delfin import exception
+from delfin import ssl_utils
 from delfin.common import config # noqa
 from delfin.drivers.manager import DriverManager
 
+CONF = cfg.CONF
 sys.modules['delfin.cryptor'] = mock.Mock()
 
 
 class TestDriverManager(TestCase):
 
+    def _override(self, name, value):
+        CONF.set_override(name, value, group='storage_driver')
+        self.addCleanup(CONF.clear_override, name, group='storage_driver')
+
     def test_init(self):
         manager = DriverManager()
         self.assertIsNotNone(manager.driver_factory)
+
+    @mock.patch('delfin.ssl_utils.get_storage_ca_path')
+    @mock.patch('copy.deepcopy')
+    def test_get_driver_cached(self, mock_deepcopy, mock_ca_path):
+        manager = DriverManager()
+        driver = mock.Mock()
+        manager.update_driver('storage_1', driver)
+        try:
+            self.assertIs(driver, manager.get_driver(
+                None, storage_id='storage_1'))
+            self.assertFalse(mock_deepcopy.called)
+            self.assertFalse(mock_ca_path.called)
+        finally:
+            manager.remove_driver('storage_1')
+
+    @mock.patch('delfin.ssl_utils.reload_certificate')
+    def test_reload_certificate_if_changed(self, mock_reload):
+        ca_path = tempfile.mkdtemp() + '/'
+        try:
+            ssl_utils.reload_certificate_if_changed(ca_path)
+            ssl_utils.reload_certificate_if_changed(ca_path)
+            self.assertEqual(1, mock_reload.call_count)
+
+            open(ca_path + 'new.pem', 'w').close()
+            os.utime(ca_path, ns=(0, 0))
+            ssl_utils.reload_certificate_if_changed(ca_path)
+            self.assertEqual(2, mock_reload.call_count)
+        finally:
+            shutil.rmtree(ca_path)
+
+        self.assertRaises(exception.InvalidCAPath,
+                          ssl_utils.reload_certificate_if_changed, ca_path)
+
+    def test_evict_drivers(self):
+        manager = DriverManager()
+        idle_driver = mock.Mock()
+        manager.update_driver('storage_idle', idle_driver)
+        manager.update_driver('storage_used', mock.Mock())
+        manager.driver_sessions['storage_idle'].last_used -= 7200
+        try:
+            self.assertEqual([], manager.evict_drivers())
+
+            self._override('driver_idle_timeout', 3600)
+            self.assertEqual(['storage_idle'], manager.evict_drivers())
+            self.assertNotIn('storage_idle', manager.driver_factory)
+            idle_driver.close_connection.assert_called_once_with()
+
+            stats = manager.get_session_stats()
+            self.assertEqual(1, stats['open_sessions'])
+            self.assertEqual(1, stats['sessions']['storage_used']['logins'])
+        finally:
+            manager.remove_driver('storage_idle')
+            manager.remove_driver('storage_used')
+
+    def test_evict_drivers_in_use(self):
+        self._override('driver_idle_timeout', 3600)
+        self._override('max_cached_drivers', 1)
+        manager = DriverManager()
+        busy_driver = mock.Mock()
+        manager.update_driver('storage_busy', busy_driver)
+        manager.update_driver('storage_other', mock.Mock())
+        manager.driver_sessions['storage_busy'].last_used -= 7200
+        try:
+            with manager.use_driver(context.get_admin_context(),
+                                    'storage_busy') as driver:
+                self.assertEqual(busy_driver, driver)
+                manager.driver_sessions['storage_busy'].last_used -= 7200
+                self.assertEqual(['storage_other'], manager.evict_drivers())
+                self.assertIn('storage_busy', manager.driver_factory)
+                busy_driver.close_connection.assert_not_called()
+            self.assertEqual(
+                0, manager.driver_sessions['storage_busy'].in_use)
+            self.assertEqual([], manager.evict_drivers())
+        finally:
+            manager.remove_driver('storage_busy')
+            manager.remove_driver('storage_other')
@@ -0,0 +1,70 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http:#www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from delfin import exception
+from delfin.drivers.utils import trap_parser
+
+OID_MAP = {
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.1': 'alertId',
+    '1.3.6.1.4.1.2011.2.91.10.3.1.1.10': 'alertName',
+    '1.3.6.1.4.1.12925.1.7.1.2.1': 'severity',
+}
+
+
+class TestTrapSpec(unittest.TestCase):
+
+    def test_resolve(self):
+        spec = trap_parser.TrapSpec(OID_MAP)
+        self.assertEqual('alertId', spec.resolve(
+            '1.3.6.1.4.1.2011.2.91.10.3.1.1.1.0'))
+        self.assertEqual('alertName', spec.resolve(
+            '1.3.6.1.4.1.2011.2.91.10.3.1.1.10.0'))
+        self.assertEqual('severity', spec.resolve(
+            '1.3.6.1.4.1.12925.1.7.1.2.1'))
+        self.assertIsNone(spec.resolve('1.3.6.1.4.1.2011.2.91.10.3.1.1.2'))
+        self.assertIsNone(spec.resolve('1.3.6.1.4.1.2011'))
+
+    def test_parse(self):
+        spec = trap_parser.TrapSpec(OID_MAP, ('alertId', 'severity'))
+        alert = {
+            '1.3.6.1.4.1.2011.2.91.10.3.1.1.1.0': '0xf0010001',
+            '1.3.6.1.4.1.12925.1.7.1.2.1': '2',
+            '1.3.6.1.6.3.1.1.4.1.0': '1.3.6.1.4.1.2011.2.91.10.2.1.0.1',
+        }
+        self.assertDictEqual({'alertId': '0xf0010001', 'severity': '2'},
+                             spec.parse(alert))
+
+        alert.pop('1.3.6.1.4.1.12925.1.7.1.2.1')
+        self.assertRaisesRegex(exception.InvalidInput,
+                               "Mandatory information severity missing",
+                               spec.parse, alert)
+
+    def test_map_oids(self):
+        spec = trap_parser.TrapSpec(OID_MAP)
+        alert = {
+            '1.3.6.1.4.1.2011.2.91.10.3.1.1.1.0': '0xf0010001',
+            '1.3.6.1.6.3.1.1.4.1.0': '1.3.6.1.4.1.2011.2.91.10.2.1.0.1',
+        }
+        self.assertDictEqual({'alertId': '0xf0010001'},
+                             spec.map_oids(alert))
+        self.assertDictEqual({'alertId': '0xf0010001',
+                              None: '1.3.6.1.4.1.2011.2.91.10.2.1.0.1'},
+                             spec.map_oids(alert, keep_unknown=True))
+
+    def test_decode_hex(self):
+        self.assertEqual('Trap Test', trap_parser.decode_hex(
+            '0x547261702054657374'))
+        self.assertEqual('location=1', trap_parser.decode_hex('location=1'))
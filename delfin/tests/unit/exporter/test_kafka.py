@@ -0,0 +1,42 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+from kafka.errors import KafkaTimeoutError
+
+from delfin import exception
+from delfin import test
+from delfin.exporter.kafka import kafka
+
+
+@mock.patch.object(kafka, 'KafkaProducer')
+class TestKafkaExporter(test.TestCase):
+
+    def test_push_to_kafka(self, mock_producer):
+        kafka.KafkaExporter().push_to_kafka({'metric': 1})
+
+        producer = mock_producer.return_value
+        producer.send.assert_called_once_with('delfin-kafka',
+                                              value={'metric': 1})
+        producer.send.return_value.get.assert_called_once_with(timeout=30)
+        producer.close.assert_called_once_with(timeout=30)
+
+    def test_push_to_kafka_failed(self, mock_producer):
+        producer = mock_producer.return_value
+        producer.send.return_value.get.side_effect = KafkaTimeoutError()
+
+        self.assertRaises(exception.ExportFailed,
+                          kafka.KafkaExporter().push_to_kafka,
+                          {'metric': 1})
+        producer.close.assert_called_once_with(timeout=30)
@@ -0,0 +1,91 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+from delfin import test
+from delfin.common.constants import metric_struct
+from delfin.exporter import base_exporter
+from delfin.exporter import rollup
+
+fake_labels = {'storage_id': '12345', 'resource_type': 'storage',
+               'resource_id': 'storage0', 'type': 'RAW', 'unit': 'IOPS'}
+
+
+def _metric(values):
+    return metric_struct(name='iops', labels=fake_labels, values=values)
+
+
+def _rollups(rollups):
+    return {metric.name: metric.values for metric in rollups}
+
+
+class TestRollupEngine(test.TestCase):
+
+    def setUp(self):
+        super(TestRollupEngine, self).setUp()
+        self.override_config('performance_rollup_windows', ['300'])
+        self.engine = rollup.RollupEngine()
+        self.engine.open_windows.clear()
+
+    def test_window_label(self):
+        self.assertEqual('5m', rollup.window_label(300))
+        self.assertEqual('1h', rollup.window_label(3600))
+        self.assertEqual('1d', rollup.window_label(86400))
+        self.assertEqual('90s', rollup.window_label(90))
+
+    def test_streaming_rollup(self):
+        # Window 300000-600000 is still open at the end of collection
+        rollups = self.engine.process(
+            [_metric({240000: 4, 300000: 1, 360000: 3, 420000: 2})], 450000)
+        self.assertEqual({'iops_min_5m': {0: 4}, 'iops_max_5m': {0: 4},
+                          'iops_avg_5m': {0: 4}, 'iops_last_5m': {0: 4},
+                          'iops_sum_5m': {0: 4}}, _rollups(rollups))
+
+        # Overlapping points are not aggregated again
+        rollups = self.engine.process(
+            [_metric({420000: 2, 480000: 6, 540000: 4})], 600000)
+        self.assertEqual({'iops_min_5m': {300000: 1},
+                          'iops_max_5m': {300000: 6},
+                          'iops_avg_5m': {300000: 3.2},
+                          'iops_last_5m': {300000: 4},
+                          'iops_sum_5m': {300000: 16}}, _rollups(rollups))
+        self.assertEqual({}, self.engine.open_windows)
+
+    def test_backfill_rollup(self):
+        self.override_config('performance_rollup_functions', ['avg'])
+        rollups = self.engine.process(
+            [_metric({240000: 4, 300000: 1, 360000: 3})], 400000,
+            streaming=False)
+        self.assertEqual({'iops_avg_5m': {0: 4, 300000: 2}},
+                         _rollups(rollups))
+        self.assertEqual({}, self.engine.open_windows)
+
+    def test_dispatch_rollup_mode(self):
+        self.override_config('performance_rollup_mode',
+                             {'RawExporter': 'raw',
+                              'RollupExporter': 'rollup',
+                              'BothExporter': 'both'})
+        manager = base_exporter.PerformanceExporterManager()
+        exporters = [type(name, (mock.Mock,), {})()
+                     for name in ('RawExporter', 'RollupExporter',
+                                  'BothExporter')]
+        manager.exporters = exporters
+        metrics = [_metric({0: 1})]
+        rollups = [_metric({0: 2})]
+
+        manager.dispatch(None, metrics, rollups=rollups)
+        exporters[0].dispatch.assert_called_once_with(None, metrics)
+        exporters[1].dispatch.assert_called_once_with(None, rollups)
+        exporters[2].dispatch.assert_called_once_with(None,
+                                                      metrics + rollups)
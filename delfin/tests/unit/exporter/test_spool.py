@@ -0,0 +1,119 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from delfin import exception
+from delfin import test
+from delfin.common.constants import metric_struct
+from delfin.exporter import base_exporter
+from delfin.exporter import spool
+
+fake_metrics = [metric_struct(name='throughput',
+                              labels={'storage_id': '12345',
+                                      'resource_type': 'storage'},
+                              values={1622808000000: 61.9388895680357,
+                                      1622808060000: 60.0})]
+
+
+class TestSpool(test.TestCase):
+
+    def setUp(self):
+        super(TestSpool, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+
+    def test_append_replay(self):
+        exporter_spool = spool.Spool(self.path, segment_size=20)
+        for i in range(5):
+            exporter_spool.append(b'record%d' % i)
+        # Segments are rotated at segment size
+        self.assertEqual(3, len(os.listdir(self.path)))
+
+        records = []
+        self.assertEqual(5, exporter_spool.replay(records.append, 1000))
+        self.assertEqual([b'record%d' % i for i in range(5)], records)
+        self.assertEqual([], os.listdir(self.path))
+        self.assertFalse(exporter_spool.pending)
+
+    def test_replay_failure(self):
+        exporter_spool = spool.Spool(self.path)
+        for i in range(3):
+            exporter_spool.append(b'record%d' % i)
+        dispatch = mock.Mock(side_effect=[None, exception.ExportFailed(
+            'sink', 'not available'), None, None])
+
+        # Replay stops at failed record, and continues from it next time
+        self.assertEqual(1, exporter_spool.replay(dispatch, 1000))
+        self.assertEqual(2, exporter_spool.replay(dispatch, 1000))
+        self.assertEqual([mock.call(b'record0'), mock.call(b'record1'),
+                          mock.call(b'record1'), mock.call(b'record2')],
+                         dispatch.call_args_list)
+
+    def test_recover_and_truncated_record(self):
+        exporter_spool = spool.Spool(self.path)
+        exporter_spool.append(b'record0')
+        exporter_spool.append(b'record1')
+        # Process crashed while writing a record
+        exporter_spool.active.write(spool.HEADER.pack(100) + b'rec')
+        exporter_spool.active.close()
+
+        records = []
+        restarted = spool.Spool(self.path)
+        self.assertTrue(restarted.pending)
+        restarted.replay(records.append, 1000)
+        self.assertEqual([b'record0', b'record1'], records)
+
+    def test_limits(self):
+        exporter_spool = spool.Spool(self.path, segment_size=1,
+                                     max_size=30, max_age=3600)
+        for i in range(5):
+            exporter_spool.append(b'record%d' % i)
+        # Oldest segments are dropped beyond max size
+        records = []
+        exporter_spool.replay(records.append, 1000)
+        self.assertEqual([b'record3', b'record4'], records)
+
+        # Segments are dropped beyond max age
+        exporter_spool.append(b'record5')
+        old_time = time.time() - 7200
+        for name in os.listdir(self.path):
+            os.utime(os.path.join(self.path, name), (old_time, old_time))
+        records = []
+        exporter_spool.replay(records.append, 1000)
+        self.assertEqual([], records)
+
+    @mock.patch('delfin.exporter.base_exporter.eventlet.spawn_n',
+                lambda func, *args: func(*args))
+    def test_manager_spool(self):
+        self.override_config('spool_dir', self.path, 'EXPORTER_SPOOL')
+        exporter = mock.Mock()
+        exporter.dispatch.side_effect = [
+            exception.ExportFailed('sink', 'not available'), None, None]
+        manager = base_exporter.PerformanceExporterManager()
+        manager.exporters = [exporter]
+
+        manager.dispatch(None, fake_metrics)
+        exporter_spool = spool.get_spool(exporter.__class__.__name__)
+        self.assertTrue(exporter_spool.pending)
+
+        # Spooled metrics are replayed once the exporter succeeds
+        manager.dispatch(None, [])
+        self.assertEqual(mock.call(None, fake_metrics),
+                         exporter.dispatch.call_args)
+        self.assertFalse(exporter_spool.pending)
+        spool._spools.clear()
@@ -0,0 +1,128 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import shutil
+import tempfile
+import time
+
+from delfin import test
+from delfin.common.constants import metric_struct
+from delfin.exporter.tsdb import chunk
+from delfin.exporter.tsdb import store
+
+fake_storage_id = '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6'
+
+
+def _metric(name, resource_id, values):
+    return metric_struct(name=name,
+                         labels={'storage_id': fake_storage_id,
+                                 'resource_type': 'pool',
+                                 'resource_id': resource_id,
+                                 'type': 'RAW', 'unit': 'ms'},
+                         values=values)
+
+
+class TestChunk(test.TestCase):
+
+    def test_encode_decode(self):
+        points = [(1622808000000, 1.5), (1622808060000, 1.5),
+                  (1622808120000, 2.25), (1622808180003, -7.0),
+                  (1622808240000, 1e12), (1622900000000, 0.0),
+                  (1622900060000, 3)]
+        data = chunk.encode(points)
+        self.assertEqual([(timestamp, float(value))
+                          for timestamp, value in points],
+                         chunk.decode(data))
+
+    def test_compression(self):
+        points = [(1622808000000 + i * 60000, 50.0 + i % 3)
+                  for i in range(120)]
+        # Points of regular interval take few bits
+        self.assertLess(len(chunk.encode(points)), 3 * len(points))
+
+    def test_decode_truncated(self):
+        points = [(1622808000000 + i * 60000, float(i)) for i in range(10)]
+        data = chunk.encode(points)
+        self.assertRaises(ValueError, chunk.decode, data[:-2])
+
+
+class TestTimeSeriesStore(test.TestCase):
+
+    def setUp(self):
+        super(TestTimeSeriesStore, self).setUp()
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        self.override_config('block_duration', 600, 'TSDB_EXPORTER')
+        self.store = store.TimeSeriesStore(self.data_dir)
+        # Points of the tests are beyond retention
+        self.store.last_retention_check = time.time()
+
+    def test_append_query(self):
+        self.store.append([
+            _metric('response_time', 'pool0', {0: 1.0, 60000: 2.0,
+                                               120000: 3.0}),
+            _metric('response_time', 'pool1', {0: 5.0}),
+            _metric('iops', 'pool0', {0: 100.0})])
+        # Overlapping collection, points span two blocks
+        self.store.append([
+            _metric('response_time', 'pool0', {120000: 3.0, 590000: 4.0,
+                                               610000: 5.0})])
+        self.assertEqual(2, len([
+            name for name in os.listdir(
+                os.path.join(self.data_dir, fake_storage_id))
+            if name.endswith(store.BLOCK_SUFFIX)]))
+
+        series = self.store.query(fake_storage_id, 'response_time', 0,
+                                  600000, resource_id='pool0')
+        self.assertEqual(1, len(series))
+        self.assertEqual('pool0', series[0][0]['resource_id'])
+        self.assertEqual([(0, 1.0), (60000, 2.0), (120000, 3.0),
+                          (590000, 4.0)], series[0][1])
+
+        series = self.store.query(fake_storage_id, 'response_time', 0,
+                                  700000, resource_type='pool',
+                                  step=300000)
+        self.assertEqual([(0, 2.0), (300000, 4.0), (600000, 5.0)],
+                         series[0][1])
+        self.assertEqual([(0, 5.0)], series[1][1])
+
+        self.assertEqual([], self.store.query(fake_storage_id, 'iops', 0,
+                                              600000, resource_type='disk'))
+
+    def test_remove_storage(self):
+        self.store.append([_metric('iops', 'pool0', {0: 1.0})])
+        self.store.remove_storage(fake_storage_id)
+        self.assertEqual([], self.store.query(fake_storage_id, 'iops', 0,
+                                              600000))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.data_dir, fake_storage_id)))
+
+        # Metrics appended again are indexed again
+        self.store.append([_metric('iops', 'pool0', {0: 2.0})])
+        series = self.store.query(fake_storage_id, 'iops', 0, 600000)
+        self.assertEqual([(0, 2.0)], series[0][1])
+
+    def test_retention(self):
+        self.override_config('retention', 3600, 'TSDB_EXPORTER')
+        now = int(time.time()) * 1000
+        self.store.append([_metric('iops', 'pool0', {now - 86400000: 1.0,
+                                                     now: 2.0})])
+        self.store.last_retention_check = 0
+        self.store._apply_retention()
+        series = self.store.query(fake_storage_id, 'iops', 0, now)
+        self.assertEqual([(now, 2.0)], series[0][1])
+
+    def test_downsample(self):
+        self.assertEqual([(0, 1.5), (120, 3.0)],
+                         store.downsample([(0, 1), (60, 2), (120, 3)], 120))
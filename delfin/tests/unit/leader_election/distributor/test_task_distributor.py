@@ -56,3 +56,33 @@ class TestTaskDistributor(test.TestCase):
         self.assertEqual(mock_task_update.call_count, 1)
         self.assertEqual(mock_partitioner_start.call_count, 1)
         self.assertEqual(mock_get_task_executor.call_count, 1)
+
+    @mock.patch('delfin.coordination.ConsistentHashing.get_task_executor')
+    @mock.patch('delfin.coordination.ConsistentHashing.start')
+    @mock.patch('delfin.coordination.ConsistentHashing.__init__',
+                mock.Mock(return_value=None))
+    def test_get_task_executor_by_load(self, mock_partitioner_start,
+                                       mock_get_task_executor):
+        tasks = [
+            {'id': 1, 'executor': 'node1', 'interval': 100,
+             'collection_cost': 50},
+            {'id': 2, 'executor': 'node1', 'interval': 100,
+             'collection_cost': 25},
+            {'id': 3, 'executor': 'node2', 'interval': 100,
+             'collection_cost': None},
+        ]
+        calls = []
+
+        def get_task_executor(task_id, load, executor_loads):
+            calls.append((task_id, load, dict(executor_loads)))
+            return 'node2'
+        mock_get_task_executor.side_effect = get_task_executor
+        ctx = context.get_admin_context()
+        task_distributor = TaskDistributor(ctx, tasks)
+
+        self.assertEqual('node2', task_distributor.get_task_executor(1))
+        self.assertEqual('node2', task_distributor.get_task_executor(3))
+        # Load of a task moves along with it
+        self.assertEqual([(1, 0.5, {'node1': 0.25}),
+                          (3, None, {'node1': 0.25, 'node2': 0.5})], calls)
+        self.assertEqual(mock_partitioner_start.call_count, 1)
@@ -15,6 +15,7 @@
 from datetime import datetime
 from unittest import mock
 
+from oslo_config import cfg
 from oslo_utils import uuidutils
 
 from delfin import context
@@ -25,9 +26,14 @@ from delfin.common.constants import TelemetryCollection
 from delfin.common.constants import TelemetryTaskStatus, TelemetryJobStatus
 from delfin.db.sqlalchemy.models import FailedTask
 from delfin.db.sqlalchemy.models import Task
+from delfin.task_manager.scheduler.schedulers.telemetry import \
+    failed_performance_collection_handler
 from delfin.task_manager.scheduler.schedulers.telemetry. \
     failed_performance_collection_handler import \
     FailedPerformanceCollectionHandler
+from delfin.task_manager.scheduler.schedulers.telemetry import task_cache
+
+CONF = cfg.CONF
 
 fake_failed_job_id = 43
 
@@ -77,6 +83,11 @@ def failed_task_not_found_exception(ctx, failed_task_id):
 
 class TestFailedPerformanceCollectionHandler(test.TestCase):
 
+    def setUp(self):
+        super(TestFailedPerformanceCollectionHandler, self).setUp()
+        failed_performance_collection_handler._last_backfill_times.clear()
+        task_cache._collection_stats.clear()
+
     @mock.patch.object(db, 'task_get',
                        mock.Mock(return_value=fake_telemetry_job))
     @mock.patch.object(db, 'failed_task_get',
@@ -205,3 +216,91 @@ class TestFailedPerformanceCollectionHandler(test.TestCase):
         # Verify that no action performed for deleted storage failed tasks
         self.assertEqual(mock_collect_telemetry.call_count, 0)
         self.assertEqual(mock_failed_task_update.call_count, 0)
+
+    @mock.patch.object(db, 'task_get',
+                       mock.Mock(return_value=fake_telemetry_job))
+    @mock.patch.object(db, 'failed_task_get')
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.remove_failed_job')
+    @mock.patch('delfin.db.failed_task_update')
+    @mock.patch('delfin.task_manager.tasks.telemetry'
+                '.PerformanceCollectionTask.collect')
+    @mock.patch('delfin.drivers.api.API.get_capabilities',
+                mock.Mock(return_value={}))
+    def test_failed_job_postponed(self, mock_collect_telemetry,
+                                  mock_failed_task_update, mock_remove_job,
+                                  mock_failed_task_get):
+        mock_collect_telemetry.return_value = TelemetryTaskStatus. \
+            TASK_EXEC_STATUS_SUCCESS
+        now = int(datetime.now().timestamp()) * 1000
+        failed_job = fake_failed_job.copy()
+        failed_job[FailedTask.start_time.name] = now - 600 * 1000
+        failed_job[FailedTask.end_time.name] = now - 300 * 1000
+        mock_failed_task_get.return_value = failed_job
+        ctx = context.get_admin_context()
+        storage_id = fake_telemetry_job[Task.storage_id.name]
+
+        # Storage is still failing, retry is not consumed
+        task_cache.record_collection(storage_id, 1, False, success=False)
+        FailedPerformanceCollectionHandler.get_instance(
+            ctx, fake_failed_job_id)()
+        self.assertEqual(mock_collect_telemetry.call_count, 0)
+        self.assertEqual(mock_failed_task_update.call_count, 0)
+
+        # Storage recovered, only one backfill per min_backfill_interval
+        task_cache.record_collection(storage_id, 1, False)
+        FailedPerformanceCollectionHandler.get_instance(
+            ctx, fake_failed_job_id)()
+        FailedPerformanceCollectionHandler.get_instance(
+            ctx, fake_failed_job_id)()
+        self.assertEqual(mock_collect_telemetry.call_count, 1)
+        self.assertEqual(mock_failed_task_update.call_count, 1)
+        self.assertEqual(mock_remove_job.call_count, 1)
+
+        # Storage failing for longer than max_failed_task_retry_window,
+        # the failed task is stopped without collection
+        task_cache.record_collection(storage_id, 1, False, success=False)
+        failed_job[FailedTask.end_time.name] = now - (
+            CONF.telemetry.max_failed_task_retry_window + 60) * 1000
+        FailedPerformanceCollectionHandler.get_instance(
+            ctx, fake_failed_job_id)()
+        self.assertEqual(mock_collect_telemetry.call_count, 1)
+        self.assertEqual(mock_remove_job.call_count, 2)
+
+    @mock.patch.object(db, 'task_get',
+                       mock.Mock(return_value=fake_telemetry_job))
+    @mock.patch.object(db, 'failed_task_get')
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.remove_failed_job')
+    @mock.patch('delfin.db.failed_task_update')
+    @mock.patch('delfin.task_manager.tasks.telemetry'
+                '.PerformanceCollectionTask.collect')
+    @mock.patch('delfin.drivers.api.API.get_capabilities')
+    def test_failed_job_retention_window(self, mock_get_capabilities,
+                                         mock_collect_telemetry,
+                                         mock_failed_task_update,
+                                         mock_remove_job,
+                                         mock_failed_task_get):
+        mock_get_capabilities.return_value = {
+            'performance_metric_retention_window': 3600}
+        mock_collect_telemetry.return_value = TelemetryTaskStatus. \
+            TASK_EXEC_STATUS_SUCCESS
+        now = int(datetime.now().timestamp()) * 1000
+        failed_job = fake_failed_job.copy()
+        failed_job[FailedTask.start_time.name] = now - 7200 * 1000
+        failed_job[FailedTask.end_time.name] = now - 1800 * 1000
+        mock_failed_task_get.return_value = failed_job
+        ctx = context.get_admin_context()
+
+        # Window is clipped to retention window of the driver
+        FailedPerformanceCollectionHandler.get_instance(
+            ctx, fake_failed_job_id)()
+        start_time, end_time = mock_collect_telemetry.call_args[0][3:5]
+        self.assertGreaterEqual(start_time, now - 3600 * 1000)
+        self.assertEqual(failed_job[FailedTask.end_time.name], end_time)
+
+        # Window is not retained anymore
+        failed_performance_collection_handler._last_backfill_times.clear()
+        failed_job[FailedTask.end_time.name] = now - 5400 * 1000
+        FailedPerformanceCollectionHandler.get_instance(
+            ctx, fake_failed_job_id)()
+        self.assertEqual(mock_collect_telemetry.call_count, 1)
+        self.assertEqual(mock_remove_job.call_count, 2)
@@ -25,6 +25,8 @@ from delfin.task_manager.scheduler.schedulers.telemetry.job_handler import \
     JobHandler
 from delfin.task_manager.scheduler.schedulers.telemetry.job_handler import \
     FailedJobHandler
+from delfin.task_manager.scheduler.schedulers.telemetry.job_handler import \
+    get_next_collection_time
 from delfin.db.sqlalchemy.models import FailedTask
 from delfin.task_manager.scheduler.schedulers.telemetry. \
     failed_performance_collection_handler import \
@@ -106,7 +108,8 @@ class TestTelemetryJob(test.TestCase):
     @mock.patch.object(db, 'task_get',
                        mock.Mock(return_value=fake_telemetry_job))
     @mock.patch(
-        'apscheduler.schedulers.background.BackgroundScheduler.add_job')
+        'delfin.task_manager.scheduler.collection_scheduler.'
+        'CollectionScheduler.add_job')
     def test_telemetry_job_scheduling(self, mock_add_job):
         ctx = context.get_admin_context()
         telemetry_job = JobHandler(ctx, fake_telemetry_job['id'],
@@ -117,6 +120,19 @@ class TestTelemetryJob(test.TestCase):
         telemetry_job.schedule_job(fake_telemetry_job['id'])
         self.assertEqual(mock_add_job.call_count, 1)
 
+    def test_get_next_collection_time(self):
+        current_time = 1616560337
+        next_times = set()
+        for task_id in range(100):
+            next_time = get_next_collection_time(task_id, 900, current_time)
+            self.assertTrue(current_time < next_time <= current_time + 900)
+            # Phase of the task is kept across reschedules
+            self.assertEqual(next_time + 900, get_next_collection_time(
+                task_id, 900, next_time))
+            next_times.add(next_time)
+        # Tasks are spread over the interval
+        self.assertGreater(len(next_times), 50)
+
     @mock.patch.object(db, 'task_delete',
                        mock.Mock())
     @mock.patch.object(db, 'task_get_all',
@@ -126,7 +142,8 @@ class TestTelemetryJob(test.TestCase):
     @mock.patch.object(db, 'task_get',
                        mock.Mock(return_value=fake_telemetry_job))
     @mock.patch(
-        'apscheduler.schedulers.background.BackgroundScheduler.add_job',
+        'delfin.task_manager.scheduler.collection_scheduler.'
+        'CollectionScheduler.add_job',
         mock.Mock())
     @mock.patch('logging.LoggerAdapter.error')
     def test_telemetry_removal_success(self, mock_log_error):
@@ -151,7 +168,8 @@ class TestFailedTelemetryJob(test.TestCase):
     @mock.patch.object(db, 'failed_task_get',
                        mock.Mock(return_value=fake_failed_job))
     @mock.patch(
-        'apscheduler.schedulers.background.BackgroundScheduler.add_job')
+        'delfin.task_manager.scheduler.collection_scheduler.'
+        'CollectionScheduler.add_job')
     def test_failed_job_scheduling(self, mock_add_job):
         failed_job = FailedJobHandler(context.get_admin_context())
         # call failed job scheduling
@@ -161,9 +179,11 @@ class TestFailedTelemetryJob(test.TestCase):
     @mock.patch.object(db, 'failed_task_get',
                        mock.Mock(return_value=fake_failed_job))
     @mock.patch(
-        'apscheduler.schedulers.background.BackgroundScheduler.remove_job')
+        'delfin.task_manager.scheduler.collection_scheduler.'
+        'CollectionScheduler.remove_job')
     @mock.patch(
-        'apscheduler.schedulers.background.BackgroundScheduler.get_job')
+        'delfin.task_manager.scheduler.collection_scheduler.'
+        'CollectionScheduler.get_job')
     @mock.patch.object(db, 'failed_task_delete')
     @mock.patch.object(db, 'failed_task_get_all')
     def test_failed_job_with_max_retry(self, mock_failed_get_all,
@@ -187,9 +207,11 @@ class TestFailedTelemetryJob(test.TestCase):
         self.assertEqual(mock_remove_job.call_count, 1)
 
     @mock.patch(
-        'apscheduler.schedulers.background.BackgroundScheduler.get_job')
+        'delfin.task_manager.scheduler.collection_scheduler.'
+        'CollectionScheduler.get_job')
     @mock.patch(
-        'apscheduler.schedulers.background.BackgroundScheduler.add_job')
+        'delfin.task_manager.scheduler.collection_scheduler.'
+        'CollectionScheduler.add_job')
     @mock.patch.object(db, 'failed_task_get_all')
     def test_failed_job_with_job_already_scheduled(self, mock_failed_get_all,
                                                    mock_add_job,
@@ -211,7 +233,8 @@ class TestFailedTelemetryJob(test.TestCase):
     @mock.patch.object(db, 'failed_task_get',
                        mock.Mock(return_value=fake_failed_job))
     @mock.patch(
-        'apscheduler.schedulers.background.BackgroundScheduler.remove_job')
+        'delfin.task_manager.scheduler.collection_scheduler.'
+        'CollectionScheduler.remove_job')
     @mock.patch.object(db, 'failed_task_delete')
     @mock.patch.object(db, 'failed_task_get_all')
     def test_failed_job_scheduling_with_no_task(self, mock_failed_get_all,
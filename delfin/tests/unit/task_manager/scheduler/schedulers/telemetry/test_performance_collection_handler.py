@@ -21,8 +21,13 @@ from delfin import db
 from delfin import exception
 from delfin import test
 from delfin.common import constants
+from delfin.common.constants import TelemetryCollection
+from delfin.common.constants import TelemetryJobStatus
 from delfin.common.constants import TelemetryTaskStatus
+from delfin.db.sqlalchemy.models import FailedTask
 from delfin.db.sqlalchemy.models import Task
+from delfin.task_manager.scheduler.collection_scheduler import CollectionJob
+from delfin.task_manager.scheduler.schedulers.telemetry import task_cache
 from delfin.task_manager.scheduler.schedulers.telemetry. \
     performance_collection_handler import \
     PerformanceCollectionHandler
@@ -57,6 +62,14 @@ def task_not_found_exception(ctx, task_id):
 
 class TestPerformanceCollectionHandler(test.TestCase):
 
+    def setUp(self):
+        super(TestPerformanceCollectionHandler, self).setUp()
+        self.task_cache = task_cache.TaskStateCache()
+        self.task_cache.deleted.clear()
+        self.task_cache.last_run_times.clear()
+        self.task_cache.collection_costs.clear()
+        self.task_cache.changed_costs.clear()
+
     @mock.patch.object(db, 'task_get',
                        mock.Mock(return_value=fake_telemetry_job))
     @mock.patch('delfin.db.task_update')
@@ -73,7 +86,9 @@ class TestPerformanceCollectionHandler(test.TestCase):
         perf_collection_handler()
 
         self.assertEqual(mock_collect_telemetry.call_count, 1)
-        self.assertEqual(mock_task_update.call_count, 1)
+        # Last run time is written to DB on next flush
+        self.assertEqual(mock_task_update.call_count, 0)
+        self.assertIn(fake_task_id, self.task_cache.last_run_times)
 
     @mock.patch('delfin.db.task_update')
     @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.assign_failed_job')
@@ -101,7 +116,45 @@ class TestPerformanceCollectionHandler(test.TestCase):
         # Verify that failed task create is called if collect telemetry fails
         self.assertEqual(mock_failed_task_create.call_count, 1)
         self.assertEqual(mock_assign_failed_job.call_count, 1)
-        self.assertEqual(mock_task_update.call_count, 1)
+        self.assertIn(fake_task_id, self.task_cache.last_run_times)
+
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.assign_failed_job')
+    @mock.patch.object(db, 'failed_task_create')
+    @mock.patch.object(db, 'failed_task_update')
+    @mock.patch.object(db, 'failed_task_get_all')
+    def test_merge_failed_window(self, mock_failed_task_get_all,
+                                 mock_failed_task_update,
+                                 mock_failed_task_create,
+                                 mock_assign_failed_job):
+        ctx = context.get_admin_context()
+        handler = PerformanceCollectionHandler(ctx, fake_task_id,
+                                               fake_storage_id, {}, 60,
+                                               fake_executor)
+        failed_task = {
+            FailedTask.id.name: 1,
+            FailedTask.start_time.name: 1000000,
+            FailedTask.end_time.name: 1120000,
+            FailedTask.retry_count.name: 2,
+            FailedTask.result.name:
+                TelemetryJobStatus.FAILED_JOB_STATUS_RETRYING,
+        }
+        mock_failed_task_get_all.return_value = [failed_task]
+
+        # Overlapping window extends the pending failed task
+        handler._handle_task_failure(1060000, 1180000)
+        mock_failed_task_update.assert_called_once_with(
+            ctx, 1,
+            {FailedTask.start_time.name: 1000000,
+             FailedTask.end_time.name: 1180000,
+             FailedTask.retry_count.name: 0,
+             FailedTask.result.name:
+                 TelemetryJobStatus.FAILED_JOB_STATUS_INIT})
+        self.assertEqual(mock_failed_task_create.call_count, 0)
+
+        # Disjoint window gets a failed task of its own
+        handler._handle_task_failure(2000000, 2120000)
+        self.assertEqual(mock_failed_task_update.call_count, 1)
+        self.assertEqual(mock_failed_task_create.call_count, 1)
 
     @mock.patch.object(db, 'task_get',
                        mock.Mock(return_value=fake_deleted_telemetry_job))
@@ -122,6 +175,7 @@ class TestPerformanceCollectionHandler(test.TestCase):
         # for deleted storage
         self.assertEqual(mock_collect_telemetry.call_count, 0)
         self.assertEqual(mock_task_update.call_count, 0)
+        self.assertNotIn(fake_task_id, self.task_cache.last_run_times)
 
     @mock.patch('delfin.db.task_get', task_not_found_exception)
     @mock.patch('delfin.task_manager.tasks.telemetry'
@@ -138,3 +192,63 @@ class TestPerformanceCollectionHandler(test.TestCase):
 
         # Verify that collect telemetry for deleted storage
         self.assertEqual(mock_collect_telemetry.call_count, 0)
+
+    @mock.patch('delfin.db.task_update_last_run_time')
+    @mock.patch.object(db, 'task_get',
+                       mock.Mock(return_value=fake_telemetry_job))
+    def test_task_state_cache(self, mock_update_last_run_time):
+        ctx = context.get_admin_context()
+        self.assertFalse(self.task_cache.is_deleted(ctx, fake_task_id))
+        self.assertFalse(self.task_cache.is_deleted(ctx, fake_task_id))
+        self.assertEqual(db.task_get.call_count, 1)
+
+        self.task_cache.set_last_run_time(fake_task_id, 100)
+        self.task_cache.set_last_run_time(fake_task_id, 200)
+        self.task_cache.set_last_run_time(fake_task_id + 1, 200)
+        self.task_cache.flush()
+        mock_update_last_run_time.assert_called_once_with(
+            mock.ANY, {fake_task_id: 200, fake_task_id + 1: 200})
+
+        # Removing the job drops the cached state
+        self.task_cache.remove(fake_task_id)
+        self.assertNotIn(fake_task_id, self.task_cache.deleted)
+
+    @mock.patch('delfin.db.task_update_collection_cost')
+    def test_collection_cost(self, mock_update_collection_cost):
+        self.task_cache.flush_job_id = 'fake_flush_job'
+        self.task_cache.set_collection_cost(fake_task_id, 10, 100)
+        self.task_cache.set_collection_cost(fake_task_id, 20)
+        self.task_cache.flush()
+        # Cost is smoothed over collections
+        mock_update_collection_cost.assert_called_once_with(
+            mock.ANY, {fake_task_id: (13.0, 100)})
+
+        # Unchanged costs are not written again
+        self.task_cache.flush()
+        self.assertEqual(mock_update_collection_cost.call_count, 1)
+
+    @mock.patch.object(db, 'task_update')
+    @mock.patch.object(db, 'task_get', mock.Mock(
+        return_value=dict(fake_telemetry_job, job_id='fake_job')))
+    def test_raise_interval_on_overruns(self, mock_task_update):
+        self.override_config('auto_adjust_interval', True, 'telemetry')
+        ctx = context.get_admin_context()
+        handler = PerformanceCollectionHandler(ctx, fake_task_id,
+                                               fake_storage_id, {}, 100,
+                                               fake_executor)
+        job = CollectionJob('fake_job', handler, 100, 0)
+        handler.scheduler = mock.Mock()
+        handler.scheduler.get_job.return_value = job
+
+        for _ in range(TelemetryCollection.MAX_CONSECUTIVE_OVERRUNS - 1):
+            handler._record_collection(90, 80)
+        self.assertEqual(mock_task_update.call_count, 0)
+
+        handler._record_collection(90, 80)
+        mock_task_update.assert_called_once_with(ctx, fake_task_id,
+                                                 {'interval': 200})
+        self.assertEqual(200, handler.interval)
+        self.assertEqual(200, job.interval)
+        stats = task_cache.get_collection_stats()[fake_storage_id]
+        self.assertEqual(TelemetryCollection.MAX_CONSECUTIVE_OVERRUNS,
+                         stats['overruns'])
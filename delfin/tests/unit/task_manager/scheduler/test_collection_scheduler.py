@@ -0,0 +1,79 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from apscheduler.jobstores.base import JobLookupError
+
+from delfin import test
+from delfin.task_manager.scheduler.collection_scheduler import \
+    CollectionScheduler
+
+
+class TestCollectionScheduler(test.TestCase):
+
+    def test_add_remove_job(self):
+        scheduler = CollectionScheduler(max_workers=1)
+        job = scheduler.add_job(mock.Mock(), 'interval', seconds=10,
+                                next_run_time='2021-03-24 10:00:00',
+                                id='job_1')
+        self.assertIs(job, scheduler.get_job('job_1'))
+        self.assertEqual(10, job.interval)
+
+        scheduler.remove_job('job_1')
+        self.assertIsNone(scheduler.get_job('job_1'))
+        self.assertTrue(job.removed)
+        self.assertRaises(JobLookupError, scheduler.remove_job, 'job_1')
+
+    def test_pop_due_jobs(self):
+        scheduler = CollectionScheduler(max_workers=1)
+        job_1 = scheduler.add_job(mock.Mock(), seconds=10,
+                                  next_run_time=100, id='job_1')
+        job_2 = scheduler.add_job(mock.Mock(), seconds=10,
+                                  next_run_time=105, id='job_2')
+        job_3 = scheduler.add_job(mock.Mock(), seconds=10,
+                                  next_run_time=102, id='job_3')
+        scheduler.add_job(mock.Mock(), seconds=10, next_run_time=200,
+                          id='job_4')
+        scheduler.remove_job('job_3')
+
+        due_jobs = scheduler._pop_due_jobs(125)
+        self.assertEqual([(job_1, 100), (job_2, 105)], due_jobs)
+        # Missed runs are not caught up and phase is kept
+        self.assertEqual(130, job_1.next_run_time)
+        self.assertEqual(135, job_2.next_run_time)
+        self.assertNotIn(job_3, [item[2] for item in scheduler.heap])
+
+    def test_submit(self):
+        scheduler = CollectionScheduler(max_workers=1)
+        scheduler.executor = mock.Mock()
+        job = scheduler.add_job(mock.Mock(), seconds=10, next_run_time=100,
+                                misfire_grace_time=5, id='job_1')
+
+        scheduler._submit(job, 100, 101)
+        scheduler.executor.submit.assert_called_once_with(
+            scheduler._run_job, job, 100)
+
+        # Previous run is still going on
+        scheduler._submit(job, 110, 111)
+        self.assertEqual(1, scheduler.stats['skipped'])
+
+        scheduler._run_job(job, 100)
+        job.func.assert_called_once_with()
+        self.assertFalse(job.running)
+
+        # Run is later than misfire grace time
+        scheduler._submit(job, 120, 130)
+        self.assertEqual(1, scheduler.stats['misfired'])
+        self.assertEqual(1, scheduler.executor.submit.call_count)
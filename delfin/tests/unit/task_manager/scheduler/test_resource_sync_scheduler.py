@@ -0,0 +1,78 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from delfin.common import constants
+from delfin import db
+from delfin import test
+from delfin.task_manager.scheduler import resource_sync_scheduler
+from delfin.task_manager.tasks import resources
+
+VOLUME_TASK = 'delfin.task_manager.tasks.resources.StorageVolumeTask'
+RESOURCE_TASKS = len(resources.StorageResourceTask.__subclasses__())
+
+
+@mock.patch('delfin.task_manager.rpcapi.TaskAPI', mock.Mock())
+class TestResourceSyncScheduler(test.TestCase):
+
+    def setUp(self):
+        super(TestResourceSyncScheduler, self).setUp()
+        self.override_config('resource_sync_interval', 3600)
+        self.override_config('resource_sync_intervals',
+                             'StorageVolumeTask:600,StorageDiskTask:0')
+        self.storages = [
+            {'id': 'storage1', 'sync_status': constants.SyncStatus.SYNCED},
+            {'id': 'storage2', 'sync_status': 12}]
+
+    @mock.patch('random.uniform', lambda start, end: end)
+    @mock.patch('time.time')
+    def test_schedule(self, mock_time):
+        scheduler = resource_sync_scheduler.ResourceSyncScheduler()
+        sync = scheduler.task_rpcapi.sync_storage_resource
+        with mock.patch.object(db, 'storage_get_all',
+                               return_value=self.storages):
+            mock_time.return_value = 0
+            scheduler.schedule()
+            # First syncs are spread over the interval
+            sync.assert_not_called()
+            self.assertEqual(2 * (RESOURCE_TASKS - 1),
+                             len(scheduler.next_sync_times))
+            self.assertEqual(
+                600, scheduler.next_sync_times[('storage1', VOLUME_TASK)])
+
+            mock_time.return_value = 600
+            scheduler.schedule()
+            # Storage syncing by the user is skipped
+            sync.assert_called_once_with(
+                scheduler.ctx, 'storage1', VOLUME_TASK,
+                constants.SyncPriority.PERIODIC)
+
+            mock_time.return_value = 3600
+            scheduler.schedule()
+            # Volumes twice, disks not at all
+            self.assertEqual(RESOURCE_TASKS, sync.call_count)
+
+        # Storages removed are dropped
+        with mock.patch.object(db, 'storage_get_all',
+                               return_value=self.storages[:1]):
+            scheduler.schedule()
+        self.assertEqual(RESOURCE_TASKS - 1, len(scheduler.next_sync_times))
+
+    def test_invalid_intervals(self):
+        self.assertRaises(ValueError, self.override_config,
+                          'resource_sync_intervals', 'StorageVolumeTask:-1')
+        self.assertRaises(ValueError, self.override_config,
+                          'resource_sync_intervals',
+                          'StorageVolumeTask:hourly')
@@ -11,8 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import datetime
 from unittest import mock
 
+from oslo_utils import timeutils
+
 from delfin import context
 from delfin import db
 from delfin import exception
@@ -91,25 +94,125 @@ class TestAlertTask(test.TestCase):
         self.assertEqual(mock_dispatch.call_count, 1)
         self.assertEqual(mock_fill_storage_attributes.call_count,
                          len(fake_alerts))
+        # Alerts synced are stored
+        self.assertEqual(fake_alerts, [
+            alert['alert'] for alert in db.alert_get_all(
+                context, sort_keys=['id'], sort_dirs=['asc'],
+                filters={'storage_id': storage_id})])
+
+    @mock.patch.object(db, 'storage_get',
+                       mock.Mock(return_value=fake_storage))
+    @mock.patch('delfin.exporter.base_exporter.AlertExporterManager.dispatch')
+    @mock.patch('delfin.drivers.api.API.list_alerts')
+    def test_sync_alerts_incremental(self, mock_list_alerts, mock_dispatch):
+        task = alerts.AlertSyncTask()
+        storage_id = fake_storage['id']
+        alert_list = [dict(alert, occur_time=1000 + i)
+                      for i, alert in enumerate(fake_alerts)]
+
+        # First sync exports all alerts without time filter
+        mock_list_alerts.return_value = [dict(a) for a in alert_list]
+        task.sync_alerts(context, storage_id, None)
+        mock_list_alerts.assert_called_with(context, storage_id, None)
+        self.assertEqual(len(mock_dispatch.call_args[0][1]), 2)
+
+        # Unchanged alerts are not exported again and watermark is passed
+        mock_list_alerts.return_value = [dict(alert_list[1])]
+        task.sync_alerts(context, storage_id, None)
+        mock_list_alerts.assert_called_with(context, storage_id,
+                                            {'begin_time': 1001})
+        self.assertEqual(mock_dispatch.call_count, 1)
+
+        # Changed and new alerts are exported
+        changed = dict(alert_list[1], severity=constants.Severity.MINOR)
+        new = dict(alert_list[0], sequence_number=80, occur_time=1002)
+        mock_list_alerts.return_value = [changed, new]
+        task.sync_alerts(context, storage_id, None)
+        self.assertEqual(mock_dispatch.call_count, 2)
+        self.assertEqual(mock_dispatch.call_args[0][1], [changed, new])
+
+        # Explicit query parameters export everything returned
+        mock_list_alerts.return_value = [dict(a) for a in alert_list]
+        task.sync_alerts(context, storage_id, {'begin_time': 0})
+        self.assertEqual(len(mock_dispatch.call_args[0][1]), 2)
+
+        task.remove_watermark(storage_id)
+        mock_list_alerts.return_value = []
+        task.sync_alerts(context, storage_id, None)
+        mock_list_alerts.assert_called_with(context, storage_id, None)
+
+    @mock.patch.object(db, 'storage_get',
+                       mock.Mock(return_value=fake_storage))
+    @mock.patch('delfin.exporter.base_exporter.AlertExporterManager.dispatch',
+                mock.Mock())
+    @mock.patch('delfin.drivers.api.API.list_alerts')
+    def test_sync_alerts_store(self, mock_list_alerts):
+        task = alerts.AlertSyncTask()
+        storage_id = fake_storage['id']
+        alert_list = [dict(alert, occur_time=1000 + i)
+                      for i, alert in enumerate(fake_alerts)]
+
+        def stored():
+            return [alert['sequence_number'] for alert in db.alert_get_all(
+                context, sort_keys=['id'], sort_dirs=['asc'],
+                filters={'storage_id': storage_id})]
+
+        now = datetime.datetime(2021, 1, 1)
+        timeutils.set_time_override(now)
+        self.addCleanup(timeutils.clear_time_override)
+        mock_list_alerts.return_value = [dict(a) for a in alert_list]
+        task.sync_alerts(context, storage_id, None)
+        self.assertEqual(['79', '50'], stored())
+
+        # Alerts listed again unchanged are still seen, the ones not listed
+        # since alert_store_max_age are purged
+        for days in (20, 40):
+            timeutils.set_time_override(now + datetime.timedelta(days=days))
+            mock_list_alerts.return_value = [dict(alert_list[1])]
+            task.sync_alerts(context, storage_id, None)
+        self.assertEqual(['50'], stored())
+
+        # Sync of a time range keeps the alerts not listed
+        mock_list_alerts.return_value = []
+        task.sync_alerts(context, storage_id, {'begin_time': 2000,
+                                               'end_time': None})
+        self.assertEqual(['50'], stored())
+
+        # Full sync removes the alerts cleared on the storage, but not the
+        # ones only received as traps
+        db.alerts_upsert(context, storage_id, [{'sequence_number': 'trap1'}],
+                         origin=constants.AlertOrigin.TRAP)
+        timeutils.set_time_override(now + datetime.timedelta(days=41))
+        task.sync_alerts(context, storage_id, {'begin_time': None,
+                                               'end_time': None})
+        self.assertEqual(['trap1'], stored())
 
-    @mock.patch('delfin.drivers.api.API.clear_alert')
-    def test_clear_alerts(self, mock_clear_alert):
+    @mock.patch('delfin.drivers.api.API.clear_alerts')
+    def test_clear_alerts(self, mock_clear_alerts):
         task = alerts.AlertSyncTask()
         storage_id = fake_storage['id']
         task.clear_alerts(context, storage_id, [])
-        self.assertEqual(mock_clear_alert.call_count, 0)
+        self.assertEqual(mock_clear_alerts.call_count, 0)
 
         sequence_number_list = ['sequence_number_1', 'sequence_number_2']
-        task.clear_alerts(context, storage_id, sequence_number_list)
-        self.assertEqual(mock_clear_alert.call_count,
-                         len(sequence_number_list))
+        mock_clear_alerts.return_value = dict.fromkeys(sequence_number_list)
+        ret = task.clear_alerts(context, storage_id, sequence_number_list)
+        mock_clear_alerts.assert_called_once_with(context, storage_id,
+                                                  sequence_number_list)
+        self.assertEqual(ret, [])
 
-        mock_clear_alert.side_effect = \
+        mock_clear_alerts.side_effect = \
             exception.AccessInfoNotFound(storage_id)
         ret = task.clear_alerts(context, storage_id, sequence_number_list)
         self.assertEqual(ret, [])
 
-        mock_clear_alert.side_effect = \
-            exception.Invalid('Fake exception')
+        mock_clear_alerts.side_effect = None
+        mock_clear_alerts.return_value = {
+            'sequence_number_1': None,
+            'sequence_number_2': exception.Invalid('Fake exception')}
+        ret = task.clear_alerts(context, storage_id, sequence_number_list)
+        self.assertEqual(ret, ['sequence_number_2'])
+
+        mock_clear_alerts.side_effect = exception.Invalid('Fake exception')
         ret = task.clear_alerts(context, storage_id, sequence_number_list)
         self.assertEqual(ret, sequence_number_list)
@@ -0,0 +1,111 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from delfin import context
+from delfin import db
+from delfin import test
+from delfin.task_manager import metrics_manager
+
+fake_executor = 'node1'
+
+
+def fake_task(task_id, storage_id, collection_cost=None):
+    return {'id': task_id,
+            'storage_id': storage_id,
+            'interval': 100,
+            'executor': fake_executor,
+            'collection_cost': collection_cost}
+
+
+@mock.patch('delfin.task_manager.metrics_manager.ConsistentHashing',
+            mock.Mock())
+@mock.patch('delfin.task_manager.scheduler.schedule_manager.SchedulerManager',
+            mock.Mock())
+@mock.patch.object(metrics_manager.MetricsTaskManager, 'schedule_boot_jobs',
+                   mock.Mock())
+@mock.patch.object(metrics_manager.MetricsTaskManager, 'create_process',
+                   mock.Mock())
+class TestMetricsTaskManager(test.TestCase):
+
+    def setUp(self):
+        super(TestMetricsTaskManager, self).setUp()
+        self.override_config('max_storages_in_child', 5, 'telemetry')
+        self.override_config('max_collection_load_in_child', 1.0,
+                             'telemetry')
+        self.ctx = context.get_admin_context()
+
+    def _assign(self, manager, tasks):
+        with mock.patch.object(db, 'task_get',
+                               side_effect=lambda ctx, task_id:
+                               tasks[task_id - 1]):
+            return [manager.get_local_executor(self.ctx, task['id'], None,
+                                               fake_executor)
+                    for task in tasks]
+
+    def test_get_local_executor_by_load(self):
+        manager = metrics_manager.MetricsTaskManager()
+        # Loads are 0.6, 0.5, 0.3 and 0.2 of a local executor
+        tasks = [fake_task(1, 'storage1', 60),
+                 fake_task(2, 'storage2', 50),
+                 fake_task(3, 'storage3', 30),
+                 fake_task(4, 'storage4', 20)]
+        topics = self._assign(manager, tasks)
+
+        self.assertEqual(['node1:executor_1', 'node1:executor_2',
+                          'node1:executor_1', 'node1:executor_2'], topics)
+        self.assertEqual({'storage1', 'storage3'},
+                         manager.executor_map['executor_1']['storages'])
+        # Storage assigned already keeps its executor
+        self.assertEqual(['node1:executor_2'],
+                         self._assign(manager, tasks[:2])[1:])
+
+    def test_get_local_executor_not_measured(self):
+        manager = metrics_manager.MetricsTaskManager()
+        tasks = [fake_task(index + 1, 'storage%d' % index)
+                 for index in range(6)]
+        topics = self._assign(manager, tasks)
+
+        # Storages not measured are placed max_storages_in_child per
+        # executor
+        self.assertEqual(['node1:executor_1'] * 5 + ['node1:executor_2'],
+                         topics)
+
+    @mock.patch('delfin.task_manager.subprocess_rpcapi.SubprocessAPI')
+    def test_rebalance_executors(self, mock_rpcapi):
+        manager = metrics_manager.MetricsTaskManager()
+        manager.group = fake_executor
+        tasks = [fake_task(1, 'storage1', 40),
+                 fake_task(2, 'storage2', 40)]
+        self._assign(manager, tasks)
+        self.assertEqual(['executor_1'], list(manager.executor_map))
+
+        # Collections of storage2 got slower
+        tasks[1]['collection_cost'] = 90
+        with mock.patch.object(db, 'task_get_all', return_value=tasks), \
+                mock.patch.object(manager, 'get_all_tasks',
+                                  return_value=([tasks[0]], [])):
+            manager.rebalance_executors()
+
+        self.assertEqual({'storage2'},
+                         manager.executor_map['executor_1']['storages'])
+        self.assertEqual({'storage1'},
+                         manager.executor_map['executor_2']['storages'])
+        self.assertEqual('executor_2',
+                         manager.storage_executors['storage1'])
+        manager.rpcapi.remove_job_local.assert_called_once_with(
+            mock.ANY, 1, 'node1:executor_1')
+        manager.rpcapi.assign_job_local.assert_called_once_with(
+            mock.ANY, 1, 'node1:executor_2')
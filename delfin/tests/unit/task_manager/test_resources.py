@@ -15,11 +15,12 @@
 
 from unittest import mock
 from delfin.common import config # noqa
+from delfin.common import constants
 from delfin.drivers import fake_storage
 from delfin.task_manager.tasks import resources
 from delfin.task_manager.tasks.resources import StorageDeviceTask
 
-from delfin import test, context, coordination
+from delfin import test, context, coordination, exception
 
 storage = {
     'id': '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6',
@@ -374,12 +375,81 @@ class TestStorageVolumeTask(test.TestCase):
         vol_obj.sync()
         self.assertTrue(mock_vol_del.called)
 
+    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.drivers.api.API.list_volumes')
+    @mock.patch('delfin.db.volume_get_all')
+    @mock.patch('delfin.db.volumes_update')
+    @mock.patch('delfin.db.storage_update')
+    @mock.patch('delfin.db.storage_get')
+    def test_sync_unchanged(self, mock_storage_get, mock_storage_update,
+                            mock_vol_update, mock_vol_get_all,
+                            mock_list_vols, get_lock):
+        def fake_storage_get(ctx, storage_id):
+            if ctx.read_deleted == 'yes':
+                raise exception.StorageNotFound(storage_id)
+            return {'id': storage_id, 'sync_status': 1000}
+
+        mock_storage_get.side_effect = fake_storage_get
+        vol_obj = resources.StorageVolumeTask(
+            context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
+        mock_list_vols.side_effect = lambda *args: [dict(vol) for vol
+                                                    in vols_list]
+        mock_vol_get_all.return_value = vols_list
+        stats = resources.get_sync_stats()
+        vol_obj.sync()
+        vol_obj.sync()
+
+        # Resources listed again in another order are unchanged too
+        mock_list_vols.side_effect = lambda *args: [dict(vol) for vol
+                                                    in reversed(vols_list)]
+        vol_obj.periodic = True
+        vol_obj.sync()
+        self.assertEqual(1, mock_vol_update.call_count)
+        self.assertEqual(1, mock_vol_get_all.call_count)
+        self.assertEqual(
+            stats.get('writes_avoided', 0) + 2 * len(vols_list),
+            resources.get_sync_stats()['writes_avoided'])
+        # Periodic sync does not change the sync status
+        self.assertEqual(2, mock_storage_update.call_count)
+
+        mock_list_vols.side_effect = lambda *args: []
+        vol_obj.sync()
+        self.assertEqual(2, mock_vol_get_all.call_count)
+
+    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.drivers.api.API.list_volumes')
+    @mock.patch('delfin.db.volume_get_all')
+    @mock.patch('delfin.db.volumes_delete')
+    @mock.patch('delfin.db.volumes_create')
+    @mock.patch('delfin.db.resource_version_bump')
+    def test_sync_failed_bump_version(self, mock_version_bump,
+                                      mock_vol_create, mock_vol_del,
+                                      mock_vol_get_all, mock_list_vols,
+                                      get_lock):
+        vol_obj = resources.StorageVolumeTask(
+            context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
+        mock_list_vols.return_value = [dict(vols_list[0],
+                                            native_volume_id='new')]
+        mock_vol_get_all.return_value = vols_list
+        mock_vol_create.side_effect = exception.DelfinException()
+
+        # Volumes deleted before the failure are visible
+        vol_obj.sync()
+        self.assertTrue(mock_vol_del.called)
+        mock_version_bump.assert_called_once_with(
+            context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda',
+            constants.ResourceType.VOLUME)
+
+    @mock.patch('delfin.db.resource_version_delete')
     @mock.patch('delfin.db.volume_delete_by_storage')
-    def test_remove(self, mock_vol_del):
+    def test_remove(self, mock_vol_del, mock_version_delete):
         vol_obj = resources.StorageVolumeTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         vol_obj.remove()
         self.assertTrue(mock_vol_del.called)
+        mock_version_delete.assert_called_once_with(
+            context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda',
+            constants.ResourceType.VOLUME)
 
 
 class TestStoragecontrollerTask(test.TestCase):
@@ -0,0 +1,50 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+from delfin import context
+from delfin import test
+from delfin.common import constants
+from delfin.task_manager import rpcapi
+
+
+@mock.patch('delfin.rpc.get_client')
+class TestTaskAPI(test.TestCase):
+
+    def test_sync_storage_resource(self, mock_get_client):
+        client = mock_get_client.return_value
+        client.can_send_version.return_value = True
+        ctx = context.get_admin_context()
+
+        rpcapi.TaskAPI().sync_storage_resource(
+            ctx, 'storage1', 'task', constants.SyncPriority.PERIODIC)
+        client.prepare.assert_called_once_with(version='1.1')
+        client.prepare.return_value.cast.assert_called_once_with(
+            ctx, 'sync_storage_resource', storage_id='storage1',
+            resource_task='task', priority=constants.SyncPriority.PERIODIC)
+
+    def test_sync_storage_resource_version_capped(self, mock_get_client):
+        self.override_config('task_rpc_version_cap', '1.0')
+        client = mock_get_client.return_value
+        client.can_send_version.return_value = False
+        ctx = context.get_admin_context()
+
+        rpcapi.TaskAPI().sync_storage_resource(
+            ctx, 'storage1', 'task', constants.SyncPriority.PERIODIC)
+        self.assertEqual('1.0',
+                         mock_get_client.call_args[1]['version_cap'])
+        client.prepare.assert_called_once_with(version='1.0')
+        client.prepare.return_value.cast.assert_called_once_with(
+            ctx, 'sync_storage_resource', storage_id='storage1',
+            resource_task='task')
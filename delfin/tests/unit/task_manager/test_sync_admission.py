@@ -0,0 +1,139 @@
+# Copyright 2021 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import eventlet
+from eventlet import event
+
+from delfin.common import constants
+from delfin import context
+from delfin import db
+from delfin import exception
+from delfin import test
+from delfin.task_manager import sync_admission
+
+USER = constants.SyncPriority.USER
+PERIODIC = constants.SyncPriority.PERIODIC
+
+
+def fake_storage_get(ctx, storage_id):
+    if storage_id == 'removed':
+        raise exception.StorageNotFound(storage_id)
+    # Storages vendor1-a, vendor1-b and vendor2-a
+    return {'id': storage_id, 'vendor': storage_id.split('-')[0]}
+
+
+@mock.patch.object(db, 'storage_get', fake_storage_get)
+class TestSyncAdmissionController(test.TestCase):
+
+    def setUp(self):
+        super(TestSyncAdmissionController, self).setUp()
+        self.ctx = context.get_admin_context()
+        self.started = []
+        self.finish = {}
+        self.controller = sync_admission.SyncAdmissionController(
+            self._run_sync)
+
+    def _run_sync(self, ctx, storage_id, resource_task, priority):
+        key = (storage_id, resource_task)
+        self.started.append(key)
+        self.finish[key] = event.Event()
+        self.finish[key].wait()
+
+    def _submit(self, storage_id, resource_task, priority=USER):
+        self.controller.submit(self.ctx, storage_id, resource_task,
+                               priority)
+        # Let the syncs admitted start
+        eventlet.sleep(0)
+
+    def _done(self, storage_id, resource_task):
+        self.finish.pop((storage_id, resource_task)).send()
+        eventlet.sleep(0)
+        eventlet.sleep(0)
+
+    def test_storage_and_vendor_limits(self):
+        self.override_config('sync_max_concurrent_tasks_per_storage', 2)
+        self.override_config('sync_max_concurrent_tasks_per_vendor', 3)
+        for task in ('task1', 'task2', 'task3'):
+            self._submit('vendor1-a', task)
+            self._submit('vendor1-b', task)
+            self._submit('vendor2-a', task)
+
+        # Two syncs of a storage, three of vendor1
+        self.assertEqual([('vendor1-a', 'task1'), ('vendor1-b', 'task1'),
+                          ('vendor2-a', 'task1'), ('vendor1-a', 'task2'),
+                          ('vendor2-a', 'task2')], self.started)
+        stats = self.controller.get_stats()
+        self.assertEqual({USER: 4, PERIODIC: 0}, stats['queued'])
+        self.assertEqual(5, stats['running'])
+        self.assertEqual({'vendor1': 3, 'vendor2': 2},
+                         stats['running_by_vendor'])
+
+        # The storage waiting longer is served first
+        self._done('vendor1-a', 'task1')
+        self.assertEqual(('vendor1-b', 'task2'), self.started[-1])
+
+    def test_node_limit_and_priority(self):
+        self.override_config('sync_max_concurrent_tasks', 1)
+        self._submit('vendor1-a', 'task1')
+        self._submit('vendor1-b', 'task1', PERIODIC)
+        self._submit('vendor2-a', 'task1')
+        self.assertEqual([('vendor1-a', 'task1')], self.started)
+
+        self._done('vendor1-a', 'task1')
+        self._done('vendor2-a', 'task1')
+        self.assertEqual([('vendor1-a', 'task1'), ('vendor2-a', 'task1'),
+                          ('vendor1-b', 'task1')], self.started)
+        stats = self.controller.get_stats()
+        self.assertEqual(3, stats['admitted'])
+        self.assertGreater(stats['wait_time_max'], 0)
+
+    def test_collapse_duplicates(self):
+        self.override_config('sync_max_concurrent_tasks', 1)
+        self._submit('vendor1-a', 'task1')
+        # Periodic sync of the sync running is collapsed
+        self._submit('vendor1-a', 'task1', PERIODIC)
+        self._submit('vendor1-b', 'task1', PERIODIC)
+        # Queued already, the sync queued gets the higher priority
+        self._submit('vendor1-b', 'task1')
+        self._submit('vendor2-a', 'task1')
+        self._submit('vendor1-b', 'task1', PERIODIC)
+        # User sync of the sync running runs again after it
+        self._submit('vendor1-a', 'task1')
+
+        stats = self.controller.get_stats()
+        self.assertEqual(3, stats['collapsed'])
+        self.assertEqual({USER: 3, PERIODIC: 0}, stats['queued'])
+
+        self._done('vendor1-a', 'task1')
+        self._done('vendor1-b', 'task1')
+        self._done('vendor2-a', 'task1')
+        self.assertEqual([('vendor1-a', 'task1'), ('vendor1-b', 'task1'),
+                          ('vendor2-a', 'task1'), ('vendor1-a', 'task1')],
+                         self.started)
+
+    def test_sync_failed_releases_slot(self):
+        self.override_config('sync_max_concurrent_tasks', 1)
+        run_sync = mock.Mock(side_effect=[Exception('failed'), None])
+        controller = sync_admission.SyncAdmissionController(run_sync)
+        controller.submit(self.ctx, 'removed', 'task1')
+        controller.submit(self.ctx, 'vendor1-a', 'task1')
+        eventlet.sleep(0)
+        eventlet.sleep(0)
+
+        self.assertEqual(2, run_sync.call_count)
+        stats = controller.get_stats()
+        self.assertEqual(0, stats['running'])
+        self.assertEqual({USER: 0, PERIODIC: 0}, stats['queued'])
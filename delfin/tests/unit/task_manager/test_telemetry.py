@@ -11,12 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+import tempfile
 from unittest import mock
 
 from delfin import context
 from delfin import db
 from delfin import exception
 from delfin import test
+from delfin import utils
+from delfin.common.constants import metric_struct
+from delfin.exporter import watermark
 from delfin.task_manager.tasks import telemetry
 from delfin.task_manager.metrics_manager import MetricsTaskManager
 from delfin.task_manager.scheduler.schedulers.telemetry.job_handler \
@@ -40,6 +45,11 @@ fake_storage = {
     'free_capacity': 1045449,
 }
 
+fake_labels = {'storage_id': fake_storage['id'],
+               'resource_type': 'storage',
+               'resource_id': 'storage0',
+               'type': 'RAW', 'unit': 'IOPS'}
+
 
 class TestPerformanceCollectionTask(test.TestCase):
 
@@ -77,6 +87,115 @@ class TestPerformanceCollectionTask(test.TestCase):
         self.assertEqual(mock_dispatch.call_count, 0)
         self.assertEqual(mock_log_error.call_count, 1)
 
+    @mock.patch('delfin.exporter.base_exporter.PerformanceExporterManager'
+                '.dispatch')
+    @mock.patch('delfin.drivers.api.API.collect_perf_metrics')
+    def test_performance_collection_deadline(self, mock_collect_perf_metrics,
+                                             mock_dispatch):
+        deadlines = []
+
+        def _collect(ctx, *args):
+            deadlines.append(ctx.collection_deadline)
+            raise exception.CollectionDeadlineExceeded(fake_storage['id'], 1)
+
+        mock_collect_perf_metrics.side_effect = _collect
+        perf_task = telemetry.PerformanceCollectionTask()
+        status = perf_task.collect(context.get_admin_context(),
+                                   fake_storage['id'], [], 100800, 100900,
+                                   timeout=1)
+        self.assertFalse(status)
+        self.assertEqual(mock_dispatch.call_count, 0)
+        # Work left behind by the driver sees the collection cancelled
+        self.assertTrue(deadlines[0].expired())
+        self.assertRaises(exception.CollectionDeadlineExceeded,
+                          deadlines[0].check)
+
+    @mock.patch.object(db, 'storage_get',
+                       mock.Mock(return_value=fake_storage))
+    @mock.patch('delfin.exporter.base_exporter.PerformanceExporterManager'
+                '.dispatch')
+    @mock.patch('delfin.drivers.api.API.collect_perf_metrics')
+    def test_performance_collection_deduplicate(self,
+                                                mock_collect_perf_metrics,
+                                                mock_dispatch):
+        watermark.WatermarkStore().watermarks.clear()
+        perf_task = telemetry.PerformanceCollectionTask()
+        storage_id = fake_storage['id']
+
+        def _metrics(values):
+            return [metric_struct(name='iops', labels=dict(fake_labels),
+                                  values=values)]
+
+        mock_collect_perf_metrics.return_value = _metrics(
+            {100800: 1, 100860: 2})
+        perf_task.collect(context, storage_id, [], 100800, 100860)
+        self.assertEqual({100800: 1, 100860: 2},
+                         mock_dispatch.call_args[0][1][0].values)
+
+        # Points of overlap exported before are dropped
+        mock_collect_perf_metrics.return_value = _metrics(
+            {100860: 2, 100920: 3})
+        perf_task.collect(context, storage_id, [], 100860, 100920)
+        self.assertEqual({100920: 3},
+                         mock_dispatch.call_args[0][1][0].values)
+
+        mock_collect_perf_metrics.return_value = _metrics({100920: 3})
+        perf_task.collect(context, storage_id, [], 100860, 100920)
+        self.assertEqual([], mock_dispatch.call_args[0][1])
+
+        # Backfill of missed windows is not deduplicated
+        mock_collect_perf_metrics.return_value = _metrics({100500: 0})
+        perf_task.collect(context, storage_id, [], 100500, 100560,
+                          deduplicate=False)
+        self.assertEqual({100500: 0},
+                         mock_dispatch.call_args[0][1][0].values)
+        watermark.WatermarkStore().watermarks.clear()
+
+    @mock.patch.dict(utils.Singleton._instances)
+    def test_watermark_store_persistence(self):
+        path = os.path.join(tempfile.mkdtemp(), 'watermarks.json')
+        self.override_config('export_watermark_file', path, 'telemetry')
+        metric = metric_struct(name='iops', labels=dict(fake_labels),
+                               values={utils.utcnow_ms(): 1})
+        utils.Singleton._instances.pop(watermark.WatermarkStore, None)
+        store = watermark.WatermarkStore()
+        metrics, watermarks = store.filter([metric])
+        store.commit(watermarks)
+        store.save()
+
+        # Watermarks are loaded on restart
+        utils.Singleton._instances.pop(watermark.WatermarkStore)
+        restarted = watermark.WatermarkStore()
+        self.assertEqual(store.watermarks, restarted.watermarks)
+        self.assertEqual(([], {}), restarted.filter([metric]))
+
+        # Watermarks saved by another process are kept
+        other = metric_struct(name='iops', labels={'storage_id': 'other'},
+                              values={utils.utcnow_ms(): 1})
+        utils.Singleton._instances.pop(watermark.WatermarkStore)
+        other_store = watermark.WatermarkStore()
+        other_store.watermarks.clear()
+        other_store.commit(other_store.filter([other])[1])
+        other_store.save()
+        utils.Singleton._instances.pop(watermark.WatermarkStore)
+        restarted = watermark.WatermarkStore()
+        self.assertEqual(([], {}), restarted.filter([metric, other]))
+        os.remove(path)
+
+    @mock.patch.object(db, 'storage_get',
+                       mock.Mock(return_value=fake_storage))
+    def test_get_storage_labels(self):
+        storage_id = fake_storage['id']
+        telemetry.remove_storage_labels(storage_id)
+        labels = {'name': fake_storage['name'],
+                  'serial_number': fake_storage['serial_number']}
+        self.assertDictEqual(labels, telemetry.get_storage_labels(
+            context, storage_id))
+        self.assertDictEqual(labels, telemetry.get_storage_labels(
+            context, storage_id))
+        self.assertEqual(db.storage_get.call_count, 1)
+        telemetry.remove_storage_labels(storage_id)
+
     @mock.patch.object(SubprocessAPI, 'assign_job_local')
     @mock.patch.object(db, 'task_get')
     @mock.patch.object(JobHandler, 'schedule_job')
@@ -134,15 +253,20 @@ class TestPerformanceCollectionTask(test.TestCase):
 
         mgr.enable_sub_process = True
         mgr.executor_map = {
-            'host1': {
-                "storages": ['storage_id1'],
+            'executor_1': {
+                "storages": {'storage_id1'},
             }
         }
+        mgr.storage_executors = {'storage_id1': 'executor_1'}
         mgr.scheduler = BackgroundScheduler()
         mgr.scheduler.start()
         mgr.remove_job('context', 'task_id1', 'host1')
         self.assertEqual(mock_job_schedule.call_count, 1)
         self.assertEqual(mock_subprocess_api.call_count, 1)
+        mock_subprocess_api.assert_called_once_with(
+            'context', 'task_id1', 'host1:executor_1')
+        self.assertEqual(set(), mgr.executor_map['executor_1']['storages'])
+        self.assertNotIn('storage_id1', mgr.storage_executors)
 
     @mock.patch.object(SubprocessAPI, 'assign_failed_job_local')
     @mock.patch.object(db, 'failed_task_get')
@@ -206,12 +330,17 @@ class TestPerformanceCollectionTask(test.TestCase):
 
         mgr.enable_sub_process = True
         mgr.executor_map = {
-            'host1': {
-                "storages": ['storage_id1'],
+            'executor_1': {
+                "storages": {'storage_id1'},
             }
         }
+        mgr.storage_executors = {'storage_id1': 'executor_1'}
         mgr.scheduler = BackgroundScheduler()
         mgr.scheduler.start()
         mgr.remove_failed_job('context', 'task_id1', 'host1')
         self.assertEqual(mock_job_schedule.call_count, 1)
         self.assertEqual(mock_subprocess_api.call_count, 1)
+        mock_subprocess_api.assert_called_once_with(
+            'context', 'task_id1', 'host1:executor_1')
+        self.assertEqual(set(), mgr.executor_map['executor_1']['storages'])
+        self.assertNotIn('storage_id1', mgr.storage_executors)
@@ -148,3 +148,25 @@ class ConsistentHashingTestCase(test.TestCase):
         part.start()
         part.watch_group_change()
         self.assertTrue(crd.run_watchers.called)
+
+    @mock.patch.object(coordination.partitioner, 'Partitioner')
+    def test_get_task_executor_by_load(self, mock_partitioner):
+        part = mock_partitioner.return_value
+        part.ring.nodes = {b'node1': 100, b'node2': 100}
+
+        def members_for_object(task_id, ignore_members=None):
+            return [member for member in [b'node1', b'node2']
+                    if member not in (ignore_members or [])]
+        part.members_for_object.side_effect = members_for_object
+        hashing = coordination.ConsistentHashing()
+        hashing.start()
+
+        # Task hashed to node1 is placed there while it has room
+        self.assertEqual('node1', hashing.get_task_executor(
+            'task', 1.0, {'node1': 0.5, 'node2': 1.5}))
+        # and on next node on the ring when it is overloaded
+        self.assertEqual('node2', hashing.get_task_executor(
+            'task', 1.0, {'node1': 4.0, 'node2': 1.0}))
+        # Load not measured yet follows the ring
+        self.assertEqual('node1', hashing.get_task_executor(
+            'task', None, {'node1': 4.0, 'node2': 1.0}))
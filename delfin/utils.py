@@ -20,7 +20,9 @@
 
 import contextlib
 import functools
+import hashlib
 import inspect
+import json
 import os
 import pyclbr
 import random
@@ -46,6 +48,7 @@ import retrying
 import six
 
 from delfin import exception
+from delfin.common import constants
 from delfin.i18n import _
 
 CONF = cfg.CONF
@@ -610,3 +613,34 @@ class Singleton(type):
 
 def utcnow_ms():
     return int(timeutils.utcnow(True).timestamp() * 1000)
+
+
+# Keys of extra attributes holding credentials, left out of fingerprints
+_CREDENTIAL_KEYWORDS = ('password', 'pwd', 'secret', 'token', 'credential')
+
+
+def access_info_fingerprint(access_info):
+    """Hash of the vendor, model, endpoints and extra attributes of access
+    information, credentials excluded, the same for access information of
+    the same storage.
+    """
+    fields = [(access_info.get('vendor') or '').strip().lower(),
+              (access_info.get('model') or '').strip().lower()]
+    for access in constants.ACCESS_TYPE:
+        if access_info.get(access):
+            host = access_info[access].get('host') or ''
+            port = access_info[access].get('port')
+            fields.append([access, host.strip().lower(),
+                           None if port is None else six.text_type(port)])
+    # Extra attributes such as array_id tell apart the storages behind the
+    # same endpoint, they are only added when set so that the fingerprints
+    # of access information without them are unchanged
+    extra_attributes = sorted(
+        [key, six.text_type(value).strip()]
+        for key, value in (access_info.get('extra_attributes') or {}).items()
+        if value is not None and not any(
+            keyword in key.lower() for keyword in _CREDENTIAL_KEYWORDS))
+    if extra_attributes:
+        fields.append(['extra_attributes', extra_attributes])
+    return hashlib.sha256(json.dumps(
+        fields, separators=(',', ':')).encode()).hexdigest()
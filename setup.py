@@ -34,7 +34,8 @@ setup(
             'example = delfin.exporter.example:PerformanceExporterExample',
             'prometheus = delfin.exporter.prometheus.exporter'
             ':PerformanceExporterPrometheus',
-            'kafka = delfin.exporter.kafka.exporter:PerformanceExporterKafka'
+            'kafka = delfin.exporter.kafka.exporter:PerformanceExporterKafka',
+            'tsdb = delfin.exporter.tsdb.exporter:PerformanceExporterTSDB'
         ],
         'delfin.storage.drivers': [
             'fake_storage fake_driver = delfin.drivers.fake_storage:FakeStorageDriver',